@@ -2,18 +2,24 @@
 
 from .api_inspector import (
     APIInspectorServer,
+    AsyncCaptureServer,
+    CaptureLog,
     DataExporter,
     HTTPRequestData,
     RequestStatistics,
     RequestStorage,
+    ServerBackend,
     create_api_inspector_widget,
 )
 
 __all__ = [
     "APIInspectorServer",
+    "AsyncCaptureServer",
+    "CaptureLog",
     "DataExporter",
     "HTTPRequestData",
     "RequestStatistics",
     "RequestStorage",
+    "ServerBackend",
     "create_api_inspector_widget",
 ]
@@ -1,28 +1,42 @@
+import asyncio
+import bisect
+import heapq
+import itertools
 import json
 import logging
+import queue
+import sqlite3
 import threading
 import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
+from enum import Enum
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from socketserver import ThreadingMixIn
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
-from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+import appdirs
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QComboBox,
     QFileDialog,
     QFrame,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
     QMessageBox,
     QPushButton,
     QSplitter,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QTabWidget,
     QTextEdit,
     QVBoxLayout,
@@ -34,6 +48,64 @@ from devboost.styles import get_tool_style
 # Logger for debugging
 logger = logging.getLogger(__name__)
 
+# Endpoints listed in request statistics
+STATISTICS_TOP_ENDPOINTS = 10
+
+# Minutes covered by the per-minute request histogram, ending with the current minute
+STATISTICS_HISTOGRAM_MINUTES = 60
+
+# Most captures the capture log commits in one transaction
+CAPTURE_LOG_BATCH_SIZE = 500
+
+# Captures waiting for the capture log writer before add_request blocks
+CAPTURE_LOG_QUEUE_SIZE = 10000
+
+_CAPTURE_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    seq INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    query_params TEXT NOT NULL,
+    client_ip TEXT NOT NULL,
+    request_id TEXT NOT NULL,
+    content_length INTEGER NOT NULL,
+    user_agent TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bodies (
+    seq INTEGER PRIMARY KEY,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_method ON requests(method COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS requests_path ON requests(path);
+CREATE INDEX IF NOT EXISTS requests_timestamp ON requests(timestamp);
+"""
+
+_CAPTURE_LOG_SELECT = (
+    "SELECT r.seq, r.timestamp, r.method, r.url, r.headers, r.query_params, b.body, r.client_ip,"
+    " r.request_id, r.content_length, r.user_agent FROM requests AS r LEFT JOIN bodies AS b ON b.seq = r.seq"
+)
+
+# Milliseconds between coalesced table updates in the widget
+TABLE_REFRESH_INTERVAL_MS = 250
+
+# Headers sent with every capture response
+CAPTURE_RESPONSE_HEADERS = {
+    "Content-type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, PATCH, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+}
+
+# Limits of the asyncio backend
+ASYNC_MAX_CONNECTIONS = 1000  # Connections served at once; later ones wait until a slot frees up
+ASYNC_MAX_HEADER_BYTES = 64 * 1024  # Request line and headers; also the read buffer size per connection
+ASYNC_MAX_BODY_BYTES = 16 * 1024 * 1024
+ASYNC_KEEPALIVE_TIMEOUT = 30.0  # Seconds an idle connection is kept open
+ASYNC_WRITE_BUFFER_BYTES = 256 * 1024  # Unsent response bytes per connection before reading pauses
+
 
 @dataclass
 class HTTPRequestData:
@@ -58,107 +130,625 @@ class RequestStatistics:
     total_requests: int = 0
     method_breakdown: dict[str, int] = field(default_factory=dict)
     requests_per_hour: list[int] = field(default_factory=list)
+    requests_per_minute: list[int] = field(default_factory=list)  # Oldest minute first, current minute last
     average_body_size: float = 0.0
     top_endpoints: list[tuple[str, int]] = field(default_factory=list)
     last_updated: datetime = field(default_factory=datetime.now)
 
 
+class _CountBucket:
+    """Keys of a TopKCounter that share one count, linked to the neighbouring counts."""
+
+    __slots__ = ("count", "higher", "keys", "lower")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.keys: dict[Any, None] = {}  # Insertion-ordered set
+        self.lower: _CountBucket = self
+        self.higher: _CountBucket = self
+
+
+class TopKCounter:
+    """
+    Exact counter with O(1) increments and decrements and O(K) top-K queries.
+
+    Keys with the same count share a bucket, and the buckets form a circular list ordered by
+    count around a sentinel. Changing a count by one only moves the key to a neighbouring bucket,
+    and the K most frequent keys are read by walking down from the highest bucket. Unlike a heap
+    this stays exact when counts go down again, as they do when requests are evicted.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove every key."""
+        self._head = _CountBucket(0)  # Sentinel: higher is the lowest bucket, lower the highest
+        self._buckets: dict[int, _CountBucket] = {0: self._head}
+        self._counts: dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def get(self, key: Any) -> int:
+        """Get the count of a key, 0 if it is not counted."""
+        return self._counts.get(key, 0)
+
+    def increment(self, key: Any) -> None:
+        """Add one to the count of a key."""
+        count = self._counts.get(key, 0)
+        current = self._buckets[count]
+        bucket = self._buckets.get(count + 1) or self._insert_above(current, count + 1)
+        bucket.keys[key] = None
+        self._counts[key] = count + 1
+        if count:
+            self._discard(current, key)
+
+    def decrement(self, key: Any) -> None:
+        """Subtract one from the count of a key, forgetting it at zero."""
+        count = self._counts[key]
+        current = self._buckets[count]
+        if count == 1:
+            del self._counts[key]
+        else:
+            bucket = self._buckets.get(count - 1) or self._insert_above(current.lower, count - 1)
+            bucket.keys[key] = None
+            self._counts[key] = count - 1
+        self._discard(current, key)
+
+    def most_common(self, k: int) -> list[tuple[Any, int]]:
+        """Get the k keys with the highest counts, highest first; ties keep the order they reached the count."""
+        result: list[tuple[Any, int]] = []
+        bucket = self._head.lower
+        while bucket is not self._head and len(result) < k:
+            result.extend((key, bucket.count) for key in itertools.islice(bucket.keys, k - len(result)))
+            bucket = bucket.lower
+        return result
+
+    def _insert_above(self, below: _CountBucket, count: int) -> _CountBucket:
+        """Link a new empty bucket directly above another one."""
+        bucket = _CountBucket(count)
+        bucket.lower = below
+        bucket.higher = below.higher
+        below.higher.lower = bucket
+        below.higher = bucket
+        self._buckets[count] = bucket
+        return bucket
+
+    def _discard(self, bucket: _CountBucket, key: Any) -> None:
+        """Remove a key from a bucket, unlinking the bucket once it is empty."""
+        del bucket.keys[key]
+        if not bucket.keys:
+            bucket.lower.higher = bucket.higher
+            bucket.higher.lower = bucket.lower
+            del self._buckets[bucket.count]
+
+
+def _time_range_cutoff(time_range: str) -> datetime | None:
+    """Get the oldest timestamp included by a time range filter, or None for unknown ranges."""
+    now = datetime.now()
+    if time_range == "last_hour":
+        return now - timedelta(hours=1)
+    if time_range == "last_day":
+        return now - timedelta(days=1)
+    return None
+
+
+class CaptureLog:
+    """
+    Append-only SQLite log of captured requests, for histories longer than the in-memory window.
+
+    Request metadata and bodies are stored in separate tables, so filtering and listing never read
+    bodies. Appends are queued and committed in batches by a writer thread, and WAL mode lets
+    queries run while it writes, so capturing only waits for the disk when the queue is full. Rows
+    are keyed by the sequence numbers of the RequestStorage writing to the log.
+    """
+
+    def __init__(self, db_path: Path | None = None, batch_size: int = CAPTURE_LOG_BATCH_SIZE):
+        """
+        Open or create the log.
+
+        Args:
+            db_path: Optional database file (defaults to the DevBoost app data dir)
+            batch_size: Most captures committed in one transaction
+
+        Raises:
+            OSError: If the database directory cannot be created
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.db_path = db_path or Path(appdirs.user_data_dir("DevBoost", "DeskRiders")) / "api_inspector_captures.db"
+        self.batch_size = batch_size
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_CAPTURE_LOG_SCHEMA)
+            self.next_seq = connection.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM requests").fetchone()[0]
+
+        self._queue: queue.Queue[tuple[int, HTTPRequestData, str] | None] = queue.Queue(CAPTURE_LOG_QUEUE_SIZE)
+        self._written = threading.Condition()
+        self._written_seq = self.next_seq  # Every appended sequence number below this is committed
+        self._writer = threading.Thread(target=self._write_loop, name="api-inspector-capture-log", daemon=True)
+        self._writer.start()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection for one transaction or query."""
+        connection = sqlite3.connect(self.db_path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def append(self, seq: int, request: HTTPRequestData, path: str) -> None:
+        """
+        Queue a capture for writing, blocking while the queue is full.
+
+        Sequence numbers must increase from one append to the next.
+        """
+        self._queue.put((seq, request, path))
+        self.next_seq = seq + 1
+
+    def wait_for(self, seq: int) -> None:
+        """Block until every capture appended with a sequence number below seq is committed."""
+        target = min(seq, self.next_seq)
+        with self._written:
+            self._written.wait_for(lambda: self._written_seq >= target)
+
+    def _write_loop(self) -> None:
+        """Commit queued captures in batches until close() queues None."""
+        try:
+            connection = sqlite3.connect(self.db_path)
+            connection.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error:
+            logger.exception("Failed to open capture log %s for writing", self.db_path)
+            connection = None
+        try:
+            closing = False
+            while not closing:
+                item = self._queue.get()
+                batch = []
+                while item is not None:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                closing = item is None
+                if batch:
+                    self._write_batch(connection, batch)
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _write_batch(
+        self, connection: sqlite3.Connection | None, batch: list[tuple[int, HTTPRequestData, str]]
+    ) -> None:
+        """Commit one batch of captures and wake up waiting readers; batches are dropped without a connection."""
+        try:
+            if connection is None:
+                raise sqlite3.OperationalError("capture log is not open for writing")
+            with connection:
+                connection.executemany(
+                    "INSERT INTO requests (seq, timestamp, method, url, path, headers, query_params, client_ip,"
+                    " request_id, content_length, user_agent) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            seq,
+                            request.timestamp.timestamp(),
+                            request.method,
+                            request.url,
+                            path,
+                            json.dumps(request.headers),
+                            json.dumps(request.query_params),
+                            request.client_ip,
+                            request.request_id,
+                            request.content_length,
+                            request.user_agent,
+                        )
+                        for seq, request, path in batch
+                    ],
+                )
+                connection.executemany(
+                    "INSERT INTO bodies (seq, body) VALUES (?, ?)",
+                    [(seq, request.body) for seq, request, _ in batch if request.body],
+                )
+        except sqlite3.Error:
+            logger.exception("Failed to write %s captured requests to %s", len(batch), self.db_path)
+        with self._written:
+            self._written_seq = batch[-1][0] + 1
+            self._written.notify_all()
+
+    def iter_requests(
+        self, filters: dict[str, Any] | None = None, before_seq: int | None = None
+    ) -> Iterator[tuple[int, HTTPRequestData]]:
+        """
+        Stream logged requests in capture order.
+
+        Only committed captures are returned; call wait_for() first to include recent appends.
+
+        Args:
+            filters: Same filters as RequestStorage.get_requests
+            before_seq: Only return requests numbered below this
+
+        Yields:
+            (sequence number, request) pairs
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if filters and filters.get("method"):
+            clauses.append("r.method = ? COLLATE NOCASE")
+            params.append(filters["method"])
+        if filters and filters.get("path"):
+            clauses.append("r.path = ?")
+            params.append(filters["path"])
+        if filters and filters.get("url_pattern"):
+            clauses.append("instr(lower(r.url), ?) > 0")
+            params.append(filters["url_pattern"].lower())
+        cutoff = _time_range_cutoff(filters["time_range"]) if filters and filters.get("time_range") else None
+        if cutoff is not None:
+            clauses.append("r.timestamp >= ?")
+            params.append(cutoff.timestamp())
+        if before_seq is not None:
+            clauses.append("r.seq < ?")
+            params.append(before_seq)
+        # Clauses are fixed strings; only placeholders carry filter values
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"{_CAPTURE_LOG_SELECT}{where} ORDER BY r.seq"
+
+        with self._connect() as connection:
+            rows = connection.execute(query, params)
+            for seq, timestamp, method, url, headers, query_params, body, *rest in rows:
+                request = HTTPRequestData(
+                    datetime.fromtimestamp(timestamp),
+                    method,
+                    url,
+                    json.loads(headers),
+                    json.loads(query_params),
+                    body or "",
+                    *rest,
+                )
+                yield seq, request
+
+    def count(self) -> int:
+        """Get the number of committed captures."""
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+
+    def clear(self) -> None:
+        """Delete every logged capture once pending appends are committed; numbering continues."""
+        self.wait_for(self.next_seq)
+        with self._connect() as connection:
+            connection.execute("DELETE FROM bodies")
+            connection.execute("DELETE FROM requests")
+
+    def close(self) -> None:
+        """Commit pending appends and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+
 class RequestStorage:
-    """Thread-safe in-memory storage for captured HTTP requests."""
+    """
+    Thread-safe in-memory storage for captured HTTP requests.
+
+    Requests live in a fixed-capacity ring addressed by a sequence number that grows with every
+    capture, so adding and evicting are O(1). Indexes by method, path, URL and minute map keys to
+    sequence numbers in capture order. Because the evicted request is always the oldest, it is at
+    the front of every index deque that holds it. Filtered queries walk the smallest matching
+    index, so they cost time in proportion to the result rather than the buffer.
+
+    Statistics are kept as running aggregates that are updated on add and undone on eviction:
+    method and per-minute counts are the index sizes, the body size is a running sum and endpoints
+    are ranked by a TopKCounter. Reading statistics therefore does not depend on the buffer size
+    and is cheap enough to refresh several times a second.
+
+    With a CaptureLog set, every capture is also appended to disk. Memory keeps only the newest
+    ``max_requests`` requests with their indexes, while ``full_history`` queries and exports read
+    older requests back from the log. Statistics cover the requests in memory.
+    """
 
-    def __init__(self, max_requests: int = 10000):
+    def __init__(self, max_requests: int = 10000, capture_log: CaptureLog | None = None):
+        """
+        Initialize the storage.
+
+        Args:
+            max_requests: Requests kept in memory
+            capture_log: Optional on-disk log that receives every capture (see set_capture_log)
+        """
         self.max_requests = max_requests
-        self._requests: list[HTTPRequestData] = []
         self._lock = threading.RLock()
+        self._capture_log: CaptureLog | None = None
+        self._reset(0)
+        if capture_log is not None:
+            self.set_capture_log(capture_log)
+
+    def _reset(self, first_seq: int) -> None:
+        """Drop all requests and indexes, numbering the next request first_seq."""
+        self._ring: list[HTTPRequestData | None] = [None] * self.max_requests
+        self._paths: list[str] = [""] * self.max_requests  # URL path of each slot, parsed once on add
+        self._first_seq = first_seq  # Sequence number of the oldest stored request
+        self._next_seq = first_seq  # Sequence number given to the next request
         self._request_counter = 0
+        self._method_index: dict[str, deque[int]] = {}
+        self._path_index: dict[str, deque[int]] = {}
+        self._url_index: dict[str, deque[int]] = {}  # Keyed by lowercased URL
+        self._minute_index: dict[int, deque[int]] = {}
+        self._minutes: deque[int] = deque()  # Minutes present in _minute_index, ascending
+        self._endpoint_counts = TopKCounter()  # Stored requests per URL path
+        self._total_body_size = 0
+
+    @staticmethod
+    def _minute_of(timestamp: datetime) -> int:
+        """Get the time bucket of a timestamp."""
+        return int(timestamp.timestamp() // 60)
 
     def add_request(self, request_data: HTTPRequestData) -> None:
         """Add a new request to storage with thread safety."""
         with self._lock:
-            # Implement circular buffer to prevent unlimited memory growth
-            if len(self._requests) >= self.max_requests:
-                self._requests.pop(0)
-
-            self._requests.append(request_data)
+            # Circular buffer: overwrite the oldest slot to prevent unlimited memory growth
+            if self._next_seq - self._first_seq >= self.max_requests:
+                self._evict_oldest()
+
+            seq = self._next_seq
+            slot = seq % self.max_requests
+            path = urlparse(request_data.url).path
+            self._ring[slot] = request_data
+            self._paths[slot] = path
+            self._next_seq += 1
             self._request_counter += 1
-            logger.debug("Added request %s, total: %s", request_data.request_id, len(self._requests))
-
-    def get_requests(self, filters: dict[str, Any] | None = None) -> list[HTTPRequestData]:
-        """Get requests with optional filtering."""
+            self._endpoint_counts.increment(path)
+            self._total_body_size += request_data.content_length
+
+            self._method_index.setdefault(request_data.method.upper(), deque()).append(seq)
+            self._path_index.setdefault(path, deque()).append(seq)
+            self._url_index.setdefault(request_data.url.lower(), deque()).append(seq)
+            if self._capture_log is not None:
+                # Queued under the lock so the log receives captures in sequence order
+                self._capture_log.append(seq, request_data, path)
+
+            minute = self._minute_of(request_data.timestamp)
+            if minute not in self._minute_index:
+                # Timestamps of concurrent captures can arrive slightly out of order
+                if self._minutes and minute < self._minutes[-1]:
+                    bisect.insort(self._minutes, minute)
+                else:
+                    self._minutes.append(minute)
+            self._minute_index.setdefault(minute, deque()).append(seq)
+            logger.debug("Added request %s, total: %s", request_data.request_id, self._next_seq - self._first_seq)
+
+    def _evict_oldest(self) -> None:
+        """Remove the oldest request from the ring and every index."""
+        seq = self._first_seq
+        slot = seq % self.max_requests
+        request = self._ring[slot]
+        self._ring[slot] = None
+        self._first_seq += 1
+        self._endpoint_counts.decrement(self._paths[slot])
+        self._total_body_size -= request.content_length
+
+        self._pop_index(self._method_index, request.method.upper(), seq)
+        self._pop_index(self._path_index, self._paths[slot], seq)
+        self._pop_index(self._url_index, request.url.lower(), seq)
+        minute = self._minute_of(request.timestamp)
+        if self._pop_index(self._minute_index, minute, seq):
+            if self._minutes[0] == minute:
+                self._minutes.popleft()
+            else:
+                self._minutes.remove(minute)
+
+    @staticmethod
+    def _pop_index(index: dict, key: Any, seq: int) -> bool:
+        """Remove the oldest sequence number from an index entry, returning True if the entry emptied."""
+        seqs = index[key]
+        if seqs[0] == seq:
+            seqs.popleft()
+        else:
+            seqs.remove(seq)
+        if seqs:
+            return False
+        del index[key]
+        return True
+
+    def set_capture_log(self, capture_log: CaptureLog | None) -> None:
+        """
+        Start or stop writing every capture to an on-disk log.
+
+        Requests already in memory are written to the new log. If the log holds captures of an
+        earlier session, the requests in memory are renumbered after them, which readers following
+        sequence numbers see as the requests being evicted and captured again. A previous log is
+        closed after its pending captures are committed.
+        """
         with self._lock:
-            requests = self._requests.copy()
-
-            if not filters:
-                return requests
+            if self._capture_log is not None:
+                self._capture_log.close()
+            self._capture_log = capture_log
+            if capture_log is None:
+                return
+
+            if capture_log.next_seq > self._first_seq:
+                requests = [self._ring[seq % self.max_requests] for seq in range(self._first_seq, self._next_seq)]
+                self._reset(max(capture_log.next_seq, self._next_seq))
+                for request in requests:
+                    self.add_request(request)
+            else:
+                for seq in range(self._first_seq, self._next_seq):
+                    slot = seq % self.max_requests
+                    capture_log.append(seq, self._ring[slot], self._paths[slot])
+
+    def get_requests(self, filters: dict[str, Any] | None = None, full_history: bool = False) -> list[HTTPRequestData]:
+        """
+        Get requests in capture order with optional filtering.
+
+        Supported filters are ``method`` (exact, case-insensitive), ``path`` (exact URL path),
+        ``url_pattern`` (case-insensitive substring of the URL) and ``time_range`` (``last_hour`` or
+        ``last_day``). The smallest matching index drives the query and the other filters are
+        checked per request. ``url_pattern`` is matched against distinct URLs, so it is cheap while
+        captures repeat endpoints.
+
+        Args:
+            filters: Optional filters
+            full_history: Also return requests evicted from memory that the capture log holds
+        """
+        if full_history and self._capture_log is not None:
+            return list(self.iter_requests(filters, full_history=True))
+        with self._lock:
+            return [self._ring[seq % self.max_requests] for seq in self._select(filters, self._first_seq)]
 
-            # Apply filters
-            if filters.get("method"):
-                requests = [r for r in requests if r.method.upper() == filters["method"].upper()]
+    def iter_requests(
+        self, filters: dict[str, Any] | None = None, full_history: bool = False
+    ) -> Iterator[HTTPRequestData]:
+        """
+        Stream requests in capture order, reading evicted ones from the capture log.
 
-            if filters.get("url_pattern"):
-                pattern = filters["url_pattern"].lower()
-                requests = [r for r in requests if pattern in r.url.lower()]
+        The requests in memory are taken when iteration starts; older ones are read from disk while
+        iterating, so exporting a long history does not load it into memory at once.
 
-            if filters.get("time_range"):
-                # Filter by time range (last hour, day, etc.)
-                now = datetime.now()
-                if filters["time_range"] == "last_hour":
-                    cutoff = now.replace(hour=now.hour - 1) if now.hour > 0 else now.replace(day=now.day - 1, hour=23)
-                    requests = [r for r in requests if r.timestamp >= cutoff]
-                elif filters["time_range"] == "last_day":
-                    cutoff = now.replace(day=now.day - 1) if now.day > 1 else now.replace(month=now.month - 1, day=30)
-                    requests = [r for r in requests if r.timestamp >= cutoff]
+        Args:
+            filters: Same filters as get_requests
+            full_history: Include requests evicted from memory when a capture log is set
+        """
+        with self._lock:
+            first_seq = self._first_seq
+            hot = [self._ring[seq % self.max_requests] for seq in self._select(filters, first_seq)]
+            capture_log = self._capture_log if full_history else None
+        if capture_log is not None:
+            capture_log.wait_for(first_seq)
+            for _, request in capture_log.iter_requests(filters, before_seq=first_seq):
+                yield request
+        yield from hot
+
+    def get_requests_since(
+        self, seq: int, filters: dict[str, Any] | None = None
+    ) -> tuple[list[tuple[int, HTTPRequestData]], int]:
+        """
+        Get stored requests numbered seq or later, for readers that follow the capture incrementally.
+
+        Sequence numbers grow with every capture and are never reused, also across clears, so a
+        reader that keeps the returned next sequence number receives every later capture once.
+        Requests numbered below ``get_sequence_range()[0]`` have been evicted or cleared.
+
+        Args:
+            seq: First sequence number wanted
+            filters: Same filters as get_requests
+
+        Returns:
+            Matching (sequence number, request) pairs in capture order, and the sequence number to
+            pass on the next call
+        """
+        with self._lock:
+            rows = [(s, self._ring[s % self.max_requests]) for s in self._select(filters, seq)]
+            return rows, self._next_seq
 
-            return requests
+    def get_sequence_range(self) -> tuple[int, int]:
+        """Get the sequence number of the oldest stored request and the one the next capture gets."""
+        with self._lock:
+            return self._first_seq, self._next_seq
+
+    def _select(self, filters: dict[str, Any] | None, start: int) -> list[int]:
+        """Get sequence numbers from start onwards of stored requests matching the filters."""
+        start = max(start, self._first_seq)
+        # Each filter: (candidate count, index deques holding its candidates, per-request check)
+        candidates: list[tuple[int, list[deque[int]], Any]] = []
+
+        if filters and filters.get("method"):
+            method = filters["method"].upper()
+            seqs = self._method_index.get(method)
+            candidates.append((len(seqs or ()), [seqs] if seqs else [], lambda r, _p: r.method.upper() == method))
+
+        if filters and filters.get("path"):
+            wanted_path = filters["path"]
+            seqs = self._path_index.get(wanted_path)
+            candidates.append((len(seqs or ()), [seqs] if seqs else [], lambda _r, p: p == wanted_path))
+
+        if filters and filters.get("url_pattern"):
+            pattern = filters["url_pattern"].lower()
+            matched = [seqs for url, seqs in self._url_index.items() if pattern in url]
+            candidates.append((
+                sum(len(seqs) for seqs in matched),
+                matched,
+                lambda r, _p: pattern in r.url.lower(),
+            ))
+
+        cutoff = _time_range_cutoff(filters["time_range"]) if filters and filters.get("time_range") else None
+        if cutoff is not None:
+            first = bisect.bisect_left(self._minutes, self._minute_of(cutoff))
+            matched = [self._minute_index[minute] for minute in itertools.islice(self._minutes, first, None)]
+            candidates.append((
+                sum(len(seqs) for seqs in matched),
+                matched,
+                lambda r, _p: r.timestamp >= cutoff,
+            ))
+
+        # Scan the requested tail directly when it is shorter than every index candidate list
+        tail = self._next_seq - start
+        if not candidates or tail <= min(size for size, _, _ in candidates):
+            seqs = range(start, self._next_seq)
+        else:
+            _, driver, _ = min(candidates, key=lambda candidate: candidate[0])
+            seqs = driver[0] if len(driver) == 1 else heapq.merge(*driver)
+        if not candidates:
+            return list(seqs)
+
+        checks = [check for _, _, check in candidates]
+        selected = []
+        for seq in seqs:
+            if seq < start:
+                continue
+            slot = seq % self.max_requests
+            if all(check(self._ring[slot], self._paths[slot]) for check in checks):
+                selected.append(seq)
+        return selected
 
     def get_statistics(self) -> RequestStatistics:
-        """Calculate and return current statistics."""
+        """Get current statistics from the running aggregates."""
         with self._lock:
-            if not self._requests:
+            count = self._next_seq - self._first_seq
+            if count == 0:
                 return RequestStatistics()
 
-            # Calculate method breakdown
-            method_breakdown = {}
-            total_body_size = 0
-            endpoint_counts = {}
-
-            for request in self._requests:
-                # Method breakdown
-                method = request.method.upper()
-                method_breakdown[method] = method_breakdown.get(method, 0) + 1
-
-                # Body size calculation
-                total_body_size += request.content_length
-
-                # Endpoint counting
-                path = urlparse(request.url).path
-                endpoint_counts[path] = endpoint_counts.get(path, 0) + 1
-
-            # Calculate average body size
-            avg_body_size = total_body_size / len(self._requests) if self._requests else 0
-
-            # Get top endpoints
-            top_endpoints = sorted(endpoint_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+            current_minute = self._minute_of(datetime.now())
+            requests_per_minute = [
+                len(self._minute_index.get(minute, ()))
+                for minute in range(current_minute - STATISTICS_HISTOGRAM_MINUTES + 1, current_minute + 1)
+            ]
 
             return RequestStatistics(
-                total_requests=len(self._requests),
-                method_breakdown=method_breakdown,
-                average_body_size=avg_body_size,
-                top_endpoints=top_endpoints,
+                total_requests=count,
+                method_breakdown={method: len(seqs) for method, seqs in self._method_index.items()},
+                requests_per_minute=requests_per_minute,
+                average_body_size=self._total_body_size / count,
+                top_endpoints=self._endpoint_counts.most_common(STATISTICS_TOP_ENDPOINTS),
                 last_updated=datetime.now(),
             )
 
     def clear_requests(self) -> None:
         """Clear all stored requests."""
         with self._lock:
-            self._requests.clear()
-            self._request_counter = 0
+            # Keep numbering after a clear, so readers see the cleared requests as evicted
+            self._reset(self._next_seq)
+            if self._capture_log is not None:
+                self._capture_log.clear()
             logger.info("Cleared all stored requests")
 
     def get_request_count(self) -> int:
         """Get current request count."""
         with self._lock:
-            return len(self._requests)
+            return self._next_seq - self._first_seq
+
+
+def capture_response_body(request_data: HTTPRequestData) -> bytes:
+    """Build the JSON body returned to the client for a captured request."""
+    response = {
+        "status": "captured",
+        "request_id": request_data.request_id,
+        "method": request_data.method,
+        "timestamp": request_data.timestamp.isoformat(),
+    }
+    return json.dumps(response).encode()
 
 
 class APIInspectorRequestHandler(BaseHTTPRequestHandler):
@@ -166,6 +756,7 @@ class APIInspectorRequestHandler(BaseHTTPRequestHandler):
 
     def __init__(self, request, client_address, server):
         self.storage = getattr(server, "storage", None)
+        self.on_request = getattr(server, "on_request", None)  # Replaces storage.add_request when set
         super().__init__(request, client_address, server)
 
     def _capture_request(self):
@@ -199,23 +790,17 @@ class APIInspectorRequestHandler(BaseHTTPRequestHandler):
             )
 
             # Store the request
-            self.storage.add_request(request_data)
+            if self.on_request:
+                self.on_request(request_data)
+            else:
+                self.storage.add_request(request_data)
 
             # Send response
             self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, PATCH, OPTIONS")
-            self.send_header("Access-Control-Allow-Headers", "*")
+            for name, value in CAPTURE_RESPONSE_HEADERS.items():
+                self.send_header(name, value)
             self.end_headers()
-
-            response = {
-                "status": "captured",
-                "request_id": request_data.request_id,
-                "method": self.command,
-                "timestamp": request_data.timestamp.isoformat(),
-            }
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(capture_response_body(request_data))
 
         except Exception:
             logger.exception("Error capturing request")
@@ -254,6 +839,253 @@ class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
     allow_reuse_address = True
 
 
+class ServerBackend(Enum):
+    """Capture server implementations."""
+
+    THREADING = "threading"  # One thread and one request per connection
+    ASYNCIO = "asyncio"  # One event loop thread with keep-alive, pipelining and backpressure
+
+
+class _HTTPError(Exception):
+    """Request the asyncio backend answers with an error status before closing the connection."""
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"{status} {reason}")
+        self.status = status
+        self.reason = reason
+
+
+def _parse_request_head(head: bytes) -> tuple[str, str, str, dict[str, str]]:
+    """
+    Parse the request line and headers of an HTTP/1.x request.
+
+    Returns:
+        Method, request target, HTTP version and headers as sent
+
+    Raises:
+        _HTTPError: If the request line or a header line is malformed
+    """
+    # Clients may send empty lines between pipelined requests
+    lines = head.lstrip(b"\r\n").decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise _HTTPError(400, "Bad Request")
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(":")
+        if not separator or not name.strip():
+            raise _HTTPError(400, "Bad Request")
+        headers[name.strip()] = value.strip()
+    return parts[0], parts[1], parts[2], headers
+
+
+class AsyncCaptureServer:
+    """
+    HTTP/1.1 capture server built on asyncio, running its event loop on a background thread.
+
+    Connections stay open between requests, and requests pipelined on one connection are answered
+    in order. Flow is bounded at every stage: at most ``max_connections`` connections are served at
+    once, reading pauses while a connection's request buffer is full, and a connection reads its
+    next request only after the unsent responses drop below ``ASYNC_WRITE_BUFFER_BYTES``, so a
+    client that does not read its responses stops being read instead of growing server memory.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_request: Callable[[HTTPRequestData], None],
+        max_connections: int = ASYNC_MAX_CONNECTIONS,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            on_request: Called on the event loop thread with every captured request
+            max_connections: Connections served at once
+        """
+        self.host = host
+        self.port = port
+        self.on_request = on_request
+        self.max_connections = max_connections
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._connections: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(max_connections)
+        self._request_ids = itertools.count(1)
+
+    def start(self) -> None:
+        """
+        Bind the listening socket and start serving on a background thread.
+
+        Raises:
+            OSError: If the port cannot be bound
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            # Bind on the calling thread so bind errors reach the caller
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._serve_connection, self.host, self.port, limit=ASYNC_MAX_HEADER_BYTES)
+            )
+        except BaseException:
+            loop.close()
+            raise
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = loop
+        self._thread = threading.Thread(target=loop.run_forever, name="api-inspector-asyncio", daemon=True)
+        self._thread.start()
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Close the listening socket and every open connection, then stop the event loop."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout)
+        except Exception:
+            logger.exception("Error closing asyncio capture server")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            loop.close()
+        self._loop = None
+
+    async def _close(self) -> None:
+        """Stop accepting and cancel the connection handlers."""
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until the client or keep-alive rules close it."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        writer.transport.set_write_buffer_limits(high=ASYNC_WRITE_BUFFER_BYTES)
+        peer = writer.get_extra_info("peername")
+        client_ip = peer[0] if peer else ""
+        try:
+            async with self._slots:
+                while await self._serve_request(reader, writer, client_ip):
+                    pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            logger.debug("Client %s disconnected or overran a chunk header mid-request", client_ip)
+        except asyncio.CancelledError:
+            # Server shutdown; ending quietly keeps asyncio from logging the cancelled connection task
+            logger.debug("Closed connection from %s on shutdown", client_ip)
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _serve_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, client_ip: str) -> bool:
+        """
+        Read, capture and answer one request.
+
+        Returns:
+            True if the connection stays open for another request
+        """
+        try:
+            async with asyncio.timeout(ASYNC_KEEPALIVE_TIMEOUT):
+                head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, TimeoutError):
+            return False  # Closed or idle between requests
+        except asyncio.LimitOverrunError:
+            await self._send(writer, 431, "Request Header Fields Too Large", b"", keep_alive=False)
+            return False
+
+        try:
+            method, target, version, headers = _parse_request_head(head)
+            fields = {name.lower(): value for name, value in headers.items()}
+            if fields.get("expect", "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            body = await self._read_body(reader, fields)
+        except _HTTPError as e:
+            await self._send(writer, e.status, e.reason, b"", keep_alive=False)
+            return False
+
+        connection = fields.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        request_data = HTTPRequestData(
+            timestamp=datetime.now(),
+            method=method,
+            url=target,
+            headers=headers,
+            query_params=parse_qs(urlparse(target).query),
+            body=body.decode("utf-8", errors="ignore"),
+            client_ip=client_ip,
+            request_id=f"{int(time.time() * 1000)}_{next(self._request_ids)}",
+            content_length=len(body),
+            user_agent=fields.get("user-agent", ""),
+        )
+        try:
+            self.on_request(request_data)
+        except Exception:
+            logger.exception("Error capturing request")
+            await self._send(writer, 500, "Internal Server Error", b"", keep_alive=False)
+            return False
+
+        payload = capture_response_body(request_data)
+        await self._send(writer, 200, "OK", payload, keep_alive, include_body=method != "HEAD")
+        return keep_alive
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, fields: dict[str, str]) -> bytes:
+        """Read a fixed-length or chunked request body."""
+        if "chunked" in fields.get("transfer-encoding", "").lower():
+            chunks = []
+            total = 0
+            while True:
+                try:
+                    size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+                except ValueError:
+                    raise _HTTPError(400, "Bad Request") from None
+                if size == 0:
+                    # Skip trailer fields up to the empty line
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    return b"".join(chunks)
+                total += size
+                if total > ASYNC_MAX_BODY_BYTES:
+                    raise _HTTPError(413, "Content Too Large")
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+
+        try:
+            length = int(fields.get("content-length", 0))
+        except ValueError:
+            raise _HTTPError(400, "Bad Request") from None
+        if length < 0:
+            raise _HTTPError(400, "Bad Request")
+        if length > ASYNC_MAX_BODY_BYTES:
+            raise _HTTPError(413, "Content Too Large")
+        return await reader.readexactly(length) if length else b""
+
+    @staticmethod
+    async def _send(
+        writer: asyncio.StreamWriter,
+        status: int,
+        reason: str,
+        payload: bytes,
+        keep_alive: bool,
+        include_body: bool = True,
+    ) -> None:
+        """Write a response and wait while the connection's send buffer is over its limit."""
+        lines = [
+            f"HTTP/1.1 {status} {reason}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            *(f"{name}: {value}" for name, value in CAPTURE_RESPONSE_HEADERS.items()),
+        ]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (payload if include_body else b""))
+        await writer.drain()
+
+
 class APIInspectorServer(QObject):
     """HTTP capture server that runs in a separate thread."""
 
@@ -262,40 +1094,52 @@ class APIInspectorServer(QObject):
     server_stopped = pyqtSignal()  # Signal emitted when server stops
     server_error = pyqtSignal(str)  # Signal emitted on server error
 
-    def __init__(self, port: int = 9010, storage: RequestStorage | None = None):
+    def __init__(
+        self,
+        port: int = 9010,
+        storage: RequestStorage | None = None,
+        backend: ServerBackend = ServerBackend.THREADING,
+    ):
         super().__init__()
         self.port = port
         self.storage = storage or RequestStorage()
+        self.backend = backend
         self.server = None
         self.server_thread = None
         self._running = False
 
-    def start_server(self) -> bool:
-        """Start the HTTP server."""
+    def start_server(self, backend: ServerBackend | None = None) -> bool:
+        """
+        Start the HTTP server.
+
+        Args:
+            backend: Server implementation to start (defaults to the one given at construction)
+        """
         if self._running:
             logger.warning("Server is already running")
             return True
 
+        if backend is not None:
+            self.backend = backend
         try:
             # Try to start server on specified port, fallback to available port
             for port_attempt in range(self.port, self.port + 10):
                 try:
-                    self.server = ThreadingHTTPServer(("localhost", port_attempt), APIInspectorRequestHandler)
-                    self.server.storage = self.storage
-                    self.port = port_attempt
+                    self._create_server(port_attempt)
                     break
                 except OSError:
                     if port_attempt == self.port + 9:  # Last attempt
                         raise
                     continue
 
-            # Start server in separate thread
-            self.server_thread = threading.Thread(target=self._run_server, daemon=True)
-            self.server_thread.start()
+            if self.backend == ServerBackend.THREADING:
+                # Start server in separate thread
+                self.server_thread = threading.Thread(target=self._run_server, daemon=True)
+                self.server_thread.start()
 
             self._running = True
             self.server_started.emit(self.port)
-            logger.info("API Inspector server started on port %s", self.port)
+            logger.info("API Inspector %s server started on port %s", self.backend.value, self.port)
             return True
 
         except Exception as e:
@@ -304,6 +1148,23 @@ class APIInspectorServer(QObject):
             self.server_error.emit(error_msg)
             return False
 
+    def _create_server(self, port: int) -> None:
+        """Bind the selected backend to a port, recording the port actually bound."""
+        if self.backend == ServerBackend.ASYNCIO:
+            self.server = AsyncCaptureServer("localhost", port, self._record_request)
+            self.server.start()
+            self.port = self.server.port
+        else:
+            self.server = ThreadingHTTPServer(("localhost", port), APIInspectorRequestHandler)
+            self.server.storage = self.storage
+            self.server.on_request = self._record_request
+            self.port = self.server.server_address[1]
+
+    def _record_request(self, request_data: HTTPRequestData) -> None:
+        """Store a captured request and announce it (called on server threads)."""
+        self.storage.add_request(request_data)
+        self.request_captured.emit(request_data)
+
     def _run_server(self):
         """Run the server (called in separate thread)."""
         try:
@@ -318,7 +1179,9 @@ class APIInspectorServer(QObject):
             return
 
         try:
-            if self.server:
+            if isinstance(self.server, AsyncCaptureServer):
+                self.server.shutdown()
+            elif self.server:
                 self.server.shutdown()
                 self.server.server_close()
 
@@ -337,6 +1200,7 @@ class APIInspectorServer(QObject):
         return {
             "running": self._running,
             "port": self.port,
+            "backend": self.backend.value,
             "url": f"http://localhost:{self.port}",
             "request_count": self.storage.get_request_count() if self.storage else 0,
         }
@@ -352,6 +1216,34 @@ class DataExporter:
     def __init__(self, storage: RequestStorage):
         self.storage = storage
 
+    CSV_HEADER = "timestamp,method,url,client_ip,content_length,user_agent,headers,query_params,body"
+
+    @staticmethod
+    def _json_record(request: HTTPRequestData) -> dict[str, Any]:
+        """Convert a request to its JSON export record."""
+        return {
+            "timestamp": request.timestamp.isoformat(),
+            "method": request.method,
+            "url": request.url,
+            "headers": request.headers,
+            "query_params": request.query_params,
+            "body": request.body,
+            "client_ip": request.client_ip,
+            "request_id": request.request_id,
+            "content_length": request.content_length,
+            "user_agent": request.user_agent,
+        }
+
+    @staticmethod
+    def _csv_line(request: HTTPRequestData) -> str:
+        """Convert a request to its CSV export line."""
+        # Escape and format fields for CSV
+        headers_str = json.dumps(request.headers).replace('"', '""')
+        query_params_str = json.dumps(request.query_params).replace('"', '""')
+        body_str = request.body.replace('"', '""').replace("\n", "\\n")
+
+        return f'"{request.timestamp.isoformat()}","{request.method}","{request.url}","{request.client_ip}",{request.content_length},"{request.user_agent}","{headers_str}","{query_params_str}","{body_str}"'
+
     def export_json(self, filters: dict[str, Any] | None = None) -> str:
         """Export requests as JSON string."""
         requests = self.storage.get_requests(filters)
@@ -360,42 +1252,56 @@ class DataExporter:
             "export_timestamp": datetime.now().isoformat(),
             "total_requests": len(requests),
             "filters_applied": filters or {},
-            "requests": [],
+            "requests": [self._json_record(request) for request in requests],
         }
 
-        for request in requests:
-            export_data["requests"].append({
-                "timestamp": request.timestamp.isoformat(),
-                "method": request.method,
-                "url": request.url,
-                "headers": request.headers,
-                "query_params": request.query_params,
-                "body": request.body,
-                "client_ip": request.client_ip,
-                "request_id": request.request_id,
-                "content_length": request.content_length,
-                "user_agent": request.user_agent,
-            })
-
         return json.dumps(export_data, indent=2)
 
     def export_csv(self, filters: dict[str, Any] | None = None) -> str:
         """Export requests as CSV string."""
         requests = self.storage.get_requests(filters)
-
-        # CSV header
-        csv_lines = ["timestamp,method,url,client_ip,content_length,user_agent,headers,query_params,body"]
-
-        for request in requests:
-            # Escape and format fields for CSV
-            headers_str = json.dumps(request.headers).replace('"', '""')
-            query_params_str = json.dumps(request.query_params).replace('"', '""')
-            body_str = request.body.replace('"', '""').replace("\n", "\\n")
-
-            csv_line = f'"{request.timestamp.isoformat()}","{request.method}","{request.url}","{request.client_ip}",{request.content_length},"{request.user_agent}","{headers_str}","{query_params_str}","{body_str}"'
-            csv_lines.append(csv_line)
-
-        return "\n".join(csv_lines)
+        return "\n".join([self.CSV_HEADER, *(self._csv_line(request) for request in requests)])
+
+    def export_to_file(
+        self, filename: str, fmt: str = "json", filters: dict[str, Any] | None = None, full_history: bool = True
+    ) -> bool:
+        """
+        Write an export straight to a file, one request at a time.
+
+        With a capture log set, evicted requests are streamed from disk, so the export can be far
+        larger than memory. The JSON layout matches export_json, with ``total_requests`` written
+        after the requests.
+
+        Args:
+            filename: Destination file
+            fmt: ``json`` or ``csv``
+            filters: Same filters as RequestStorage.get_requests
+            full_history: Include requests evicted from memory that the capture log holds
+
+        Returns:
+            True if the file was written
+        """
+        requests = self.storage.iter_requests(filters, full_history=full_history)
+        try:
+            with Path(filename).open("w", encoding="utf-8", newline="") as output:
+                if fmt == "csv":
+                    output.write(self.CSV_HEADER)
+                    for request in requests:
+                        output.write("\n" + self._csv_line(request))
+                else:
+                    output.write(f'{{\n  "export_timestamp": {json.dumps(datetime.now().isoformat())},\n')
+                    output.write(f'  "filters_applied": {json.dumps(filters or {})},\n  "requests": [')
+                    total = 0
+                    for request in requests:
+                        record = json.dumps(self._json_record(request), indent=2).replace("\n", "\n    ")
+                        output.write(f"{',' if total else ''}\n    {record}")
+                        total += 1
+                    output.write(f'\n  ],\n  "total_requests": {total}\n}}\n')
+            logger.info("Export saved to %s", filename)
+            return True
+        except (OSError, sqlite3.Error):
+            logger.exception("Failed to save export")
+            return False
 
     def save_export(self, data: str, filename: str) -> bool:
         """Save export data to file."""
@@ -408,6 +1314,103 @@ class DataExporter:
             return False
 
 
+class RequestTableModel(QAbstractTableModel):
+    """
+    Table model that shows captured requests straight from a RequestStorage.
+
+    Rows only hold (sequence number, request) pairs and cell text is produced when the view paints
+    a row, so only visible rows cost anything. ``sync()`` applies everything evicted or captured
+    since the previous call as one removal at the top and one insertion at the bottom; calling it
+    from a timer coalesces any number of captures into a single view update.
+    """
+
+    COLUMNS = ("Time", "Method", "URL", "IP", "Length", "Agent")
+
+    def __init__(self, storage: RequestStorage, parent: QObject | None = None):
+        super().__init__(parent)
+        self.storage = storage
+        self._filters: dict[str, Any] | None = None
+        self._seqs: list[int] = []
+        self._requests: list[HTTPRequestData] = []
+        self._next_seq = 0  # First sequence number not yet fetched from storage
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        # Flat table: valid parents (cells) have no children
+        return 0 if parent is not None and parent.isValid() else len(self._requests)
+
+    def columnCount(self, parent: QModelIndex | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        request = self._requests[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return request.timestamp.strftime("%H:%M:%S")
+            if column == 1:
+                return request.method
+            if column == 2:
+                return request.url
+            if column == 3:
+                return request.client_ip
+            if column == 4:
+                return str(request.content_length)
+            return request.user_agent
+        if role == Qt.ItemDataRole.ToolTipRole and column == 2:
+            return request.url
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == 4:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def request_at(self, row: int) -> HTTPRequestData | None:
+        """Get the request shown in a row, or None for rows out of range."""
+        return self._requests[row] if 0 <= row < len(self._requests) else None
+
+    def set_filters(self, filters: dict[str, Any] | None) -> None:
+        """Show only requests matching the filters (same keys as RequestStorage.get_requests)."""
+        self.beginResetModel()
+        self._filters = filters or None
+        rows, self._next_seq = self.storage.get_requests_since(0, self._filters)
+        self._seqs = [seq for seq, _ in rows]
+        self._requests = [request for _, request in rows]
+        self.endResetModel()
+
+    def sync(self) -> int:
+        """
+        Bring the rows up to date with the storage.
+
+        Returns:
+            Number of rows appended
+        """
+        first_seq, next_seq = self.storage.get_sequence_range()
+
+        # Rows are in capture order, so evicted and cleared requests are all at the top
+        evicted = bisect.bisect_left(self._seqs, first_seq)
+        if evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            del self._seqs[:evicted]
+            del self._requests[:evicted]
+            self.endRemoveRows()
+
+        if next_seq == self._next_seq:
+            return 0
+        rows, self._next_seq = self.storage.get_requests_since(self._next_seq, self._filters)
+        if rows:
+            start = len(self._requests)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._seqs.extend(seq for seq, _ in rows)
+            self._requests.extend(request for _, request in rows)
+            self.endInsertRows()
+        return len(rows)
+
+
 def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     """
     Create and return the API Inspector widget using a factory pattern (no QWidget subclass),
@@ -438,6 +1441,17 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     port_input.setMaximumWidth(80)
     server_bar.addWidget(port_input)
 
+    server_bar.addWidget(QLabel("Backend:"))
+    backend_combo = QComboBox()
+    backend_combo.addItem("Threaded", ServerBackend.THREADING)
+    backend_combo.addItem("Asyncio (keep-alive)", ServerBackend.ASYNCIO)
+    backend_combo.setToolTip("Asyncio keeps connections open and handles high request rates")
+    server_bar.addWidget(backend_combo)
+
+    persist_checkbox = QCheckBox("Save to disk")
+    persist_checkbox.setToolTip("Keep every capture in an on-disk log; exports then include the full history")
+    server_bar.addWidget(persist_checkbox)
+
     toggle_btn = QPushButton("Start Server")
     clear_btn = QPushButton("Clear")
     refresh_btn = QPushButton("Refresh")
@@ -455,9 +1469,13 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     total_label = QLabel("Total Requests: 0")
     avg_size_label = QLabel("Avg Body Size: 0 B")
     methods_label = QLabel("Methods: {}")
+    rate_label = QLabel("Last Minute: 0")
+    top_endpoint_label = QLabel("Top Endpoint: -")
     stats_bar.addWidget(total_label)
     stats_bar.addWidget(avg_size_label)
     stats_bar.addWidget(methods_label)
+    stats_bar.addWidget(rate_label)
+    stats_bar.addWidget(top_endpoint_label)
     stats_bar.addStretch()
     layout.addWidget(stats_frame)
 
@@ -482,13 +1500,18 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     # ----------------- Main Splitter -----------------
     splitter = QSplitter(Qt.Orientation.Horizontal)
 
-    # Request list (left)
-    request_table = QTableWidget()
-    request_table.setColumnCount(6)
-    request_table.setHorizontalHeaderLabels(["Time", "Method", "URL", "IP", "Length", "Agent"])
+    # Request list (left): the view only asks the model for rows it paints
+    table_model = RequestTableModel(storage, root)
+    request_table = QTableView()
+    request_table.setModel(table_model)
     request_table.horizontalHeader().setStretchLastSection(True)
-    request_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-    request_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+    # Fixed row heights spare the view from measuring every row when thousands are appended
+    request_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    request_table.verticalHeader().setDefaultSectionSize(request_table.fontMetrics().height() + 8)
+    request_table.verticalHeader().setVisible(False)
+    request_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    request_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+    request_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
     splitter.addWidget(request_table)
 
     # Request details (right)
@@ -542,17 +1565,19 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
         total_label.setText(f"Total Requests: {stats.total_requests}")
         avg_size_label.setText(f"Avg Body Size: {int(stats.average_body_size)} B")
         methods_label.setText(f"Methods: {stats.method_breakdown}")
+        rate_label.setText(f"Last Minute: {stats.requests_per_minute[-1] if stats.requests_per_minute else 0}")
+        if stats.top_endpoints:
+            path, hits = stats.top_endpoints[0]
+            top_endpoint_label.setText(f"Top Endpoint: {path} ({hits})")
+        else:
+            top_endpoint_label.setText("Top Endpoint: -")
 
     def _refresh_table() -> None:
-        reqs = storage.get_requests(current_filters or None)
-        request_table.setRowCount(len(reqs))
-        for row, r in enumerate(reqs):
-            request_table.setItem(row, 0, QTableWidgetItem(r.timestamp.strftime("%H:%M:%S")))
-            request_table.setItem(row, 1, QTableWidgetItem(r.method))
-            request_table.setItem(row, 2, QTableWidgetItem(r.url))
-            request_table.setItem(row, 3, QTableWidgetItem(r.client_ip))
-            request_table.setItem(row, 4, QTableWidgetItem(str(r.content_length)))
-            request_table.setItem(row, 5, QTableWidgetItem(r.user_agent))
+        # Follow new captures only while the user is looking at the newest rows
+        scroll_bar = request_table.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+        if table_model.sync() and at_bottom:
+            request_table.scrollToBottom()
 
     def _clear_details() -> None:
         headers_view.clear()
@@ -577,7 +1602,7 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
         if server.is_running():
             server.stop_server()
         else:
-            if not server.start_server():
+            if not server.start_server(backend_combo.currentData()):
                 QMessageBox.critical(root, "Server Error", "Failed to start the API Inspector server.")
 
     def on_clear():
@@ -589,27 +1614,32 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     def on_apply_filters():
         nonlocal current_filters
         current_filters = _collect_filters()
-        _refresh_table()
+        table_model.set_filters(current_filters)
 
     def on_export(fmt: str):
         exporter = DataExporter(storage)
-        if fmt == "json":
-            data = exporter.export_json(current_filters or None)
-            filter_name = "json"
-        else:
-            data = exporter.export_csv(current_filters or None)
-            filter_name = "csv"
         file_path, _ = QFileDialog.getSaveFileName(
             root,
             "Save export",
-            f"api_inspector_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{filter_name}",
-            f"*.{filter_name}",
+            f"api_inspector_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}",
+            f"*.{fmt}",
         )
         if file_path:
-            ok = exporter.save_export(data, file_path)
+            # Streams from the capture log when one is set, so long histories are not loaded at once
+            ok = exporter.export_to_file(file_path, fmt, current_filters or None)
             if not ok:
                 QMessageBox.critical(root, "Save Error", "Failed to save the export file.")
 
+    def on_toggle_persistence(enabled: bool):
+        try:
+            storage.set_capture_log(CaptureLog() if enabled else None)
+        except (OSError, sqlite3.Error) as e:
+            logger.exception("Failed to open the capture log")
+            QMessageBox.critical(root, "Capture Log", f"Failed to open the capture log: {e}")
+            persist_checkbox.blockSignals(True)
+            persist_checkbox.setChecked(False)
+            persist_checkbox.blockSignals(False)
+
     def on_send_to_scratch():
         if not scratch_pad_widget:
             QMessageBox.information(root, "Scratch Pad", "Scratch Pad is not available.")
@@ -636,18 +1666,12 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
 
     def on_table_selection_change():
         nonlocal selected_request
-        row = request_table.currentRow()
-        if row < 0:
-            selected_request = None
+        rows = request_table.selectionModel().selectedRows()
+        selected_request = table_model.request_at(rows[0].row()) if rows else None
+        if selected_request is None:
             _clear_details()
-            return
-        reqs = storage.get_requests(current_filters or None)
-        if 0 <= row < len(reqs):
-            selected_request = reqs[row]
-            _display_request(selected_request)
         else:
-            selected_request = None
-            _clear_details()
+            _display_request(selected_request)
 
     # Wire buttons
     toggle_btn.clicked.connect(on_toggle_server)
@@ -657,12 +1681,16 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     export_json_btn.clicked.connect(lambda: on_export("json"))
     export_csv_btn.clicked.connect(lambda: on_export("csv"))
     send_to_scratch_btn.clicked.connect(on_send_to_scratch)
-    request_table.itemSelectionChanged.connect(on_table_selection_change)
+    persist_checkbox.toggled.connect(on_toggle_persistence)
+    # Commit captures still queued for the capture log when the tool closes
+    root.destroyed.connect(lambda: storage.set_capture_log(None))
+    request_table.selectionModel().selectionChanged.connect(on_table_selection_change)
 
     # Server signals
     def _on_server_started(port: int):
         status_label.setText(f"Server Status: Running on port {port}")
         status_label.setStyleSheet("font-weight: bold; color: #2ecc71;")
+        backend_combo.setEnabled(False)
         # Update toggle button to reflect current action (stop when running)
         try:
             toggle_btn.setText("Stop Server")
@@ -673,6 +1701,7 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     def _on_server_stopped():
         status_label.setText("Server Status: Stopped")
         status_label.setStyleSheet("font-weight: bold; color: #e74c3c;")
+        backend_combo.setEnabled(True)
         # Update toggle button to reflect current action (start when stopped)
         try:
             toggle_btn.setText("Start Server")
@@ -687,11 +1716,18 @@ def create_api_inspector_widget(style=None, scratch_pad_widget=None) -> QWidget:
     server.server_stopped.connect(_on_server_stopped)
     server.server_error.connect(_on_server_error)
 
-    # Refresh timer
-    timer = QTimer(root)
-    timer.setInterval(1000)
-    timer.timeout.connect(lambda: (_refresh_statistics(), _refresh_table()))
-    timer.start()
+    # Refresh timers: statistics are read from running aggregates, so they can update at 10 Hz
+    stats_timer = QTimer(root)
+    stats_timer.setInterval(100)
+    stats_timer.timeout.connect(_refresh_statistics)
+    stats_timer.start()
+
+    # New captures are appended in one batch per tick; the timer polls the storage instead of
+    # listening to request_captured, which would queue one GUI event per request
+    table_timer = QTimer(root)
+    table_timer.setInterval(TABLE_REFRESH_INTERVAL_MS)
+    table_timer.timeout.connect(_refresh_table)
+    table_timer.start()
 
     # Initial refresh
     _refresh_statistics()
@@ -0,0 +1,373 @@
+"""
+Load benchmark comparing the API Inspector capture server backends.
+
+Starts each backend in its own process, drives it with concurrent asyncio clients and reports
+requests per second and latency percentiles as JSON::
+
+    devboost-api-benchmark --connections 50 --requests 20000
+    devboost-api-benchmark --backend asyncio --pipeline 8
+
+Clients reuse a connection while the server keeps it alive and reconnect when it closes it, so
+the threaded backend (one request per connection) and the asyncio backend (keep-alive) are
+measured under the same load. Pipelining is only used on connections the server keeps open.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from .api_inspector import APIInspectorServer, RequestStorage, ServerBackend
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_USAGE = 2
+
+# Version of the JSON report layout
+REPORT_VERSION = 1
+
+DEFAULT_CONNECTIONS = 50
+DEFAULT_REQUESTS = 10000
+DEFAULT_PIPELINE = 1
+DEFAULT_BODY_SIZE = 256
+
+# Seconds a client waits for one response before counting the request as failed
+REQUEST_TIMEOUT = 10.0
+
+# Seconds to wait for a server process to bind its port
+SERVER_START_TIMEOUT = 30.0
+
+
+@dataclass
+class BackendResult:
+    """Load test result of one server backend."""
+
+    backend: str
+    requests: int  # Requests answered with 200
+    errors: int  # Requests that failed, timed out or got another status
+    seconds: float
+    requests_per_second: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    captured: int  # Requests the server stored
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Get a percentile of an ascending list by the nearest-rank method."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _build_request(host: str, port: int, body_size: int) -> bytes:
+    """Build the raw HTTP/1.1 request every client sends."""
+    body = b"x" * body_size
+    head = (
+        f"POST /benchmark/items?source=load HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        f"User-Agent: devboost-api-benchmark\r\n"
+        f"Content-Type: text/plain\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    """
+    Read one response.
+
+    Returns:
+        Status code and whether the server keeps the connection open
+    """
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    status_line, *header_lines = head.rstrip("\r\n").split("\r\n")
+    version, status, *_ = status_line.split(" ", 2)
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+
+    connection = headers.get("connection", "")
+    keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        # Without a length the body ends when the server closes the connection
+        await reader.read()
+        keep_alive = False
+    return int(status), keep_alive
+
+
+async def _run_client(
+    host: str, port: int, count: int, pipeline: int, request: bytes, latencies: list[float]
+) -> tuple[int, int]:
+    """
+    Send requests over one logical client, reconnecting whenever the server closes the connection.
+
+    Returns:
+        Number of successful and failed requests
+    """
+    succeeded = errors = 0
+    remaining = count
+    reader = writer = None
+    reusable = False  # Whether the server kept the current connection open, which allows pipelining
+    while remaining:
+        batch = min(pipeline if reusable else 1, remaining)
+        answered = 0
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(request * batch)
+            await writer.drain()
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                for _ in range(batch):
+                    status, reusable = await _read_response(reader)
+                    latencies.append(time.perf_counter() - started)
+                    answered += 1
+                    if status == 200:
+                        succeeded += 1
+                    else:
+                        errors += 1
+                    if not reusable:
+                        break
+        except (OSError, TimeoutError, asyncio.IncompleteReadError, ValueError):
+            # Count the request that failed; unanswered pipelined requests are sent again
+            errors += 1
+            answered += 1
+            reusable = False
+        remaining -= answered
+        if not reusable and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+    return succeeded, errors
+
+
+async def _generate_load(
+    host: str, port: int, connections: int, requests: int, pipeline: int, body_size: int
+) -> tuple[list[float], int, int, float]:
+    """
+    Drive a server with concurrent clients.
+
+    Returns:
+        Latencies of answered requests in seconds, successful and failed request counts and total wall time
+    """
+    request = _build_request(host, port, body_size)
+    latencies: list[float] = []
+    per_client, extra = divmod(requests, connections)
+    counts = [per_client + (1 if index < extra else 0) for index in range(connections)]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(_run_client(host, port, count, pipeline, request, latencies) for count in counts if count)
+    )
+    seconds = time.perf_counter() - started
+    return latencies, sum(ok for ok, _ in outcomes), sum(failed for _, failed in outcomes), seconds
+
+
+def _serve(backend: str, capacity: int, log_level: int, ready: Any, stop: Any) -> None:
+    """Run a capture server in a benchmark worker process until told to stop."""
+    # Replace the GUI's logging setup, which the devboost package installs on import
+    logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s", force=True)
+    server = APIInspectorServer(port=0, storage=RequestStorage(max_requests=capacity), backend=ServerBackend(backend))
+    if not server.start_server():
+        ready.put(None)
+        return
+    ready.put(server.port)
+    stop.wait()
+    server.stop_server()
+    ready.put(server.storage.get_request_count())
+
+
+def run_backend(
+    backend: ServerBackend,
+    connections: int = DEFAULT_CONNECTIONS,
+    requests: int = DEFAULT_REQUESTS,
+    pipeline: int = DEFAULT_PIPELINE,
+    body_size: int = DEFAULT_BODY_SIZE,
+    isolate: bool = True,
+) -> BackendResult:
+    """
+    Load test one backend.
+
+    Args:
+        backend: Server backend to start
+        connections: Concurrent clients
+        requests: Total requests sent
+        pipeline: Requests a client sends before reading responses on a kept-alive connection
+        body_size: Request body size in bytes
+        isolate: Run the server in its own process so it does not share the GIL with the clients
+
+    Returns:
+        Throughput and latency of the backend
+
+    Raises:
+        RuntimeError: If the server does not start
+    """
+    if isolate:
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        stop = context.Event()
+        process = context.Process(
+            target=_serve,
+            args=(backend.value, requests, logging.getLogger().getEffectiveLevel(), ready, stop),
+            daemon=True,
+        )
+        process.start()
+        try:
+            port = ready.get(timeout=SERVER_START_TIMEOUT)
+            if port is None:
+                raise RuntimeError(f"{backend.value} server failed to start")
+            latencies, succeeded, errors, seconds = asyncio.run(
+                _generate_load("localhost", port, connections, requests, pipeline, body_size)
+            )
+            stop.set()
+            captured = ready.get(timeout=SERVER_START_TIMEOUT)
+        finally:
+            stop.set()
+            process.join(timeout=SERVER_START_TIMEOUT)
+            if process.is_alive():
+                process.kill()
+    else:
+        server = APIInspectorServer(port=0, storage=RequestStorage(max_requests=requests), backend=backend)
+        if not server.start_server():
+            raise RuntimeError(f"{backend.value} server failed to start")
+        try:
+            latencies, succeeded, errors, seconds = asyncio.run(
+                _generate_load("localhost", server.port, connections, requests, pipeline, body_size)
+            )
+        finally:
+            server.stop_server()
+        captured = server.storage.get_request_count()
+
+    latencies.sort()
+    return BackendResult(
+        backend=backend.value,
+        requests=succeeded,
+        errors=errors,
+        seconds=round(seconds, 4),
+        requests_per_second=round(succeeded / seconds, 1) if seconds > 0 else 0.0,
+        p50_ms=round(_percentile(latencies, 0.50) * 1000, 3),
+        p99_ms=round(_percentile(latencies, 0.99) * 1000, 3),
+        max_ms=round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        captured=captured,
+    )
+
+
+def _print_summary(report: dict[str, Any], stream: TextIO):
+    """Write a human-readable table of the report."""
+    stream.write(f"{'backend':<10} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}\n")
+    for result in report["results"]:
+        stream.write(
+            f"{result['backend']:<10} {result['requests_per_second']:>10.1f} {result['p50_ms']:>9.2f}"
+            f" {result['p99_ms']:>9.2f} {result['max_ms']:>9.2f} {result['errors']:>7}\n"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for devboost-api-benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="devboost-api-benchmark",
+        description="Compare requests/sec and latency of the API Inspector capture server backends.",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=[backend.value for backend in ServerBackend],
+        help="Backend to benchmark (repeatable, default: all)",
+    )
+    parser.add_argument("-c", "--connections", type=int, default=DEFAULT_CONNECTIONS, help="Concurrent clients")
+    parser.add_argument("-n", "--requests", type=int, default=DEFAULT_REQUESTS, help="Total requests per backend")
+    parser.add_argument(
+        "--pipeline",
+        type=int,
+        default=DEFAULT_PIPELINE,
+        help="Requests sent back to back on a kept-alive connection before reading the responses",
+    )
+    parser.add_argument("--body-size", type=int, default=DEFAULT_BODY_SIZE, help="Request body size in bytes")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON report here instead of stdout")
+    parser.add_argument(
+        "--in-process", action="store_true", help="Run the server in this process (clients then share its GIL)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log server details to stderr")
+    return parser
+
+
+def run(args: argparse.Namespace, stream: TextIO = sys.stdout, summary_stream: TextIO = sys.stderr) -> int:
+    """
+    Run the load tests selected by parsed arguments.
+
+    Args:
+        args: Parsed command line arguments
+        stream: Destination for the JSON report when no output file is given
+        summary_stream: Destination for the summary table
+
+    Returns:
+        Process exit status
+    """
+    if min(args.connections, args.requests, args.pipeline) < 1 or args.body_size < 0:
+        summary_stream.write("Connections, requests and pipeline must be at least 1 and body size not negative\n")
+        return EXIT_USAGE
+
+    backends = [ServerBackend(value) for value in args.backend] if args.backend else list(ServerBackend)
+    results = [
+        asdict(
+            run_backend(
+                backend,
+                connections=args.connections,
+                requests=args.requests,
+                pipeline=args.pipeline,
+                body_size=args.body_size,
+                isolate=not args.in_process,
+            )
+        )
+        for backend in backends
+    ]
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "platform": {"python": platform.python_version(), "system": platform.platform()},
+        "load": {
+            "connections": args.connections,
+            "requests": args.requests,
+            "pipeline": args.pipeline,
+            "body_size": args.body_size,
+        },
+        "results": results,
+    }
+
+    payload = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        stream.write(payload)
+    _print_summary(report, summary_stream)
+    return EXIT_OK
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the devboost-api-benchmark console script."""
+    args = build_parser().parse_args(argv)
+    # Replace the GUI's logging setup, which the devboost package installs on import
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        force=True,
+    )
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,7 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QMainWindow,
     QMessageBox,
     QProgressBar,
@@ -40,16 +41,22 @@ from PyQt6.QtWidgets import (
 
 from devboost.styles import COLORS, get_status_style, get_tool_style
 
+from .cache import OptimizationCache
 from .detector import FileTypeDetector as FileTypeDetector
 from .file_manager import FileManager
+from .history import OptimizationHistory
 from .images import ImageOptimizationEngine
-from .manager import OptimizationManager
+from .manager import ExecutorMode, OptimizationManager
 from .models import BatchOperationResult, BatchProgress, FileInfo
 from .pdfs import PDFOptimizationEngine
-from .settings import OptimizationPreset, OptimizationSettings, QualityPreset, SettingsManager
+from .scanner import FileScanner
+from .settings import VIDEO_ENCODER_PRESETS, OptimizationPreset, OptimizationSettings, QualityPreset, SettingsManager
 from .ui.file_drop_area import FileDropArea
+from .ui.file_list import FileListDelegate, FileListModel
 from .ui.results_dialog import OptimizationResultsDialog
 from .videos import VideoOptimizationEngine
+from .watcher import DirectoryWatcher
+from .watcher import WatchManifest as WatchManifest
 
 logger = logging.getLogger(__name__)
 
@@ -97,7 +104,9 @@ class FileOptimizationWidget(QWidget):
         self.pdf_engine = PDFOptimizationEngine()
 
         # Initialize optimization manager
-        self.optimization_manager = OptimizationManager()
+        self.optimization_manager = OptimizationManager(
+            executor_mode=ExecutorMode.AUTO, cache=OptimizationCache(), history=OptimizationHistory()
+        )
         self.optimization_manager.initialize_engines()
 
         # Connect optimization manager signals
@@ -107,6 +116,17 @@ class FileOptimizationWidget(QWidget):
         self.optimization_manager.batch_completed.connect(self._on_batch_completed)
         self.optimization_manager.error_occurred.connect(self._on_optimization_error)
 
+        # Dropped files are stat'ed and sniffed in the background and added as chunks finish; dropped
+        # links and data URLs are fetched to temporary files first
+        self.file_scanner = FileScanner(url_fetcher=self.file_manager.process_links)
+        self.file_scanner.files_scanned.connect(self._on_files_scanned)
+        self.file_scanner.scan_finished.connect(self._on_scan_finished)
+        self._scan_id = 0
+        self._scan_unsupported: list[FileInfo] = []
+
+        # Folder watch mode (None when not watching)
+        self.directory_watcher: DirectoryWatcher | None = None
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -182,22 +202,20 @@ class FileOptimizationWidget(QWidget):
         file_list_layout = QVBoxLayout(self.file_list_frame)
         file_list_layout.setContentsMargins(10, 10, 10, 10)
 
-        # Placeholder for file list items - Use scroll area for large lists
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-        self.file_list_container = QWidget()
-        self.file_list_layout = QVBoxLayout(self.file_list_container)
-        self.file_list_layout.setContentsMargins(0, 0, 0, 0)
-        self.file_list_layout.setSpacing(5)
-        # Align items to the top by adding stretch at the bottom
-        self.file_list_layout.addStretch()
-
-        scroll_area.setWidget(self.file_list_container)
-        file_list_layout.addWidget(scroll_area)
+        # File rows are painted from a model, so drops of thousands of files stay cheap
+        self.file_list_model = FileListModel(self.current_files, self)
+        self.file_list_delegate = FileListDelegate(self)
+        self.file_list_delegate.remove_requested.connect(self._on_remove_clicked)
+        self.file_list_view = QListView()
+        self.file_list_view.setModel(self.file_list_model)
+        self.file_list_view.setItemDelegate(self.file_list_delegate)
+        self.file_list_view.setUniformItemSizes(True)
+        self.file_list_view.setMouseTracking(True)
+        self.file_list_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.file_list_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.file_list_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.file_list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        file_list_layout.addWidget(self.file_list_view)
 
         # Add file list frame with stretch factor to take remaining space
         left_layout.addWidget(self.file_list_frame, 1)
@@ -262,8 +280,14 @@ class FileOptimizationWidget(QWidget):
         self.clear_button.setEnabled(False)
         self.clear_button.clicked.connect(self.clear_files)
 
+        self.watch_button = QPushButton("👁️ Watch Folder")
+        self.watch_button.setCheckable(True)
+        self.watch_button.setToolTip("Optimize new and changed files in a folder as they appear")
+        self.watch_button.clicked.connect(self.toggle_watch_folder)
+
         buttons_layout.addWidget(self.optimize_button)
         buttons_layout.addWidget(self.clear_button)
+        buttons_layout.addWidget(self.watch_button)
         buttons_layout.addStretch()
 
         right_layout.addLayout(buttons_layout)
@@ -579,6 +603,15 @@ class FileOptimizationWidget(QWidget):
 
         layout.addWidget(self.progressive_checkbox, 2, 0, 1, 2)
 
+        # Multi-stage pipeline
+        self.image_pipeline_checkbox = QCheckBox("Chain tools and keep smallest output")
+        self.image_pipeline_checkbox.setToolTip(
+            "Run resize, lossy and lossless stages back to back in memory and save the smallest result"
+        )
+        self.image_pipeline_checkbox.stateChanged.connect(self._on_settings_changed)
+        self.image_pipeline_checkbox.setStyleSheet(self.progressive_checkbox.styleSheet())
+        layout.addWidget(self.image_pipeline_checkbox, 3, 0, 1, 2)
+
         return group
 
     def _create_video_quality_group(self) -> QGroupBox:
@@ -673,6 +706,104 @@ class FileOptimizationWidget(QWidget):
 
         layout.addWidget(self.video_fps_spin, 2, 1)
 
+        # Encoder speed preset
+        layout.addWidget(QLabel("Encoder Preset:"), 3, 0)
+
+        self.video_preset_combo = QComboBox()
+        self.video_preset_combo.addItems(VIDEO_ENCODER_PRESETS)
+        self.video_preset_combo.setCurrentText("medium")
+        self.video_preset_combo.setToolTip("Faster presets encode quicker but produce larger files")
+        self.video_preset_combo.currentTextChanged.connect(self._on_settings_changed)
+        self.video_preset_combo.setStyleSheet(f"""
+            QComboBox {{
+                background-color: {COLORS["bg_secondary"]};
+                border: 1px solid {COLORS["border_secondary"]};
+                border-radius: 4px;
+                padding: 6px;
+                color: {COLORS["text_primary"]};
+            }}
+            QComboBox:focus {{
+                border-color: {COLORS["info"]};
+            }}
+        """)
+
+        layout.addWidget(self.video_preset_combo, 3, 1)
+
+        # Two-pass target size
+        layout.addWidget(QLabel("Target Size:"), 4, 0)
+
+        self.video_target_size_spin = QSpinBox()
+        self.video_target_size_spin.setRange(0, 100000)
+        self.video_target_size_spin.setValue(0)  # 0 means off (single-pass CRF)
+        self.video_target_size_spin.setSpecialValueText("Off")
+        self.video_target_size_spin.setSuffix(" KB")
+        self.video_target_size_spin.setToolTip("Two-pass encode to this output size instead of a constant quality")
+        self.video_target_size_spin.valueChanged.connect(self._on_settings_changed)
+        self.video_target_size_spin.setStyleSheet(f"""
+            QSpinBox {{
+                background-color: {COLORS["bg_secondary"]};
+                border: 1px solid {COLORS["border_secondary"]};
+                border-radius: 4px;
+                padding: 4px;
+                color: {COLORS["text_primary"]};
+            }}
+            QSpinBox:focus {{
+                border-color: {COLORS["info"]};
+            }}
+        """)
+
+        layout.addWidget(self.video_target_size_spin, 4, 1)
+
+        # Encoder threads
+        layout.addWidget(QLabel("Threads:"), 5, 0)
+
+        self.video_threads_spin = QSpinBox()
+        self.video_threads_spin.setRange(0, 64)
+        self.video_threads_spin.setValue(0)  # 0 means auto
+        self.video_threads_spin.setSpecialValueText("Auto")
+        self.video_threads_spin.valueChanged.connect(self._on_settings_changed)
+        self.video_threads_spin.setStyleSheet(f"""
+            QSpinBox {{
+                background-color: {COLORS["bg_secondary"]};
+                border: 1px solid {COLORS["border_secondary"]};
+                border-radius: 4px;
+                padding: 4px;
+                color: {COLORS["text_primary"]};
+            }}
+            QSpinBox:focus {{
+                border-color: {COLORS["info"]};
+            }}
+        """)
+
+        layout.addWidget(self.video_threads_spin, 5, 1)
+
+        # Segmented (chunked parallel) encoding
+        self.video_segmented_checkbox = QCheckBox("Encode long videos in parallel chunks")
+        self.video_segmented_checkbox.setChecked(False)
+        self.video_segmented_checkbox.setToolTip("Split at keyframes and encode the chunks on multiple cores")
+        self.video_segmented_checkbox.stateChanged.connect(self._on_settings_changed)
+        self.video_segmented_checkbox.setStyleSheet(f"""
+            QCheckBox {{
+                color: {COLORS["text_primary"]};
+            }}
+            QCheckBox::indicator {{
+                width: 16px;
+                height: 16px;
+            }}
+            QCheckBox::indicator:unchecked {{
+                border: 1px solid {COLORS["border_secondary"]};
+                background-color: {COLORS["bg_secondary"]};
+                border-radius: 3px;
+            }}
+            QCheckBox::indicator:checked {{
+                border: 1px solid {COLORS["info"]};
+                background-color: {COLORS["info"]};
+                border-radius: 3px;
+            }}
+        """)
+
+        layout.addWidget(self.video_segmented_checkbox, 6, 0, 1, 2)
+
         return group
 
     def _create_pdf_quality_group(self) -> QGroupBox:
@@ -809,6 +940,14 @@ class FileOptimizationWidget(QWidget):
         self.ghostscript_status_label.setWordWrap(True)
         layout.addWidget(self.ghostscript_status_label, 3, 0, 1, 2)
 
+        # Parallel page ranges
+        self.pdf_parallel_checkbox = QCheckBox("Optimize large PDFs in parallel page ranges")
+        self.pdf_parallel_checkbox.setChecked(False)
+        self.pdf_parallel_checkbox.setToolTip("Run one Ghostscript process per page range and merge the results")
+        self.pdf_parallel_checkbox.stateChanged.connect(self._on_settings_changed)
+        self.pdf_parallel_checkbox.setStyleSheet(self.video_segmented_checkbox.styleSheet())
+        layout.addWidget(self.pdf_parallel_checkbox, 4, 0, 1, 2)
+
         # Update status initially
         self._update_ghostscript_status()
 
@@ -1109,6 +1248,26 @@ class FileOptimizationWidget(QWidget):
 
         layout.addWidget(self.preserve_metadata_checkbox)
 
+        # Result cache checkbox
+        self.use_cache_checkbox = QCheckBox("Reuse cached results for unchanged files")
+        self.use_cache_checkbox.setChecked(True)
+        self.use_cache_checkbox.setToolTip("Skip re-optimizing files whose content and settings were seen before")
+        self.use_cache_checkbox.stateChanged.connect(self._on_settings_changed)
+        self.use_cache_checkbox.setStyleSheet(self.preserve_metadata_checkbox.styleSheet())
+
+        layout.addWidget(self.use_cache_checkbox)
+
+        # Skip-if-no-gain checkbox
+        self.skip_if_no_gain_checkbox = QCheckBox("Skip files that would not get smaller")
+        self.skip_if_no_gain_checkbox.setChecked(True)
+        self.skip_if_no_gain_checkbox.setToolTip(
+            "Estimate the gain from a small sample first and discard outputs larger than the original"
+        )
+        self.skip_if_no_gain_checkbox.stateChanged.connect(self._on_settings_changed)
+        self.skip_if_no_gain_checkbox.setStyleSheet(self.preserve_metadata_checkbox.styleSheet())
+
+        layout.addWidget(self.skip_if_no_gain_checkbox)
+
         return group
 
     def _create_status_bar(self) -> QFrame:
@@ -1185,104 +1344,56 @@ class FileOptimizationWidget(QWidget):
         logger.info("Status updated: %s", message)
 
     def handle_files_dropped(self, file_paths: list[str]):
-        """Handle files dropped onto the drop area."""
-        logger.info("Handling dropped files: %s", file_paths)
+        """Handle files dropped onto the drop area by scanning them in the background."""
+        logger.info("Handling %d dropped files", len(file_paths))
 
-        # Process files through FileManager
-        new_files = []
-        for file_path in file_paths:
-            file_infos = self.file_manager.process_input(file_path)
-            new_files.extend(file_infos)
+        self._scan_unsupported = []
+        self._scan_id = self.file_scanner.scan(file_paths)
+        if file_paths:
+            self.update_status(f"Scanning {len(file_paths)} file{'s' if len(file_paths) != 1 else ''}...", "info")
 
-        # Filter supported files
-        supported_files = [f for f in new_files if f.is_supported]
-        unsupported_files = [f for f in new_files if not f.is_supported]
+    def _on_files_scanned(self, scan_id: int, file_infos: list[FileInfo]):
+        """Add a chunk of scanned files to the list."""
+        if scan_id != self._scan_id:
+            return
 
-        if not supported_files and not unsupported_files:
-            self.update_status("No valid files found", "error")
+        supported_files = [f for f in file_infos if f.is_supported]
+        self._scan_unsupported.extend(f for f in file_infos if not f.is_supported)
+        if not supported_files:
             return
 
-        # Add supported files to current list
-        self.current_files.extend(supported_files)
+        # Add supported files to current list and the UI list as one row insertion
+        self.file_list_model.add_files(supported_files)
 
         # Show file list frame
         self.file_list_frame.show()
 
-        # Add files to the UI list
-        for file_info in supported_files:
-            self._add_file_to_list(file_info)
+        # Enable action buttons
+        self.optimize_button.setEnabled(True)
+        self.clear_button.setEnabled(True)
+
+    def _on_scan_finished(self, scan_id: int, found_count: int):
+        """Report the outcome of a finished scan."""
+        if scan_id != self._scan_id:
+            return
+
+        if found_count == 0:
+            self.update_status("No valid files found", "error")
+            return
 
         # Show warnings for unsupported files
-        if unsupported_files:
-            unsupported_names = [f.path.name for f in unsupported_files]
+        if self._scan_unsupported:
+            unsupported_names = [f.path.name for f in self._scan_unsupported]
             logger.warning("Unsupported files skipped: %s", unsupported_names)
-            self.update_status(f"Skipped {len(unsupported_files)} unsupported file(s)", "warning")
-
-        # Enable action buttons if we have supported files
-        if supported_files:
-            self.optimize_button.setEnabled(True)
-            self.clear_button.setEnabled(True)
+            self.update_status(f"Skipped {len(self._scan_unsupported)} unsupported file(s)", "warning")
+            if found_count == len(self._scan_unsupported):
+                return
 
-            # Update status
-            total_supported = len(self.current_files)
-            file_suffix = "s" if total_supported != 1 else ""
+        # Update status
+        total_supported = len(self.current_files)
+        file_suffix = "s" if total_supported != 1 else ""
         self.update_status(f"Ready to optimize {total_supported} file{file_suffix}")
 
-    def _add_file_to_list(self, file_info: FileInfo):
-        """Add a file to the UI file list."""
-        # Create file item widget
-        file_widget = QWidget()
-        file_widget.setFixedHeight(50)  # Set consistent height for all file items
-        file_layout = QHBoxLayout(file_widget)
-        file_layout.setContentsMargins(5, 5, 5, 5)
-        file_layout.setSpacing(8)
-
-        # File type icon
-        type_icons = {"image": "🖼️", "video": "🎬", "pdf": "📄", "unknown": "❓"}
-        icon = type_icons.get(file_info.file_type, "📄")
-
-        # File info label
-        file_size_mb = file_info.size / (1024 * 1024) if file_info.size > 0 else 0
-        size_text = f"{file_size_mb:.1f} MB" if file_size_mb >= 0.1 else f"{file_info.size} bytes"
-
-        file_label = QLabel(f"{icon} {file_info.path.name}")
-        file_label.setStyleSheet(f"font-weight: 500; color: {COLORS['text_primary']};")
-
-        size_label = QLabel(f"({size_text})")
-        size_label.setStyleSheet(f"color: {COLORS['text_muted']}; font-size: 11px;")
-
-        # Magic number detection indicator
-        if file_info.magic_detected:
-            magic_label = QLabel("✓")
-            magic_label.setToolTip("File type verified by content analysis")
-            magic_label.setStyleSheet(f"color: {COLORS['success']}; font-weight: bold;")
-            file_layout.addWidget(magic_label)
-
-        file_layout.addWidget(file_label)
-        file_layout.addWidget(size_label)
-
-        # Remove button per item
-        remove_button = QPushButton("🗑️ Remove")
-        remove_button.setToolTip("Remove this file from the list")
-        remove_button.clicked.connect(lambda _=False, w=file_widget, p=file_info.path: self._on_remove_clicked(w, p))
-        file_layout.addWidget(remove_button)
-
-        file_layout.addStretch()
-
-        # Style the file widget
-        file_widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {COLORS["bg_tertiary"]};
-                border-radius: 4px;
-                border: 1px solid {COLORS["border_secondary"]};
-            }}
-            QWidget:hover {{
-                background-color: {COLORS["btn_hover"]};
-            }}
-        """)
-
-        self.file_list_layout.addWidget(file_widget)
-
     def browse_files(self):
         """Open file browser to select files."""
 
@@ -1338,15 +1449,11 @@ class FileOptimizationWidget(QWidget):
                 return
 
             # Add to current files and UI
-            self.current_files.extend(supported_files)
+            self.file_list_model.add_files(supported_files)
 
             # Show file list frame
             self.file_list_frame.show()
 
-            # Add files to UI
-            for file_info in supported_files:
-                self._add_file_to_list(file_info)
-
             # Enable action buttons
             self.optimize_button.setEnabled(True)
             self.clear_button.setEnabled(True)
@@ -1379,13 +1486,46 @@ class FileOptimizationWidget(QWidget):
             file_paths = [file_info.path for file_info in self.current_files]
 
             # Start batch optimization using OptimizationManager
-            self.optimization_manager.optimize_batch(file_paths, None, settings)
+            preset_name = self.preset_combo.currentText() if hasattr(self, "preset_combo") else None
+            self.optimization_manager.optimize_batch(file_paths, None, settings, preset_name=preset_name or None)
 
         except Exception as e:
             logger.exception("Error starting batch optimization")
             self.update_status(f"Batch optimization failed to start: {e}", "error")
             self.optimize_button.setEnabled(True)
 
+    def toggle_watch_folder(self):
+        """Start watching a folder chosen by the user, or stop the current watch."""
+        if self.directory_watcher is not None:
+            self.directory_watcher.stop()
+            self.directory_watcher = None
+            self.watch_button.setChecked(False)
+            self.watch_button.setText("👁️ Watch Folder")
+            self.update_status("Stopped watching folder")
+            return
+
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Watch")
+        if not folder:
+            self.watch_button.setChecked(False)
+            return
+
+        self.directory_watcher = DirectoryWatcher(
+            Path(folder), self.optimization_manager, self.settings_manager.get_current_settings
+        )
+        self.directory_watcher.sync_started.connect(self._on_watch_sync_started)
+        self.watch_button.setChecked(True)
+        self.watch_button.setText("⏹️ Stop Watching")
+        self.update_status(f"Watching {folder} for new or changed files", "info")
+        try:
+            self.directory_watcher.start()
+        except Exception as e:
+            logger.exception("Error starting folder watch")
+            self.update_status(f"Failed to watch folder: {e}", "error")
+
+    def _on_watch_sync_started(self, file_count: int):
+        """Report that the watched folder has files to optimize."""
+        self.update_status(f"Optimizing {file_count} new or changed file{'s' if file_count != 1 else ''}...", "info")
+
     def _optimize_single_file(self, file_info: FileInfo) -> dict[str, Any]:
         """Optimize a single file based on its type."""
         settings = self.settings_manager.get_current_settings()
@@ -1419,21 +1559,10 @@ class FileOptimizationWidget(QWidget):
         # In a more advanced implementation, this could be configurable
         return input_path
 
-    def _on_remove_clicked(self, file_widget: QWidget, file_path: Path):
+    def _on_remove_clicked(self, file_path: Path):
         """Remove a single file item from the list and state."""
-        # Remove the widget from the layout
-        for i in range(self.file_list_layout.count()):
-            item = self.file_list_layout.itemAt(i)
-            if item and item.widget() is file_widget:
-                self.file_list_layout.takeAt(i)
-                file_widget.deleteLater()
-                break
-
-        # Remove from current_files (first match)
-        for i, fi in enumerate(self.current_files):
-            if fi.path == file_path:
-                del self.current_files[i]
-                break
+        # Remove from current_files (first match), which also removes its row
+        self.file_list_model.remove_file(file_path)
 
         # Update controls and status
         if not self.current_files:
@@ -1447,14 +1576,11 @@ class FileOptimizationWidget(QWidget):
 
     def clear_files(self):
         """Clear all files from the list."""
-        # Clear file list
-        while self.file_list_layout.count():
-            child = self.file_list_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        # Drop results of a scan that is still running
+        self.file_scanner.cancel()
 
-        # Clear current files list
-        self.current_files.clear()
+        # Clear current files list and its rows
+        self.file_list_model.clear()
 
         # Cleanup temporary files
         self.file_manager.cleanup_temp_files()
@@ -1595,7 +1721,12 @@ class FileOptimizationWidget(QWidget):
         # Update settings from UI controls
         settings.create_backup = False  # Always disabled - create new compressed files
         settings.preserve_metadata = self.preserve_metadata_checkbox.isChecked()
+        settings.use_cache = self.use_cache_checkbox.isChecked()
+        if hasattr(self, "skip_if_no_gain_checkbox"):
+            settings.skip_if_no_gain = self.skip_if_no_gain_checkbox.isChecked()
         settings.progressive_jpeg = self.progressive_checkbox.isChecked()
+        if hasattr(self, "image_pipeline_checkbox"):
+            settings.image_pipeline = self.image_pipeline_checkbox.isChecked()
 
         # Dimensions
         settings.max_width = self.max_width_spin.value() if self.max_width_spin.value() > 0 else None
@@ -1620,6 +1751,19 @@ class FileOptimizationWidget(QWidget):
         if hasattr(self, "video_fps_spin"):
             settings.video_fps = self.video_fps_spin.value() if self.video_fps_spin.value() > 0 else None
 
+        if hasattr(self, "video_preset_combo"):
+            settings.video_encoder_preset = self.video_preset_combo.currentText()
+
+        if hasattr(self, "video_target_size_spin"):
+            target_size = self.video_target_size_spin.value()
+            settings.video_target_size_kb = target_size if target_size > 0 else None
+
+        if hasattr(self, "video_threads_spin"):
+            settings.video_threads = self.video_threads_spin.value() if self.video_threads_spin.value() > 0 else None
+
+        if hasattr(self, "video_segmented_checkbox"):
+            settings.video_segmented = self.video_segmented_checkbox.isChecked()
+
         # PDF settings (if controls exist)
         if hasattr(self, "pdf_quality_spin"):
             settings.pdf_quality = self.pdf_quality_spin.value() if self.pdf_quality_spin.value() > 0 else None
@@ -1627,6 +1771,9 @@ class FileOptimizationWidget(QWidget):
         if hasattr(self, "pdf_dpi_spin"):
             settings.pdf_dpi = self.pdf_dpi_spin.value() if self.pdf_dpi_spin.value() > 0 else None
 
+        if hasattr(self, "pdf_parallel_checkbox"):
+            settings.pdf_parallel = self.pdf_parallel_checkbox.isChecked()
+
         self.settings_manager.set_current_settings(settings)
 
     def _update_ui_from_settings(self):
@@ -1651,7 +1798,12 @@ class FileOptimizationWidget(QWidget):
         # Checkboxes
         # create_backup_checkbox removed - always create new compressed files
         self.preserve_metadata_checkbox.setChecked(settings.preserve_metadata)
+        self.use_cache_checkbox.setChecked(settings.use_cache)
+        if hasattr(self, "skip_if_no_gain_checkbox"):
+            self.skip_if_no_gain_checkbox.setChecked(settings.skip_if_no_gain)
         self.progressive_checkbox.setChecked(settings.progressive_jpeg)
+        if hasattr(self, "image_pipeline_checkbox"):
+            self.image_pipeline_checkbox.setChecked(settings.image_pipeline)
 
         # Dimensions
         self.max_width_spin.setValue(settings.max_width or 0)
@@ -1674,6 +1826,18 @@ class FileOptimizationWidget(QWidget):
         if hasattr(self, "video_fps_spin"):
             self.video_fps_spin.setValue(settings.video_fps or 0)
 
+        if hasattr(self, "video_preset_combo"):
+            self.video_preset_combo.setCurrentText(settings.video_encoder_preset)
+
+        if hasattr(self, "video_target_size_spin"):
+            self.video_target_size_spin.setValue(settings.video_target_size_kb or 0)
+
+        if hasattr(self, "video_threads_spin"):
+            self.video_threads_spin.setValue(settings.video_threads or 0)
+
+        if hasattr(self, "video_segmented_checkbox"):
+            self.video_segmented_checkbox.setChecked(settings.video_segmented)
+
         # PDF settings (if controls exist)
         if hasattr(self, "pdf_quality_spin"):
             self.pdf_quality_spin.setValue(settings.pdf_quality or 0)
@@ -1681,6 +1845,9 @@ class FileOptimizationWidget(QWidget):
         if hasattr(self, "pdf_dpi_spin"):
             self.pdf_dpi_spin.setValue(settings.pdf_dpi or 0)
 
+        if hasattr(self, "pdf_parallel_checkbox"):
+            self.pdf_parallel_checkbox.setChecked(settings.pdf_parallel)
+
     def _set_resize_percentage(self, percentage: int):
         """Set resize percentage using quick buttons with actual percentage-based scaling."""
         # Store the selected percentage for use during optimization
@@ -1858,7 +2025,9 @@ class FileOptimizationWidget(QWidget):
 
     def _on_file_completed(self, result: BatchOperationResult):
         """Handle file processing completion with detailed logging."""
-        if result.success:
+        if result.skipped:
+            logger.info("⏭️ Skipped: %s - %s", result.file_path.name, result.skip_reason)
+        elif result.success:
             # Calculate size reduction
             size_reduction = result.original_size - result.optimized_size
             size_reduction_mb = size_reduction / (1024 * 1024)
@@ -1944,9 +2113,11 @@ class FileOptimizationWidget(QWidget):
         for result in failed:
             logger.error("Failed to optimize %s: %s", result.file_path.name, result.error_message)
 
-        # Show results dialog if there are results to display
-        if results:
-            results_dialog = OptimizationResultsDialog(results, self.batch_progress, self)
+        # Show results dialog if there are results to display (watch mode only reports in the status bar)
+        if results and self.directory_watcher is None:
+            results_dialog = OptimizationResultsDialog(
+                results, self.batch_progress, self, history=self.optimization_manager.history
+            )
             results_dialog.exec()
 
     def _on_optimization_error(self, error_message: str):
@@ -0,0 +1,94 @@
+import base64
+import binascii
+import re
+from typing import TextIO
+
+# Characters of base64 text decoded per step; bounds the decoder's working memory
+BASE64_CHUNK_CHARS = 64 * 1024
+
+# Anything outside the base64 alphabet (line breaks, spaces) is discarded, like b64decode does
+_NON_ALPHABET = re.compile(r"[^A-Za-z0-9+/=]")
+
+
+class Base64StreamDecoder:
+    """
+    Incremental base64 decoder.
+
+    Text can be fed in pieces of any length. Each call decodes the complete 4-character groups
+    received so far and keeps the remainder for the next call, so memory use depends on the piece
+    size rather than the payload size.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._finished = False
+
+    def decode(self, text: str) -> bytes:
+        """
+        Decode the next piece of base64 text.
+
+        Args:
+            text: Base64 text, possibly containing whitespace
+
+        Returns:
+            Bytes decoded from every complete group received so far
+
+        Raises:
+            ValueError: If data follows the final padding
+        """
+        text = self._pending + _NON_ALPHABET.sub("", text)
+        if not text:
+            return b""
+        if self._finished:
+            raise ValueError("Base64 data continues after padding")
+
+        usable = len(text) - len(text) % 4
+        self._pending = text[usable:]
+        if usable == 0:
+            return b""
+        if "=" in text[: usable - 2]:
+            raise ValueError("Base64 data continues after padding")
+        self._finished = text[usable - 1] == "="
+        try:
+            return base64.b64decode(text[:usable])
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 data: {e}") from e
+
+    def finish(self) -> bytes:
+        """
+        Decode the final partial group, tolerating missing padding.
+
+        Returns:
+            Remaining decoded bytes
+
+        Raises:
+            ValueError: If the remaining data cannot be a base64 group
+        """
+        text, self._pending = self._pending, ""
+        if not text:
+            return b""
+        if self._finished:
+            raise ValueError("Base64 data continues after padding")
+        if len(text) == 1:
+            raise ValueError("Invalid base64 data: truncated group")
+        try:
+            return base64.b64decode(text + "=" * (-len(text) % 4))
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 data: {e}") from e
+
+
+def iter_text_chunks(source: str | TextIO, start: int = 0, chunk_chars: int = BASE64_CHUNK_CHARS):
+    """
+    Yield a text source in pieces without copying it whole.
+
+    Args:
+        source: String or readable text stream
+        start: Offset in a string source where reading begins
+        chunk_chars: Characters per piece
+    """
+    if isinstance(source, str):
+        for offset in range(start, len(source), chunk_chars):
+            yield source[offset : offset + chunk_chars]
+        return
+    while chunk := source.read(chunk_chars):
+        yield chunk
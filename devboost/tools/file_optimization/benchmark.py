@@ -0,0 +1,570 @@
+"""
+Reproducible performance benchmarks for the file optimization engines.
+
+Generates a synthetic corpus (PNG/JPEG/GIF images at several resolutions, ffmpeg test-pattern
+videos and multi-page PDFs), runs the image, video and PDF engines over it once per preset and
+writes throughput, compression ratio and peak memory to JSON. Given a baseline file from an
+earlier run, cases that got slower, compress worse or use more memory than the regression
+threshold allows are reported and the command exits with status 1::
+
+    devboost-benchmark --output baseline.json
+    devboost-benchmark --baseline baseline.json --threshold 10
+
+Each case runs in a fresh worker process, so the recorded peak memory belongs to that case alone.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from PIL import Image, ImageDraw
+
+from .cli import resolve_settings
+from .process_runner import run_process
+from .settings import OptimizationSettings, SettingsManager
+from .telemetry import child_peak_rss_bytes, peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_REGRESSIONS = 1
+EXIT_USAGE = 2
+
+# Version of the JSON report layout
+REPORT_VERSION = 1
+
+ENGINES = ("image", "video", "pdf")
+
+# Allowed change in percent (percentage points for compression ratio) before a case counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 10.0
+
+# Timed runs per case; the fastest is reported to filter out scheduling noise
+DEFAULT_REPEAT = 3
+
+# Corpus sizes: full runs cover typical web, desktop and 4K inputs, quick runs keep CI short
+IMAGE_RESOLUTIONS = ((640, 480), (1920, 1080), (3840, 2160))
+QUICK_IMAGE_RESOLUTIONS = ((640, 480),)
+IMAGE_FORMATS = (".png", ".jpg", ".gif")
+VIDEO_CLIPS = (((320, 240), 2), ((1280, 720), 2))  # (resolution, seconds)
+QUICK_VIDEO_CLIPS = (((320, 240), 1),)
+PDF_PAGE_COUNTS = (4, 16)
+QUICK_PDF_PAGE_COUNTS = (2,)
+
+# Seed for the synthetic content, so every run benchmarks identical bytes
+CORPUS_SEED = 20240601
+
+# Metrics compared against the baseline: name -> True when higher values are better
+REGRESSION_METRICS = {
+    "mb_per_second": True,
+    "compression_ratio": True,
+    "peak_rss_bytes": False,
+    "info_seconds": False,
+}
+
+
+@dataclass
+class CorpusItem:
+    """One generated benchmark input."""
+
+    engine: str  # 'image', 'video' or 'pdf'
+    label: str  # Format and size, e.g. 'png-1920x1080'
+    path: Path
+
+
+@dataclass
+class BenchmarkCase:
+    """Measurements of one engine and preset over one corpus item."""
+
+    engine: str
+    corpus: str
+    preset: str
+    files: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0  # Fastest of the timed runs
+    mb_per_second: float = 0.0
+    files_per_second: float = 0.0
+    compression_ratio: float = 0.0  # Percent of the input size saved
+    peak_rss_bytes: int | None = None  # Peak of the worker process running the engine
+    tool_peak_rss_bytes: int | None = None  # Largest peak of any external tool the engine started
+    info_seconds: float | None = None  # Fastest page count read (get_pdf_info), PDF cases only
+    failures: int = 0
+    methods: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Identifier used to match cases between runs."""
+        return f"{self.engine}/{self.corpus}/{self.preset}"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchmarkCase":
+        """Create a case from its JSON form, ignoring unknown keys."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+@dataclass
+class Regression:
+    """A metric of one case that got worse than the threshold allows."""
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # Percent, or percentage points for compression_ratio
+
+    def describe(self) -> str:
+        """Get a one-line description."""
+        unit = " points" if self.metric == "compression_ratio" else "%"
+        return f"{self.key}: {self.metric} {self.baseline:g} -> {self.current:g} ({self.change:+.1f}{unit})"
+
+
+def _synthetic_photo(size: tuple[int, int], rng: random.Random) -> Image.Image:
+    """Draw a photo-like RGB image: smooth gradients, hard-edged shapes and fine noise."""
+    width, height = size
+    gradient = Image.linear_gradient("L")
+    image = Image.merge(
+        "RGB",
+        (
+            gradient.resize(size),
+            Image.radial_gradient("L").resize(size),
+            gradient.rotate(90).resize(size),
+        ),
+    )
+    draw = ImageDraw.Draw(image)
+    for _ in range(24):
+        x0, y0 = rng.randrange(width), rng.randrange(height)
+        x1, y1 = x0 + rng.randrange(width // 4 + 1), y0 + rng.randrange(height // 4 + 1)
+        colour = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        if rng.random() < 0.5:
+            draw.rectangle((x0, y0, x1, y1), fill=colour)
+        else:
+            draw.ellipse((x0, y0, x1, y1), fill=colour)
+
+    noise_size = (max(1, width // 2), max(1, height // 2))
+    noise = Image.frombytes("L", noise_size, rng.randbytes(noise_size[0] * noise_size[1]))
+    return Image.blend(image, noise.resize(size).convert("RGB"), 0.15)
+
+
+def _synthetic_pdf(path: Path, pages: int, rng: random.Random):
+    """Write a multi-page PDF of text lines and photos, rendered as 100 dpi A4 page images."""
+    page_size = (827, 1169)
+    images = []
+    for number in range(pages):
+        page = Image.new("RGB", page_size, "white")
+        draw = ImageDraw.Draw(page)
+        draw.text((60, 50), f"Benchmark page {number + 1}", fill="black")
+        for line in range(40):
+            words = " ".join(
+                ["lorem", "ipsum", "dolor", "sit", "amet"][rng.randrange(5)] for _ in range(rng.randrange(6, 14))
+            )
+            draw.text((60, 90 + line * 14), words, fill=(30, 30, 30))
+        page.paste(_synthetic_photo((600, 400), rng), (113, 700))
+        images.append(page)
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=100)
+
+
+def generate_corpus(directory: Path, engines: tuple[str, ...] = ENGINES, quick: bool = False) -> list[CorpusItem]:
+    """
+    Generate the synthetic benchmark inputs.
+
+    Videos are only generated when ffmpeg is installed.
+
+    Args:
+        directory: Folder for the generated files
+        engines: Engines to generate inputs for
+        quick: Generate only the smallest inputs
+
+    Returns:
+        Generated inputs, in a stable order
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(CORPUS_SEED)  # noqa: S311 - reproducible test data, not security sensitive
+    items = []
+
+    if "image" in engines:
+        for width, height in QUICK_IMAGE_RESOLUTIONS if quick else IMAGE_RESOLUTIONS:
+            photo = _synthetic_photo((width, height), rng)
+            for extension in IMAGE_FORMATS:
+                label = f"{extension[1:]}-{width}x{height}"
+                path = directory / f"{label}{extension}"
+                if extension == ".gif":
+                    photo.quantize(256).save(path)
+                elif extension == ".jpg":
+                    photo.save(path, quality=95)
+                else:
+                    photo.save(path)
+                items.append(CorpusItem("image", label, path))
+
+    if "video" in engines:
+        ffmpeg = shutil.which("ffmpeg")
+        for (width, height), seconds in QUICK_VIDEO_CLIPS if quick else VIDEO_CLIPS:
+            if ffmpeg is None:
+                logger.warning("ffmpeg is not installed, skipping video corpus")
+                break
+            label = f"mp4-{width}x{height}-{seconds}s"
+            path = directory / f"{label}.mp4"
+            # A near-lossless test pattern gives the engine realistic headroom to compress
+            cmd = [ffmpeg, "-y", "-v", "error", "-f", "lavfi", "-i"]
+            cmd += [f"testsrc2=size={width}x{height}:rate=30:duration={seconds}"]
+            cmd += ["-pix_fmt", "yuv420p", "-c:v", "libx264", "-preset", "ultrafast", "-crf", "12", str(path)]
+            result = run_process(cmd, timeout=120)
+            if not result.success:
+                logger.warning("Could not generate %s: %s", label, result.stderr)
+                continue
+            items.append(CorpusItem("video", label, path))
+
+    if "pdf" in engines:
+        for pages in QUICK_PDF_PAGE_COUNTS if quick else PDF_PAGE_COUNTS:
+            label = f"pdf-{pages}-pages"
+            path = directory / f"{label}.pdf"
+            _synthetic_pdf(path, pages, rng)
+            items.append(CorpusItem("pdf", label, path))
+
+    return items
+
+
+def _create_engine(engine: str):
+    """Create the optimization engine for an engine name."""
+    # Imported here so worker processes only load the engine they benchmark
+    if engine == "image":
+        from .images import ImageOptimizationEngine
+
+        return ImageOptimizationEngine()
+    if engine == "video":
+        from .videos import VideoOptimizationEngine
+
+        return VideoOptimizationEngine()
+    from .pdfs import PDFOptimizationEngine
+
+    return PDFOptimizationEngine()
+
+
+def engine_unavailable_reason(engine: str) -> str | None:
+    """Get why an engine cannot run on this machine, or None when it can."""
+    required = {"video": "ffmpeg", "pdf": "ghostscript"}.get(engine)
+    if required and not _create_engine(engine)._available_tools.get(required, False):
+        return f"{required} is not installed"
+    return None
+
+
+def _init_worker(log_level: int):
+    """Apply the parent's log level in a spawned worker, which the devboost import would reset."""
+    logging.basicConfig(
+        level=log_level, stream=sys.stderr, format="%(asctime)s %(levelname)s %(name)s: %(message)s", force=True
+    )
+
+
+def run_case(
+    engine: str, preset: str, settings: OptimizationSettings, item: CorpusItem, output_dir: Path, repeat: int
+) -> BenchmarkCase:
+    """
+    Time one engine and preset on one corpus item.
+
+    Args:
+        engine: Engine name
+        preset: Preset name recorded in the case
+        settings: Settings for the preset
+        item: Input to optimize
+        output_dir: Folder for the outputs
+        repeat: Number of timed runs
+
+    Returns:
+        Measurements of the fastest run
+    """
+    optimizer = _create_engine(engine)
+    optimize = {"image": "optimize_image", "video": "optimize_video", "pdf": "optimize_pdf"}[engine]
+    output_path = output_dir / f"{item.path.stem}-compressed{item.path.suffix}"
+    case = BenchmarkCase(engine=engine, corpus=item.label, preset=preset, files=1)
+    case.input_bytes = item.path.stat().st_size
+    methods = set()
+
+    best = None
+    for _ in range(max(1, repeat)):
+        output_path.unlink(missing_ok=True)
+        start = time.perf_counter()
+        try:
+            result = getattr(optimizer, optimize)(item.path, output_path, settings)
+        except Exception as e:
+            case.failures += 1
+            case.error = str(e)
+            continue
+        elapsed = time.perf_counter() - start
+        methods.add(result.get("method", engine))
+        if best is None or elapsed < best:
+            best = elapsed
+            case.output_bytes = output_path.stat().st_size if output_path.exists() else case.input_bytes
+
+    case.methods = sorted(methods)
+    if best is not None:
+        case.seconds = best
+        case.mb_per_second = case.input_bytes / (1024 * 1024) / best if best > 0 else 0.0
+        case.files_per_second = case.files / best if best > 0 else 0.0
+        case.compression_ratio = (case.input_bytes - case.output_bytes) / case.input_bytes * 100
+    if engine == "pdf":
+        # Page counting reads only the cross-reference structure and should stay flat as documents grow
+        info_times = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            optimizer.get_pdf_info(item.path)
+            info_times.append(time.perf_counter() - start)
+        case.info_seconds = min(info_times)
+    case.peak_rss_bytes = peak_rss_bytes()
+    case.tool_peak_rss_bytes = child_peak_rss_bytes()
+    return case
+
+
+def run_benchmarks(
+    corpus: list[CorpusItem],
+    presets: dict[str, OptimizationSettings],
+    output_dir: Path,
+    repeat: int = DEFAULT_REPEAT,
+    isolate: bool = True,
+    engines: tuple[str, ...] = ENGINES,
+) -> dict[str, Any]:
+    """
+    Run every engine and preset over the corpus.
+
+    Args:
+        corpus: Inputs from generate_corpus
+        presets: Preset name -> settings
+        output_dir: Folder for the outputs
+        repeat: Timed runs per case
+        isolate: Run each case in a fresh process so peak memory is per case (otherwise peak memory
+            is the high-water mark of the current process)
+        engines: Engines to run
+
+    Returns:
+        JSON-serializable report
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    skipped = []
+    available = []
+    for engine in engines:
+        reason = engine_unavailable_reason(engine)
+        if reason:
+            logger.warning("Skipping %s benchmarks: %s", engine, reason)
+            skipped.append({"engine": engine, "reason": reason})
+        else:
+            available.append(engine)
+
+    jobs = [
+        (item.engine, preset, settings, item, output_dir, repeat)
+        for item in corpus
+        if item.engine in available
+        for preset, settings in presets.items()
+    ]
+    if isolate:
+        # One spawned process per case: peak RSS is a process high-water mark and cannot be reset
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            max_tasks_per_child=1,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().getEffectiveLevel(),),
+        ) as pool:
+            cases = [pool.submit(run_case, *job).result() for job in jobs]
+    else:
+        cases = [run_case(*job) for job in jobs]
+
+    return {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "environment": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "processor": platform.processor() or platform.machine(),
+            "repeat": repeat,
+            "isolated": isolate,
+        },
+        "cases": [asdict(case) for case in cases],
+        "skipped": skipped,
+    }
+
+
+def compare_to_baseline(
+    report: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_REGRESSION_THRESHOLD
+) -> list[Regression]:
+    """
+    Find cases that regressed against a baseline report.
+
+    Throughput, peak memory and PDF info time are compared in percent of the baseline value,
+    compression ratio in percentage points. Cases present in only one report are ignored. A case
+    that fails where the baseline succeeded is always a regression.
+
+    Args:
+        report: Current report from run_benchmarks
+        baseline: Earlier report
+        threshold: Allowed worsening before a metric counts as regressed
+
+    Returns:
+        Regressions, in report order
+    """
+    baseline_cases = {case.key: case for case in map(BenchmarkCase.from_dict, baseline.get("cases", []))}
+    regressions = []
+    for case in map(BenchmarkCase.from_dict, report.get("cases", [])):
+        previous = baseline_cases.get(case.key)
+        if previous is None:
+            continue
+        if case.failures > previous.failures:
+            regressions.append(
+                Regression(case.key, "failures", previous.failures, case.failures, case.failures - previous.failures)
+            )
+            continue
+
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            old, new = getattr(previous, metric), getattr(case, metric)
+            if old is None or new is None:
+                continue
+            if metric == "compression_ratio":
+                change = new - old
+            elif old:
+                change = (new - old) / old * 100
+            else:
+                continue
+            worsening = -change if higher_is_better else change
+            if worsening > threshold:
+                regressions.append(Regression(case.key, metric, old, new, change))
+    return regressions
+
+
+def _print_summary(report: dict[str, Any], stream: TextIO):
+    """Write a human-readable table of the report."""
+    stream.write(f"{'case':<52} {'MB/s':>9} {'files/s':>8} {'saved':>7} {'peak MB':>8}\n")
+    for case in map(BenchmarkCase.from_dict, report["cases"]):
+        peak = f"{case.peak_rss_bytes / (1024 * 1024):.0f}" if case.peak_rss_bytes else "-"
+        if case.error and not case.seconds:
+            stream.write(f"{case.key:<52} failed: {case.error}\n")
+            continue
+        stream.write(
+            f"{case.key:<52} {case.mb_per_second:>9.2f} {case.files_per_second:>8.2f}"
+            f" {case.compression_ratio:>6.1f}% {peak:>8}\n"
+        )
+    for skipped in report["skipped"]:
+        stream.write(f"{skipped['engine']}: skipped ({skipped['reason']})\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for devboost-benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="devboost-benchmark",
+        description="Benchmark the file optimization engines on a synthetic corpus and compare with a baseline.",
+    )
+    parser.add_argument("--engine", action="append", choices=ENGINES, help="Engine to benchmark (repeatable)")
+    parser.add_argument(
+        "-p", "--preset", action="append", help="Preset or quality level to run (repeatable, default: built-in presets)"
+    )
+    parser.add_argument("--quick", action="store_true", help="Benchmark only the smallest inputs")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case (fastest is kept)")
+    parser.add_argument("--corpus-dir", type=Path, help="Keep the generated corpus and outputs in this folder")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Allowed worsening in percent (percentage points for compression ratio)",
+    )
+    parser.add_argument(
+        "--in-process", action="store_true", help="Run cases in this process (faster, but peak memory is cumulative)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log engine details to stderr")
+    return parser
+
+
+def run(args: argparse.Namespace, stream: TextIO = sys.stdout, summary_stream: TextIO = sys.stderr) -> int:
+    """
+    Run the benchmarks selected by parsed arguments.
+
+    Args:
+        args: Parsed command line arguments
+        stream: Destination for the JSON report when no output file is given
+        summary_stream: Destination for the summary table and regressions
+
+    Returns:
+        Process exit status
+    """
+    if args.repeat < 1:
+        summary_stream.write("Repeat must be at least 1\n")
+        return EXIT_USAGE
+
+    settings_manager = SettingsManager()
+    try:
+        if args.preset:
+            presets = {name: resolve_settings(settings_manager, name) for name in args.preset}
+        else:
+            presets = {
+                name: OptimizationSettings.from_dict(preset.settings.to_dict())
+                for name, preset in settings_manager.get_presets().items()
+                if preset.is_builtin
+            }
+    except ValueError as e:
+        summary_stream.write(f"{e}\n")
+        return EXIT_USAGE
+    for settings in presets.values():
+        # Measure the engines themselves, not cache hits or skip predictions
+        settings.use_cache = False
+        settings.skip_if_no_gain = False
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            summary_stream.write(f"Cannot read baseline {args.baseline}: {e}\n")
+            return EXIT_USAGE
+
+    engines = tuple(args.engine) if args.engine else ENGINES
+    with tempfile.TemporaryDirectory(prefix="devboost_benchmark_") as temp_dir:
+        work_dir = args.corpus_dir or Path(temp_dir)
+        corpus = generate_corpus(work_dir / "corpus", engines, quick=args.quick)
+        report = run_benchmarks(
+            corpus, presets, work_dir / "output", repeat=args.repeat, isolate=not args.in_process, engines=engines
+        )
+
+    payload = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(payload, encoding="utf-8")
+    else:
+        stream.write(payload)
+    _print_summary(report, summary_stream)
+
+    if baseline is None:
+        return EXIT_OK
+    regressions = compare_to_baseline(report, baseline, args.threshold)
+    for regression in regressions:
+        summary_stream.write(f"REGRESSION {regression.describe()}\n")
+    if not regressions:
+        summary_stream.write(f"No regressions beyond {args.threshold:g} against {args.baseline}\n")
+    return EXIT_REGRESSIONS if regressions else EXIT_OK
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the devboost-benchmark console script."""
+    args = build_parser().parse_args(argv)
+    # Replace the GUI's logging setup, which the devboost package installs on import
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        force=True,
+    )
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
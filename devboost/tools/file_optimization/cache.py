@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any
+
+import appdirs
+
+from .settings import OptimizationSettings
+
+logger = logging.getLogger(__name__)
+
+# Default upper bound for cached optimized outputs (bytes)
+DEFAULT_MAX_CACHE_SIZE = 1024 * 1024 * 1024
+
+# Settings that do not change the optimized bytes and must not split cache entries
+_FINGERPRINT_IGNORED_SETTINGS = {"create_backup", "use_cache", "skip_if_no_gain", "min_gain_percent"}
+
+
+class OptimizationCache:
+    """
+    Content-addressed on-disk cache of optimization results.
+
+    Entries are keyed by a SHA-256 of the input bytes combined with a fingerprint of the
+    optimization settings and output format. Each entry is stored as ``<key>.bin`` (the optimized
+    output) plus ``<key>.json`` (result metadata). The cache is bounded by total size and evicts
+    the least recently used entries first, using the output file mtime as the access time.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_size: int = DEFAULT_MAX_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Optional custom cache directory (defaults to the DevBoost app data dir)
+            max_size: Maximum total size of cached outputs in bytes
+        """
+        self.cache_dir = cache_dir or Path(appdirs.user_data_dir("DevBoost", "DeskRiders")) / "optimization_cache"
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._ensure_cache_dir()
+
+    def _ensure_cache_dir(self):
+        """Ensure cache directory exists."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            logger.info("Optimization cache directory ensured: %s", self.cache_dir)
+        except Exception:
+            logger.exception("Failed to create optimization cache directory %s", self.cache_dir)
+
+    @staticmethod
+    def settings_fingerprint(settings: OptimizationSettings) -> str:
+        """Get a stable fingerprint of the settings that affect optimized output."""
+        data = {k: v for k, v in settings.to_dict().items() if k not in _FINGERPRINT_IGNORED_SETTINGS}
+        payload = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """Get the SHA-256 content hash of a file."""
+        with file_path.open("rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def make_key(self, input_path: Path, output_path: Path, settings: OptimizationSettings) -> str:
+        """
+        Build the cache key for an optimization request.
+
+        Args:
+            input_path: Input file path
+            output_path: Output file path (its extension selects the output format)
+            settings: Optimization settings
+
+        Returns:
+            Hex digest identifying the input content, settings and output format
+        """
+        parts = [self.hash_file(input_path), self.settings_fingerprint(settings), output_path.suffix.lower()]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.bin", self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, output_path: Path) -> dict[str, Any] | None:
+        """
+        Copy a cached output to output_path.
+
+        Args:
+            key: Cache key from make_key
+            output_path: Destination for the cached output
+
+        Returns:
+            Cached result metadata, or None on a cache miss
+        """
+        data_path, meta_path = self._entry_paths(key)
+        try:
+            metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+            shutil.copyfile(data_path, output_path)
+            # Touch the entry so LRU eviction keeps recently used outputs
+            os.utime(data_path)
+        except FileNotFoundError:
+            self._record_lookup(hit=False)
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Failed to read cache entry %s: %s", key, e)
+            self._record_lookup(hit=False)
+            return None
+
+        self._record_lookup(hit=True)
+        logger.debug("Optimization cache hit: %s -> %s", key, output_path)
+        return metadata
+
+    def _record_lookup(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, key: str, optimized_path: Path, metadata: dict[str, Any]) -> bool:
+        """
+        Store an optimized output in the cache.
+
+        Args:
+            key: Cache key from make_key
+            optimized_path: Path to the optimized output
+            metadata: JSON-serializable result metadata (method, sizes, ratio)
+
+        Returns:
+            True if the entry was stored
+        """
+        data_path, meta_path = self._entry_paths(key)
+        # Write to per-thread temporary names first so readers never see partial entries
+        tmp_suffix = f".{os.getpid()}-{threading.get_ident()}.tmp"
+        tmp_data = self.cache_dir / f"{key}.bin{tmp_suffix}"
+        tmp_meta = self.cache_dir / f"{key}.json{tmp_suffix}"
+        try:
+            if optimized_path.stat().st_size > self.max_size:
+                return False
+            shutil.copyfile(optimized_path, tmp_data)
+            tmp_meta.write_text(json.dumps(metadata), encoding="utf-8")
+            tmp_data.replace(data_path)
+            tmp_meta.replace(meta_path)
+        except OSError as e:
+            logger.warning("Failed to store cache entry %s: %s", key, e)
+            tmp_data.unlink(missing_ok=True)
+            tmp_meta.unlink(missing_ok=True)
+            return False
+
+        logger.debug("Stored optimization cache entry %s (%s)", key, optimized_path)
+        with self._lock:
+            self._evict()
+        return True
+
+    def get_size(self) -> int:
+        """Get the total size of cached outputs in bytes."""
+        return sum(entry.stat().st_size for entry in self.cache_dir.glob("*.bin"))
+
+    def _evict(self):
+        """Evict least recently used entries until the cache fits in max_size."""
+        entries = []
+        for data_path in self.cache_dir.glob("*.bin"):
+            try:
+                stat = data_path.stat()
+                entries.append((stat.st_mtime, stat.st_size, data_path))
+            except OSError:
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        if total_size <= self.max_size:
+            return
+
+        entries.sort()
+        for _, size, data_path in entries:
+            if total_size <= self.max_size:
+                break
+            data_path.unlink(missing_ok=True)
+            data_path.with_suffix(".json").unlink(missing_ok=True)
+            total_size -= size
+            logger.debug("Evicted optimization cache entry %s", data_path.stem)
+
+    def clear(self):
+        """Remove every cache entry."""
+        with self._lock:
+            for entry in self.cache_dir.iterdir():
+                if entry.suffix in (".bin", ".json", ".tmp") and entry.is_file():
+                    entry.unlink(missing_ok=True)
+            self.hits = 0
+            self.misses = 0
+            logger.info("Optimization cache cleared")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache usage statistics."""
+        return {
+            "cache_dir": str(self.cache_dir),
+            "size": self.get_size(),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,255 @@
+"""
+Headless command line interface for batch file optimization.
+
+Runs the same engines as the File Optimization tool without creating a QApplication, so it can
+be used on build servers. Progress is written to stdout as JSON lines, one event per line::
+
+    {"event": "start", "total": 3, "jobs": 4}
+    {"event": "file", "path": "a.png", "success": true, ..., "completed": 1, "total": 3}
+    {"event": "summary", "total": 3, "succeeded": 3, "failed": 0, ...}
+
+The exit status is 0 when every file succeeded, 1 when any file failed and 2 for usage errors.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, TextIO
+
+from PyQt6.QtCore import Qt
+
+from .cache import OptimizationCache
+from .detector import FileTypeDetector
+from .history import OptimizationHistory
+from .manager import ExecutorMode, OptimizationManager
+from .models import BatchOperationResult
+from .settings import OptimizationSettings, QualityPreset, SettingsManager
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for devboost-optimize."""
+    parser = argparse.ArgumentParser(
+        prog="devboost-optimize",
+        description="Optimize images, videos and PDFs without the DevBoost GUI. Progress is printed as JSON lines.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Files, directories (searched recursively) or glob patterns such as 'assets/**/*.png'",
+    )
+    parser.add_argument(
+        "-p",
+        "--preset",
+        help="Named preset (e.g. 'Web Optimized' or web-optimized) or quality level (maximum, high, medium, low)",
+    )
+    parser.add_argument("-q", "--quality", type=int, help="Image quality (0-100), overriding the preset")
+    parser.add_argument("-o", "--output-dir", type=Path, help="Write outputs here instead of next to the inputs")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Number of files optimized concurrently"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not reuse or store cached results")
+    parser.add_argument(
+        "--keep-larger", action="store_true", help="Keep outputs that are not smaller than their inputs"
+    )
+    parser.add_argument(
+        "--no-history", action="store_true", help="Do not record the run in the local throughput history"
+    )
+    parser.add_argument("--list-presets", action="store_true", help="Print the available presets and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log engine details to stderr")
+    return parser
+
+
+def expand_paths(patterns: list[str]) -> list[Path]:
+    """
+    Expand files, directories and glob patterns into supported input files.
+
+    Args:
+        patterns: Paths or glob patterns from the command line
+
+    Returns:
+        Unique supported files in the order they were matched
+    """
+    found: dict[Path, None] = {}
+    for pattern in patterns:
+        # Path.glob cannot take absolute patterns, which shells pass through when quoted
+        matches = [Path(match) for match in sorted(glob.glob(pattern, recursive=True))]  # noqa: PTH207
+        if not matches and Path(pattern).exists():
+            matches = [Path(pattern)]
+        for match in matches:
+            candidates = sorted(path for path in match.rglob("*") if path.is_file()) if match.is_dir() else [match]
+            for path in candidates:
+                # Skip outputs of earlier runs so repeated invocations do not compress them again
+                if FileTypeDetector.is_supported_file(path) and not path.stem.endswith("-compressed"):
+                    found.setdefault(path, None)
+    return list(found)
+
+
+def resolve_settings(settings_manager: SettingsManager, preset: str | None) -> OptimizationSettings:
+    """
+    Get the settings for a preset name or quality level.
+
+    Args:
+        settings_manager: Source of built-in and custom presets
+        preset: Preset name (case-insensitive, hyphens may replace spaces), quality level, or None
+
+    Returns:
+        Settings for the preset, or default settings when preset is None
+
+    Raises:
+        ValueError: If the preset is unknown
+    """
+    if preset is None:
+        return OptimizationSettings()
+
+    wanted = preset.replace("-", " ").replace("_", " ").strip().lower()
+    for name, optimization_preset in settings_manager.get_presets().items():
+        if name.lower() == wanted:
+            return OptimizationSettings.from_dict(optimization_preset.settings.to_dict())
+
+    for quality in QualityPreset:
+        if quality.value == wanted:
+            return OptimizationSettings(quality_preset=quality)
+
+    raise ValueError(f"Unknown preset: {preset}")
+
+
+def _emit(stream: TextIO, event: str, **fields: Any):
+    """Write one JSON-lines event."""
+    stream.write(json.dumps({"event": event, **fields}, default=str) + "\n")
+    stream.flush()
+
+
+def _result_event(result: BatchOperationResult) -> dict[str, Any]:
+    """Get the JSON fields describing one file result."""
+    return {
+        "path": str(result.file_path),
+        "success": result.success,
+        "skipped": result.skipped,
+        "original_size": result.original_size,
+        "optimized_size": result.optimized_size,
+        "compression_ratio": round(result.compression_ratio, 2),
+        "method": result.method_used,
+        "processing_time": round(result.processing_time, 3),
+        "error": result.error_message,
+        "skip_reason": result.skip_reason,
+    }
+
+
+def run(args: argparse.Namespace, stream: TextIO = sys.stdout) -> int:
+    """
+    Optimize the files selected by parsed arguments.
+
+    Args:
+        args: Parsed command line arguments
+        stream: Destination for JSON-lines events
+
+    Returns:
+        Process exit status
+    """
+    settings_manager = SettingsManager()
+    if args.list_presets:
+        for name, preset in settings_manager.get_presets().items():
+            _emit(stream, "preset", name=name, description=preset.description, builtin=preset.is_builtin)
+        return EXIT_OK
+
+    try:
+        settings = resolve_settings(settings_manager, args.preset)
+    except ValueError as e:
+        _emit(stream, "error", message=str(e))
+        return EXIT_USAGE
+
+    if args.quality is not None:
+        settings.image_quality = args.quality
+    if args.no_cache:
+        settings.use_cache = False
+    if args.keep_larger:
+        settings.skip_if_no_gain = False
+
+    errors = settings_manager.validate_settings(settings)
+    if args.jobs < 1:
+        errors.append("Jobs must be at least 1")
+    if errors:
+        for error in errors:
+            _emit(stream, "error", message=error)
+        return EXIT_USAGE
+
+    file_paths = expand_paths(args.paths)
+    if not args.paths:
+        _emit(stream, "error", message="No input paths given")
+        return EXIT_USAGE
+    if not file_paths:
+        _emit(stream, "error", message="No supported files matched")
+        return EXIT_USAGE
+
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    manager = OptimizationManager(
+        executor_mode=ExecutorMode.AUTO,
+        max_workers=args.jobs,
+        cache=OptimizationCache() if settings.use_cache else None,
+        thread_workers=args.jobs,
+        history=None if args.no_history else OptimizationHistory(),
+    )
+    manager.initialize_engines()
+
+    def _on_file_completed(result: BatchOperationResult):
+        progress = manager.get_current_progress()
+        _emit(stream, "file", **_result_event(result), completed=progress.completed_files, total=progress.total_files)
+
+    # There is no event loop, so results must be delivered on the emitting thread
+    manager.file_completed.connect(_on_file_completed, Qt.ConnectionType.DirectConnection)
+
+    start_time = time.time()
+    _emit(stream, "start", total=len(file_paths), jobs=args.jobs)
+    try:
+        results = manager.optimize_batch(file_paths, args.output_dir, settings, preset_name=args.preset)
+    finally:
+        manager.cleanup()
+
+    succeeded = [r for r in results if r.success]
+    failed = [r for r in results if not r.success]
+    original_size = sum(r.original_size for r in succeeded)
+    optimized_size = sum(r.optimized_size for r in succeeded)
+    _emit(
+        stream,
+        "summary",
+        total=len(results),
+        succeeded=len(succeeded),
+        failed=len(failed),
+        skipped=sum(1 for r in results if r.skipped),
+        original_size=original_size,
+        optimized_size=optimized_size,
+        saved_bytes=original_size - optimized_size,
+        compression_ratio=round((original_size - optimized_size) / original_size * 100, 2) if original_size else 0.0,
+        elapsed=round(time.time() - start_time, 3),
+    )
+    return EXIT_FAILURES if failed or len(results) < len(file_paths) else EXIT_OK
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the devboost-optimize console script."""
+    args = build_parser().parse_args(argv)
+    # Replace the GUI's logging setup, which the devboost package installs on import
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        force=True,
+    )
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
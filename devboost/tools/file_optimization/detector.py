@@ -7,6 +7,54 @@ from .models import FileInfo
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from the start of a file for magic number detection
+HEADER_SIZE = 32
+
+
+class SignatureTrie:
+    """
+    Byte-prefix trie of magic number signatures.
+
+    Matching walks the header once, one node per byte, instead of testing every signature with
+    ``startswith``. Nodes are dicts keyed by byte value; the MIME type of a signature ending at a
+    node is stored under the ``None`` key.
+    """
+
+    def __init__(self, signatures: dict[bytes, str]):
+        """
+        Build the trie.
+
+        Args:
+            signatures: Mapping of signature bytes to MIME type
+        """
+        self._root: dict = {}
+        for signature, mime_type in signatures.items():
+            node = self._root
+            for byte in signature:
+                node = node.setdefault(byte, {})
+            node[None] = (signature, mime_type)
+
+    def match(self, header: bytes) -> list[tuple[bytes, str]]:
+        """
+        Find every signature that prefixes the header.
+
+        Args:
+            header: Leading bytes of a file
+
+        Returns:
+            List of (signature, MIME type) tuples, longest (most specific) signature first
+        """
+        matches = []
+        node = self._root
+        for byte in header:
+            node = node.get(byte)
+            if node is None:
+                break
+            if None in node:
+                matches.append(node[None])
+        matches.reverse()
+        return matches
+
 
 class FileTypeDetector:
     """
@@ -33,6 +81,9 @@ class FileTypeDetector:
         b"%PDF": "application/pdf",
     }
 
+    # Trie over MAGIC_SIGNATURES, built on first use
+    _signature_trie: ClassVar[SignatureTrie | None] = None
+
     # File type categories based on MIME types
     TYPE_CATEGORIES: ClassVar[dict[str, list[str]]] = {
         "image": [
@@ -89,8 +140,11 @@ class FileTypeDetector:
             FileInfo object with detection results
         """
         try:
-            # Get basic file info
-            size = file_path.stat().st_size if file_path.exists() else 0
+            # A single stat both checks existence and gets the size
+            try:
+                size = file_path.stat().st_size
+            except FileNotFoundError:
+                size = 0
             extension = file_path.suffix.lower()
 
             # Initialize with extension-based detection
@@ -98,7 +152,7 @@ class FileTypeDetector:
             magic_detected = False
 
             # Try magic number detection if file exists
-            if file_path.exists() and size > 0:
+            if size > 0:
                 detected_mime = cls._detect_by_magic_number(file_path)
                 if detected_mime:
                     mime_type = detected_mime
@@ -145,32 +199,39 @@ class FileTypeDetector:
         """
         try:
             with Path(file_path).open("rb") as f:
-                # Read first 32 bytes for magic number detection
-                header = f.read(32)
-
-                # Check for exact matches first
-                for magic_bytes, mime_type in cls.MAGIC_SIGNATURES.items():
-                    if header.startswith(magic_bytes):
-                        # Special handling for RIFF files (WebP vs AVI)
-                        if magic_bytes == b"RIFF" and len(header) >= 12:
-                            # Check RIFF subtype
-                            if header[8:12] == b"WEBP":
-                                return "image/webp"
-                            if header[8:12] == b"AVI ":
-                                return "video/avi"
-                        # Special handling for HEIC files (check at offset 4)
-                        elif b"ftypheic" in magic_bytes and len(header) >= 12:
-                            if b"heic" in header[4:12]:
-                                return "image/heic"
-                        else:
-                            return mime_type
-
-                # Check for patterns at specific offsets
-                if len(header) >= 12 and header[4:12] == b"ftypheic":
-                    return "image/heic"
-
+                header = f.read(HEADER_SIZE)
         except Exception as e:
-            logger.debug("Could not read magic number from {file_path}: %s", e)
+            logger.debug("Could not read magic number from %s: %s", file_path, e)
+            return None
+        return cls.detect_mime_from_header(header)
+
+    @classmethod
+    def detect_mime_from_header(cls, header: bytes) -> str | None:
+        """
+        Detect a MIME type from the leading bytes of a file.
+
+        Args:
+            header: First HEADER_SIZE bytes of the file
+
+        Returns:
+            MIME type if detected, None otherwise
+        """
+        if cls._signature_trie is None:
+            cls._signature_trie = SignatureTrie(cls.MAGIC_SIGNATURES)
+
+        for magic_bytes, mime_type in cls._signature_trie.match(header):
+            # Special handling for RIFF files (WebP vs AVI)
+            if magic_bytes == b"RIFF":
+                if header[8:12] == b"WEBP":
+                    return "image/webp"
+                if header[8:12] == b"AVI ":
+                    return "video/avi"
+            else:
+                return mime_type
+
+        # Check for patterns at specific offsets
+        if len(header) >= 12 and header[4:12] == b"ftypheic":
+            return "image/heic"
 
         return None
 
@@ -0,0 +1,275 @@
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+import urllib.parse
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .detector import HEADER_SIZE, FileTypeDetector
+
+logger = logging.getLogger(__name__)
+
+# Concurrent downloads, and pooled connections kept per host
+DEFAULT_MAX_DOWNLOADS = 4
+
+# Seconds to wait for a connection or for the next chunk of data
+DOWNLOAD_TIMEOUT = 30
+
+# Bytes written per read from the response
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Times an interrupted download is resumed with a range request before giving up
+DOWNLOAD_RETRIES = 3
+
+
+class DownloadCancelledError(Exception):
+    """Raised in a download worker when its job was cancelled or the downloader shut down."""
+
+
+def is_http_url(value: str) -> bool:
+    """Check if a string is an http or https URL that URLDownloader accepts."""
+    parsed_url = urllib.parse.urlparse(value)
+    return parsed_url.scheme in ("http", "https") and bool(parsed_url.netloc)
+
+
+@dataclass
+class DownloadJob:
+    """State of one URL download, updated by the worker thread while it runs."""
+
+    url: str
+    path: Path
+    total_size: int | None = None  # None until the server reports a length
+    received: int = 0
+    mime_type: str | None = None  # Sniffed from the first chunk
+    file_type: str = "unknown"
+    error: str | None = None
+    resumed: int = 0  # Number of range requests used to continue after interruptions
+    detected: threading.Event = field(default_factory=threading.Event, repr=False)
+    cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Future | None = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        """Check if the download finished, successfully or not."""
+        return self.future is not None and self.future.done()
+
+    @property
+    def success(self) -> bool:
+        """Check if the download finished without error."""
+        return self.done and not self.future.cancelled() and self.error is None
+
+    def cancel(self):
+        """Stop the download before its next chunk is written and remove the partial file."""
+        self.cancelled.set()
+
+
+DownloadCallback = Callable[[DownloadJob], None]
+
+
+class URLDownloader:
+    """
+    Concurrent HTTP(S) downloader for files to optimize.
+
+    Downloads run on a bounded thread pool and share a requests Session, which keeps a pool of
+    connections per host. Responses are streamed to disk. The first chunk is sniffed for its file
+    type, and type_callback fires right away, so callers can schedule work before large downloads
+    finish. Interrupted downloads are resumed with ``Range`` requests when the server supports them.
+    """
+
+    def __init__(
+        self,
+        max_downloads: int = DEFAULT_MAX_DOWNLOADS,
+        timeout: float = DOWNLOAD_TIMEOUT,
+        retries: int = DOWNLOAD_RETRIES,
+        download_dir: Path | None = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ):
+        """
+        Initialize the downloader.
+
+        Args:
+            max_downloads: Maximum concurrent downloads (also the connection pool size per host)
+            timeout: Connect and read timeout in seconds
+            retries: Number of resume attempts for an interrupted download
+            download_dir: Optional directory for downloaded files (defaults to the system temp dir)
+            chunk_size: Bytes read from the response at a time (a chunk cut short by a dropped
+                connection is fetched again)
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.download_dir = download_dir
+        self.chunk_size = chunk_size
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_downloads, pool_maxsize=max_downloads)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_downloads, thread_name_prefix="url-download")
+        self._closing = threading.Event()
+
+    def submit(
+        self,
+        url: str,
+        progress_callback: DownloadCallback | None = None,
+        type_callback: DownloadCallback | None = None,
+    ) -> DownloadJob:
+        """
+        Start downloading a URL in the background.
+
+        Args:
+            url: http or https URL
+            progress_callback: Called from the worker thread after every chunk
+            type_callback: Called from the worker thread once the file type is sniffed from the first chunk
+
+        Returns:
+            DownloadJob tracking the download
+
+        Raises:
+            ValueError: If the URL scheme is not http or https
+        """
+        if not is_http_url(url):
+            raise ValueError(f"Unsupported URL: {url}")
+
+        url_path = urllib.parse.urlparse(url).path
+        extension = Path(url_path).suffix if url_path else ""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=extension, prefix="devboost_opt_", dir=self.download_dir)
+        os.close(temp_fd)
+
+        job = DownloadJob(url=url, path=Path(temp_path))
+        job.future = self._executor.submit(self._download, job, progress_callback, type_callback)
+        return job
+
+    def download_all(
+        self,
+        urls: list[str],
+        progress_callback: DownloadCallback | None = None,
+        type_callback: DownloadCallback | None = None,
+    ) -> list[DownloadJob]:
+        """
+        Download URLs concurrently and wait for all of them.
+
+        Args:
+            urls: URLs to download
+            progress_callback: Called from worker threads after every chunk
+            type_callback: Called from worker threads once each file type is sniffed from its first chunk
+
+        Returns:
+            One DownloadJob per URL, in input order (invalid URLs are returned with an error)
+        """
+        jobs = []
+        for url in urls:
+            try:
+                jobs.append(self.submit(url, progress_callback=progress_callback, type_callback=type_callback))
+            except ValueError as e:
+                logger.warning("%s", e)
+                jobs.append(DownloadJob(url=url, path=Path(), error=str(e)))
+        wait([job.future for job in jobs if job.future])
+        return jobs
+
+    def _download(
+        self, job: DownloadJob, progress_callback: DownloadCallback | None, type_callback: DownloadCallback | None
+    ):
+        """Stream a URL to job.path, resuming with range requests after interruptions."""
+        attempts = 0
+        try:
+            while True:
+                try:
+                    self._stream_response(job, progress_callback, type_callback)
+                    if job.total_size is not None and job.received < job.total_size:
+                        raise requests.ConnectionError(
+                            f"Connection closed after {job.received} of {job.total_size} bytes"
+                        )
+                    break
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    attempts += 1
+                    if attempts > self.retries:
+                        raise
+                    logger.info("Download of %s interrupted at %d bytes, resuming: %s", job.url, job.received, e)
+                    job.resumed += 1
+
+            job.path = self._apply_detected_extension(job.path, job.mime_type)
+            logger.info("Downloaded %s -> %s (%d bytes)", job.url, job.path, job.received)
+        except DownloadCancelledError as e:
+            job.error = str(e)
+            logger.info("%s", e)
+            job.path.unlink(missing_ok=True)
+        except Exception as e:
+            job.error = str(e)
+            logger.exception("Failed to download %s", job.url)
+            job.path.unlink(missing_ok=True)
+        finally:
+            # Waiters on the type must not block forever on failed or empty downloads
+            job.detected.set()
+
+    def _stream_response(
+        self, job: DownloadJob, progress_callback: DownloadCallback | None, type_callback: DownloadCallback | None
+    ):
+        """Request the remaining bytes of a download and append them to its file."""
+        headers = {"Range": f"bytes={job.received}-"} if job.received else {}
+        with self._session.get(job.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if job.received and response.status_code != requests.codes.partial_content:
+                # The server ignored the range, so start over
+                logger.info("Server does not support ranges for %s, restarting download", job.url)
+                job.received = 0
+            if job.total_size is None:
+                job.total_size = self._get_total_size(response, job.received)
+
+            mode = "ab" if job.received else "wb"
+            with job.path.open(mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if not chunk:
+                        continue
+                    if job.mime_type is None:
+                        self._detect_type(job, chunk, response.headers.get("Content-Type"))
+                        if type_callback:
+                            type_callback(job)
+                    if job.cancelled.is_set() or self._closing.is_set():
+                        raise DownloadCancelledError(f"Download of {job.url} was cancelled")
+                    f.write(chunk)
+                    job.received += len(chunk)
+                    if progress_callback:
+                        progress_callback(job)
+
+    @staticmethod
+    def _get_total_size(response: requests.Response, offset: int) -> int | None:
+        """Get the full file size from Content-Range or Content-Length."""
+        content_range = response.headers.get("Content-Range", "")
+        if "/" in content_range and not content_range.endswith("/*"):
+            return int(content_range.rsplit("/", 1)[1])
+        content_length = response.headers.get("Content-Length")
+        return offset + int(content_length) if content_length else None
+
+    @staticmethod
+    def _detect_type(job: DownloadJob, chunk: bytes, content_type: str | None):
+        """Sniff the file type from the first bytes, falling back to the server's Content-Type."""
+        mime_type = FileTypeDetector.detect_mime_from_header(chunk[:HEADER_SIZE])
+        if mime_type is None and content_type:
+            mime_type = content_type.split(";")[0].strip()
+        job.mime_type = mime_type or "application/octet-stream"
+        job.file_type = FileTypeDetector._get_file_category(job.mime_type)
+        job.detected.set()
+
+    @staticmethod
+    def _apply_detected_extension(path: Path, mime_type: str | None) -> Path:
+        """Give extensionless downloads the extension of their sniffed type."""
+        if path.suffix or not mime_type:
+            return path
+        extension = mimetypes.guess_extension(mime_type)
+        if not extension:
+            return path
+        renamed = path.with_suffix(extension)
+        path.replace(renamed)
+        return renamed
+
+    def shutdown(self):
+        """Cancel queued and running downloads and close pooled connections."""
+        self._closing.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._session.close()
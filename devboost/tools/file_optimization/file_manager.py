@@ -1,19 +1,26 @@
-import base64
 import logging
 import mimetypes
+import re
 import shutil
 import tempfile
 import urllib.parse
 import urllib.request
 from pathlib import Path
-from urllib.error import URLError
 
-from .detector import FileTypeDetector
+from .base64_stream import Base64StreamDecoder, iter_text_chunks
+from .detector import HEADER_SIZE, FileTypeDetector
+from .downloader import DownloadCallback, DownloadJob, URLDownloader, is_http_url
 from .models import FileInfo
 from .settings import OptimizationSettings
 
 logger = logging.getLogger(__name__)
 
+# Plain base64 text, matched instead of decoded when checking pasted input
+_BASE64_TEXT = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+# Longest input checked against the file system before being treated as base64 (PATH_MAX on Linux)
+MAX_PATH_LENGTH = 4096
+
 
 class FileManager:
     """
@@ -30,6 +37,7 @@ class FileManager:
         self.logger = logging.getLogger(__name__)
         self.backup_dir = backup_dir or self._get_default_backup_dir()
         self.temp_files: list[Path] = []
+        self._downloader: URLDownloader | None = None
         self._ensure_backup_dir()
 
     def _get_default_backup_dir(self) -> Path:
@@ -64,18 +72,29 @@ class FileManager:
         except Exception:
             logger.exception("Failed to create backup directory {self.backup_dir}")
 
-    def process_input(self, input_data: str) -> list[FileInfo]:
+    def process_input(self, input_data: str, type_callback: DownloadCallback | None = None) -> list[FileInfo]:
         """
-        Process a local file path and return file information.
+        Process a local file path, http(s) URLs or base64 data and return file information.
 
         Args:
-            input_data: Local file path string
+            input_data: Local file path string, URLs separated by whitespace, or a data URL / plain
+                base64 text
+            type_callback: Optional callback receiving each DownloadJob once its file type is sniffed,
+                before the download completes
 
         Returns:
             List of FileInfo objects for processed files
         """
         input_data = input_data.strip()
-        # Only treat input as a local file path. URL/Base64 inputs are no longer supported.
+        # Checked first so multi-megabyte payloads are never split or resolved as a path. Absolute
+        # paths without an extension can also be valid base64 text, so existing files win.
+        if input_data.startswith("data:") or (
+            self._is_base64_image(input_data) and not self._is_existing_path(input_data)
+        ):
+            return self._process_base64(input_data)
+        urls = input_data.split()
+        if urls and all(is_http_url(url) for url in urls):
+            return self.process_urls(urls, type_callback=type_callback)
         return self._process_file_path(input_data)
 
     def _is_url(self, data: str) -> bool:
@@ -92,17 +111,23 @@ class FileManager:
         if data.startswith("data:image/"):
             return True
 
-        # Check for plain base64 (basic validation)
+        # Check for plain base64 (basic validation) without decoding the whole payload
         if len(data) > 50:  # Reduced minimum length
-            try:
-                # Try to decode the entire string to validate
-                base64.b64decode(data, validate=True)
+            if len(data) % 4 == 0 and _BASE64_TEXT.fullmatch(data):
                 return True
-            except Exception:
-                self.logger.debug("Invalid base64 data detected")
+            self.logger.debug("Invalid base64 data detected")
 
         return False
 
+    def _is_existing_path(self, data: str) -> bool:
+        """Check if the input names an existing file system entry, without stat-ing long payloads."""
+        if len(data) > MAX_PATH_LENGTH:
+            return False
+        try:
+            return Path(data).exists()
+        except (OSError, ValueError):  # Name too long for the file system, or embedded NUL
+            return False
+
     def _process_file_path(self, file_path: str) -> list[FileInfo]:
         """Process a file path input."""
         try:
@@ -116,69 +141,110 @@ class FileManager:
             logger.exception("Error processing file path {file_path}")
             return []
 
-    def _process_url(self, url: str) -> list[FileInfo]:
-        """Process a URL input by downloading the file."""
-        try:
-            # Validate URL scheme for security
-            parsed_url = urllib.parse.urlparse(url)
-            if parsed_url.scheme not in ("http", "https"):
-                logger.warning("Unsupported URL scheme: %s", parsed_url.scheme)
-                return []
-
-            # Try to get file extension from URL
-            url_path = parsed_url.path
-            extension = Path(url_path).suffix if url_path else ""
+    def process_urls(
+        self,
+        urls: list[str],
+        progress_callback: DownloadCallback | None = None,
+        type_callback: DownloadCallback | None = None,
+    ) -> list[FileInfo]:
+        """
+        Download URLs concurrently and return information about the downloaded files.
 
-            # Create temporary file with extension if available
-            temp_file = self._create_temp_file(suffix=extension)
+        Each download's type is sniffed from its first chunk, and downloads of files that cannot be
+        optimized are cancelled right away instead of being fetched in full.
 
-            # Download file
-            # S310: URL open with validated scheme - only http/https schemes are allowed above
-            with urllib.request.urlopen(url, timeout=30) as response, Path(temp_file).open("wb") as f:  # noqa: S310
-                shutil.copyfileobj(response, f)
+        Args:
+            urls: http or https URLs
+            progress_callback: Optional callback receiving each DownloadJob as its data arrives
+            type_callback: Optional callback receiving each DownloadJob once its file type is sniffed
 
-            # Detect file type
-            file_info = FileTypeDetector.detect_file_type(temp_file)
+        Returns:
+            List of FileInfo objects for the URLs that downloaded successfully
+        """
 
+        def on_type_detected(job: DownloadJob):
+            if job.file_type == "unknown":
+                job.cancel()
+            if type_callback:
+                type_callback(job)
+
+        file_infos = []
+        jobs = self.get_downloader().download_all(
+            urls, progress_callback=progress_callback, type_callback=on_type_detected
+        )
+        for job in jobs:
+            if job.cancelled.is_set():
+                logger.warning("Skipped URL %s: %s cannot be optimized", job.url, job.mime_type)
+                continue
+            if not job.success:
+                logger.error("Failed to download from URL %s: %s", job.url, job.error)
+                continue
             # Add to temp files for cleanup
-            self.temp_files.append(temp_file)
+            self.temp_files.append(job.path)
+            file_infos.append(FileTypeDetector.detect_file_type(job.path))
+        return file_infos
 
-            logger.info("Downloaded file from URL: {url} -> %s", temp_file)
-            return [file_info]
+    def process_links(self, links: list[str], type_callback: DownloadCallback | None = None) -> list[FileInfo]:
+        """
+        Ingest dropped links: data URLs are decoded to temporary files, http(s) URLs are downloaded.
 
-        except URLError:
-            logger.exception("Failed to download from URL {url}")
-            return []
-        except Exception:
-            logger.exception("Error processing URL {url}")
-            return []
+        Args:
+            links: data URLs and http or https URLs
+            type_callback: Optional callback receiving each DownloadJob once its file type is sniffed
+
+        Returns:
+            List of FileInfo objects for the links that were fetched successfully
+        """
+        file_infos = []
+        urls = []
+        for link in links:
+            if link.startswith("data:"):
+                file_infos.extend(self._process_base64(link))
+            else:
+                urls.append(link)
+        if urls:
+            file_infos.extend(self.process_urls(urls, type_callback=type_callback))
+        return file_infos
+
+    def get_downloader(self) -> URLDownloader:
+        """Get the URL downloader, creating it on first use."""
+        if self._downloader is None:
+            self._downloader = URLDownloader()
+        return self._downloader
 
     def _process_base64(self, base64_data: str) -> list[FileInfo]:
-        """Process base64 encoded data."""
+        """Process base64 encoded data, decoding it straight to a temporary file."""
+        temp_file = None
         try:
-            # Handle data URL format
+            # Handle data URL format without copying the payload out of the string
             if base64_data.startswith("data:"):
-                # Extract MIME type and data
-                header, data = base64_data.split(",", 1)
-                mime_type = header.split(";")[0].split(":")[1]
-
-                # Determine file extension from MIME type
-                extension = mimetypes.guess_extension(mime_type) or ".bin"
+                separator = base64_data.index(",")
+                mime_type = base64_data[:separator].split(";")[0].split(":")[1]
+                start = separator + 1
             else:
                 # Plain base64 data, assume image
-                data = base64_data
-                extension = ".png"  # Default to PNG
                 mime_type = "image/png"
+                start = 0
 
-            # Decode base64 data
-            file_data = base64.b64decode(data)
+            decoder = Base64StreamDecoder()
+            chunks = iter_text_chunks(base64_data, start)
 
-            # Create temporary file
-            temp_file = self._create_temp_file(suffix=extension)
+            # Decode just enough to sniff the type, which picks the temp file extension
+            head = b""
+            for chunk in chunks:
+                head += decoder.decode(chunk)
+                if len(head) >= HEADER_SIZE:
+                    break
+            detected_mime = FileTypeDetector.detect_mime_from_header(head[:HEADER_SIZE])
+            extension = mimetypes.guess_extension(detected_mime or mime_type) or ".bin"
 
-            # Write decoded data
-            with Path(temp_file).open("wb") as f:
-                f.write(file_data)
+            # Write decoded chunks as they are produced so the payload is never held decoded in memory
+            temp_file = self._create_temp_file(suffix=extension)
+            with temp_file.open("wb") as f:
+                f.write(head)
+                for chunk in chunks:
+                    f.write(decoder.decode(chunk))
+                f.write(decoder.finish())
 
             # Detect file type (this will override our assumptions with actual detection)
             file_info = FileTypeDetector.detect_file_type(temp_file)
@@ -191,6 +257,8 @@ class FileManager:
 
         except Exception:
             logger.exception("Error processing base64 data")
+            if temp_file is not None:
+                temp_file.unlink(missing_ok=True)
             return []
 
     def _create_temp_file(self, suffix: str = "") -> Path:
@@ -296,6 +364,11 @@ class FileManager:
 
         self.temp_files.clear()
 
+        # Stop download workers and close pooled connections; the downloader is recreated on next use
+        if self._downloader is not None:
+            self._downloader.shutdown()
+            self._downloader = None
+
     def get_backup_folder_path(self) -> Path:
         """Get the backup folder path."""
         return self.backup_dir
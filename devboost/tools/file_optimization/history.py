@@ -0,0 +1,247 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import appdirs
+
+from .cache import OptimizationCache
+from .models import BatchOperationResult
+from .settings import OptimizationSettings
+
+logger = logging.getLogger(__name__)
+
+# Runs returned by the throughput report when no limit is given
+DEFAULT_REPORT_RUNS = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    preset TEXT NOT NULL,
+    settings_fingerprint TEXT NOT NULL,
+    executor_mode TEXT NOT NULL,
+    file_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    path TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    method TEXT,
+    success INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    original_size INTEGER NOT NULL,
+    optimized_size INTEGER NOT NULL,
+    processing_time REAL NOT NULL,
+    tool_cpu_time REAL NOT NULL,
+    stage_times TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_run_id ON files(run_id);
+"""
+
+
+@dataclass
+class ThroughputRow:
+    """Throughput of one engine in one optimization run."""
+
+    run_id: int
+    started_at: float
+    preset: str
+    settings_fingerprint: str
+    file_type: str
+    file_count: int
+    failed_count: int
+    skipped_count: int  # Files skipped by the gain estimate without a full encode
+    input_bytes: int
+    processing_time: float  # Summed per-file wall time
+    tool_cpu_time: float
+    stage_times: dict[str, float] = field(default_factory=dict)  # Stage name -> summed wall seconds
+
+    @property
+    def mb_per_second(self) -> float:
+        """Input megabytes optimized per second of per-file processing time."""
+        if self.processing_time <= 0:
+            return 0.0
+        return self.input_bytes / (1024 * 1024) / self.processing_time
+
+    @property
+    def files_per_second(self) -> float:
+        """Files optimized per second of per-file processing time."""
+        if self.processing_time <= 0:
+            return 0.0
+        return self.file_count / self.processing_time
+
+
+class OptimizationHistory:
+    """
+    Local SQLite history of optimization runs with per-file stage timings.
+
+    Every batch is stored as a run (preset, settings fingerprint, executor mode) with one row per
+    file holding its engine, sizes, wall time, external tool CPU time and stage timings. The
+    throughput report aggregates them per run and engine, so regressions show up when tools or
+    settings change.
+    """
+
+    def __init__(self, db_path: Path | None = None):
+        """
+        Initialize the history.
+
+        Args:
+            db_path: Optional database file (defaults to the DevBoost app data dir)
+        """
+        self.db_path = db_path or Path(appdirs.user_data_dir("DevBoost", "DeskRiders")) / "optimization_history.db"
+        self._lock = threading.Lock()
+        self._ensure_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one transaction; short-lived connections keep the history usable from any thread."""
+        with self._lock:
+            connection = sqlite3.connect(self.db_path)
+            try:
+                with connection:
+                    yield connection
+            finally:
+                connection.close()
+
+    def _ensure_schema(self):
+        """Create the database file and tables if needed."""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as connection:
+                connection.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error):
+            logger.exception("Failed to initialize optimization history %s", self.db_path)
+
+    def record_run(
+        self,
+        results: list[BatchOperationResult],
+        settings: OptimizationSettings,
+        started_at: float,
+        finished_at: float | None = None,
+        preset: str | None = None,
+        executor_mode: str = "",
+    ) -> int | None:
+        """
+        Store a finished batch.
+
+        Args:
+            results: Results of every file in the batch
+            settings: Settings the batch ran with
+            started_at: Batch start as a Unix timestamp
+            finished_at: Batch end as a Unix timestamp (defaults to now)
+            preset: Preset name shown in reports (defaults to the quality preset)
+            executor_mode: Executor backend the batch ran on
+
+        Returns:
+            Id of the stored run, or None if it could not be stored
+        """
+        rows = [
+            (
+                str(result.file_path),
+                result.file_type,
+                result.method_used,
+                int(result.success),
+                int(result.skipped),
+                result.original_size,
+                result.optimized_size,
+                result.processing_time,
+                result.tool_cpu_time,
+                json.dumps(result.stage_times),
+            )
+            for result in results
+        ]
+        try:
+            with self._connect() as connection:
+                cursor = connection.execute(
+                    "INSERT INTO runs (started_at, finished_at, preset, settings_fingerprint, executor_mode, file_count)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        started_at,
+                        finished_at if finished_at is not None else time.time(),
+                        preset or settings.quality_preset.value,
+                        OptimizationCache.settings_fingerprint(settings),
+                        executor_mode,
+                        len(results),
+                    ),
+                )
+                run_id = cursor.lastrowid
+                connection.executemany(
+                    "INSERT INTO files (run_id, path, file_type, method, success, skipped, original_size,"
+                    " optimized_size, processing_time, tool_cpu_time, stage_times)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, *row) for row in rows],
+                )
+        except sqlite3.Error:
+            logger.exception("Failed to record optimization run in %s", self.db_path)
+            return None
+        return run_id
+
+    def get_throughput_report(self, limit: int = DEFAULT_REPORT_RUNS) -> list[ThroughputRow]:
+        """
+        Get per-engine throughput of the most recent runs.
+
+        Files served from the cache are excluded, since they did not run an engine. Files skipped by
+        the gain estimate are only counted, since their size was never fully encoded.
+
+        Args:
+            limit: Maximum number of runs included
+
+        Returns:
+            One row per run and engine, newest run first
+        """
+        try:
+            with self._connect() as connection:
+                records = connection.execute(
+                    """
+                    SELECT r.id, r.started_at, r.preset, r.settings_fingerprint, f.file_type, f.method,
+                           f.success, f.skipped, f.original_size, f.processing_time, f.tool_cpu_time,
+                           f.stage_times
+                    FROM (SELECT * FROM runs ORDER BY id DESC LIMIT ?) AS r
+                    JOIN files AS f ON f.run_id = r.id
+                    WHERE f.method IS NULL OR f.method NOT LIKE 'cached%'
+                    ORDER BY r.id DESC, f.file_type
+                    """,
+                    (limit,),
+                ).fetchall()
+        except sqlite3.Error:
+            logger.exception("Failed to read optimization history %s", self.db_path)
+            return []
+
+        report: dict[tuple[int, str], ThroughputRow] = {}
+        for record in records:
+            run_id, started_at, preset, fingerprint, file_type, method, success, skipped = record[:8]
+            size, seconds, cpu, stages = record[8:]
+            row = report.get((run_id, file_type))
+            if row is None:
+                row = ThroughputRow(run_id, started_at, preset, fingerprint, file_type, 0, 0, 0, 0, 0.0, 0.0)
+                report[(run_id, file_type)] = row
+            if not success:
+                row.failed_count += 1
+                continue
+            # Skipped after a full encode (method set) still measures the engine; estimate skips do not
+            if skipped and method is None:
+                row.skipped_count += 1
+                continue
+            row.file_count += 1
+            row.input_bytes += size
+            row.processing_time += seconds
+            row.tool_cpu_time += cpu
+            for name, stage_seconds in json.loads(stages).items():
+                row.stage_times[name] = row.stage_times.get(name, 0.0) + stage_seconds
+        return list(report.values())
+
+    def clear(self):
+        """Delete all recorded runs."""
+        try:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM files")
+                connection.execute("DELETE FROM runs")
+        except sqlite3.Error:
+            logger.exception("Failed to clear optimization history %s", self.db_path)
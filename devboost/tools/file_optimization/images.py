@@ -1,16 +1,83 @@
 import logging
 import shutil
 import subprocess
+import time
+from io import BytesIO
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from PIL import Image, ImageFile
+from PIL import Image, ImageFile, ImageMode
 
 from .process_runner import run_process
+from .telemetry import peak_rss_bytes
+from .telemetry import stage as timed_stage
+from .tool_probe import ToolProbeCache, get_default_probe_cache
 
 if TYPE_CHECKING:
     from . import OptimizationSettings
 
+# Image.info keys holding metadata that is dropped when preserve_metadata is off
+METADATA_INFO_KEYS = ("exif", "icc_profile", "xmp", "XML:com.adobe.xmp", "photoshop", "comment")
+
+# Default stage chains for pipeline mode, keyed by output format
+DEFAULT_IMAGE_PIPELINES = {
+    ".png": ("resize", "pngquant", "oxipng"),
+    ".jpg": ("resize", "jpegoptim"),
+    ".jpeg": ("resize", "jpegoptim"),
+    ".gif": ("resize", "gifsicle"),
+}
+
+# Pipeline stages backed by external tools reading stdin and writing stdout, with the formats they accept
+PIPE_STAGE_FORMATS = {
+    "pngquant": (".png",),
+    "oxipng": (".png",),
+    "jpegoptim": (".jpg", ".jpeg"),
+    "gifsicle": (".gif",),
+}
+
+# Side of the centre crop encoded to predict the gain of a full re-encode
+GAIN_SAMPLE_SIZE = 256
+
+# libjpeg's standard luminance quantization table (quality 50), used to estimate JPEG quality
+STANDARD_LUMINANCE_TABLE = (
+    16, 11, 10, 16, 24, 40, 51, 61,
+    12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56,
+    14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77,
+    24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101,
+    72, 92, 95, 98, 112, 100, 103, 99,
+)  # fmt: skip
+
+# Resampling uses Image.reduce for integer downscaling until within this factor of the target size
+RESIZE_REDUCING_GAP = 3.0
+
+
+def get_decoded_bytes(img: Image.Image) -> int:
+    """Get the size in bytes of an image's decoded pixel data (width x height x bands x band size)."""
+    mode = ImageMode.getmode(img.mode)
+    return img.width * img.height * len(mode.bands) * int(mode.typestr[-1])
+
+
+def estimate_jpeg_quality(quantization: dict[int, list[int]] | None) -> int | None:
+    """
+    Estimate the libjpeg quality setting a JPEG was saved with from its quantization tables.
+
+    Args:
+        quantization: Quantization tables as exposed by PIL's ``JpegImageFile.quantization``
+
+    Returns:
+        Estimated quality (1-100), or None when the image has no luminance table
+    """
+    table = (quantization or {}).get(0)
+    if not table:
+        return None
+    # libjpeg scales the standard table by 5000/quality below 50 and by 200 - 2 * quality above
+    scale = sum(table) * 100 / sum(STANDARD_LUMINANCE_TABLE)
+    quality = (200 - scale) / 2 if scale <= 100 else 5000 / scale
+    return max(1, min(100, round(quality)))
+
 
 class ImageOptimizationEngine:
     """
@@ -20,21 +87,33 @@ class ImageOptimizationEngine:
     It automatically detects available optimization tools and falls back gracefully when tools are not available.
     """
 
-    def __init__(self):
-        """Initialize the image optimization engine."""
+    def __init__(self, probe_cache: ToolProbeCache | None = None):
+        """
+        Initialize the image optimization engine.
+
+        Args:
+            probe_cache: Optional tool probe cache (defaults to the shared on-disk cache)
+        """
         self.logger = logging.getLogger(__name__)
+        self._probe_cache = probe_cache or get_default_probe_cache()
         self._available_tools = self._detect_available_tools()
 
         # Enable loading of truncated images
         ImageFile.LOAD_TRUNCATED_IMAGES = True
 
+    @property
+    def probe_cache(self) -> ToolProbeCache:
+        """Tool probe cache used to detect available optimizers."""
+        return self._probe_cache
+
     def _detect_available_tools(self) -> dict[str, bool]:
         """Detect which optimization tools are available on the system."""
         tools = {
             "pil": True,  # PIL/Pillow is always available since it's a dependency
-            "pngquant": self._check_command_available("pngquant"),
-            "jpegoptim": self._check_command_available("jpegoptim"),
-            "gifsicle": self._check_command_available("gifsicle"),
+            "pngquant": self._probe_cache.probe("pngquant", "pngquant", self._check_command_available),
+            "jpegoptim": self._probe_cache.probe("jpegoptim", "jpegoptim", self._check_command_available),
+            "gifsicle": self._probe_cache.probe("gifsicle", "gifsicle", self._check_command_available),
+            "oxipng": self._probe_cache.probe("oxipng", "oxipng", self._check_command_available),
             "libvips": self._check_libvips_available(),
         }
 
@@ -74,7 +153,35 @@ class ImageOptimizationEngine:
 
         return formats
 
-    def optimize_image(self, input_path: Path, output_path: Path, settings: "OptimizationSettings") -> dict[str, Any]:
+    def select_method(self, input_path: Path, settings: "OptimizationSettings | None" = None) -> str:
+        """
+        Select the optimization method that optimize_image will use for a file.
+
+        Args:
+            input_path: Path to the input image
+            settings: Optional optimization settings (pipeline mode overrides tool selection)
+
+        Returns:
+            One of "pipeline", "pngquant", "jpegoptim", "gifsicle", "libvips" or "pil"
+        """
+        if settings is not None and settings.image_pipeline:
+            return "pipeline"
+
+        input_ext = input_path.suffix.lower()
+
+        if input_ext == ".png" and self._available_tools.get("pngquant", False):
+            return "pngquant"
+        if input_ext in [".jpg", ".jpeg"] and self._available_tools.get("jpegoptim", False):
+            return "jpegoptim"
+        if input_ext == ".gif" and self._available_tools.get("gifsicle", False):
+            return "gifsicle"
+        if self._available_tools.get("libvips", False):
+            return "libvips"
+        return "pil"
+
+    def optimize_image(
+        self, input_path: Path, output_path: Path, settings: "OptimizationSettings", method: str | None = None
+    ) -> dict[str, Any]:
         """
         Optimize an image using the best available method.
 
@@ -82,6 +189,7 @@ class ImageOptimizationEngine:
             input_path: Path to the input image
             output_path: Path for the optimized output image
             settings: Optimization settings
+            method: Optional method name from select_method to use instead of auto-selection
 
         Returns:
             Dictionary with optimization results including file sizes and method used
@@ -90,25 +198,35 @@ class ImageOptimizationEngine:
             raise FileNotFoundError(f"Input file does not exist: {input_path}")
 
         original_size = input_path.stat().st_size
-        input_ext = input_path.suffix.lower()
-        output_path.suffix.lower() if output_path.suffix else input_ext
 
         self.logger.info("Optimizing image: %s -> %s", input_path, output_path)
+        start_time = time.perf_counter()
+        rss_before = peak_rss_bytes()
 
         try:
             # Choose optimization method based on format and available tools
-            if input_ext == ".png" and self._available_tools.get("pngquant", False):
+            method = method or self.select_method(input_path, settings)
+            if method == "pipeline":
+                result = self._optimize_with_pipeline(input_path, output_path, settings)
+            elif method == "pngquant":
                 result = self._optimize_with_pngquant(input_path, output_path, settings)
-            elif input_ext in [".jpg", ".jpeg"] and self._available_tools.get("jpegoptim", False):
+            elif method == "jpegoptim":
                 result = self._optimize_with_jpegoptim(input_path, output_path, settings)
-            elif input_ext == ".gif" and self._available_tools.get("gifsicle", False):
+            elif method == "gifsicle":
                 result = self._optimize_with_gifsicle(input_path, output_path, settings)
-            elif self._available_tools.get("libvips", False):
+            elif method == "libvips":
                 result = self._optimize_with_libvips(input_path, output_path, settings)
             else:
                 # Fallback to PIL/Pillow
                 result = self._optimize_with_pil(input_path, output_path, settings)
 
+            # The process peak RSS is shared by every file, so only report how far this call raised it
+            rss_after = peak_rss_bytes()
+            result.update({
+                "processing_time": time.perf_counter() - start_time,
+                "peak_rss_growth_bytes": rss_after - rss_before if rss_after is not None else None,
+            })
+
             # Calculate compression ratio
             if output_path.exists():
                 optimized_size = output_path.stat().st_size
@@ -132,13 +250,57 @@ class ImageOptimizationEngine:
         """Optimize image using PIL/Pillow with enhanced format conversion support."""
         self.logger.debug("Using PIL/Pillow for optimization")
 
-        with Image.open(input_path) as img:
-            # Handle format-specific conversions
-            output_format = output_path.suffix.lower()
+        output_format = output_path.suffix.lower()
+        encoded = self._encode_with_pil(input_path, output_path, input_path.suffix.lower(), output_format, settings)
+
+        return {
+            "method": "PIL/Pillow",
+            "success": True,
+            "format": output_format,
+            "converted": input_path.suffix.lower() != output_format,
+            **encoded,
+        }
+
+    def _encode_with_pil(
+        self,
+        source: Path | BytesIO,
+        destination: Path | BytesIO,
+        input_format: str,
+        output_format: str,
+        settings: "OptimizationSettings",
+    ) -> dict[str, Any]:
+        """
+        Decode, resize and re-encode an image with PIL/Pillow.
+
+        Args:
+            source: Input file path or in-memory buffer
+            destination: Output file path or in-memory buffer
+            input_format: Input file extension
+            output_format: Output file extension (selects the encoder)
+            settings: Optimization settings
+
+        Returns:
+            Dictionary with the output_dimensions of the saved image, and the decoded_dimensions and
+            decoded_bytes of the pixel data decoded from the source (after draft mode reduction)
+        """
+        with Image.open(source) as img:
+            # Decode straight to near the target resolution instead of decoding everything and shrinking
+            target_size = None
+            if settings.max_width or settings.max_height:
+                target_size = self._get_target_size(img.size, settings.max_width, settings.max_height)
+            if target_size and img.format == "JPEG":
+                # JPEG draft mode decodes at 1/2, 1/4 or 1/8 scale while staying at least target_size
+                img.draft(img.mode, target_size)
+            with timed_stage("decode"):
+                img.load()
+            decoded = {"decoded_dimensions": img.size, "decoded_bytes": get_decoded_bytes(img)}
+            if target_size:
+                with timed_stage("resize"):
+                    img = img.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
 
             # Convert HEIC/TIFF to appropriate formats with proper color mode handling
-            if input_path.suffix.lower() in [".heic", ".tiff", ".tif"]:
-                self.logger.info("Converting %s to %s format", input_path.suffix.lower(), output_format)
+            if input_format in [".heic", ".tiff", ".tif"]:
+                self.logger.info("Converting %s to %s format", input_format, output_format)
 
                 # Convert to RGB if needed for JPEG output
                 if output_format in [".jpg", ".jpeg"] and img.mode in ["RGBA", "LA", "P"]:
@@ -165,39 +327,106 @@ class ImageOptimizationEngine:
                     background.paste(img)
                 img = background
 
-            # Resize if dimensions are specified
-            if settings.max_width or settings.max_height:
-                img = self._resize_image(img, settings.max_width, settings.max_height)
-
-            # Prepare save options
-            save_kwargs = {}
-
-            if output_format in [".jpg", ".jpeg"]:
-                quality = settings.get_quality_for_type("image")
-                save_kwargs.update({"quality": quality, "optimize": True, "progressive": settings.progressive_jpeg})
-            elif output_format == ".png":
-                save_kwargs.update({"optimize": True, "compress_level": 9})
-            elif output_format == ".webp":
-                quality = settings.get_quality_for_type("image")
-                save_kwargs.update({"quality": quality, "optimize": True})
-
             # Remove metadata if not preserving
             if not settings.preserve_metadata:
-                # Create new image without EXIF data
-                img_data = img.getdata()
-                img_clean = Image.new(img.mode, img.size)
-                img_clean.putdata(img_data)
-                img = img_clean
+                self._strip_metadata(img)
 
             # Save optimized image
-            img.save(output_path, **save_kwargs)
+            save_kwargs = self._get_pil_save_kwargs(output_format, settings)
+            with timed_stage("encode"):
+                img.save(destination, format=Image.registered_extensions().get(output_format), **save_kwargs)
 
-        return {
-            "method": "PIL/Pillow",
-            "success": True,
-            "format": output_format,
-            "converted": input_path.suffix.lower() != output_format,
-        }
+        return {"output_dimensions": img.size, **decoded}
+
+    def _get_pil_save_kwargs(self, output_format: str, settings: "OptimizationSettings") -> dict[str, Any]:
+        """Get PIL/Pillow save options for an output format."""
+        save_kwargs = {}
+
+        if output_format in [".jpg", ".jpeg"]:
+            quality = settings.get_quality_for_type("image")
+            save_kwargs.update({"quality": quality, "optimize": True, "progressive": settings.progressive_jpeg})
+        elif output_format == ".png":
+            save_kwargs.update({"optimize": True, "compress_level": 9})
+        elif output_format == ".webp":
+            quality = settings.get_quality_for_type("image")
+            save_kwargs.update({"quality": quality, "optimize": True})
+
+        return save_kwargs
+
+    def estimate_gain(self, input_path: Path, output_path: Path, settings: "OptimizationSettings") -> float | None:
+        """
+        Cheaply predict the size reduction of optimize_image, in percent of the input size.
+
+        JPEGs whose quantization tables show they are already at or below the target quality are
+        predicted to gain only their stripped metadata. Other images have a centre crop encoded with
+        the target settings, scaled up to the full image size.
+
+        Args:
+            input_path: Path to the input image
+            output_path: Path for the optimized output image
+            settings: Optimization settings
+
+        Returns:
+            Predicted gain in percent, or None when it cannot be predicted reliably (resizing, format
+            conversion, or lossy tools such as pngquant that PIL cannot imitate)
+        """
+        output_format = output_path.suffix.lower()
+        extensions = Image.registered_extensions()
+        if settings.max_width or settings.max_height or getattr(self, "resize_percentage", None):
+            return None
+        if extensions.get(input_path.suffix.lower()) != extensions.get(output_format):
+            return None
+        if self.select_method(input_path, settings) not in ("pil", "libvips", "jpegoptim"):
+            return None
+
+        original_size = input_path.stat().st_size
+        if original_size == 0:
+            return None
+
+        with Image.open(input_path) as img:
+            if img.format == "JPEG":
+                source_quality = estimate_jpeg_quality(img.quantization)
+                if source_quality is not None and source_quality <= settings.get_quality_for_type("image"):
+                    metadata_size = 0
+                    if not settings.preserve_metadata:
+                        metadata_size = sum(len(img.info.get(key) or b"") for key in METADATA_INFO_KEYS)
+                    return metadata_size / original_size * 100
+
+            width, height = img.size
+            sample_width, sample_height = min(width, GAIN_SAMPLE_SIZE), min(height, GAIN_SAMPLE_SIZE)
+            left, top = (width - sample_width) // 2, (height - sample_height) // 2
+            sample_size = self._encode_sample(
+                img.crop((left, top, left + sample_width, top + sample_height)), output_format, settings
+            )
+            # Headers and tables do not grow with the image, so measure them on a tiny crop and scale only the rest
+            overhead = self._encode_sample(img.crop((left, top, left + 8, top + 8)), output_format, settings)
+
+        scale = (width * height) / (sample_width * sample_height)
+        predicted_size = overhead + max(0, sample_size - overhead) * scale
+        return (original_size - predicted_size) / original_size * 100
+
+    def _encode_sample(self, sample: Image.Image, output_format: str, settings: "OptimizationSettings") -> int:
+        """Encode an image sample in memory with the target settings and return its size in bytes."""
+        if not settings.preserve_metadata:
+            self._strip_metadata(sample)
+        buffer = BytesIO()
+        sample.save(
+            buffer,
+            format=Image.registered_extensions().get(output_format),
+            **self._get_pil_save_kwargs(output_format, settings),
+        )
+        return buffer.tell()
+
+    def _strip_metadata(self, img: Image.Image) -> None:
+        """
+        Drop EXIF, ICC and XMP metadata so it is not written when the image is saved.
+
+        Savers only write metadata found in ``img.info`` (or passed explicitly), so removing the keys
+        strips it without copying any pixels. Keys that affect rendering, such as ``transparency``,
+        are kept.
+        """
+        for key in METADATA_INFO_KEYS:
+            img.info.pop(key, None)
 
     def _optimize_with_pngquant(
         self, input_path: Path, output_path: Path, settings: "OptimizationSettings"
@@ -323,25 +552,9 @@ class ImageOptimizationEngine:
                 if scale < 1.0:  # Only downscale
                     img = img.resize(scale)
 
-            # Prepare save options
-            save_kwargs = {}
-            output_format = output_path.suffix.lower()
-
-            if output_format in [".jpg", ".jpeg"]:
-                quality = settings.get_quality_for_type("image")
-                save_kwargs.update({"Q": quality, "optimize_coding": True, "interlace": settings.progressive_jpeg})
-            elif output_format == ".png":
-                save_kwargs.update({"compression": 9, "interlace": True})
-            elif output_format == ".webp":
-                quality = settings.get_quality_for_type("image")
-                save_kwargs.update({"Q": quality, "lossless": quality >= 90})
-
-            # Remove metadata if not preserving
-            if not settings.preserve_metadata:
-                save_kwargs["strip"] = True
-
             # Save optimized image
-            img.write_to_file(str(output_path), **save_kwargs)
+            output_format = output_path.suffix.lower()
+            img.write_to_file(str(output_path), **self._get_libvips_save_kwargs(output_format, settings))
 
             return {"method": "libvips", "success": True, "format": output_format}
 
@@ -349,17 +562,156 @@ class ImageOptimizationEngine:
             self.logger.warning("libvips optimization failed, falling back to PIL: %s", str(e))
             return self._optimize_with_pil(input_path, output_path, settings)
 
-    def _resize_image(self, img: Image.Image, max_width: int | None, max_height: int | None) -> Image.Image:
-        """Resize image maintaining aspect ratio, supporting both fixed dimensions and percentage scaling."""
-        current_width, current_height = img.size
+    def _get_libvips_save_kwargs(self, output_format: str, settings: "OptimizationSettings") -> dict[str, Any]:
+        """Get libvips save options for an output format."""
+        save_kwargs = {}
+
+        if output_format in [".jpg", ".jpeg"]:
+            quality = settings.get_quality_for_type("image")
+            save_kwargs.update({"Q": quality, "optimize_coding": True, "interlace": settings.progressive_jpeg})
+        elif output_format == ".png":
+            save_kwargs.update({"compression": 9, "interlace": True})
+        elif output_format == ".webp":
+            quality = settings.get_quality_for_type("image")
+            save_kwargs.update({"Q": quality, "lossless": quality >= 90})
+
+        # Remove metadata if not preserving
+        if not settings.preserve_metadata:
+            save_kwargs["strip"] = True
+
+        return save_kwargs
+
+    def _optimize_with_pipeline(
+        self, input_path: Path, output_path: Path, settings: "OptimizationSettings"
+    ) -> dict[str, Any]:
+        """
+        Optimize an image by chaining stages in memory and keeping the smallest candidate output.
+
+        Each stage receives the previous stage's output, through stdin/stdout pipes for external
+        tools or in-memory buffers for PIL and libvips, so intermediate results never touch the disk.
+        Stages whose tool is missing, that do not accept the current format, or that fail are skipped
+        and the buffer is passed on unchanged. Only the final choice is written to output_path.
+        """
+        input_format = input_path.suffix.lower()
+        output_format = output_path.suffix.lower()
+        stages = settings.image_pipeline_stages or DEFAULT_IMAGE_PIPELINES.get(output_format, ("resize", "pil"))
+        self.logger.debug("Using image pipeline: %s", " -> ".join(stages))
+
+        data = input_path.read_bytes()
+        current_format = input_format
+        candidates: list[tuple[str, bytes]] = []
+        stage_reports: list[dict[str, Any]] = []
+
+        for stage in stages:
+            try:
+                if stage in PIPE_STAGE_FORMATS:
+                    if not self._available_tools.get(stage, False):
+                        stage_reports.append({"stage": stage, "skipped": "not installed"})
+                        continue
+                    if current_format not in PIPE_STAGE_FORMATS[stage]:
+                        stage_reports.append({"stage": stage, "skipped": f"does not accept {current_format}"})
+                        continue
+                    data = self._run_pipe_stage(stage, data, settings)
+                else:
+                    if stage == "resize" and not self._needs_encode(data, current_format, output_format, settings):
+                        stage_reports.append({"stage": stage, "skipped": "not needed"})
+                        continue
+                    data = self._run_encode_stage(stage, data, current_format, output_format, settings)
+                    current_format = output_format
+            except Exception as e:
+                self.logger.warning("Image pipeline stage %s failed, passing buffer on: %s", stage, e)
+                stage_reports.append({"stage": stage, "skipped": str(e)})
+                continue
+
+            stage_reports.append({"stage": stage, "size": len(data)})
+            candidates.append((stage, data))
+
+        if not candidates:
+            self.logger.warning("No image pipeline stage produced output, falling back to PIL")
+            return self._optimize_with_pil(input_path, output_path, settings)
+
+        selected_stage, best = min(candidates, key=lambda candidate: len(candidate[1]))
+        output_path.write_bytes(best)
+
+        return {
+            "method": f"pipeline ({'+'.join(stage for stage, _ in candidates)})",
+            "success": True,
+            "format": output_format,
+            "converted": input_format != output_format,
+            "stages": stage_reports,
+            "selected_stage": selected_stage,
+        }
+
+    def _needs_encode(
+        self, data: bytes, current_format: str, output_format: str, settings: "OptimizationSettings"
+    ) -> bool:
+        """Check if a buffer must be re-encoded to reach the output format or size."""
+        if Image.registered_extensions().get(current_format) != Image.registered_extensions().get(output_format):
+            return True
+        with Image.open(BytesIO(data)) as img:
+            return self._get_target_size(img.size, settings.max_width, settings.max_height) is not None
+
+    def _run_encode_stage(
+        self, stage: str, data: bytes, current_format: str, output_format: str, settings: "OptimizationSettings"
+    ) -> bytes:
+        """Resize and re-encode a buffer in memory ("resize" prefers libvips, "pil" always uses PIL)."""
+        if stage == "resize" and self._available_tools.get("libvips", False):
+            try:
+                import pyvips
+
+                img = pyvips.Image.new_from_buffer(data, "")
+                target_size = self._get_target_size((img.width, img.height), settings.max_width, settings.max_height)
+                if target_size:
+                    img = img.resize(target_size[0] / img.width)
+                return img.write_to_buffer(output_format, **self._get_libvips_save_kwargs(output_format, settings))
+            except Exception as e:
+                self.logger.warning("libvips resize failed, falling back to PIL: %s", str(e))
+
+        buffer = BytesIO()
+        self._encode_with_pil(BytesIO(data), buffer, current_format, output_format, settings)
+        return buffer.getvalue()
+
+    def _get_pipe_command(self, stage: str, settings: "OptimizationSettings") -> list[str]:
+        """Build the stdin-to-stdout command line for an external pipeline stage."""
+        quality = settings.get_quality_for_type("image")
+
+        if stage == "pngquant":
+            cmd = ["pngquant", "--quality", f"{max(0, quality - 10)}-{min(100, quality + 5)}"]
+            if not settings.preserve_metadata:
+                cmd.append("--strip")
+            return [*cmd, "-"]
+        if stage == "oxipng":
+            cmd = ["oxipng", "--opt", "4"]
+            if not settings.preserve_metadata:
+                cmd.extend(["--strip", "safe"])
+            return [*cmd, "--stdout", "-"]
+        if stage == "jpegoptim":
+            cmd = ["jpegoptim", f"--max={quality}"]
+            if not settings.preserve_metadata:
+                cmd.append("--strip-all")
+            return [*cmd, "--stdin", "--stdout"]
+        return ["gifsicle", "--optimize=3"]
+
+    def _run_pipe_stage(self, stage: str, data: bytes, settings: "OptimizationSettings") -> bytes:
+        """Pipe a buffer through an external tool and return its stdout."""
+        # S603: subprocess call with validated input - cmd is constructed from trusted sources
+        result = run_process(self._get_pipe_command(stage, settings), timeout=30, text=False, input_data=data)
+        if not result.success or not result.stdout:
+            stderr = result.stderr.decode(errors="replace") if isinstance(result.stderr, bytes) else result.stderr
+            raise RuntimeError(f"{stage} exited with {result.returncode}: {stderr.strip()}")
+        return result.stdout
+
+    def _get_target_size(
+        self, size: tuple[int, int], max_width: int | None, max_height: int | None
+    ) -> tuple[int, int] | None:
+        """Get the downscaled size for an image, or None when it already fits (images are never upscaled)."""
+        current_width, current_height = size
 
         # Check if percentage-based scaling is active
         if hasattr(self, "resize_percentage") and self.resize_percentage:
             # Use percentage-based scaling
             scale = self.resize_percentage
-            new_width = int(current_width * scale)
-            new_height = int(current_height * scale)
-            return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            return int(current_width * scale), int(current_height * scale)
 
         # Calculate new dimensions using fixed max dimensions
         if max_width and max_height:
@@ -372,13 +724,18 @@ class ImageOptimizationEngine:
         elif max_height:
             scale = max_height / current_height
         else:
-            return img
+            return None
 
         if scale < 1.0:  # Only downscale
-            new_width = int(current_width * scale)
-            new_height = int(current_height * scale)
-            return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            return int(current_width * scale), int(current_height * scale)
 
+        return None
+
+    def _resize_image(self, img: Image.Image, max_width: int | None, max_height: int | None) -> Image.Image:
+        """Resize image maintaining aspect ratio, supporting both fixed dimensions and percentage scaling."""
+        target_size = self._get_target_size(img.size, max_width, max_height)
+        if target_size:
+            return img.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=RESIZE_REDUCING_GAP)
         return img
 
     def get_optimization_info(self) -> dict[str, Any]:
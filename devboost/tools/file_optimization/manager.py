@@ -1,15 +1,56 @@
 import logging
 import mimetypes
+import multiprocessing
+import os
 import time
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from enum import Enum
 from pathlib import Path
 from typing import Any
 
 from PyQt6.QtCore import QMutex, QObject, pyqtSignal
 
+from .cache import OptimizationCache
+from .history import OptimizationHistory
 from .models import BatchOperationResult, BatchProgress, FileInfo
+from .scheduler import BatchScheduler, EngineBudget, ScheduledJob, default_engine_budgets
 from .settings import OptimizationSettings
+from .telemetry import collect_telemetry, current_telemetry, stage
+
+# Image methods that run inside the Python interpreter and hold the GIL while encoding
+CPU_BOUND_IMAGE_METHODS = {"pil"}
+
+# Per-process image engine used by process pool workers (created by the pool initializer)
+_worker_image_engine = None
+
+
+class ExecutorMode(Enum):
+    """Execution backends for batch optimization."""
+
+    THREAD = "thread"  # Every engine runs on the thread pool
+    PROCESS = "process"  # CPU-bound engines run on a process pool sized from core count
+    AUTO = "auto"  # Use the process pool only when more than one core is available
+
+
+def _init_image_worker(probe_cache_file: Path):
+    """Create the process pool worker's image engine on the parent engine's tool probe cache."""
+    global _worker_image_engine
+    from .images import ImageOptimizationEngine
+    from .tool_probe import ToolProbeCache
+
+    _worker_image_engine = ImageOptimizationEngine(probe_cache=ToolProbeCache(probe_cache_file))
+
+
+def _optimize_image_in_worker(
+    input_path: Path, output_path: Path, settings: OptimizationSettings, method: str
+) -> dict[str, Any]:
+    """Optimize an image inside a process pool worker using the method selected by the parent process."""
+    with collect_telemetry() as telemetry:
+        result = _worker_image_engine.optimize_image(input_path, output_path, settings, method=method)
+    # Stage timings cannot cross the process boundary through the thread-local collector
+    result["telemetry"] = telemetry.to_dict()
+    return result
 
 
 class OptimizationManager(QObject):
@@ -28,8 +69,25 @@ class OptimizationManager(QObject):
     batch_completed = pyqtSignal(list)  # list of BatchOperationResult
     error_occurred = pyqtSignal(str, str)  # file path, error message
 
-    def __init__(self):
-        """Initialize the optimization manager."""
+    def __init__(
+        self,
+        executor_mode: ExecutorMode = ExecutorMode.THREAD,
+        max_workers: int | None = None,
+        cache: OptimizationCache | None = None,
+        thread_workers: int | None = None,
+        history: OptimizationHistory | None = None,
+    ):
+        """
+        Initialize the optimization manager.
+
+        Args:
+            executor_mode: Backend used for CPU-bound engines (subprocess-backed engines always use threads)
+            max_workers: Process pool size (defaults to the number of available cores)
+            cache: Optional content-addressed cache of optimized outputs
+            thread_workers: Number of files optimized concurrently (defaults to 4, or the process pool
+                size if that is larger)
+            history: Optional run history that every finished batch is recorded in
+        """
         super().__init__()
         self.logger = logging.getLogger(__name__)
 
@@ -38,8 +96,29 @@ class OptimizationManager(QObject):
         self.video_engine = None
         self.pdf_engine = None
 
-        # Thread management
-        self._thread_pool = ThreadPoolExecutor(max_workers=4)
+        # Result cache (disabled when None)
+        self.cache = cache
+
+        # Run history with per-file stage timings (disabled when None)
+        self.history = history
+
+        # Input extension -> file type, built on first use from the engines' supported formats
+        self._format_index: dict[str, str] | None = None
+
+        # Executor management
+        self.executor_mode = executor_mode
+        self._process_pool_size = max_workers or os.cpu_count() or 1
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._pool_mutex = QMutex()
+
+        # Thread management - in process mode each thread only waits on a worker process,
+        # so the thread pool must be at least as large as the process pool
+        if thread_workers is None:
+            thread_workers = max(4, self._process_pool_size) if self._uses_process_pool() else 4
+        self._thread_pool = ThreadPoolExecutor(max_workers=thread_workers)
+
+        # Per-engine concurrency limits and cost weights, measured in thread pool slots
+        self.engine_budgets: dict[str, EngineBudget] = default_engine_budgets(thread_workers)
         self._is_processing = False
         self._cancel_requested = False
         self._progress_mutex = QMutex()
@@ -47,7 +126,50 @@ class OptimizationManager(QObject):
         # Progress tracking
         self._current_progress = BatchProgress(0, 0)
 
-        self.logger.info("OptimizationManager initialized")
+        self.logger.info(
+            "OptimizationManager initialized: executor_mode=%s process_pool_size=%d",
+            self.executor_mode.value,
+            self._process_pool_size,
+        )
+
+    def _uses_process_pool(self) -> bool:
+        """Check if CPU-bound engines should be dispatched to the process pool."""
+        if self.executor_mode == ExecutorMode.PROCESS:
+            return True
+        return self.executor_mode == ExecutorMode.AUTO and self._process_pool_size > 1
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Get the process pool, creating it on first use."""
+        self._pool_mutex.lock()
+        try:
+            if self._process_pool is None:
+                # Spawn workers instead of forking so Qt and thread pool state is not copied into them
+                context = multiprocessing.get_context("spawn")
+                # Workers share the parent engine's probe cache file rather than the default one
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self._process_pool_size,
+                    mp_context=context,
+                    initializer=_init_image_worker,
+                    initargs=(self.image_engine.probe_cache.cache_file,),
+                )
+                self.logger.info("Process pool started with %d workers", self._process_pool_size)
+            return self._process_pool
+        finally:
+            self._pool_mutex.unlock()
+
+    def _optimize_image(self, input_path: Path, output_path: Path, settings: OptimizationSettings) -> dict[str, Any]:
+        """Optimize an image, moving GIL-bound methods to the process pool when enabled."""
+        method = self.image_engine.select_method(input_path, settings)
+        if self._uses_process_pool() and method in CPU_BOUND_IMAGE_METHODS:
+            self.logger.debug("Dispatching %s to process pool (method=%s)", input_path, method)
+            pool = self._get_process_pool()
+            result = pool.submit(_optimize_image_in_worker, input_path, output_path, settings, method).result()
+            worker_telemetry = result.pop("telemetry", None)
+            telemetry = current_telemetry()
+            if worker_telemetry and telemetry is not None:
+                telemetry.merge(worker_telemetry)
+            return result
+        return self.image_engine.optimize_image(input_path, output_path, settings)
 
     def initialize_engines(self):
         """Initialize optimization engines after their classes are defined."""
@@ -57,8 +179,22 @@ class OptimizationManager(QObject):
         self.image_engine = ImageOptimizationEngine()
         self.video_engine = VideoOptimizationEngine()
         self.pdf_engine = PDFOptimizationEngine()
+        self._format_index = None
         self.logger.info("OptimizationManager engines initialized: Image, Video, PDF")
 
+    def _get_format_index(self) -> dict[str, str]:
+        """Get the file type for each input extension, built once from the engines' supported formats."""
+        if self._format_index is None:
+            index = {}
+            if self.image_engine:
+                index.update(dict.fromkeys(self.image_engine.get_supported_formats()["input"], "image"))
+            # PDFs go to the PDF engine even when libvips can read them as images
+            index[".pdf"] = "pdf"
+            if self.video_engine:
+                index.update(dict.fromkeys(self.video_engine.get_supported_formats()["input"], "video"))
+            self._format_index = index
+        return self._format_index
+
     def get_file_info(self, file_path: Path) -> FileInfo:
         """
         Get information about a file including type detection.
@@ -69,10 +205,11 @@ class OptimizationManager(QObject):
         Returns:
             FileInfo object with file details
         """
-        if not file_path.exists():
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
             return FileInfo(path=file_path, size=0, mime_type="", file_type="unknown", extension="", is_supported=False)
 
-        file_size = file_path.stat().st_size
         file_extension = file_path.suffix.lower()
 
         # Detect MIME type
@@ -80,25 +217,14 @@ class OptimizationManager(QObject):
         if not mime_type:
             mime_type = "application/octet-stream"
 
-        # Determine file type and support
-        file_type = "unknown"
+        # Determine file type and support from the engines' input formats
+        file_type = self._get_format_index().get(file_extension, "unknown")
         is_supported = False
-
-        # Check image formats
-        if self.image_engine:
-            image_formats = self.image_engine.get_supported_formats()
-            if file_extension in image_formats["input"]:
-                file_type = "image"
-                is_supported = True
-
-        # Check video formats
-        if self.video_engine and file_extension in self.video_engine.get_supported_formats()["input"]:
-            file_type = "video"
+        if file_type == "image":
+            is_supported = True
+        elif file_type == "video":
             is_supported = self.video_engine._available_tools.get("ffmpeg", False)
-
-        # Check PDF format
-        elif file_extension == ".pdf":
-            file_type = "pdf"
+        elif file_type == "pdf":
             is_supported = self.pdf_engine._available_tools.get("ghostscript", False) if self.pdf_engine else False
 
         return FileInfo(
@@ -111,7 +237,11 @@ class OptimizationManager(QObject):
         )
 
     def optimize_single_file(
-        self, input_path: Path, output_path: Path, settings: OptimizationSettings
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: OptimizationSettings,
+        file_progress_callback: Callable[[float], None] | None = None,
     ) -> BatchOperationResult:
         """
         Optimize a single file using the appropriate engine.
@@ -120,13 +250,34 @@ class OptimizationManager(QObject):
             input_path: Path to input file
             output_path: Path for output file
             settings: Optimization settings
+            file_progress_callback: Optional callback receiving percent complete (0-100) for engines
+                that report progress while they run (currently video)
 
         Returns:
-            BatchOperationResult with optimization details
+            BatchOperationResult with optimization details, including per-stage timings
         """
         start_time = time.time()
-        file_info = self.get_file_info(input_path)
+        with collect_telemetry() as telemetry:
+            with stage("probe"):
+                file_info = self.get_file_info(input_path)
+            result = self._optimize_file(
+                file_info, input_path, output_path, settings, start_time, file_progress_callback
+            )
+        result.file_type = file_info.file_type
+        result.stage_times = telemetry.stages
+        result.tool_cpu_time = telemetry.tool_cpu_time
+        return result
 
+    def _optimize_file(
+        self,
+        file_info: FileInfo,
+        input_path: Path,
+        output_path: Path,
+        settings: OptimizationSettings,
+        start_time: float,
+        file_progress_callback: Callable[[float], None] | None,
+    ) -> BatchOperationResult:
+        """Optimize a probed file with its engine (see optimize_single_file)."""
         if not file_info.is_supported:
             return BatchOperationResult(
                 file_path=input_path,
@@ -138,35 +289,106 @@ class OptimizationManager(QObject):
         try:
             # No backup creation - always create new compressed file
 
+            # Return the cached output instantly when these exact bytes were optimized with these settings
+            cache_key = self._get_cache_key(input_path, output_path, settings)
+            if cache_key:
+                with stage("cache"):
+                    cached_result = self._load_cached_result(cache_key, input_path, output_path, start_time)
+                if cached_result:
+                    return cached_result
+
+            # Skip files that a cheap sample encode predicts will barely shrink
+            if settings.skip_if_no_gain:
+                with stage("estimate"):
+                    predicted_gain = self._estimate_gain(file_info, input_path, output_path, settings)
+                if predicted_gain is not None and predicted_gain < settings.min_gain_percent:
+                    return self._skipped_result(
+                        input_path,
+                        file_info.size,
+                        start_time,
+                        f"Predicted gain {predicted_gain:.1f}% is below {settings.min_gain_percent:g}%",
+                    )
+
+            # In-place requests are written to a sibling file first, so a larger output never replaces the input
+            in_place = output_path.resolve() == input_path.resolve()
+            work_path = (
+                output_path.with_name(f".{output_path.stem}.optimizing{output_path.suffix}")
+                if in_place
+                else output_path
+            )
+
             # Choose appropriate engine and optimize
             result = None
             method_used = ""
 
-            if file_info.file_type == "image" and self.image_engine:
-                result = self.image_engine.optimize_image(input_path, output_path, settings)
-                method_used = result.get("method", "image")
-            elif file_info.file_type == "video" and self.video_engine:
-                result = self.video_engine.optimize_video(input_path, output_path, settings)
-                method_used = result.get("method", "video")
-            elif file_info.file_type == "pdf" and self.pdf_engine:
-                result = self.pdf_engine.optimize_pdf(input_path, output_path, settings)
-                method_used = result.get("method", "pdf")
+            try:
+                with stage("optimize"):
+                    if file_info.file_type == "image" and self.image_engine:
+                        result = self._optimize_image(input_path, work_path, settings)
+                        method_used = result.get("method", "image")
+                    elif file_info.file_type == "video" and self.video_engine:
+                        result = self.video_engine.optimize_video(
+                            input_path, work_path, settings, progress_callback=file_progress_callback
+                        )
+                        method_used = result.get("method", "video")
+                    elif file_info.file_type == "pdf" and self.pdf_engine:
+                        result = self.pdf_engine.optimize_pdf(input_path, work_path, settings)
+                        method_used = result.get("method", "pdf")
+            except Exception:
+                if in_place:
+                    work_path.unlink(missing_ok=True)
+                raise
 
             if not result or not result.get("success", False):
                 raise RuntimeError("Optimization failed - no result returned")
 
+            # Discard outputs that did not shrink instead of replacing a file with a larger one
+            original_size = result.get("original_size", file_info.size)
+            optimized_size = result.get("optimized_size", 0)
+            if settings.skip_if_no_gain and optimized_size and optimized_size >= original_size:
+                work_path.unlink(missing_ok=True)
+                return self._skipped_result(
+                    input_path,
+                    original_size,
+                    start_time,
+                    f"Output ({optimized_size} bytes) was not smaller than the input ({original_size} bytes)",
+                    method_used=method_used,
+                )
+
+            with stage("write"):
+                if in_place and work_path.exists():
+                    work_path.replace(output_path)
+
             processing_time = time.time() - start_time
 
-            return BatchOperationResult(
+            operation_result = BatchOperationResult(
                 file_path=input_path,
                 success=True,
-                original_size=result.get("original_size", file_info.size),
-                optimized_size=result.get("optimized_size", 0),
+                original_size=original_size,
+                optimized_size=optimized_size,
                 compression_ratio=result.get("compression_ratio", 0.0),
                 processing_time=processing_time,
                 method_used=method_used,
             )
 
+            # Outputs that did not shrink stay out of the cache: skip_if_no_gain is not part of the key,
+            # so a later run with it enabled must re-evaluate them instead of reusing the larger file
+            no_gain = bool(optimized_size) and optimized_size >= original_size
+            if cache_key and output_path.exists() and not no_gain:
+                with stage("write"):
+                    self.cache.put(
+                        cache_key,
+                        output_path,
+                        {
+                            "method": method_used,
+                            "original_size": operation_result.original_size,
+                            "optimized_size": operation_result.optimized_size,
+                            "compression_ratio": operation_result.compression_ratio,
+                        },
+                    )
+
+            return operation_result
+
         except Exception as e:
             processing_time = time.time() - start_time
             error_msg = str(e)
@@ -180,12 +402,73 @@ class OptimizationManager(QObject):
                 processing_time=processing_time,
             )
 
+    def _estimate_gain(
+        self, file_info: FileInfo, input_path: Path, output_path: Path, settings: OptimizationSettings
+    ) -> float | None:
+        """Predict the size reduction in percent, or None when the engine cannot estimate it cheaply."""
+        try:
+            if file_info.file_type == "image" and self.image_engine:
+                return self.image_engine.estimate_gain(input_path, output_path, settings)
+            if file_info.file_type == "video" and self.video_engine:
+                return self.video_engine.estimate_gain(input_path, output_path, settings)
+        except Exception as e:
+            self.logger.warning("Could not estimate optimization gain for %s: %s", input_path, e)
+        # PDFs have no cheap estimate; larger outputs are still discarded after optimizing
+        return None
+
+    def _skipped_result(
+        self, input_path: Path, original_size: int, start_time: float, reason: str, method_used: str | None = None
+    ) -> BatchOperationResult:
+        """Build the result for a file left as-is because optimizing it would not make it smaller."""
+        self.logger.info("Skipping %s: %s", input_path, reason)
+        return BatchOperationResult(
+            file_path=input_path,
+            success=True,
+            original_size=original_size,
+            optimized_size=original_size,
+            compression_ratio=0.0,
+            processing_time=time.time() - start_time,
+            method_used=method_used,
+            skipped=True,
+            skip_reason=reason,
+        )
+
+    def _get_cache_key(self, input_path: Path, output_path: Path, settings: OptimizationSettings) -> str | None:
+        """Get the cache key for a file, or None when caching is disabled or unavailable."""
+        if self.cache is None or not settings.use_cache:
+            return None
+        try:
+            return self.cache.make_key(input_path, output_path, settings)
+        except OSError as e:
+            self.logger.warning("Could not hash %s for cache lookup: %s", input_path, e)
+            return None
+
+    def _load_cached_result(
+        self, cache_key: str, input_path: Path, output_path: Path, start_time: float
+    ) -> BatchOperationResult | None:
+        """Copy a cached output into place and build its result, or return None on a miss."""
+        metadata = self.cache.get(cache_key, output_path)
+        if metadata is None:
+            return None
+
+        self.logger.info("Using cached optimization result for %s", input_path)
+        return BatchOperationResult(
+            file_path=input_path,
+            success=True,
+            original_size=metadata.get("original_size", 0),
+            optimized_size=metadata.get("optimized_size", 0),
+            compression_ratio=metadata.get("compression_ratio", 0.0),
+            processing_time=time.time() - start_time,
+            method_used=f"cached ({metadata.get('method', 'unknown')})",
+        )
+
     def optimize_batch(
         self,
         file_paths: list[Path],
         output_dir: Path | None = None,
         settings: OptimizationSettings | None = None,
         progress_callback: Callable[[BatchProgress], None] | None = None,
+        preset_name: str | None = None,
     ) -> list[BatchOperationResult]:
         """
         Optimize multiple files in batch with enhanced progress tracking.
@@ -195,6 +478,7 @@ class OptimizationManager(QObject):
             output_dir: Optional output directory (if None, files are optimized in place)
             settings: Optimization settings (uses default if None)
             progress_callback: Optional callback for progress updates
+            preset_name: Preset the settings came from, recorded in the run history
 
         Returns:
             List of BatchOperationResult objects
@@ -221,71 +505,35 @@ class OptimizationManager(QObject):
             self._progress_mutex.unlock()
 
         results = []
+        started_at = time.time()
 
         try:
-            # Process files with thread pool for better performance
-            future_to_path = {}
+            # Queue every file with the scheduler: smallest files first, within per-engine budgets
+            scheduler = self._create_scheduler(file_paths)
+            future_to_job: dict[Future, ScheduledJob] = {}
 
-            for file_path in file_paths:
+            while scheduler.has_pending() or future_to_job:
                 if self._cancel_requested:
+                    self._cancel_pending(future_to_job)
                     break
 
-                # Determine output path - always create new file with -compressed suffix
-                if output_dir:
-                    output_path = output_dir / f"{file_path.stem}-compressed{file_path.suffix}"
-                else:
-                    output_path = file_path.parent / f"{file_path.stem}-compressed{file_path.suffix}"
-
-                # Submit optimization task
-                future = self._thread_pool.submit(
-                    self._optimize_file_with_progress, file_path, output_path, settings, progress_callback
-                )
-                future_to_path[future] = file_path
+                for job in scheduler.take_ready():
+                    output_path = self.get_output_path(job.path, output_dir)
+                    future = self._thread_pool.submit(
+                        self._optimize_file_with_progress, job.path, output_path, settings, progress_callback
+                    )
+                    future_to_job[future] = job
 
-            # Collect results as they complete
-            for future in as_completed(future_to_path):
-                if self._cancel_requested:
+                if not future_to_job:
+                    self.logger.error("Scheduler could not release %d pending files", scheduler.pending_count())
                     break
 
-                try:
-                    result = future.result()
-                    results.append(result)
-
-                    # Update enhanced progress tracking
-                    self._progress_mutex.lock()
-                    try:
-                        self._current_progress.completed_files += 1
-                        if result.success:
-                            self._current_progress.success_count += 1
-                            self._current_progress.total_original_size += result.original_size
-                            if result.optimized_size:
-                                self._current_progress.total_optimized_size += result.optimized_size
-                            # Update bytes processed
-                            self._current_progress.bytes_processed += result.original_size
-                        else:
-                            self._current_progress.error_count += 1
-
-                        # Update current operation status
-                        remaining_files = self._current_progress.total_files - self._current_progress.completed_files
-                        if remaining_files > 0:
-                            self._current_progress.current_operation = f"Processing ({remaining_files} remaining)"
-                        else:
-                            self._current_progress.current_operation = "Completing"
-
-                    finally:
-                        self._progress_mutex.unlock()
-
-                    # Emit signals
-                    self.file_completed.emit(result)
-                    self.progress_updated.emit(self._current_progress)
-
-                    if progress_callback:
-                        progress_callback(self._current_progress)
-
-                except Exception as e:
-                    self.logger.exception("Error processing file")
-                    file_path = future_to_path[future]
-                    self.error_occurred.emit(str(file_path), str(e))
+                # Collect results as they complete and return their budget to the scheduler
+                done, _ = wait(future_to_job, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = future_to_job.pop(future)
+                    scheduler.release(job)
+                    self._collect_result(future, job.path, results, progress_callback)
 
         finally:
             self._is_processing = False
@@ -295,10 +543,101 @@ class OptimizationManager(QObject):
                 self._current_progress.current_operation = "Completed"
             finally:
                 self._progress_mutex.unlock()
+            if self.history is not None and results:
+                self.history.record_run(
+                    results,
+                    settings,
+                    started_at,
+                    preset=preset_name,
+                    executor_mode="process" if self._uses_process_pool() else "thread",
+                )
             self.batch_completed.emit(results)
 
         return results
 
+    def _create_scheduler(self, file_paths: list[Path]) -> BatchScheduler:
+        """Create a scheduler with one job per file, keyed by engine type and file size."""
+        scheduler = BatchScheduler(self.engine_budgets, self._thread_pool._max_workers)
+        for file_path in file_paths:
+            file_info = self.get_file_info(file_path)
+            scheduler.add_job(file_path, file_info.file_type, file_info.size)
+        return scheduler
+
+    def get_output_path(self, file_path: Path, output_dir: Path | None = None) -> Path:
+        """
+        Get the path optimize_batch writes a file's output to.
+
+        Args:
+            file_path: Input file path
+            output_dir: Output directory passed to optimize_batch (None writes next to the input)
+
+        Returns:
+            Output path with the -compressed suffix
+        """
+        if output_dir:
+            return output_dir / f"{file_path.stem}-compressed{file_path.suffix}"
+        return file_path.parent / f"{file_path.stem}-compressed{file_path.suffix}"
+
+    def _collect_result(
+        self,
+        future: Future,
+        file_path: Path,
+        results: list[BatchOperationResult],
+        progress_callback: Callable[[BatchProgress], None] | None = None,
+    ):
+        """Record a finished task in the results and progress tracking, then emit signals."""
+        try:
+            result = future.result()
+            results.append(result)
+
+            # Update enhanced progress tracking
+            self._progress_mutex.lock()
+            try:
+                self._current_progress.completed_files += 1
+                self._current_progress.file_progress.pop(str(file_path), None)
+                if result.success:
+                    self._current_progress.success_count += 1
+                    self._current_progress.total_original_size += result.original_size
+                    if result.optimized_size:
+                        self._current_progress.total_optimized_size += result.optimized_size
+                    # Update bytes processed
+                    self._current_progress.bytes_processed += result.original_size
+                else:
+                    self._current_progress.error_count += 1
+
+                # Update current operation status
+                remaining_files = self._current_progress.total_files - self._current_progress.completed_files
+                if remaining_files > 0:
+                    self._current_progress.current_operation = f"Processing ({remaining_files} remaining)"
+                else:
+                    self._current_progress.current_operation = "Completing"
+
+            finally:
+                self._progress_mutex.unlock()
+
+            # Emit signals
+            self.file_completed.emit(result)
+            self.progress_updated.emit(self._current_progress)
+
+            if progress_callback:
+                progress_callback(self._current_progress)
+
+        except Exception as e:
+            self.logger.exception("Error processing file")
+            self.error_occurred.emit(str(file_path), str(e))
+
+    def set_engine_budget(self, file_type: str, max_concurrent: int, cost: float = 1.0):
+        """
+        Set the concurrency limit and cost weight for an engine type.
+
+        Args:
+            file_type: Engine type ('image', 'video', 'pdf' or 'unknown')
+            max_concurrent: Maximum number of files of this type processed at once
+            cost: Worker slots consumed by each running file of this type
+        """
+        self.engine_budgets[file_type] = EngineBudget(max_concurrent=max(1, max_concurrent), cost=max(0.0, cost))
+        self.logger.info("Engine budget for %s set to %s", file_type, self.engine_budgets[file_type])
+
     def _optimize_file_with_progress(
         self,
         input_path: Path,
@@ -333,14 +672,31 @@ class OptimizationManager(QObject):
         finally:
             self._progress_mutex.unlock()
 
+        def _report_file_progress(percent: float):
+            self._progress_mutex.lock()
+            try:
+                self._current_progress.file_progress[str(input_path)] = percent
+            finally:
+                self._progress_mutex.unlock()
+            self.progress_updated.emit(self._current_progress)
+            if progress_callback:
+                progress_callback(self._current_progress)
+
         # Perform optimization and measure time
-        result = self.optimize_single_file(input_path, output_path, settings)
+        result = self.optimize_single_file(
+            input_path, output_path, settings, file_progress_callback=_report_file_progress
+        )
 
         # Update result with processing time
         result.processing_time = time.time() - file_start_time
 
         return result
 
+    def _cancel_pending(self, future_to_job: dict[Future, ScheduledJob]):
+        """Cancel submitted tasks that have not started yet."""
+        cancelled = sum(1 for future in future_to_job if future.cancel())
+        self.logger.info("Cancelled %d pending optimization tasks", cancelled)
+
     def cancel_batch_operation(self):
         """Cancel the current batch operation."""
         self._cancel_requested = True
@@ -386,7 +742,14 @@ class OptimizationManager(QObject):
             "engines": {},
             "supported_formats": self.get_supported_formats(),
             "thread_pool_size": self._thread_pool._max_workers,
+            "executor_mode": self.executor_mode.value,
+            "process_pool_size": self._process_pool_size if self._uses_process_pool() else 0,
+            "engine_budgets": {
+                file_type: {"max_concurrent": budget.max_concurrent, "cost": budget.cost}
+                for file_type, budget in self.engine_budgets.items()
+            },
             "is_processing": self._is_processing,
+            "cache": self.cache.get_stats() if self.cache else None,
         }
 
         if self.image_engine:
@@ -399,7 +762,10 @@ class OptimizationManager(QObject):
         return info
 
     def cleanup(self):
-        """Clean up resources and shutdown thread pool."""
+        """Clean up resources and shutdown thread and process pools."""
         self._cancel_requested = True
         self._thread_pool.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
         self.logger.info("OptimizationManager cleanup completed")
@@ -1,5 +1,5 @@
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -28,6 +28,11 @@ class BatchOperationResult:
     error_message: str | None = None
     processing_time: float = 0.0
     method_used: str | None = None
+    skipped: bool = False  # No smaller output was produced, so the input was left as the result
+    skip_reason: str | None = None
+    file_type: str = "unknown"  # Engine that handled the file: 'image', 'video', 'pdf' or 'unknown'
+    stage_times: dict[str, float] = field(default_factory=dict)  # Stage name -> wall seconds (inclusive)
+    tool_cpu_time: float = 0.0  # CPU seconds used by external tools
 
 
 @dataclass
@@ -47,13 +52,15 @@ class BatchProgress:
     average_processing_time: float = 0.0
     current_operation: str = ""
     bytes_processed: int = 0
+    file_progress: dict[str, float] = field(default_factory=dict)  # In-flight file path -> percent complete
 
     @property
     def progress_percentage(self) -> float:
-        """Calculate progress percentage."""
+        """Calculate progress percentage, including partial progress of files still being processed."""
         if self.total_files == 0:
             return 0.0
-        return (self.completed_files / self.total_files) * 100
+        in_flight = sum(self.file_progress.values()) / 100
+        return min(100.0, ((self.completed_files + in_flight) / self.total_files) * 100)
 
     @property
     def total_compression_ratio(self) -> float:
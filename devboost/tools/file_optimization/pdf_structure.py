@@ -0,0 +1,406 @@
+import mmap
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# Bytes from the end of the file searched for the startxref keyword
+STARTXREF_SEARCH_SIZE = 4096
+
+# Upper bound on the dictionary bytes scanned per object when counting images
+OBJECT_HEADER_SCAN_SIZE = 65536
+
+_WHITESPACE_RE = re.compile(rb"(?:[ \t\r\n\f\x00]+|%[^\r\n]*)*")
+_KEYWORD_RE = re.compile(rb"[^ \t\r\n\f\x00()<>\[\]{}/%]*")
+_XREF_ENTRY_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+([nf])")
+_NUMBER_RE = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_OBJECT_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_IMAGE_SUBTYPE_RE = re.compile(rb"/Subtype\s*/Image(?=[\s/<>\[\]()%]|$)")
+_FONT_TYPE_RE = re.compile(rb"/Type\s*/Font(?=[\s/<>\[\]()%]|$)")
+
+
+class PDFStructureError(Exception):
+    """Raised when a PDF's cross-reference structure cannot be read."""
+
+
+class _Ref(NamedTuple):
+    """Indirect object reference (``num gen R``)."""
+
+    num: int
+    gen: int
+
+
+class _Name(str):
+    """PDF name object (``/Name``), stored without the leading slash."""
+
+
+@dataclass
+class PDFStructure:
+    """Document facts read from the PDF object structure without rendering."""
+
+    pages: int
+    image_count: int
+    has_fonts: bool
+
+
+class _ObjectParser:
+    """Minimal parser for PDF objects: dictionaries, arrays, names, numbers, strings and references."""
+
+    def __init__(self, data: bytes | mmap.mmap, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def skip_whitespace(self):
+        self.pos = _WHITESPACE_RE.match(self.data, self.pos).end()
+
+    def read_keyword(self) -> bytes:
+        self.skip_whitespace()
+        match = _KEYWORD_RE.match(self.data, self.pos)
+        self.pos = match.end()
+        return match.group()
+
+    def parse(self) -> Any:
+        self.skip_whitespace()
+        data = self.data
+        head = bytes(data[self.pos : self.pos + 2])
+        if head == b"<<":
+            return self._parse_dict()
+        if head[:1] == b"<":
+            end = data.find(b">", self.pos)
+            if end < 0:
+                raise PDFStructureError("Unterminated hex string")
+            value = bytes(data[self.pos + 1 : end])
+            self.pos = end + 1
+            return value
+        if head[:1] == b"[":
+            self.pos += 1
+            items = []
+            while True:
+                self.skip_whitespace()
+                if data[self.pos : self.pos + 1] == b"]":
+                    self.pos += 1
+                    return items
+                if self.pos >= len(data):
+                    raise PDFStructureError("Unterminated array")
+                items.append(self.parse())
+        if head[:1] == b"/":
+            self.pos += 1
+            return _Name(self.read_keyword().decode("latin-1"))
+        if head[:1] == b"(":
+            return self._parse_string()
+
+        match = _NUMBER_RE.match(data, self.pos)
+        if match:
+            self.pos = match.end()
+            token = match.group()
+            if b"." in token:
+                return float(token)
+            number = int(token)
+            # "num gen R" is a reference; anything else leaves the parser after the first number
+            saved = self.pos
+            gen_keyword = self.read_keyword()
+            if gen_keyword.isdigit() and self.read_keyword() == b"R":
+                return _Ref(number, int(gen_keyword))
+            self.pos = saved
+            return number
+
+        keyword = self.read_keyword()
+        if keyword == b"true":
+            return True
+        if keyword == b"false":
+            return False
+        if keyword == b"null":
+            return None
+        raise PDFStructureError(f"Unexpected token {keyword!r} at offset {self.pos}")
+
+    def _parse_dict(self) -> dict[str, Any]:
+        self.pos += 2
+        result = {}
+        while True:
+            self.skip_whitespace()
+            if self.data[self.pos : self.pos + 2] == b">>":
+                self.pos += 2
+                return result
+            if self.pos >= len(self.data):
+                raise PDFStructureError("Unterminated dictionary")
+            key = self.parse()
+            if not isinstance(key, _Name):
+                raise PDFStructureError(f"Dictionary key is not a name at offset {self.pos}")
+            result[str(key)] = self.parse()
+
+    def _parse_string(self) -> bytes:
+        # Strings are only skipped over, so escapes are kept as-is apart from escaped parentheses
+        depth = 0
+        start = self.pos
+        data = self.data
+        while self.pos < len(data):
+            char = data[self.pos : self.pos + 1]
+            if char == b"\\":
+                self.pos += 2
+                continue
+            if char == b"(":
+                depth += 1
+            elif char == b")":
+                depth -= 1
+                if depth == 0:
+                    self.pos += 1
+                    return bytes(data[start + 1 : self.pos - 1])
+            self.pos += 1
+        raise PDFStructureError("Unterminated string")
+
+
+def _apply_png_predictor(data: bytes, columns: int) -> bytes:
+    """Undo the PNG row predictors used by cross-reference streams (/Predictor >= 10)."""
+    row_size = columns + 1
+    previous = bytearray(columns)
+    output = bytearray()
+    for start in range(0, len(data), row_size):
+        filter_type = data[start]
+        row = bytearray(data[start + 1 : start + row_size])
+        for i in range(len(row)):
+            left = row[i - 1] if i > 0 else 0
+            up = previous[i]
+            if filter_type == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif filter_type == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif filter_type == 3:
+                row[i] = (row[i] + ((left + up) >> 1)) & 0xFF
+            elif filter_type == 4:
+                upper_left = previous[i - 1] if i > 0 else 0
+                estimate = left + up - upper_left
+                distances = (abs(estimate - left), abs(estimate - up), abs(estimate - upper_left))
+                row[i] = (row[i] + (left, up, upper_left)[distances.index(min(distances))]) & 0xFF
+        output.extend(row)
+        previous = row
+    return bytes(output)
+
+
+class _PDFReader:
+    """Reads the cross-reference table/streams of a PDF and resolves objects on demand."""
+
+    def __init__(self, data: bytes | mmap.mmap):
+        self.data = data
+        # Object number -> (1, offset, 0) for objects in the file body, (2, stream_num, index) for objects
+        # stored in an object stream
+        self.entries: dict[int, tuple[int, int, int]] = {}
+        self.trailer: dict[str, Any] = {}
+        self._object_streams: dict[int, tuple[bytes, list[tuple[int, int]], int]] = {}
+        self._read_cross_references()
+
+    def _read_cross_references(self):
+        tail_start = max(0, len(self.data) - STARTXREF_SEARCH_SIZE)
+        index = self.data.rfind(b"startxref", tail_start)
+        if index < 0:
+            raise PDFStructureError("startxref not found")
+        parser = _ObjectParser(self.data, index + len(b"startxref"))
+        offset = parser.parse()
+
+        visited = set()
+        while isinstance(offset, int) and offset not in visited:
+            visited.add(offset)
+            trailer = self._read_section(offset)
+            for key, value in trailer.items():
+                # The newest trailer wins, older ones only fill in missing keys
+                self.trailer.setdefault(key, value)
+            offset = trailer.get("Prev")
+
+        if "Root" not in self.trailer:
+            raise PDFStructureError("Trailer has no /Root")
+
+    def _read_section(self, offset: int) -> dict[str, Any]:
+        """Read one cross-reference section and return its trailer dictionary."""
+        parser = _ObjectParser(self.data, offset)
+        if parser.read_keyword() == b"xref":
+            table_entries = self._read_xref_table(parser)
+            trailer = parser.parse() if parser.read_keyword() == b"trailer" else None
+            if not isinstance(trailer, dict):
+                raise PDFStructureError(f"Missing trailer after xref table at offset {offset}")
+            # Hybrid files list compressed objects in a stream that takes precedence over the table
+            if isinstance(trailer.get("XRefStm"), int):
+                self._read_xref_stream(trailer["XRefStm"])
+            for num, entry in table_entries.items():
+                self.entries.setdefault(num, entry)
+            return trailer
+        return self._read_xref_stream(offset)
+
+    def _read_xref_table(self, parser: _ObjectParser) -> dict[int, tuple[int, int, int]]:
+        entries = {}
+        while True:
+            saved = parser.pos
+            first = parser.read_keyword()
+            if not first.isdigit():
+                parser.pos = saved
+                return entries
+            count = int(parser.read_keyword())
+            for num in range(int(first), int(first) + count):
+                match = _XREF_ENTRY_RE.match(self.data, parser.pos)
+                if not match:
+                    raise PDFStructureError(f"Malformed xref entry at offset {parser.pos}")
+                parser.pos = match.end()
+                entries[num] = (1, int(match.group(1)), 0) if match.group(3) == b"n" else (0, 0, 0)
+
+    def _read_xref_stream(self, offset: int) -> dict[str, Any]:
+        header, data = self._read_indirect_object(offset)
+        if not isinstance(header, dict) or header.get("Type") != "XRef" or data is None:
+            raise PDFStructureError(f"No cross-reference stream at offset {offset}")
+        widths = header["W"]
+        index = header.get("Index", [0, header["Size"]])
+        entry_size = sum(widths)
+        position = 0
+        for first, count in zip(index[::2], index[1::2], strict=False):
+            for num in range(first, first + count):
+                row = data[position : position + entry_size]
+                position += entry_size
+                fields = []
+                field_start = 0
+                for width in widths:
+                    fields.append(int.from_bytes(row[field_start : field_start + width], "big"))
+                    field_start += width
+                # A zero-width type field means type 1
+                kind = fields[0] if widths[0] else 1
+                self.entries.setdefault(num, (kind, fields[1], fields[2]))
+        return header
+
+    def _read_indirect_object(self, offset: int) -> tuple[Any, bytes | None]:
+        """Parse ``num gen obj`` at an offset and return its value and decoded stream data (if any)."""
+        match = _OBJECT_HEADER_RE.match(self.data, offset)
+        if not match:
+            raise PDFStructureError(f"No object at offset {offset}")
+        parser = _ObjectParser(self.data, match.end())
+        value = parser.parse()
+        if not isinstance(value, dict):
+            return value, None
+        saved = parser.pos
+        if parser.read_keyword() != b"stream":
+            parser.pos = saved
+            return value, None
+
+        # Stream data starts after the end-of-line following the keyword
+        start = parser.pos
+        if self.data[start : start + 2] == b"\r\n":
+            start += 2
+        elif self.data[start : start + 1] in (b"\n", b"\r"):
+            start += 1
+        length = value.get("Length")
+        if isinstance(length, _Ref):
+            length = self.resolve(length)
+        if not isinstance(length, int):
+            end = self.data.find(b"endstream", start)
+            if end < 0:
+                raise PDFStructureError(f"Unterminated stream at offset {offset}")
+            length = end - start
+        return value, self._decode_stream(value, bytes(self.data[start : start + length]))
+
+    @staticmethod
+    def _decode_stream(header: dict[str, Any], raw: bytes) -> bytes:
+        filters = header.get("Filter")
+        if filters is None:
+            return raw
+        if filters not in ("FlateDecode", ["FlateDecode"]):
+            raise PDFStructureError(f"Unsupported stream filter {filters}")
+        try:
+            data = zlib.decompress(raw)
+        except zlib.error as e:
+            raise PDFStructureError(f"Cannot decompress stream: {e}") from e
+        params = header.get("DecodeParms")
+        if isinstance(params, list):
+            params = params[0] if params else None
+        if isinstance(params, dict) and params.get("Predictor", 1) >= 10:
+            data = _apply_png_predictor(data, params.get("Columns", 1))
+        return data
+
+    def resolve(self, value: Any) -> Any:
+        """Resolve an indirect reference to its object value."""
+        if not isinstance(value, _Ref):
+            return value
+        entry = self.entries.get(value.num)
+        if entry is None or entry[0] == 0:
+            return None
+        if entry[0] == 1:
+            return self._read_indirect_object(entry[1])[0]
+        data, offsets, first = self.load_object_stream(entry[1])
+        if entry[2] >= len(offsets):
+            raise PDFStructureError(f"Object {value.num} missing from object stream {entry[1]}")
+        return _ObjectParser(data, first + offsets[entry[2]][1]).parse()
+
+    def load_object_stream(self, stream_num: int) -> tuple[bytes, list[tuple[int, int]], int]:
+        """Decompress an object stream once and return its data, (num, offset) pairs and /First."""
+        if stream_num not in self._object_streams:
+            entry = self.entries.get(stream_num)
+            if entry is None or entry[0] != 1:
+                raise PDFStructureError(f"Object stream {stream_num} not found")
+            header, data = self._read_indirect_object(entry[1])
+            if data is None:
+                raise PDFStructureError(f"Object {stream_num} is not a stream")
+            parser = _ObjectParser(data)
+            pairs = [(parser.parse(), parser.parse()) for _ in range(header["N"])]
+            self._object_streams[stream_num] = (data, pairs, header["First"])
+        return self._object_streams[stream_num]
+
+    def object_header(self, offset: int) -> bytes:
+        """Get the raw bytes of an object up to its stream data or endobj."""
+        limit = offset + OBJECT_HEADER_SCAN_SIZE
+        ends = [self.data.find(keyword, offset, limit) for keyword in (b"stream", b"endobj")]
+        ends = [index for index in ends if index >= 0]
+        return bytes(self.data[offset : min(ends) if ends else limit])
+
+
+def read_pdf_structure(pdf_path: Path) -> PDFStructure:
+    """
+    Read page count, image count and font presence from a PDF's object structure.
+
+    Only the cross-reference data, the page tree root and object dictionaries are read, so the
+    cost does not depend on page content. Image and font objects are recognised by their
+    dictionary entries (``/Subtype /Image`` and ``/Type /Font``) without resolving resources.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        PDFStructure with the document facts
+
+    Raises:
+        PDFStructureError: If the cross-reference structure is damaged or uses unsupported features
+    """
+    with pdf_path.open("rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Empty file
+            raise PDFStructureError("Empty file") from e
+        try:
+            return _read_structure(data)
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            raise PDFStructureError(f"Malformed PDF structure: {e}") from e
+        finally:
+            data.close()
+
+
+def _read_structure(data: mmap.mmap) -> PDFStructure:
+    reader = _PDFReader(data)
+
+    catalog = reader.resolve(reader.trailer["Root"])
+    pages = reader.resolve(catalog["Pages"])
+    page_count = reader.resolve(pages["Count"])
+    if not isinstance(page_count, int):
+        raise PDFStructureError("Page tree has no /Count")
+
+    image_count = 0
+    has_fonts = False
+    object_streams = set()
+    for kind, field, _ in reader.entries.values():
+        if kind == 1:
+            header = reader.object_header(field)
+            # Streams (images) cannot live in object streams, so only body objects are counted
+            if _IMAGE_SUBTYPE_RE.search(header):
+                image_count += 1
+            has_fonts = has_fonts or _FONT_TYPE_RE.search(header) is not None
+        elif kind == 2:
+            object_streams.add(field)
+    for stream_num in object_streams:
+        if has_fonts:
+            break
+        has_fonts = _FONT_TYPE_RE.search(reader.load_object_stream(stream_num)[0]) is not None
+
+    return PDFStructure(pages=page_count, image_count=image_count, has_fonts=has_fonts)
@@ -3,16 +3,51 @@ import os
 import re
 import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from devboost.config import get_config, set_config
 
+from .pdf_structure import PDFStructureError, read_pdf_structure
 from .process_runner import run_process
+from .telemetry import tool_run
+from .tool_probe import ToolProbeCache, get_default_probe_cache, resolve_binary
 
 if TYPE_CHECKING:
     from . import OptimizationSettings
 
+# Timeout for one ghostscript run (a whole document, or one page range in parallel mode)
+GHOSTSCRIPT_TIMEOUT = 120
+
+# Page ranges shorter than this are not worth an extra ghostscript process and merge step
+MIN_PAGES_PER_RANGE = 10
+
+
+def choose_page_ranges(page_count: int, cpu_count: int) -> list[tuple[int, int]]:
+    """
+    Split a document into contiguous page ranges for parallel optimization.
+
+    Args:
+        page_count: Number of pages in the PDF
+        cpu_count: Number of available CPU cores
+
+    Returns:
+        Inclusive 1-based (first, last) page ranges; a single range means no splitting
+    """
+    if page_count <= 0:
+        return [(1, max(1, page_count))]
+    range_count = max(1, min(cpu_count, page_count // MIN_PAGES_PER_RANGE))
+    base, extra = divmod(page_count, range_count)
+    ranges = []
+    first = 1
+    for index in range(range_count):
+        last = first + base - 1 + (1 if index < extra else 0)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
 
 class PDFOptimizationEngine:
     """
@@ -22,9 +57,15 @@ class PDFOptimizationEngine:
     for compression, quality control, and metadata preservation.
     """
 
-    def __init__(self):
-        """Initialize the PDF optimization engine."""
+    def __init__(self, probe_cache: ToolProbeCache | None = None):
+        """
+        Initialize the PDF optimization engine.
+
+        Args:
+            probe_cache: Optional tool probe cache (defaults to the shared on-disk cache)
+        """
         self.logger = logging.getLogger(__name__)
+        self._probe_cache = probe_cache or get_default_probe_cache()
         self._available_tools = self._detect_available_tools()
 
     def set_ghostscript_path(self, path: str) -> bool:
@@ -117,24 +158,26 @@ class PDFOptimizationEngine:
 
     def _check_ghostscript_in_path(self) -> bool:
         """Check for Ghostscript using PATH-based lookup."""
-        try:
-            cmd_check = run_process(  # noqa: S604
-                "command -v gs",
-                timeout=5,
-                shell=True,
-            )
-            if cmd_check.returncode == 0:
-                return self._verify_gs_command()
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            self.logger.debug("PATH-based gs check failed: %s", e)
-
+        if self._resolve_executable("gs"):
+            return self._verify_gs_command()
+        self.logger.debug("PATH-based gs check failed: gs not found")
         return False
 
     def _verify_gs_command(self) -> bool:
         """Verify the 'gs' command works and get version."""
+        probe = self._probe_cache.probe("gs-version", "gs", self._probe_gs_version)
+        if probe["ok"]:
+            self._gs_command = "gs"
+            self._gs_version = probe["version"]
+            self.logger.info("Ghostscript detected via PATH: command=%s version=%s", self._gs_command, self._gs_version)
+            return True
+        return False
+
+    def _probe_gs_version(self, executable_path: str) -> dict[str, Any]:
+        """Run ``gs --version`` and report whether it succeeded and the version it printed."""
         try:
             version_proc = run_process(
-                ["gs", "--version"],
+                [executable_path, "--version"],
                 timeout=5,
                 shell=False,
             )
@@ -142,17 +185,12 @@ class PDFOptimizationEngine:
                 stdout_text = version_proc.stdout.strip() if version_proc.stdout else ""
                 stderr_text = version_proc.stderr.strip() if version_proc.stderr else ""
                 version_text = stdout_text if stdout_text else stderr_text
-                self._gs_command = "gs"
-                self._gs_version = version_text if version_text else None
-                self.logger.info(
-                    "Ghostscript detected via PATH: command=%s version=%s", self._gs_command, self._gs_version
-                )
-                return True
+                return {"ok": True, "version": version_text if version_text else None}
             self.logger.debug("gs --version returned non-zero: %s", version_proc.returncode)
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
             self.logger.debug("Ghostscript version check failed: %s", e)
 
-        return False
+        return {"ok": False, "version": None}
 
     def _check_ghostscript_candidates(self) -> bool:
         """Check environment variables and common installation paths."""
@@ -196,17 +234,17 @@ class PDFOptimizationEngine:
 
     def _resolve_executable(self, path_like: str) -> str | None:
         """Resolve executable path, handling both absolute paths and PATH lookups."""
-        # If it looks like a path, verify it; otherwise resolve via PATH using shutil.which
-        if os.path.sep in path_like:
-            p = Path(path_like)
-            if p.is_file() and os.access(str(p), os.X_OK):
-                return str(p.resolve())
-            return None
-        resolved = shutil.which(path_like)
-        return str(Path(resolved).resolve()) if resolved else None
+        return resolve_binary(path_like)
 
     def _verify_ghostscript(self, executable_path: str) -> bool:
-        """Verify that the given executable is a working Ghostscript installation."""
+        """Verify that the given executable is a working Ghostscript installation (cached per binary)."""
+        probe = self._probe_cache.probe("ghostscript", executable_path, self._probe_ghostscript)
+        if probe["ok"]:
+            self._gs_version = probe["version"]
+        return probe["ok"]
+
+    def _probe_ghostscript(self, executable_path: str) -> dict[str, Any]:
+        """Run Ghostscript's version and help commands and report whether the output looks like Ghostscript."""
         try:
             # Verify by checking version/help output; avoid invoking shell aliases by passing list and shell=False
             # The executable_path is validated before this function is called
@@ -218,8 +256,7 @@ class PDFOptimizationEngine:
                 stderr_text = version_proc.stderr.strip() if version_proc.stderr else ""
                 version_text = stdout_text if stdout_text else stderr_text
                 if self._looks_like_ghostscript(version_text, help_proc.stdout, help_proc.stderr):
-                    self._gs_version = version_text if version_text else None
-                    return True
+                    return {"ok": True, "version": version_text if version_text else None}
 
             self.logger.debug(
                 "Candidate failed ghostscript verification: %s (version_rc=%s help_rc=%s)",
@@ -227,10 +264,10 @@ class PDFOptimizationEngine:
                 version_proc.returncode,
                 help_proc.returncode,
             )
-            return False
         except (subprocess.TimeoutExpired, FileNotFoundError, PermissionError) as e:
             self.logger.debug("Error verifying ghostscript candidate '%s': %s", executable_path, e)
-            return False
+
+        return {"ok": False, "version": None}
 
     def _looks_like_ghostscript(self, version_out: str, help_out: str, help_err: str) -> bool:
         """Check if the output looks like it's from Ghostscript."""
@@ -268,7 +305,13 @@ class PDFOptimizationEngine:
         self.logger.info("Optimizing PDF: %s -> %s", input_path, output_path)
 
         try:
-            result = self._optimize_with_ghostscript(input_path, output_path, settings)
+            page_ranges = []
+            if settings.pdf_parallel:
+                page_ranges = choose_page_ranges(self.get_pdf_info(input_path).get("pages", 0), os.cpu_count() or 1)
+            if len(page_ranges) > 1:
+                result = self._optimize_page_ranges(input_path, output_path, settings, page_ranges)
+            else:
+                result = self._optimize_with_ghostscript(input_path, output_path, settings)
 
             # Calculate compression ratio
             if output_path.exists():
@@ -293,6 +336,91 @@ class PDFOptimizationEngine:
         """Optimize PDF using ghostscript with comprehensive settings."""
         self.logger.debug("Using ghostscript for PDF optimization")
 
+        self._run_ghostscript(self._build_ghostscript_command(input_path, output_path, settings))
+
+        return {
+            "method": "ghostscript",
+            "success": True,
+            "format": ".pdf",
+            "quality_setting": "minimal",
+            "dpi": settings.pdf_dpi,
+            "metadata_preserved": settings.preserve_metadata,
+        }
+
+    def _optimize_page_ranges(
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        page_ranges: list[tuple[int, int]],
+    ) -> dict[str, Any]:
+        """
+        Optimize page ranges in parallel ghostscript processes and merge the parts.
+
+        Each range gets its own GHOSTSCRIPT_TIMEOUT, so large documents no longer hit the single
+        whole-document timeout. The merge pass re-writes already optimized parts, which is much
+        cheaper than the original distill. Document-level structures that span ranges, such as the
+        outline, are not carried over to the merged output.
+
+        Args:
+            input_path: Path to the input PDF
+            output_path: Path for the optimized output PDF
+            settings: Optimization settings
+            page_ranges: Inclusive 1-based page ranges from choose_page_ranges
+
+        Returns:
+            Dictionary with optimization results
+        """
+        self.logger.debug("Optimizing %s as %d parallel page ranges", input_path, len(page_ranges))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+
+            def _optimize_range(index: int, page_range: tuple[int, int]) -> Path:
+                part_path = work_dir / f"part_{index:03d}.pdf"
+                cmd = self._build_ghostscript_command(input_path, part_path, settings, page_range)
+                self._run_ghostscript(cmd)
+                return part_path
+
+            # Telemetry is per thread, so the workers' Ghostscript runs are timed here as one tool run
+            with tool_run(), ThreadPoolExecutor(max_workers=len(page_ranges)) as executor:
+                parts = list(executor.map(_optimize_range, range(len(page_ranges)), page_ranges))
+
+            # Images are already downsampled, so the merge uses the default settings and passes them through
+            merged_path = work_dir / "merged.pdf"
+            merge_cmd = [
+                self._gs_command,
+                "-sDEVICE=pdfwrite",
+                "-dCompatibilityLevel=1.4",
+                "-dNOPAUSE",
+                "-dBATCH",
+                "-dAutoRotatePages=/None",
+                f"-sOutputFile={merged_path}",
+                *(str(part) for part in parts),
+            ]
+            self._run_ghostscript(merge_cmd)
+
+            # Moving from the temp dir also covers in-place optimization, since the input was already read
+            shutil.move(str(merged_path), str(output_path))
+
+        return {
+            "method": "ghostscript",
+            "success": True,
+            "format": ".pdf",
+            "quality_setting": "minimal",
+            "dpi": settings.pdf_dpi,
+            "metadata_preserved": settings.preserve_metadata,
+            "page_ranges": len(page_ranges),
+        }
+
+    def _build_ghostscript_command(
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        page_range: tuple[int, int] | None = None,
+    ) -> list[str]:
+        """Build the ghostscript pdfwrite command, optionally limited to an inclusive page range."""
         # Import here to avoid circular dependency at module import time
         from devboost.tools.file_optimization import QualityPreset
 
@@ -317,16 +445,25 @@ class PDFOptimizationEngine:
         elif settings.quality_preset == QualityPreset.MINIMUM:
             cmd.extend(["-dPDFSETTINGS=/screen"])
 
+        if page_range is not None:
+            cmd.extend([f"-dFirstPage={page_range[0]}", f"-dLastPage={page_range[1]}"])
+
         # Output file
         cmd.extend([f"-sOutputFile={output_path}", str(input_path)])
+        return cmd
 
+    def _run_ghostscript(self, cmd: list[str]):
+        """Run a ghostscript command, raising RuntimeError on failure or timeout."""
         try:
             # Log the full command for debugging
             cmd_str = " ".join(cmd)
             self.logger.info("Executing Ghostscript command: %s", cmd_str)
             self.logger.debug("Running ghostscript command: %s", cmd_str)
             # The command is constructed from trusted sources (validated ghostscript executable)
-            result = run_process(cmd, timeout=120, shell=False)
+            result = run_process(cmd, timeout=GHOSTSCRIPT_TIMEOUT, shell=False)
+
+            if result.timed_out:
+                raise subprocess.TimeoutExpired(cmd, GHOSTSCRIPT_TIMEOUT)
 
             if result.returncode != 0:
                 self.logger.error("Ghostscript command failed with return code %d", result.returncode)
@@ -338,63 +475,56 @@ class PDFOptimizationEngine:
             if result.stdout:
                 self.logger.debug("Ghostscript stdout: %s", result.stdout)
 
-            return {
-                "method": "ghostscript",
-                "success": True,
-                "format": ".pdf",
-                "quality_setting": "minimal",
-                "dpi": settings.pdf_dpi,
-                "metadata_preserved": settings.preserve_metadata,
-            }
-
         except subprocess.TimeoutExpired as e:
             raise RuntimeError("PDF optimization timed out (2 minutes)") from e
 
     def get_pdf_info(self, pdf_path: Path) -> dict[str, Any]:
-        """Get PDF information using ghostscript."""
-        if not self._available_tools.get("ghostscript", False):
-            return {}
-
-        cmd = [self._gs_command, "-sDEVICE=bbox", "-dNOPAUSE", "-dBATCH", "-dQUIET", str(pdf_path)]
+        """
+        Get PDF page count and whether the document contains images and fonts.
 
+        The cross-reference structure is read directly, which takes milliseconds regardless of page
+        count. Ghostscript is only used for files the structure reader cannot handle.
+        """
         try:
-            # The command is constructed from trusted sources (validated ghostscript executable)
-            result = run_process(cmd, timeout=30, shell=False)
-
-            info = {"pages": 0, "has_images": False, "has_fonts": False}
-
-            # Parse ghostscript output for basic info
-            if result.stderr:
-                lines = result.stderr.split("\n")
-                for line in lines:
-                    if "Page" in line:
-                        info["pages"] += 1
+            structure = read_pdf_structure(pdf_path)
+        except (OSError, PDFStructureError) as e:
+            self.logger.debug("Reading PDF structure failed for %s, using ghostscript: %s", pdf_path, e)
+            return self._get_pdf_info_with_ghostscript(pdf_path)
 
-            # Try to get more detailed info with a different approach
-            info_cmd = [
-                self._gs_command,
-                "-sDEVICE=nullpage",
-                "-dNOPAUSE",
-                "-dBATCH",
-                "-dQUIET",
-                "-c",
-                "currentpagedevice /PageCount get ==",
-                str(pdf_path),
-            ]
-
-            try:
-                info_result = run_process(info_cmd, timeout=15, shell=False)
-                stdout_text = info_result.stdout.strip() if info_result.stdout else ""
-                if info_result.returncode == 0 and stdout_text.isdigit():
-                    info["pages"] = int(stdout_text)
-            except (subprocess.TimeoutExpired, ValueError):
-                pass
+        return {
+            "pages": structure.pages,
+            "has_images": structure.image_count > 0,
+            "has_fonts": structure.has_fonts,
+            "image_count": structure.image_count,
+        }
 
-            return info
+    def _get_pdf_info_with_ghostscript(self, pdf_path: Path) -> dict[str, Any]:
+        """Get the PDF page count with a single ghostscript run that opens the document without rendering it."""
+        if not self._available_tools.get("ghostscript", False):
+            return {}
 
-        except subprocess.TimeoutExpired:
+        # PostScript string literal: escape backslashes and parentheses
+        ps_path = str(pdf_path).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        cmd = [
+            self._gs_command,
+            "-q",
+            "-dNODISPLAY",
+            f"--permit-file-read={pdf_path}",
+            "-c",
+            f"({ps_path}) (r) file runpdfbegin pdfpagecount = quit",
+        ]
+
+        # The command is constructed from trusted sources (validated ghostscript executable)
+        result = run_process(cmd, timeout=30, shell=False)
+        if result.timed_out:
             return {}
 
+        info = {"pages": 0, "has_images": False, "has_fonts": False}
+        stdout_text = result.stdout.strip() if result.stdout else ""
+        if result.returncode == 0 and stdout_text.isdigit():
+            info["pages"] = int(stdout_text)
+        return info
+
     def get_optimization_info(self) -> dict[str, Any]:
         """Get information about available PDF optimization methods."""
         return {
@@ -1,9 +1,17 @@
 import subprocess
-from collections.abc import Mapping, Sequence
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass
 
+from .telemetry import tool_run
+
 Command = str | Sequence[str]
 
+# Number of trailing stderr lines kept by run_streaming_process for error reporting
+STDERR_TAIL_LINES = 200
+
 
 @dataclass
 class ProcessResult:
@@ -12,16 +20,16 @@ class ProcessResult:
     Attributes:
         success: True if the process returned exit code 0.
         returncode: Process exit code (or -1 on failure before start).
-        stdout: Captured standard output (empty string if not captured).
-        stderr: Captured standard error (empty string if not captured).
+        stdout: Captured standard output (empty string if not captured, bytes when text=False).
+        stderr: Captured standard error (empty string if not captured, bytes when text=False).
         timed_out: Whether the process timed out.
         error: String description of the error if an exception occurred.
     """
 
     success: bool
     returncode: int
-    stdout: str
-    stderr: str
+    stdout: str | bytes
+    stderr: str | bytes
     timed_out: bool = False
     error: str | None = None
 
@@ -36,11 +44,14 @@ def run_process(
     cwd: str | None = None,
     env: Mapping[str, str] | None = None,
     check: bool = False,
+    input_data: str | bytes | None = None,
 ) -> ProcessResult:
     """Run a subprocess with unified handling and return a ProcessResult.
 
     This function centralizes subprocess execution for file_optimization engines, ensuring
-    consistent timeouts, output capture, and error handling across the codebase.
+    consistent timeouts, output capture, and error handling across the codebase. ``input_data`` is
+    written to the process's stdin, which lets engines pipe in-memory buffers through tools that
+    read stdin and write stdout.
     """
     try:
         kwargs = {
@@ -55,8 +66,11 @@ def run_process(
             kwargs["cwd"] = cwd
         if env is not None:
             kwargs["env"] = env
+        if input_data is not None:
+            kwargs["input"] = input_data
 
-        result = subprocess.run(cmd, **kwargs)  # noqa: S603
+        with tool_run():
+            result = subprocess.run(cmd, **kwargs)  # noqa: S603
         pr = ProcessResult(
             success=result.returncode == 0,
             returncode=result.returncode,
@@ -88,3 +102,87 @@ def run_process(
             timed_out=False,
             error=str(e),
         )
+
+
+def run_streaming_process(
+    cmd: Sequence[str],
+    *,
+    on_line: Callable[[str], None] | None = None,
+    stall_timeout: float | None = None,
+    cwd: str | None = None,
+    env: Mapping[str, str] | None = None,
+) -> ProcessResult:
+    """Run a subprocess, streaming stdout line by line, and return a ProcessResult.
+
+    Instead of a fixed overall timeout, a watchdog kills the process when it produces no output on
+    stdout or stderr for ``stall_timeout`` seconds, so long-running but healthy jobs are never cut off.
+    Only the last STDERR_TAIL_LINES lines of stderr are kept; stdout lines are passed to ``on_line``
+    and not retained.
+    """
+    with tool_run():
+        return _run_streaming_process(cmd, on_line=on_line, stall_timeout=stall_timeout, cwd=cwd, env=env)
+
+
+def _run_streaming_process(
+    cmd: Sequence[str],
+    *,
+    on_line: Callable[[str], None] | None,
+    stall_timeout: float | None,
+    cwd: str | None,
+    env: Mapping[str, str] | None,
+) -> ProcessResult:
+    try:
+        process = subprocess.Popen(  # noqa: S603
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            cwd=cwd,
+            env=env,
+        )
+    except (FileNotFoundError, PermissionError) as e:
+        return ProcessResult(success=False, returncode=-1, stdout="", stderr=str(e), timed_out=False, error=str(e))
+
+    last_activity = [time.monotonic()]
+    stalled = threading.Event()
+    finished = threading.Event()
+    stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+
+    def _drain_stderr():
+        for line in process.stderr:
+            last_activity[0] = time.monotonic()
+            stderr_tail.append(line)
+
+    def _watchdog():
+        while not finished.wait(min(1.0, stall_timeout)):
+            if time.monotonic() - last_activity[0] > stall_timeout:
+                stalled.set()
+                process.kill()
+                return
+
+    stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+    stderr_thread.start()
+    if stall_timeout is not None:
+        threading.Thread(target=_watchdog, daemon=True).start()
+
+    try:
+        for line in process.stdout:
+            last_activity[0] = time.monotonic()
+            if on_line:
+                on_line(line.rstrip("\n"))
+        returncode = process.wait()
+    finally:
+        finished.set()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr_thread.join(timeout=5)
+
+    stderr_text = "".join(stderr_tail)
+    if stalled.is_set():
+        error = f"Process produced no output for {stall_timeout} seconds"
+        return ProcessResult(
+            success=False, returncode=returncode, stdout="", stderr=stderr_text, timed_out=True, error=error
+        )
+    return ProcessResult(success=returncode == 0, returncode=returncode, stdout="", stderr=stderr_text)
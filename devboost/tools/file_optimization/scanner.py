@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .detector import FileTypeDetector
+from .downloader import is_http_url
+from .models import FileInfo
+
+logger = logging.getLogger(__name__)
+
+# Paths sniffed per worker task and delivered per files_scanned signal
+SCAN_CHUNK_SIZE = 256
+
+URLFetcher = Callable[[list[str]], list[FileInfo]]
+
+
+def is_link(path: str | Path) -> bool:
+    """Check if a dropped entry is an http(s) or data URL to fetch rather than a local path."""
+    return isinstance(path, str) and (path.startswith("data:") or is_http_url(path))
+
+
+def scan_paths(paths: list[str | Path]) -> list[FileInfo]:
+    """
+    Stat and sniff the header of each path, skipping paths that are not regular files.
+
+    Args:
+        paths: File paths to scan
+
+    Returns:
+        FileInfo for every existing file, in input order
+    """
+    infos = []
+    for raw_path in paths:
+        try:
+            path = Path(raw_path).resolve()
+            if path.is_file():
+                infos.append(FileTypeDetector.detect_file_type(path))
+            else:
+                logger.warning("File not found: %s", raw_path)
+        except OSError as e:
+            logger.warning("Cannot scan %s: %s", raw_path, e)
+    return infos
+
+
+class FileScanner(QObject):
+    """
+    Scans dropped files on a background thread pool.
+
+    Paths are split into chunks that are stat'ed and sniffed concurrently. Each finished chunk is
+    delivered with files_scanned, so large drops appear in the file list progressively instead of
+    blocking the UI thread. Dropped http(s) and data URLs are fetched as one more task when a URL
+    fetcher is set. Starting a new scan or calling cancel() drops results of earlier scans.
+    """
+
+    files_scanned = pyqtSignal(int, list)  # scan id, list of FileInfo for one chunk
+    scan_finished = pyqtSignal(int, int)  # scan id, number of files found
+
+    def __init__(
+        self, max_workers: int | None = None, chunk_size: int = SCAN_CHUNK_SIZE, url_fetcher: URLFetcher | None = None
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            max_workers: Worker threads (defaults to a few per core, as scanning is I/O bound)
+            chunk_size: Number of paths per worker task and per files_scanned signal
+            url_fetcher: Optional function that fetches http(s) and data URLs and returns their
+                FileInfo (without one, URLs are scanned like paths and reported as missing)
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.chunk_size = chunk_size
+        self.url_fetcher = url_fetcher
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="file-scan"
+        )
+        self._lock = threading.Lock()
+        self._scan_id = 0
+        self._futures: list[Future] = []
+
+    def scan(self, paths: list[str | Path]) -> int:
+        """
+        Start scanning paths in the background.
+
+        Args:
+            paths: File paths to scan, and http(s) or data URLs to fetch when a URL fetcher is set
+
+        Returns:
+            Id of the scan, passed with its files_scanned and scan_finished signals
+        """
+        urls = []
+        if self.url_fetcher:
+            urls = [path for path in paths if is_link(path)]
+            paths = [path for path in paths if path not in urls]
+
+        with self._lock:
+            self._scan_id += 1
+            scan_id = self._scan_id
+            chunks = [(paths[i : i + self.chunk_size], None) for i in range(0, len(paths), self.chunk_size)]
+            if urls:
+                chunks.append((urls, self.url_fetcher))
+            state = {"remaining": len(chunks), "found": 0}
+            self._futures = [
+                self._executor.submit(self._scan_chunk, scan_id, chunk, state, fetch) for chunk, fetch in chunks
+            ]
+
+        self.logger.info("Scanning %d paths in %d chunks", len(paths) + len(urls), len(chunks))
+        if not chunks:
+            self.scan_finished.emit(scan_id, 0)
+        return scan_id
+
+    def _scan_chunk(
+        self, scan_id: int, paths: list[str | Path], state: dict[str, int], fetch: URLFetcher | None = None
+    ):
+        """Scan (or fetch) one chunk on a worker thread and report it unless the scan was superseded."""
+        if self._is_current(scan_id):
+            infos = fetch(paths) if fetch else scan_paths(paths)
+            if self._is_current(scan_id):
+                self.files_scanned.emit(scan_id, infos)
+        else:
+            infos = []
+
+        with self._lock:
+            state["found"] += len(infos)
+            state["remaining"] -= 1
+            finished = state["remaining"] == 0 and scan_id == self._scan_id
+        if finished:
+            self.scan_finished.emit(scan_id, state["found"])
+
+    def _is_current(self, scan_id: int) -> bool:
+        with self._lock:
+            return scan_id == self._scan_id
+
+    def cancel(self):
+        """Drop the results of the running scan."""
+        with self._lock:
+            self._scan_id += 1
+            for future in self._futures:
+                future.cancel()
+            self._futures = []
+
+    def wait_for_scan(self, timeout: float | None = None):
+        """Block until the running scan finishes (used by tests)."""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker threads."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
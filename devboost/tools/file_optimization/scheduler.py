@@ -0,0 +1,137 @@
+import heapq
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EngineBudget:
+    """Concurrency limit and cost weight for one engine type."""
+
+    max_concurrent: int
+    cost: float = 1.0
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """A file waiting to be optimized, ordered by size for shortest-job-first scheduling."""
+
+    size: int
+    index: int
+    path: Path = field(compare=False)
+    file_type: str = field(compare=False)
+
+
+def default_engine_budgets(capacity: int) -> dict[str, EngineBudget]:
+    """
+    Build default engine budgets for a worker capacity.
+
+    Videos are encoded by multi-threaded ffmpeg processes, so a single encode is weighted as half
+    of the capacity and only one runs at a time on small machines. Images and PDFs are cheap and
+    may use every slot.
+
+    Args:
+        capacity: Total number of cost units (worker slots) available
+
+    Returns:
+        Dictionary mapping file type to its EngineBudget
+    """
+    capacity = max(1, capacity)
+    return {
+        "image": EngineBudget(max_concurrent=capacity, cost=1.0),
+        "pdf": EngineBudget(max_concurrent=max(1, capacity // 2), cost=1.0),
+        "video": EngineBudget(max_concurrent=max(1, capacity // 8), cost=max(1.0, capacity / 2)),
+        "unknown": EngineBudget(max_concurrent=capacity, cost=1.0),
+    }
+
+
+class BatchScheduler:
+    """
+    Resource-aware scheduler for batch optimization.
+
+    Jobs are released shortest-first (by file size) while respecting a per-engine concurrency
+    limit and a shared cost budget, so small files finish early and expensive video encodes
+    cannot starve cheap image jobs.
+    """
+
+    def __init__(self, budgets: dict[str, EngineBudget], capacity: float):
+        """
+        Initialize the scheduler.
+
+        Args:
+            budgets: Engine budgets keyed by file type
+            capacity: Total cost units that may run at once
+        """
+        self.budgets = budgets
+        self.capacity = max(1.0, capacity)
+        # One min-heap per engine type so releasing a job only compares the heads of each queue
+        self._pending: dict[str, list[ScheduledJob]] = {}
+        self._job_counter = 0
+        self._running_counts: dict[str, int] = {}
+        self._running_cost = 0.0
+
+    def add_job(self, path: Path, file_type: str, size: int) -> ScheduledJob:
+        """Queue a file for scheduling."""
+        job = ScheduledJob(size=size, index=self._job_counter, path=path, file_type=file_type)
+        self._job_counter += 1
+        heapq.heappush(self._pending.setdefault(file_type, []), job)
+        return job
+
+    def has_pending(self) -> bool:
+        """Check if any jobs are still waiting to be released."""
+        return any(self._pending.values())
+
+    def pending_count(self) -> int:
+        """Get the number of jobs waiting to be released."""
+        return sum(len(queue) for queue in self._pending.values())
+
+    def running_count(self) -> int:
+        """Get the number of released jobs that have not finished."""
+        return sum(self._running_counts.values())
+
+    def _budget_for(self, file_type: str) -> EngineBudget:
+        return self.budgets.get(file_type) or self.budgets.get("unknown") or EngineBudget(1)
+
+    def _job_cost(self, job: ScheduledJob) -> float:
+        # Clamp to capacity so an expensive job can always run once the pool is idle
+        return min(self._budget_for(job.file_type).cost, self.capacity)
+
+    def _can_start(self, job: ScheduledJob) -> bool:
+        budget = self._budget_for(job.file_type)
+        if self._running_counts.get(job.file_type, 0) >= budget.max_concurrent:
+            return False
+        return self._running_cost + self._job_cost(job) <= self.capacity
+
+    def take_ready(self) -> list[ScheduledJob]:
+        """
+        Release every pending job that fits in the remaining budget.
+
+        Returns:
+            Jobs to start now, smallest first
+        """
+        ready = []
+        while True:
+            startable = [queue[0] for queue in self._pending.values() if queue and self._can_start(queue[0])]
+            if not startable:
+                break
+            job = heapq.heappop(self._pending[min(startable).file_type])
+            self._running_counts[job.file_type] = self._running_counts.get(job.file_type, 0) + 1
+            self._running_cost += self._job_cost(job)
+            ready.append(job)
+
+        if ready:
+            logger.debug(
+                "Scheduler released %d jobs (running cost %.1f/%.1f, %d pending)",
+                len(ready),
+                self._running_cost,
+                self.capacity,
+                self.pending_count(),
+            )
+        return ready
+
+    def release(self, job: ScheduledJob) -> None:
+        """Mark a released job as finished and return its budget."""
+        self._running_counts[job.file_type] = max(0, self._running_counts.get(job.file_type, 0) - 1)
+        self._running_cost = max(0.0, self._running_cost - self._job_cost(job))
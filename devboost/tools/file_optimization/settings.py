@@ -6,6 +6,12 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+# Stages that can be chained by the image pipeline mode
+IMAGE_PIPELINE_STAGES = ("resize", "pil", "pngquant", "oxipng", "jpegoptim", "gifsicle")
+
+# x264-style encoder speed presets, fastest (largest output) to slowest (smallest output)
+VIDEO_ENCODER_PRESETS = ("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow")
+
 
 class QualityPreset(Enum):
     """Quality presets for optimization."""
@@ -25,6 +31,9 @@ class OptimizationSettings:
     quality_preset: QualityPreset = QualityPreset.MEDIUM
     create_backup: bool = True
     preserve_metadata: bool = False
+    use_cache: bool = True  # Reuse cached outputs for identical input bytes and settings
+    skip_if_no_gain: bool = True  # Skip files predicted not to shrink and discard outputs that are not smaller
+    min_gain_percent: float = 2.0  # Predicted gain below which a file is skipped without a full encode
 
     # Image settings
     image_quality: int | None = None  # Custom quality (0-100)
@@ -32,15 +41,22 @@ class OptimizationSettings:
     max_height: int | None = None
     output_format: str | None = None  # Force specific output format
     progressive_jpeg: bool = True
+    image_pipeline: bool = False  # Chain optimization stages in memory and keep the smallest output
+    image_pipeline_stages: list[str] | None = None  # Stage order from IMAGE_PIPELINE_STAGES (None: per-format default)
 
     # Video settings
     video_quality: int | None = None  # Custom quality (0-51 for x264)
     video_bitrate: str | None = None  # e.g., "1M", "500k"
     video_fps: int | None = None
+    video_encoder_preset: str = "medium"  # Speed/size tradeoff, one of VIDEO_ENCODER_PRESETS
+    video_target_size_kb: int | None = None  # Two-pass encode to this output size instead of CRF
+    video_threads: int | None = None  # Encoder threads (None lets ffmpeg decide)
+    video_segmented: bool = False  # Split long videos at keyframes and encode the chunks in parallel
 
     # PDF settings
     pdf_quality: int | None = None  # Custom quality (0-100)
     pdf_dpi: int | None = None  # DPI for images in PDF
+    pdf_parallel: bool = False  # Optimize page ranges in parallel ghostscript processes and merge them
 
     def to_dict(self) -> dict[str, Any]:
         """Convert settings to dictionary."""
@@ -355,10 +371,29 @@ class SettingsManager:
         if settings.max_height is not None and settings.max_height <= 0:
             errors.append("Maximum height must be positive")
 
+        # Validate gain threshold
+        if not (0 <= settings.min_gain_percent < 100):
+            errors.append("Minimum gain must be between 0 and 100 percent")
+
+        # Validate image pipeline stages
+        unknown_stages = [stage for stage in settings.image_pipeline_stages or [] if stage not in IMAGE_PIPELINE_STAGES]
+        if unknown_stages:
+            errors.append(f"Image pipeline stages must be among: {', '.join(IMAGE_PIPELINE_STAGES)}")
+
         # Validate video FPS
         if settings.video_fps is not None and settings.video_fps <= 0:
             errors.append("Video FPS must be positive")
 
+        # Validate video encoder settings
+        if settings.video_encoder_preset not in VIDEO_ENCODER_PRESETS:
+            errors.append(f"Video encoder preset must be one of: {', '.join(VIDEO_ENCODER_PRESETS)}")
+
+        if settings.video_target_size_kb is not None and settings.video_target_size_kb <= 0:
+            errors.append("Video target size must be positive")
+
+        if settings.video_threads is not None and settings.video_threads < 0:
+            errors.append("Video threads must not be negative")
+
         # Validate PDF DPI
         if settings.pdf_dpi is not None and not (72 <= settings.pdf_dpi <= 600):
             errors.append("PDF DPI must be between 72 and 600")
@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_local = threading.local()
+
+
+@dataclass
+class FileTelemetry:
+    """Per-stage timings collected while one file is optimized."""
+
+    stages: dict[str, float] = field(default_factory=dict)  # Stage name -> wall seconds
+    tool_cpu_time: float = 0.0  # CPU seconds (user + system) of external tools
+
+    def add_stage(self, name: str, seconds: float):
+        """Add wall time to a stage, accumulating repeated stages."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, data: dict[str, Any]):
+        """Merge timings recorded elsewhere, e.g. in a process pool worker (see to_dict)."""
+        for name, seconds in data.get("stages", {}).items():
+            self.add_stage(name, seconds)
+        self.tool_cpu_time += data.get("tool_cpu_time", 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a picklable dictionary for returning from worker processes."""
+        return {"stages": dict(self.stages), "tool_cpu_time": self.tool_cpu_time}
+
+
+def child_cpu_time() -> float:
+    """Get the CPU seconds used by reaped child processes of this process, or 0 where unsupported."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def peak_rss_bytes() -> int | None:
+    """
+    Get the peak resident set size of this process in bytes, or None when unavailable.
+
+    This is a high-water mark for the whole process that is never reset, so it only describes a
+    single file when the file is processed in a process of its own (see the benchmark suite).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def child_peak_rss_bytes() -> int | None:
+    """Get the largest peak resident set size of any reaped child process in bytes, or None when unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_telemetry() -> FileTelemetry | None:
+    """Get the telemetry being collected on this thread, if any."""
+    return getattr(_local, "telemetry", None)
+
+
+@contextmanager
+def collect_telemetry() -> Iterator[FileTelemetry]:
+    """
+    Collect stage timings recorded on this thread until the block exits.
+
+    Yields:
+        FileTelemetry receiving every stage() and tool_run() on this thread
+    """
+    previous = current_telemetry()
+    telemetry = FileTelemetry()
+    _local.telemetry = telemetry
+    try:
+        yield telemetry
+    finally:
+        _local.telemetry = previous
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block as a named stage of the file being optimized on this thread.
+
+    Stages may nest (e.g. a tool run inside "optimize"), so stage times are inclusive. Nothing is
+    recorded when no collection is active.
+
+    Args:
+        name: Stage name such as "probe", "decode", "encode" or "write"
+    """
+    telemetry = current_telemetry()
+    if telemetry is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        telemetry.add_stage(name, time.perf_counter() - start)
+
+
+@contextmanager
+def tool_run() -> Iterator[None]:
+    """
+    Time an external tool run as the "tool" stage and record its CPU time.
+
+    CPU time is the growth of RUSAGE_CHILDREN across the block. It is exact when tools run one at
+    a time in a process (serial runs and process pool workers); when threads run tools concurrently
+    it also includes other children reaped during the block. Tools run on helper threads record
+    nothing themselves, so wrap the whole thread pool block in one tool_run() on the calling thread.
+    """
+    telemetry = current_telemetry()
+    if telemetry is None:
+        yield
+        return
+    start = time.perf_counter()
+    start_cpu = child_cpu_time()
+    try:
+        yield
+    finally:
+        telemetry.add_stage("tool", time.perf_counter() - start)
+        telemetry.tool_cpu_time += child_cpu_time() - start_cpu
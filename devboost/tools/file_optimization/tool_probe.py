@@ -0,0 +1,175 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import appdirs
+
+logger = logging.getLogger(__name__)
+
+ProbeFunction = Callable[[str], Any]
+
+
+def resolve_binary(binary: str) -> str | None:
+    """Resolve a command name or path to an absolute executable path, or None if it cannot be found."""
+    if os.path.sep in binary:
+        path = Path(binary)
+        if path.is_file() and os.access(str(path), os.X_OK):
+            return str(path.resolve())
+        return None
+    resolved = shutil.which(binary)
+    return str(Path(resolved).resolve()) if resolved else None
+
+
+class ToolProbeCache:
+    """
+    Persistent cache of external tool availability probes.
+
+    Probing a tool means spawning it (``--version`` and similar), which makes engine construction
+    slow. Results are stored on disk keyed by probe name and resolved binary path, and are only
+    reused while the binary's mtime and size are unchanged, so upgrading or replacing a tool
+    invalidates its entry. Tools that cannot be found are cached against the current PATH. Cache
+    hits are re-probed once per process on a background thread so a tool that broke without
+    changing on disk is corrected on the next start.
+    """
+
+    def __init__(self, cache_file: Path | None = None):
+        """
+        Initialize the probe cache.
+
+        Args:
+            cache_file: Optional custom cache file (defaults to the DevBoost app data dir)
+        """
+        self.cache_file = cache_file or Path(appdirs.user_data_dir("DevBoost", "DeskRiders")) / "tool_probes.json"
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._refreshed: set[str] = set()
+        self._refresh_queue: list[tuple[str, str, ProbeFunction]] = []
+        self._refresh_thread: threading.Thread | None = None
+
+    def probe(self, name: str, binary: str, probe_fn: ProbeFunction) -> Any:
+        """
+        Get a probe result, running the probe only when the binary changed since it was cached.
+
+        Args:
+            name: Probe name (the same binary may be probed in different ways)
+            binary: Command name or path of the tool
+            probe_fn: Function that probes the tool; receives the resolved path (or the original
+                command if it could not be resolved) and returns a JSON-serializable result
+
+        Returns:
+            The probe result
+        """
+        # Missing tools are keyed by name and invalidated by PATH changes; installing one makes it
+        # resolvable, which switches to a path-keyed entry and probes it immediately
+        target = resolve_binary(binary) or binary
+        key = f"{name}|{target}"
+        fingerprint = self._fingerprint(target)
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is not None and entry.get("fingerprint") == fingerprint:
+            self._schedule_refresh(key, target, probe_fn)
+            return entry.get("result")
+
+        result = probe_fn(target)
+        self._store(key, fingerprint, result)
+        return result
+
+    @staticmethod
+    def _fingerprint(target: str) -> list[Any] | None:
+        """Identify the binary version on disk (mtime and size), or the PATH for unresolved commands."""
+        if not Path(target).is_absolute():
+            return ["PATH", os.environ.get("PATH", "")]
+        try:
+            stat = Path(target).stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Load cache entries from disk once (caller holds the lock)."""
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Ignoring unreadable tool probe cache %s: %s", self.cache_file, e)
+                self._entries = {}
+        return self._entries
+
+    def _store(self, key: str, fingerprint: list[Any] | None, result: Any):
+        with self._lock:
+            entries = self._load()
+            if entries.get(key) == {"fingerprint": fingerprint, "result": result}:
+                return
+            entries[key] = {"fingerprint": fingerprint, "result": result}
+            self._save(entries)
+
+    def _save(self, entries: dict[str, dict[str, Any]]):
+        """Write entries atomically (caller holds the lock)."""
+        tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+            tmp_file.replace(self.cache_file)
+        except OSError as e:
+            logger.warning("Failed to write tool probe cache %s: %s", self.cache_file, e)
+            tmp_file.unlink(missing_ok=True)
+
+    def _schedule_refresh(self, key: str, target: str, probe_fn: ProbeFunction):
+        """Queue a cache hit to be re-probed in the background, once per process."""
+        with self._lock:
+            if key in self._refreshed:
+                return
+            self._refreshed.add(key)
+            self._refresh_queue.append((key, target, probe_fn))
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(
+                    target=self._run_refresh, name="tool-probe-refresh", daemon=True
+                )
+                self._refresh_thread.start()
+
+    def _run_refresh(self):
+        while True:
+            with self._lock:
+                if not self._refresh_queue:
+                    return
+                key, target, probe_fn = self._refresh_queue.pop(0)
+            try:
+                result = probe_fn(target)
+            except Exception:
+                logger.exception("Background tool probe failed for %s", key)
+                continue
+            self._store(key, self._fingerprint(target), result)
+            logger.debug("Refreshed tool probe %s: %s", key, result)
+
+    def wait_for_refresh(self, timeout: float | None = None):
+        """Block until background refreshes finish (used by tests and before shutdown)."""
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def clear(self):
+        """Remove every cached probe result."""
+        with self._lock:
+            self._entries = {}
+            self._refreshed.clear()
+            self.cache_file.unlink(missing_ok=True)
+
+
+_default_probe_cache: ToolProbeCache | None = None
+_default_probe_cache_lock = threading.Lock()
+
+
+def get_default_probe_cache() -> ToolProbeCache:
+    """Get the probe cache shared by every optimization engine in this process."""
+    global _default_probe_cache
+    with _default_probe_cache_lock:
+        if _default_probe_cache is None:
+            _default_probe_cache = ToolProbeCache()
+        return _default_probe_cache
@@ -1,4 +1,5 @@
 from .file_drop_area import FileDropArea
+from .file_list import FileListDelegate, FileListModel
 from .results_dialog import OptimizationResultsDialog
 
-__all__ = ["FileDropArea", "OptimizationResultsDialog"]
+__all__ = ["FileDropArea", "FileListDelegate", "FileListModel", "OptimizationResultsDialog"]
@@ -77,16 +77,19 @@ class FileDropArea(QWidget):
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Handle drag enter events."""
         if event.mimeData().hasUrls():
-            # Check if any of the URLs are files we can handle
+            # Check if any of the URLs are files we can handle or links we can download
             urls = event.mimeData().urls()
             for url in urls:
                 if url.isLocalFile():
                     file_path = Path(url.toLocalFile())
-                    if file_path.is_file() and self._is_supported_file(file_path):
-                        event.acceptProposedAction()
-                        self.setProperty("dragActive", True)
-                        self.style().polish(self)
-                        return
+                    accepted = file_path.is_file() and self._is_supported_file(file_path)
+                else:
+                    accepted = url.scheme() in ("http", "https", "data")
+                if accepted:
+                    event.acceptProposedAction()
+                    self.setProperty("dragActive", True)
+                    self.style().polish(self)
+                    return
         event.ignore()
 
     def dragLeaveEvent(self, event):
@@ -107,6 +110,9 @@ class FileDropArea(QWidget):
                     file_path = Path(url.toLocalFile())
                     if file_path.is_file() and self._is_supported_file(file_path):
                         file_paths.append(str(file_path))
+                elif url.scheme() in ("http", "https", "data"):
+                    # Links and inline images dragged from a browser are fetched and sniffed by the receiver
+                    file_paths.append(url.toString())
 
             if file_paths:
                 self.handle_files_dropped(file_paths)
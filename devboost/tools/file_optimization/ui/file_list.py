@@ -0,0 +1,161 @@
+from pathlib import Path
+from typing import Any
+
+from PyQt6.QtCore import QAbstractListModel, QEvent, QModelIndex, QObject, QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QMouseEvent, QPainter, QPen
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from devboost.styles import COLORS
+from devboost.tools.file_optimization.models import FileInfo
+
+# Height of one file row in pixels
+FILE_ROW_HEIGHT = 50
+
+# Icons shown before the file name, by file type
+_TYPE_ICONS = {"image": "🖼️", "video": "🎬", "pdf": "📄", "unknown": "❓"}
+
+
+def format_file_size(size: int) -> str:
+    """Format a file size the way the file list shows it."""
+    size_mb = size / (1024 * 1024) if size > 0 else 0
+    return f"{size_mb:.1f} MB" if size_mb >= 0.1 else f"{size} bytes"
+
+
+class FileListModel(QAbstractListModel):
+    """
+    List model of the files queued for optimization.
+
+    The model wraps the widget's file list instead of copying it, and rows are only painted when
+    visible, so adding thousands of dropped files costs one insert notification per chunk rather
+    than a widget tree per file.
+    """
+
+    def __init__(self, files: list[FileInfo], parent: QObject | None = None):
+        super().__init__(parent)
+        self.files = files
+
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        # Flat list: valid parents (items) have no children
+        return 0 if parent is not None and parent.isValid() else len(self.files)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        file_info = self.files[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{_TYPE_ICONS.get(file_info.file_type, '📄')} {file_info.path.name}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            verified = "\nFile type verified by content analysis" if file_info.magic_detected else ""
+            return f"{file_info.path}{verified}"
+        if role == Qt.ItemDataRole.UserRole:
+            return file_info
+        return None
+
+    def add_files(self, file_infos: list[FileInfo]):
+        """Append files as one row insertion."""
+        if not file_infos:
+            return
+        first = len(self.files)
+        self.beginInsertRows(QModelIndex(), first, first + len(file_infos) - 1)
+        self.files.extend(file_infos)
+        self.endInsertRows()
+
+    def remove_file(self, file_path: Path) -> bool:
+        """
+        Remove the first row showing a file.
+
+        Args:
+            file_path: Path of the file to remove
+
+        Returns:
+            True if a row was removed
+        """
+        for row, file_info in enumerate(self.files):
+            if file_info.path == file_path:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.files[row]
+                self.endRemoveRows()
+                return True
+        return False
+
+    def clear(self):
+        """Remove every row."""
+        self.beginResetModel()
+        self.files.clear()
+        self.endResetModel()
+
+
+class FileListDelegate(QStyledItemDelegate):
+    """
+    Paints file rows (name, size, verification mark and a remove action) without per-row widgets.
+
+    Clicking the remove action emits remove_requested with the row's file path.
+    """
+
+    remove_requested = pyqtSignal(Path)
+
+    REMOVE_TEXT = "🗑️ Remove"
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), FILE_ROW_HEIGHT)
+
+    def _row_rect(self, option: QStyleOptionViewItem) -> QRect:
+        # Rows are separated by a small gap, like the spacing of the former widget list
+        return option.rect.adjusted(0, 2, -1, -3)
+
+    def _remove_rect(self, option: QStyleOptionViewItem) -> QRect:
+        row_rect = self._row_rect(option)
+        width = option.fontMetrics.horizontalAdvance(self.REMOVE_TEXT) + 20
+        return QRect(row_rect.right() - width - 5, row_rect.top() + 8, width, row_rect.height() - 16)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        file_info: FileInfo = index.data(Qt.ItemDataRole.UserRole)
+        if file_info is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        row_rect = self._row_rect(option)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(QPen(QColor(COLORS["border_secondary"])))
+        painter.setBrush(QColor(COLORS["btn_hover"] if hovered else COLORS["bg_tertiary"]))
+        painter.drawRoundedRect(row_rect, 4, 4)
+
+        text_rect = row_rect.adjusted(10, 0, 0, 0)
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        if file_info.magic_detected:
+            painter.setPen(QColor(COLORS["success"]))
+            painter.drawText(text_rect, align, "✓")
+            text_rect.setLeft(text_rect.left() + option.fontMetrics.horizontalAdvance("✓") + 8)
+
+        name = index.data(Qt.ItemDataRole.DisplayRole)
+        remove_rect = self._remove_rect(option)
+        name_width = max(0, remove_rect.left() - text_rect.left() - 80)
+        name = option.fontMetrics.elidedText(name, Qt.TextElideMode.ElideMiddle, name_width)
+        painter.setPen(QColor(COLORS["text_primary"]))
+        painter.drawText(text_rect, align, name)
+
+        text_rect.setLeft(text_rect.left() + option.fontMetrics.horizontalAdvance(name) + 8)
+        painter.setPen(QColor(COLORS["text_muted"]))
+        painter.drawText(text_rect, align, f"({format_file_size(file_info.size)})")
+
+        painter.setPen(QPen(QColor(COLORS["border_primary"])))
+        painter.setBrush(QColor(COLORS["btn_bg"]))
+        painter.drawRoundedRect(remove_rect, 4, 4)
+        painter.setPen(QColor(COLORS["text_primary"]))
+        painter.drawText(remove_rect, Qt.AlignmentFlag.AlignCenter, self.REMOVE_TEXT)
+
+        painter.restore()
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and isinstance(event, QMouseEvent)
+            and event.button() == Qt.MouseButton.LeftButton
+            and self._remove_rect(option).contains(event.position().toPoint())
+        ):
+            file_info: FileInfo = index.data(Qt.ItemDataRole.UserRole)
+            if file_info is not None:
+                self.remove_requested.emit(file_info.path)
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -16,19 +16,28 @@ from PyQt6.QtWidgets import (
     QStyle,
     QTableWidget,
     QTableWidgetItem,
+    QTabWidget,
     QVBoxLayout,
 )
 
+from devboost.tools.file_optimization.history import OptimizationHistory
 from devboost.tools.file_optimization.models import BatchOperationResult, BatchProgress
 
 
 class OptimizationResultsDialog(QDialog):
     """Dialog to display detailed optimization results."""
 
-    def __init__(self, results: list[BatchOperationResult], batch_progress: BatchProgress, parent=None):
+    def __init__(
+        self,
+        results: list[BatchOperationResult],
+        batch_progress: BatchProgress,
+        parent=None,
+        history: OptimizationHistory | None = None,
+    ):
         super().__init__(parent)
         self.results = results
         self.batch_progress = batch_progress
+        self.history = history
         self.setWindowTitle("Optimization Results")
         self.setModal(True)
         self.setMinimumSize(800, 600)
@@ -43,9 +52,15 @@ class OptimizationResultsDialog(QDialog):
         summary_frame = self._create_summary_section()
         layout.addWidget(summary_frame)
 
-        # Results table
+        # Results table, plus throughput across past runs when a history is available
         results_table = self._create_results_table()
-        layout.addWidget(results_table)
+        if self.history is not None:
+            tabs = QTabWidget()
+            tabs.addTab(results_table, "Files")
+            tabs.addTab(self._create_history_table(), "Throughput History")
+            layout.addWidget(tabs)
+        else:
+            layout.addWidget(results_table)
 
         # Button section
         button_layout = self._create_button_section()
@@ -86,6 +101,7 @@ class OptimizationResultsDialog(QDialog):
             ("Total Files:", f"{len(self.results)}"),
             ("Successful:", f"{len(successful)}"),
             ("Failed:", f"{len(failed)}"),
+            ("Skipped:", f"{sum(1 for r in self.results if r.skipped)}"),
             ("Success Rate:", f"{len(successful) / len(self.results) * 100:.1f}%" if self.results else "0%"),
             ("Total Original Size:", self.batch_progress.format_size(total_original_size)),
             ("Total Optimized Size:", self.batch_progress.format_size(total_optimized_size)),
@@ -144,7 +160,11 @@ class OptimizationResultsDialog(QDialog):
             # Status
             status_item = QTableWidgetItem("✅ Success" if result.success else "❌ Failed")
             status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if result.success:
+            if result.skipped:
+                status_item.setText("⏭️ Skipped")
+                status_item.setBackground(QColor("#e2e3e5"))
+                status_item.setToolTip(result.skip_reason or "No size reduction")
+            elif result.success:
                 status_item.setBackground(QColor("#d4edda"))
             else:
                 status_item.setBackground(QColor("#f8d7da"))
@@ -196,6 +216,8 @@ class OptimizationResultsDialog(QDialog):
             # Processing time
             time_item = QTableWidgetItem(self.batch_progress.format_time(result.processing_time))
             time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            if result.stage_times:
+                time_item.setToolTip(self._format_stage_times(result.stage_times, result.tool_cpu_time))
             table.setItem(row, 6, time_item)
 
         # Resize columns to content
@@ -208,6 +230,72 @@ class OptimizationResultsDialog(QDialog):
 
         return table
 
+    def _create_history_table(self) -> QTableWidget:
+        """Create the table of per-engine throughput in recent runs."""
+        report = self.history.get_throughput_report()
+
+        table = QTableWidget()
+        table.setColumnCount(8)
+        table.setHorizontalHeaderLabels([
+            "Run",
+            "Preset",
+            "Engine",
+            "Files",
+            "MB/s",
+            "Files/s",
+            "Tool CPU",
+            "Stages",
+        ])
+        table.setAlternatingRowColors(True)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.setRowCount(len(report))
+
+        for row, entry in enumerate(report):
+            started = datetime.fromtimestamp(entry.started_at).strftime("%Y-%m-%d %H:%M")
+            run_item = QTableWidgetItem(started)
+            run_item.setToolTip(f"Run {entry.run_id}")
+            table.setItem(row, 0, run_item)
+
+            preset_item = QTableWidgetItem(entry.preset)
+            preset_item.setToolTip(f"Settings fingerprint {entry.settings_fingerprint[:12]}")
+            table.setItem(row, 1, preset_item)
+
+            table.setItem(row, 2, QTableWidgetItem(entry.file_type))
+
+            notes = [f"{entry.failed_count} failed"] if entry.failed_count else []
+            if entry.skipped_count:
+                notes.append(f"{entry.skipped_count} skipped")
+            files_text = f"{entry.file_count}" + (f" ({', '.join(notes)})" if notes else "")
+            values = [
+                files_text,
+                f"{entry.mb_per_second:.2f}",
+                f"{entry.files_per_second:.2f}",
+                self.batch_progress.format_time(entry.tool_cpu_time),
+            ]
+            for offset, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
+                table.setItem(row, 3 + offset, item)
+
+            table.setItem(row, 7, QTableWidgetItem(self._format_stage_times(entry.stage_times)))
+
+        table.resizeColumnsToContents()
+        header = table.horizontalHeader()
+        header.setMinimumSectionSize(60)
+        header.setStretchLastSection(True)
+
+        return table
+
+    @staticmethod
+    def _format_stage_times(stage_times: dict[str, float], tool_cpu_time: float = 0.0) -> str:
+        """Format stage timings, slowest first."""
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in sorted(stage_times.items(), key=lambda i: -i[1])]
+        if tool_cpu_time:
+            parts.append(f"tool CPU {tool_cpu_time:.2f}s")
+        return ", ".join(parts)
+
     def _create_button_section(self) -> QHBoxLayout:
         """Create the button section."""
         layout = QHBoxLayout()
@@ -278,6 +366,8 @@ class OptimizationResultsDialog(QDialog):
                 for result in self.results:
                     f.write(f"\nFile: {result.file_path.name}\n")
                     f.write(f"  Status: {'Success' if result.success else 'Failed'}\n")
+                    if result.skipped:
+                        f.write(f"  Skipped: {result.skip_reason or 'No size reduction'}\n")
 
                     if result.success:
                         compression = (
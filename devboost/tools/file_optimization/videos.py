@@ -1,16 +1,95 @@
 import json
 import logging
+import os
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from .process_runner import run_process
+from .process_runner import run_process, run_streaming_process
+from .telemetry import tool_run
+from .tool_probe import ToolProbeCache, get_default_probe_cache
 
 if TYPE_CHECKING:
     from . import OptimizationSettings
 
+# Seconds without any ffmpeg output before an encode is considered stalled and killed
+FFMPEG_STALL_TIMEOUT = 60
+
+# AAC audio bitrate used for every encode (kbps)
+AUDIO_BITRATE_KBPS = 128
+
+# Lowest video bitrate a two-pass target size may produce (kbps)
+MIN_TWO_PASS_VIDEO_KBPS = 64
+
+# libvpx-vp9 cpu-used level for each encoder preset (higher is faster)
+VP9_CPU_USED = {
+    "ultrafast": 5,
+    "superfast": 5,
+    "veryfast": 4,
+    "faster": 3,
+    "fast": 2,
+    "medium": 1,
+    "slow": 1,
+    "slower": 0,
+    "veryslow": 0,
+}
+
+# Presets compared by VideoOptimizationEngine.benchmark_presets by default
+DEFAULT_BENCHMARK_PRESETS = ("ultrafast", "veryfast", "medium", "slow")
+
+# Shortest chunk worth encoding separately in segmented mode (seconds)
+MIN_SEGMENT_SECONDS = 30
+
+# Length of the sample encoded from the start of a video to predict the gain of a full encode
+GAIN_SAMPLE_SECONDS = 10
+
+
+def choose_segment_count(duration: float, cpu_count: int) -> int:
+    """
+    Choose how many chunks to split a video into for segmented encoding.
+
+    Args:
+        duration: Video duration in seconds
+        cpu_count: Number of available CPU cores
+
+    Returns:
+        Chunk count (1 means encode the video in a single ffmpeg process)
+    """
+    if duration <= 0:
+        return 1
+    return max(1, min(cpu_count, int(duration // MIN_SEGMENT_SECONDS)))
+
+
+def parse_ffmpeg_progress_line(line: str, duration: float) -> float | None:
+    """
+    Parse one line of ffmpeg ``-progress`` output into percent complete.
+
+    Args:
+        line: A ``key=value`` line from ffmpeg's machine-readable progress stream
+        duration: Input duration in seconds (from ffprobe)
+
+    Returns:
+        Percent complete (0-100) for progress lines, None for unrelated lines
+    """
+    key, _, value = line.strip().partition("=")
+    if key == "progress" and value == "end":
+        return 100.0
+    # out_time_us and out_time_ms both carry microseconds in ffmpeg's progress output
+    if key not in ("out_time_us", "out_time_ms") or duration <= 0:
+        return None
+    try:
+        out_time = int(value) / 1_000_000
+    except ValueError:
+        return None
+    return max(0.0, min(100.0, out_time / duration * 100))
+
 
 class VideoOptimizationEngine:
     """
@@ -20,17 +99,23 @@ class VideoOptimizationEngine:
     and format conversion, with special support for high-quality video-to-GIF conversion using gifski.
     """
 
-    def __init__(self):
-        """Initialize the video optimization engine."""
+    def __init__(self, probe_cache: ToolProbeCache | None = None):
+        """
+        Initialize the video optimization engine.
+
+        Args:
+            probe_cache: Optional tool probe cache (defaults to the shared on-disk cache)
+        """
         self.logger = logging.getLogger(__name__)
+        self._probe_cache = probe_cache or get_default_probe_cache()
         self._available_tools = self._detect_available_tools()
 
     def _detect_available_tools(self) -> dict[str, bool]:
         """Detect which video optimization tools are available on the system."""
         tools = {
-            "ffmpeg": self._check_command_available("ffmpeg"),
-            "ffprobe": self._check_command_available("ffprobe"),
-            "gifski": self._check_command_available("gifski"),
+            "ffmpeg": self._probe_cache.probe("ffmpeg", "ffmpeg", self._check_command_available),
+            "ffprobe": self._probe_cache.probe("ffprobe", "ffprobe", self._check_command_available),
+            "gifski": self._probe_cache.probe("gifski", "gifski", self._check_command_available),
         }
 
         self.logger.info("Available video tools: %s", {tool: status for tool, status in tools.items() if status})
@@ -55,7 +140,13 @@ class VideoOptimizationEngine:
 
         return formats
 
-    def optimize_video(self, input_path: Path, output_path: Path, settings: "OptimizationSettings") -> dict[str, Any]:
+    def optimize_video(
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        progress_callback: Callable[[float], None] | None = None,
+    ) -> dict[str, Any]:
         """
         Optimize a video using the best available method.
 
@@ -63,6 +154,7 @@ class VideoOptimizationEngine:
             input_path: Path to the input video
             output_path: Path for the optimized output video
             settings: Optimization settings
+            progress_callback: Optional callback receiving percent complete (0-100) while encoding
 
         Returns:
             Dictionary with optimization results including file sizes and method used
@@ -84,9 +176,13 @@ class VideoOptimizationEngine:
             if output_ext == ".gif":
                 result = self._convert_to_gif(input_path, output_path, settings)
             elif input_ext == ".mov" and output_ext == ".mp4":
-                result = self._convert_mov_to_mp4(input_path, output_path, settings)
+                result = self._convert_mov_to_mp4(
+                    input_path, output_path, settings, progress_callback=progress_callback
+                )
             else:
-                result = self._optimize_with_ffmpeg(input_path, output_path, settings)
+                result = self._encode_with_ffmpeg(
+                    input_path, output_path, settings, progress_callback=progress_callback
+                )
 
             # Calculate compression ratio
             if output_path.exists():
@@ -106,9 +202,13 @@ class VideoOptimizationEngine:
             raise RuntimeError(f"Video optimization failed: {e!s}") from e
 
     def _optimize_with_ffmpeg(
-        self, input_path: Path, output_path: Path, settings: "OptimizationSettings"
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        progress_callback: Callable[[float], None] | None = None,
     ) -> dict[str, Any]:
-        """Optimize video using ffmpeg with comprehensive settings."""
+        """Optimize video using ffmpeg with comprehensive settings, streaming progress as it encodes."""
         self.logger.debug("Using ffmpeg for video optimization")
 
         # Get video info first
@@ -124,74 +224,244 @@ class VideoOptimizationEngine:
             actual_output_path = temp_output
             self.logger.debug("Using temporary output file to avoid in-place editing: %s", temp_output)
 
-        # Build ffmpeg command
-        cmd = ["ffmpeg", "-i", str(input_path)]
-
-        # Video codec and quality settings
         output_ext = output_path.suffix.lower()
+        duration = video_info.get("duration", 0.0)
+        input_args = ["ffmpeg", "-i", str(input_path)]
+        encoder_args = self._build_encoder_args(output_ext, settings)
+        audio_args = ["-c:a", "aac", "-b:a", f"{AUDIO_BITRATE_KBPS}k"]
 
-        if output_ext in [".mp4", ".m4v"]:
-            cmd.extend(["-c:v", "libx264"])
-            # Use CRF (Constant Rate Factor) for quality
-            crf = settings.get_quality_for_type("video")
-            cmd.extend(["-crf", str(crf)])
-
-            # Add preset for encoding speed vs compression efficiency
-            cmd.extend(["-preset", "medium"])
-
-        elif output_ext == ".webm":
-            cmd.extend(["-c:v", "libvpx-vp9"])
-            # VP9 uses different quality scale
-            crf = settings.get_quality_for_type("video")
-            cmd.extend(["-crf", str(crf)])
-
-        # Audio codec
-        cmd.extend(["-c:a", "aac", "-b:a", "128k"])
-
-        # Custom bitrate if specified
-        if settings.video_bitrate and settings.video_bitrate != "Auto":
-            cmd.extend(["-b:v", settings.video_bitrate])
-
+        filter_args = []
         # Frame rate if specified
         if settings.video_fps and settings.video_fps > 0:
-            cmd.extend(["-r", str(settings.video_fps)])
+            filter_args.extend(["-r", str(settings.video_fps)])
 
         # Resolution if specified
         if settings.max_width or settings.max_height:
             scale_filter = self._build_scale_filter(video_info, settings.max_width, settings.max_height)
             if scale_filter:
-                cmd.extend(["-vf", scale_filter])
+                filter_args.extend(["-vf", scale_filter])
 
         # Output settings
-        cmd.extend(["-movflags", "+faststart"])  # Optimize for web streaming
-        cmd.extend(["-y"])  # Overwrite output file
-        cmd.append(str(actual_output_path))
+        output_args = [
+            "-movflags",
+            "+faststart",  # Optimize for web streaming
+            "-progress",
+            "pipe:1",  # Machine-readable progress on stdout
+            "-nostats",
+            "-y",  # Overwrite output file
+            str(actual_output_path),
+        ]
+
+        two_pass_kbps = self._get_two_pass_video_kbps(settings, duration)
+        if two_pass_kbps:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                rate_args = ["-b:v", f"{two_pass_kbps}k", "-passlogfile", str(Path(temp_dir) / "ffmpeg2pass")]
+                # First pass only gathers statistics, so skip audio and discard the output
+                first_pass = [*input_args, *encoder_args, *rate_args, "-pass", "1", *filter_args, "-an"]
+                first_pass.extend(["-f", "null", "-progress", "pipe:1", "-nostats", "-y", "-"])
+                self._run_ffmpeg(first_pass, duration, progress_callback, progress_span=(0.0, 50.0))
+
+                second_pass = [*input_args, *encoder_args, *rate_args, "-pass", "2", *filter_args, *audio_args]
+                second_pass.extend(output_args)
+                self._run_ffmpeg(second_pass, duration, progress_callback, progress_span=(50.0, 100.0))
+        else:
+            rate_args = []
+            if output_ext in [".mp4", ".m4v", ".webm"]:
+                # Use CRF (Constant Rate Factor) for quality
+                rate_args.extend(["-crf", str(settings.get_quality_for_type("video"))])
+            # Custom bitrate if specified
+            if settings.video_bitrate and settings.video_bitrate != "Auto":
+                rate_args.extend(["-b:v", settings.video_bitrate])
+
+            cmd = [*input_args, *encoder_args, *rate_args, *audio_args, *filter_args, *output_args]
+            self._run_ffmpeg(cmd, duration, progress_callback)
+
+        # If we used a temporary file, replace the original
+        if temp_output and temp_output.exists():
+            self.logger.debug("Replacing original file with optimized version")
+            shutil.move(str(temp_output), str(output_path))
 
-        try:
-            self.logger.debug("Running ffmpeg command: %s", " ".join(cmd))
-            result = run_process(cmd, timeout=300, shell=False)
+        return {
+            "method": "ffmpeg",
+            "success": True,
+            "format": output_ext,
+            "codec": "libx264" if output_ext in [".mp4", ".m4v"] else "libvpx-vp9",
+            "converted": input_path.suffix.lower() != output_ext,
+            "encoder_preset": settings.video_encoder_preset,
+            "two_pass": bool(two_pass_kbps),
+        }
 
-            if not result.success:
-                raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+    def _build_encoder_args(self, output_ext: str, settings: "OptimizationSettings") -> list[str]:
+        """Build codec, speed preset and threading arguments for the output format."""
+        preset = settings.video_encoder_preset
+        args = []
+        if output_ext in [".mp4", ".m4v"]:
+            # Preset trades encoding speed against compression efficiency
+            args.extend(["-c:v", "libx264", "-preset", preset])
+        elif output_ext == ".webm":
+            # libvpx has no named presets; map the preset onto its cpu-used speed levels
+            args.extend(["-c:v", "libvpx-vp9", "-deadline", "good", "-cpu-used", str(VP9_CPU_USED.get(preset, 1))])
 
-            # If we used a temporary file, replace the original
-            if temp_output and temp_output.exists():
-                self.logger.debug("Replacing original file with optimized version")
-                shutil.move(str(temp_output), str(output_path))
+        if settings.video_threads is not None:
+            args.extend(["-threads", str(settings.video_threads)])
+        return args
 
-            return {
-                "method": "ffmpeg",
-                "success": True,
-                "format": output_ext,
-                "codec": "libx264" if output_ext in [".mp4", ".m4v"] else "libvpx-vp9",
-                "converted": input_path.suffix.lower() != output_ext,
-            }
+    def _get_two_pass_video_kbps(self, settings: "OptimizationSettings", duration: float) -> int | None:
+        """Get the video bitrate needed to hit the target output size, or None when two-pass is off."""
+        if not settings.video_target_size_kb:
+            return None
+        if duration <= 0:
+            self.logger.warning("Video duration unknown, falling back to single-pass CRF encoding")
+            return None
 
-        except subprocess.TimeoutExpired as e:
-            raise RuntimeError("Video optimization timed out (5 minutes)") from e
+        total_kbps = settings.video_target_size_kb * 8 / duration
+        return max(MIN_TWO_PASS_VIDEO_KBPS, int(total_kbps - AUDIO_BITRATE_KBPS))
+
+    def _run_ffmpeg(
+        self,
+        cmd: list[str],
+        duration: float,
+        progress_callback: Callable[[float], None] | None = None,
+        progress_span: tuple[float, float] = (0.0, 100.0),
+        on_line: Callable[[str], None] | None = None,
+    ):
+        """
+        Run an ffmpeg command under the stall watchdog, reporting progress.
+
+        Args:
+            cmd: ffmpeg command including ``-progress pipe:1``
+            duration: Input duration in seconds, used to convert output time to percent
+            progress_callback: Optional callback receiving overall percent complete
+            progress_span: Overall percent range covered by this command (for multi-pass encodes)
+            on_line: Optional callback receiving every raw progress line
+        """
+        start, end = progress_span
+
+        def _on_progress_line(line: str):
+            if on_line:
+                on_line(line)
+            percent = parse_ffmpeg_progress_line(line, duration)
+            if percent is not None and progress_callback:
+                progress_callback(start + (end - start) * percent / 100)
+
+        self.logger.debug("Running ffmpeg command: %s", " ".join(cmd))
+        result = run_streaming_process(cmd, on_line=_on_progress_line, stall_timeout=FFMPEG_STALL_TIMEOUT)
+
+        if result.timed_out:
+            raise RuntimeError(f"Video optimization timed out (no ffmpeg progress for {FFMPEG_STALL_TIMEOUT}s)")
+        if not result.success:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+
+    def benchmark_presets(
+        self,
+        input_path: Path,
+        settings: "OptimizationSettings",
+        presets: tuple[str, ...] = DEFAULT_BENCHMARK_PRESETS,
+        sample_seconds: float = 5.0,
+    ) -> list[dict[str, Any]]:
+        """
+        Encode a short sample of a video at several encoder presets and measure the tradeoff.
+
+        Args:
+            input_path: Path to the input video
+            settings: Optimization settings used for everything except the preset
+            presets: Encoder presets to compare
+            sample_seconds: Length of the sample encoded from the start of the input
+
+        Returns:
+            One dictionary per preset with encode time, throughput (fps), output bitrate and size
+        """
+        if not self._available_tools.get("ffmpeg", False):
+            raise RuntimeError("ffmpeg is required for video benchmarking but not available")
+
+        video_info = self._get_video_info(input_path)
+        duration = video_info.get("duration", 0.0)
+        sample_duration = min(sample_seconds, duration) if duration > 0 else sample_seconds
+        rate_args = ["-crf", str(settings.get_quality_for_type("video"))]
+
+        results = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for preset in presets:
+                sample_path = Path(temp_dir) / f"{preset}.mp4"
+                encoder_args = self._build_encoder_args(".mp4", replace(settings, video_encoder_preset=preset))
+                cmd = ["ffmpeg", "-t", str(sample_seconds), "-i", str(input_path), *encoder_args, *rate_args, "-an"]
+                cmd.extend(["-progress", "pipe:1", "-nostats", "-y", str(sample_path)])
+
+                frames = [0]
+
+                def _count_frames(line: str, frames=frames):
+                    key, _, value = line.partition("=")
+                    if key == "frame" and value.isdigit():
+                        frames[0] = int(value)
+
+                start_time = time.perf_counter()
+                self._run_ffmpeg(cmd, sample_duration, on_line=_count_frames)
+                encode_time = time.perf_counter() - start_time
+
+                output_size = sample_path.stat().st_size if sample_path.exists() else 0
+                results.append({
+                    "preset": preset,
+                    "encode_time": encode_time,
+                    "fps": frames[0] / encode_time if encode_time > 0 else 0.0,
+                    "bitrate_kbps": output_size * 8 / 1000 / sample_duration if sample_duration > 0 else 0.0,
+                    "output_size": output_size,
+                })
+                self.logger.info("Benchmark %s: %s", preset, results[-1])
+
+        return results
+
+    def estimate_gain(self, input_path: Path, output_path: Path, settings: "OptimizationSettings") -> float | None:
+        """
+        Cheaply predict the size reduction of optimize_video, in percent of the input size.
+
+        The first GAIN_SAMPLE_SECONDS are stream-copied and encoded with the target settings, and the
+        sample's size ratio is applied to the whole file. Two-pass encodes are predicted from their
+        target size.
+
+        Args:
+            input_path: Path to the input video
+            output_path: Path for the optimized output video
+            settings: Optimization settings
+
+        Returns:
+            Predicted gain in percent, or None for GIF conversion and videos too short for sampling
+            to be cheaper than encoding them outright
+        """
+        if not self._available_tools.get("ffmpeg", False) or output_path.suffix.lower() == ".gif":
+            return None
+
+        original_size = input_path.stat().st_size
+        if original_size == 0:
+            return None
+        if settings.video_target_size_kb:
+            return (original_size - settings.video_target_size_kb * 1024) / original_size * 100
+
+        duration = self._get_video_info(input_path).get("duration", 0.0)
+        if duration < 3 * GAIN_SAMPLE_SECONDS:
+            return None
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sample_path = Path(temp_dir) / f"sample{input_path.suffix}"
+            sample_cmd = ["ffmpeg", "-t", str(GAIN_SAMPLE_SECONDS), "-i", str(input_path), "-map", "0", "-c", "copy"]
+            sample_cmd.extend(["-progress", "pipe:1", "-nostats", "-y", str(sample_path)])
+            self._run_ffmpeg(sample_cmd, GAIN_SAMPLE_SECONDS)
+
+            encoded_path = Path(temp_dir) / f"encoded{output_path.suffix}"
+            self._optimize_with_ffmpeg(sample_path, encoded_path, settings)
+
+            sample_size = sample_path.stat().st_size
+            encoded_size = encoded_path.stat().st_size
+
+        if sample_size == 0:
+            return None
+        return (sample_size - encoded_size) / sample_size * 100
 
     def _convert_mov_to_mp4(
-        self, input_path: Path, output_path: Path, settings: "OptimizationSettings"
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        progress_callback: Callable[[float], None] | None = None,
     ) -> dict[str, Any]:
         """Convert MOV to MP4 with optimization."""
         self.logger.debug("Converting MOV to MP4")
@@ -200,7 +470,118 @@ class VideoOptimizationEngine:
         if output_path.suffix.lower() != ".mp4":
             output_path = output_path.with_suffix(".mp4")
 
-        return self._optimize_with_ffmpeg(input_path, output_path, settings)
+        return self._encode_with_ffmpeg(input_path, output_path, settings, progress_callback=progress_callback)
+
+    def _encode_with_ffmpeg(
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        progress_callback: Callable[[float], None] | None = None,
+    ) -> dict[str, Any]:
+        """Encode with ffmpeg, splitting long inputs into parallel chunks when segmented mode is enabled."""
+        if settings.video_segmented:
+            if settings.video_target_size_kb:
+                self.logger.info("Segmented encoding is not used with a two-pass target size")
+            else:
+                duration = self._get_video_info(input_path).get("duration", 0.0)
+                segment_count = choose_segment_count(duration, os.cpu_count() or 1)
+                if segment_count > 1:
+                    return self._optimize_segmented(
+                        input_path, output_path, settings, segment_count, duration, progress_callback
+                    )
+
+        return self._optimize_with_ffmpeg(input_path, output_path, settings, progress_callback=progress_callback)
+
+    def _optimize_segmented(
+        self,
+        input_path: Path,
+        output_path: Path,
+        settings: "OptimizationSettings",
+        segment_count: int,
+        duration: float,
+        progress_callback: Callable[[float], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Encode a video as parallel chunks and join them with the concat demuxer.
+
+        The input is stream-copied into chunks, which can only be cut at keyframes, so every chunk
+        starts with a keyframe and the encoded chunks concatenate without re-encoding.
+
+        Args:
+            input_path: Path to the input video
+            output_path: Path for the optimized output video
+            settings: Optimization settings
+            segment_count: Number of chunks to split the input into
+            duration: Input duration in seconds
+            progress_callback: Optional callback receiving overall percent complete
+
+        Returns:
+            Dictionary with optimization results
+        """
+        self.logger.debug("Encoding %s as %d parallel segments", input_path, segment_count)
+        output_ext = output_path.suffix.lower()
+
+        # Split cores between the concurrent encoders instead of letting each one use all of them
+        if settings.video_threads is None:
+            settings = replace(settings, video_threads=max(1, (os.cpu_count() or 1) // segment_count))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+
+            # Matroska can hold any input codec, so stream-copy splitting never fails on the container
+            split_cmd = ["ffmpeg", "-i", str(input_path), "-map", "0", "-c", "copy", "-f", "segment"]
+            split_cmd.extend(["-segment_time", f"{duration / segment_count:.3f}", "-reset_timestamps", "1"])
+            split_cmd.extend(["-progress", "pipe:1", "-nostats", "-y", str(work_dir / "chunk_%03d.mkv")])
+            self._run_ffmpeg(split_cmd, duration)
+
+            chunks = sorted(work_dir.glob("chunk_*.mkv"))
+            if not chunks:
+                raise RuntimeError("Splitting the video into segments produced no chunks")
+
+            chunk_progress = [0.0] * len(chunks)
+            progress_lock = threading.Lock()
+
+            def _encode_chunk(index: int, chunk_path: Path) -> Path:
+                def _on_chunk_progress(percent: float):
+                    with progress_lock:
+                        chunk_progress[index] = percent
+                        overall = sum(chunk_progress) / len(chunk_progress)
+                    if progress_callback:
+                        progress_callback(overall)
+
+                encoded_path = chunk_path.with_name(f"encoded_{index:03d}{output_ext}")
+                self._optimize_with_ffmpeg(chunk_path, encoded_path, settings, progress_callback=_on_chunk_progress)
+                return encoded_path
+
+            # Telemetry is per thread, so the workers' encodes are timed here as one tool run
+            with tool_run(), ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                encoded_chunks = list(executor.map(_encode_chunk, range(len(chunks)), chunks))
+
+            concat_list = work_dir / "concat.txt"
+            # The concat demuxer reads single-quoted paths, with embedded quotes written as '\''
+            concat_list.write_text(
+                "".join("file '{}'\n".format(path.as_posix().replace("'", "'\\''")) for path in encoded_chunks),
+                encoding="utf-8",
+            )
+            joined_path = work_dir / f"joined{output_ext}"
+            concat_cmd = ["ffmpeg", "-f", "concat", "-safe", "0", "-i", str(concat_list), "-c", "copy"]
+            concat_cmd.extend(["-movflags", "+faststart", "-progress", "pipe:1", "-nostats", "-y", str(joined_path)])
+            self._run_ffmpeg(concat_cmd, duration)
+
+            # Moving from the temp dir also covers in-place optimization, since the input was already split
+            shutil.move(str(joined_path), str(output_path))
+
+        return {
+            "method": "ffmpeg",
+            "success": True,
+            "format": output_ext,
+            "codec": "libx264" if output_ext in [".mp4", ".m4v"] else "libvpx-vp9",
+            "converted": input_path.suffix.lower() != output_ext,
+            "encoder_preset": settings.video_encoder_preset,
+            "two_pass": False,
+            "segments": len(chunks),
+        }
 
     def _convert_to_gif(self, input_path: Path, output_path: Path, settings: "OptimizationSettings") -> dict[str, Any]:
         """Convert video to GIF using gifski for high quality or ffmpeg as fallback."""
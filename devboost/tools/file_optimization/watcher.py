@@ -0,0 +1,411 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import appdirs
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from .cache import OptimizationCache
+from .detector import FileTypeDetector
+from .manager import OptimizationManager
+from .models import BatchOperationResult
+from .settings import OptimizationSettings
+
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last filesystem event before a sync starts
+WATCH_DEBOUNCE_MS = 750
+
+# Full rescan interval, which also catches in-place rewrites that do not raise directory events
+WATCH_POLL_INTERVAL_MS = 30_000
+
+# Suffix OptimizationManager gives outputs written next to their inputs
+OUTPUT_SUFFIX = "-compressed"
+
+
+@dataclass
+class ManifestEntry:
+    """State of a watched file when it was last optimized."""
+
+    size: int
+    mtime_ns: int
+    content_hash: str
+    settings_fingerprint: str
+    output_path: str | None = None
+
+
+class WatchManifest:
+    """
+    Persistent record of which files in a folder have already been optimized.
+
+    Each supported file is stored with its size, mtime, content hash and the fingerprint of the
+    settings it was optimized with. A scan only stats files whose size and mtime are unchanged, so
+    re-scanning a large folder costs one ``stat`` per file; files whose stat changed are hashed, and
+    only files whose content or settings differ from the manifest are reported as changed.
+    """
+
+    def __init__(self, root: Path, manifest_file: Path | None = None, recursive: bool = True):
+        """
+        Initialize the manifest.
+
+        Args:
+            root: Folder being watched
+            manifest_file: Optional custom manifest file (defaults to one per folder in the DevBoost app data dir)
+            recursive: Whether files in subfolders are included
+        """
+        self.root = root.resolve()
+        self.recursive = recursive
+        if manifest_file is None:
+            root_id = hashlib.sha256(str(self.root).encode("utf-8")).hexdigest()[:16]
+            manifest_file = (
+                Path(appdirs.user_data_dir("DevBoost", "DeskRiders")) / "watch_manifests" / f"{root_id}.json"
+            )
+        self.manifest_file = manifest_file
+        self.entries: dict[str, ManifestEntry] = {}
+        # Stat and hash taken during the last scan, recorded once a changed file is optimized
+        self._pending: dict[str, tuple[int, int, str]] = {}
+        # Files skipped by the last scan because they were modified too recently
+        self.unsettled_count = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load entries from disk, starting empty if the manifest is missing or unreadable."""
+        try:
+            data = json.loads(self.manifest_file.read_text(encoding="utf-8"))
+            self.entries = {path: ManifestEntry(**entry) for path, entry in data.get("entries", {}).items()}
+        except FileNotFoundError:
+            self.entries = {}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable watch manifest %s: %s", self.manifest_file, e)
+            self.entries = {}
+        self._dirty = False
+
+    def save(self):
+        """Write entries atomically if they changed since the last load or save."""
+        if not self._dirty:
+            return
+        tmp_file = self.manifest_file.with_name(f"{self.manifest_file.name}.{os.getpid()}.tmp")
+        payload = {"root": str(self.root), "entries": {path: asdict(entry) for path, entry in self.entries.items()}}
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(json.dumps(payload), encoding="utf-8")
+            tmp_file.replace(self.manifest_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("Failed to write watch manifest %s: %s", self.manifest_file, e)
+            tmp_file.unlink(missing_ok=True)
+
+    def iter_files(self):
+        """Yield (path, stat) for every supported input file under the root."""
+        outputs = {entry.output_path for entry in self.entries.values() if entry.output_path}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    dir_entries = list(it)
+            except OSError as e:
+                logger.warning("Cannot scan %s: %s", directory, e)
+                continue
+            for dir_entry in dir_entries:
+                # Hidden files include the work files written during in-place optimization
+                if dir_entry.name.startswith("."):
+                    continue
+                if dir_entry.is_dir(follow_symlinks=False):
+                    if self.recursive:
+                        stack.append(Path(dir_entry.path))
+                    continue
+                path = Path(dir_entry.path)
+                if (
+                    not dir_entry.is_file()
+                    or path.stem.endswith(OUTPUT_SUFFIX)
+                    or dir_entry.path in outputs
+                    or not FileTypeDetector.is_supported_file(path)
+                ):
+                    continue
+                try:
+                    yield path, dir_entry.stat()
+                except OSError:
+                    continue
+
+    def directories(self) -> list[Path]:
+        """List the root and, when recursive, every non-hidden subfolder."""
+        found = [self.root]
+        if not self.recursive:
+            return found
+        for dirpath, dirnames, _ in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            found.extend(Path(dirpath) / name for name in dirnames)
+        return found
+
+    def find_changes(self, settings: OptimizationSettings, settle_before: float | None = None) -> list[Path]:
+        """
+        Scan the folder for files that are new or changed since they were last optimized.
+
+        Args:
+            settings: Settings the files would be optimized with
+            settle_before: Optional timestamp; files modified after it are treated as still being
+                written and are left for the next scan
+
+        Returns:
+            Paths of files that need optimizing
+        """
+        fingerprint = OptimizationCache.settings_fingerprint(settings)
+        changed = []
+        seen = set()
+        self._pending.clear()
+        self.unsettled_count = 0
+
+        for path, stat in self.iter_files():
+            # Keyed by the scanned path, not its resolved target, so symlinked files match record()
+            key = str(path)
+            seen.add(key)
+            if settle_before is not None and stat.st_mtime > settle_before:
+                self.unsettled_count += 1
+                continue
+            entry = self.entries.get(key)
+            if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                if entry.settings_fingerprint == fingerprint:
+                    continue
+                content_hash = entry.content_hash
+            else:
+                try:
+                    content_hash = OptimizationCache.hash_file(path)
+                except OSError as e:
+                    logger.warning("Cannot hash %s: %s", path, e)
+                    continue
+                # Touched or copied over with identical bytes
+                if entry and entry.content_hash == content_hash and entry.settings_fingerprint == fingerprint:
+                    entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                    self._dirty = True
+                    continue
+            self._pending[key] = (stat.st_size, stat.st_mtime_ns, content_hash)
+            changed.append(path)
+
+        removed = [key for key in self.entries if key not in seen]
+        for key in removed:
+            del self.entries[key]
+        if removed:
+            self._dirty = True
+            logger.debug("Dropped %d deleted files from watch manifest", len(removed))
+
+        return changed
+
+    def record(self, result: BatchOperationResult, settings: OptimizationSettings, output_path: Path | None):
+        """
+        Mark a file from the last scan as optimized.
+
+        Args:
+            result: Result of optimizing a path returned by find_changes (failed results are not
+                recorded, so they are retried)
+            settings: Settings the file was optimized with
+            output_path: Where the optimized file was written, or None if nothing was written
+        """
+        key = str(result.file_path)
+        pending = self._pending.pop(key, None)
+        if pending is None or not result.success:
+            return
+        size, mtime_ns, content_hash = pending
+        self.entries[key] = ManifestEntry(
+            size=size,
+            mtime_ns=mtime_ns,
+            content_hash=content_hash,
+            settings_fingerprint=OptimizationCache.settings_fingerprint(settings),
+            output_path=str(output_path.resolve()) if output_path and output_path.exists() else None,
+        )
+        self._dirty = True
+
+
+class DirectoryWatcher(QObject):
+    """
+    Watches a folder and optimizes files that are added or changed.
+
+    Filesystem events come from QFileSystemWatcher (inotify, FSEvents or kqueue, depending on the
+    platform) on the watched directories. Events restart a debounce timer, so a burst of copies is
+    handled by one sync once the folder has been quiet for the debounce interval. A periodic
+    rescan catches rewrites that do not raise directory events. Each sync asks the WatchManifest for
+    new or changed files and passes only those to OptimizationManager.optimize_batch. Syncs started
+    by the timers run on a background thread and report back through the signals, so scanning and
+    optimizing a large folder never blocks the UI thread.
+    """
+
+    sync_started = pyqtSignal(int)  # number of files to optimize
+    sync_completed = pyqtSignal(list)  # list of BatchOperationResult
+    _sync_deferred = pyqtSignal()  # emitted from the sync thread to retry after the debounce
+
+    def __init__(
+        self,
+        root: Path,
+        manager: OptimizationManager,
+        settings_provider: Callable[[], OptimizationSettings],
+        output_dir: Path | None = None,
+        manifest: WatchManifest | None = None,
+        debounce_ms: int = WATCH_DEBOUNCE_MS,
+        poll_interval_ms: int = WATCH_POLL_INTERVAL_MS,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            root: Folder to watch
+            manager: Optimization manager that runs the batches
+            settings_provider: Returns the settings to use for each sync
+            output_dir: Optional output directory (defaults to writing next to the inputs)
+            manifest: Optional manifest (defaults to the persistent manifest for root)
+            debounce_ms: Quiet period after the last event before a sync starts
+            poll_interval_ms: Interval of full rescans (0 disables polling)
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.root = root.resolve()
+        self.manager = manager
+        self.settings_provider = settings_provider
+        self.output_dir = output_dir
+        self.manifest = manifest or WatchManifest(self.root)
+        self.debounce_ms = debounce_ms
+        self._syncing = False
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="watch-sync")
+        self._sync_future: Future | None = None
+
+        self._fs_watcher = QFileSystemWatcher()
+        self._fs_watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce_timer = QTimer()
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self.request_sync)
+        self._sync_deferred.connect(self._debounce_timer.start)
+
+        self._poll_timer = QTimer()
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self.request_sync)
+        self._poll_interval_ms = poll_interval_ms
+
+    @property
+    def is_watching(self) -> bool:
+        """Check if filesystem events are being watched."""
+        return bool(self._fs_watcher.directories())
+
+    @property
+    def is_syncing(self) -> bool:
+        """Check if a sync is currently optimizing files."""
+        return self._syncing
+
+    def start(self):
+        """Start watching, optimizing everything that changed since the last session in the background."""
+        self.request_sync()
+        if self._poll_interval_ms > 0:
+            self._poll_timer.start()
+        self.logger.info("Watching %s", self.root)
+
+    def stop(self):
+        """Stop watching, cancel a running sync and persist the manifest."""
+        self._stopped = True
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        watched = self._fs_watcher.directories()
+        if watched:
+            self._fs_watcher.removePaths(watched)
+        if self._syncing:
+            # The sync thread saves the manifest once the cancelled batch returns
+            self.manager.cancel_batch_operation()
+        else:
+            self.manifest.save()
+        self._executor.shutdown(wait=False)
+        self.logger.info("Stopped watching %s", self.root)
+
+    def _on_directory_changed(self, _path: str):
+        """Restart the debounce timer so bursts of events trigger one sync."""
+        self._debounce_timer.start()
+
+    def _update_watched_directories(self):
+        """Watch the current directory tree, following added and removed subfolders."""
+        current = set(self._fs_watcher.directories())
+        wanted = {str(path) for path in self.manifest.directories()}
+        if current - wanted:
+            self._fs_watcher.removePaths(list(current - wanted))
+        if wanted - current:
+            self._fs_watcher.addPaths(list(wanted - current))
+
+    def request_sync(self) -> bool:
+        """
+        Start a sync on the background thread (called from the UI thread).
+
+        Returns:
+            True if a sync was started, False if it was deferred until a running batch finishes
+        """
+        settings = self._prepare_sync()
+        if settings is None:
+            return False
+        self._sync_future = self._executor.submit(self._run_sync, settings)
+        return True
+
+    def sync(self) -> list[BatchOperationResult]:
+        """
+        Optimize every new or changed file once, on the calling thread.
+
+        Returns:
+            Results of the files optimized by this sync
+        """
+        settings = self._prepare_sync()
+        if settings is None:
+            return []
+        return self._run_sync(settings)
+
+    def wait_for_sync(self, timeout: float | None = None):
+        """Block until the background sync finishes (used by tests)."""
+        if self._sync_future is not None:
+            self._sync_future.exception(timeout)
+
+    def _prepare_sync(self) -> OptimizationSettings | None:
+        """Claim the sync slot and update the watched directories, or defer if busy."""
+        if self._stopped:
+            return None
+        if self._syncing or self.manager.is_processing():
+            # Try again once the running batch has finished
+            self._debounce_timer.start()
+            return None
+        self._syncing = True
+        self._update_watched_directories()
+        return self.settings_provider()
+
+    def _run_sync(self, settings: OptimizationSettings) -> list[BatchOperationResult]:
+        """Find and optimize changed files; runs on the sync thread or the caller of sync()."""
+        try:
+            # Files written within the debounce window may still be copying; pick them up next time
+            settle_before = time.time() - self.debounce_ms / 1000
+            changed = self.manifest.find_changes(settings, settle_before=settle_before)
+            if self.manifest.unsettled_count:
+                self._sync_deferred.emit()
+
+            results = []
+            if changed and not self._stopped:
+                self.logger.info("Optimizing %d new or changed files in %s", len(changed), self.root)
+                self.sync_started.emit(len(changed))
+                try:
+                    results = self.manager.optimize_batch(changed, self.output_dir, settings)
+                except RuntimeError:
+                    # A batch was started from the UI after this sync was claimed
+                    self._sync_deferred.emit()
+                    return []
+                for result in results:
+                    output_path = (
+                        None if result.skipped else self.manager.get_output_path(result.file_path, self.output_dir)
+                    )
+                    self.manifest.record(result, settings, output_path)
+                self.sync_completed.emit(results)
+            self.manifest.save()
+            return results
+        except Exception:
+            self.logger.exception("Sync of watched folder %s failed", self.root)
+            return []
+        finally:
+            self._syncing = False
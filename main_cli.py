@@ -1,4 +1,8 @@
+import multiprocessing
+
 from devboost import main
 
 if __name__ == "__main__":
+    # Required for process pool workers in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
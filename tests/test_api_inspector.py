@@ -0,0 +1,514 @@
+"""
+Unit tests for API Inspector request storage.
+"""
+
+import http.client
+import json
+import random
+import socket
+import sqlite3
+import tempfile
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from PyQt6 import sip
+from PyQt6.QtCore import Qt
+from PyQt6.QtTest import QAbstractItemModelTester
+from PyQt6.QtWidgets import QApplication, QTableView
+
+from devboost.tools.api_inspector import (
+    APIInspectorServer,
+    CaptureLog,
+    DataExporter,
+    HTTPRequestData,
+    RequestStorage,
+    ServerBackend,
+)
+from devboost.tools.api_inspector.api_inspector import (
+    STATISTICS_HISTOGRAM_MINUTES,
+    RequestTableModel,
+    TopKCounter,
+    create_api_inspector_widget,
+)
+
+
+def _request(number: int, method: str = "GET", url: str = "/items", timestamp: datetime | None = None, size: int = 0):
+    """Build a captured request."""
+    return HTTPRequestData(
+        timestamp=timestamp or datetime.now(),
+        method=method,
+        url=url,
+        headers={},
+        query_params={},
+        body="x" * size,
+        client_ip="127.0.0.1",
+        request_id=f"req-{number}",
+        content_length=size,
+        user_agent="test",
+    )
+
+
+class TestRequestStorageRing(unittest.TestCase):
+    """Test the fixed-capacity ring and its indexes."""
+
+    def test_eviction_keeps_newest_in_order(self):
+        """Test that a full buffer drops the oldest requests and keeps capture order."""
+        storage = RequestStorage(max_requests=5)
+        for number in range(12):
+            storage.add_request(_request(number, method="POST" if number % 2 else "GET"))
+
+        self.assertEqual(storage.get_request_count(), 5)
+        self.assertEqual([r.request_id for r in storage.get_requests()], [f"req-{n}" for n in range(7, 12)])
+        self.assertEqual([r.request_id for r in storage.get_requests({"method": "get"})], ["req-8", "req-10"])
+        self.assertEqual(storage.get_statistics().method_breakdown, {"GET": 2, "POST": 3})
+
+    def test_filters_match_linear_scan(self):
+        """Test that indexed queries return exactly what a full scan with the same filters returns."""
+        rng = random.Random(7)  # noqa: S311
+        storage = RequestStorage(max_requests=300)
+        now = datetime.now()
+        requests = []
+        for number in range(1000):
+            age = timedelta(minutes=rng.randrange(0, 3000))
+            url = f"/api/{rng.choice(['users', 'orders', 'Items'])}/{rng.randrange(5)}?page={rng.randrange(3)}"
+            request = _request(number, method=rng.choice(["GET", "POST", "DELETE"]), url=url, timestamp=now - age)
+            requests.append(request)
+            storage.add_request(request)
+        stored = requests[-300:]
+
+        cases = [
+            {"method": "post"},
+            {"path": "/api/users/3"},
+            {"url_pattern": "ITEMS"},
+            {"url_pattern": "page=2"},
+            {"time_range": "last_hour"},
+            {"time_range": "last_day", "method": "GET", "url_pattern": "orders"},
+            {"method": "PATCH"},
+            {"time_range": "forever"},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                expected = [
+                    r
+                    for r in stored
+                    if ("method" not in filters or r.method == filters["method"].upper())
+                    and ("path" not in filters or r.url.split("?")[0] == filters["path"])
+                    and ("url_pattern" not in filters or filters["url_pattern"].lower() in r.url.lower())
+                    and (
+                        filters.get("time_range") not in ("last_hour", "last_day")
+                        or r.timestamp
+                        >= datetime.now()
+                        - (timedelta(hours=1) if filters["time_range"] == "last_hour" else timedelta(days=1))
+                    )
+                ]
+                self.assertEqual(storage.get_requests(filters), expected)
+
+    def test_statistics_after_eviction(self):
+        """Test that endpoint counts and body sizes only cover stored requests."""
+        storage = RequestStorage(max_requests=3)
+        storage.add_request(_request(0, url="/old", size=1000))
+        for number in range(1, 4):
+            storage.add_request(_request(number, url=f"/new?n={number}", size=10))
+
+        stats = storage.get_statistics()
+
+        self.assertEqual(stats.total_requests, 3)
+        self.assertEqual(stats.top_endpoints, [("/new", 3)])
+        self.assertEqual(stats.average_body_size, 10)
+
+    def test_clear(self):
+        """Test that clearing empties the ring and every index."""
+        storage = RequestStorage(max_requests=3)
+        for number in range(5):
+            storage.add_request(_request(number))
+
+        storage.clear_requests()
+
+        self.assertEqual(storage.get_request_count(), 0)
+        self.assertEqual(storage.get_requests({"method": "GET"}), [])
+        self.assertEqual(storage.get_statistics().total_requests, 0)
+        storage.add_request(_request(9))
+        self.assertEqual([r.request_id for r in storage.get_requests()], ["req-9"])
+
+    def test_requests_since_follow_captures_across_clear(self):
+        """Test that sequence numbers keep growing after a clear so incremental readers see it as eviction."""
+        storage = RequestStorage(max_requests=4)
+        for number in range(3):
+            storage.add_request(_request(number, method="POST" if number == 1 else "GET"))
+
+        rows, next_seq = storage.get_requests_since(1)
+        self.assertEqual([(seq, r.request_id) for seq, r in rows], [(1, "req-1"), (2, "req-2")])
+        self.assertEqual(next_seq, 3)
+        self.assertEqual([seq for seq, _ in storage.get_requests_since(0, {"method": "GET"})[0]], [0, 2])
+
+        storage.clear_requests()
+        storage.add_request(_request(3))
+        self.assertEqual(storage.get_sequence_range(), (3, 4))
+        rows, next_seq = storage.get_requests_since(next_seq)
+        self.assertEqual([(seq, r.request_id) for seq, r in rows], [(3, "req-3")])
+
+
+class TestTopKCounter(unittest.TestCase):
+    """Test the bucketed top-K counter."""
+
+    def test_matches_counter_under_random_updates(self):
+        """Test that counts and rankings stay exact while keys go up and down."""
+        rng = random.Random(3)  # noqa: S311
+        counter = TopKCounter()
+        expected = Counter()
+        for _ in range(5000):
+            key = f"/endpoint/{rng.randrange(20)}"
+            if expected[key] and rng.random() < 0.45:
+                counter.decrement(key)
+                expected[key] -= 1
+            else:
+                counter.increment(key)
+                expected[key] += 1
+        expected = +expected
+
+        self.assertEqual(len(counter), len(expected))
+        self.assertTrue(all(counter.get(key) == count for key, count in expected.items()))
+        top = counter.most_common(5)
+        self.assertEqual([count for _, count in top], sorted(expected.values(), reverse=True)[:5])
+        self.assertTrue(all(expected[key] == count for key, count in top))
+
+    def test_ties_and_removal(self):
+        """Test tie order, keys reaching zero and asking for more keys than are counted."""
+        counter = TopKCounter()
+        for key in ["a", "b", "b", "c"]:
+            counter.increment(key)
+
+        self.assertEqual(counter.most_common(10), [("b", 2), ("a", 1), ("c", 1)])
+        counter.decrement("b")
+        counter.decrement("a")
+        self.assertEqual(counter.most_common(10), [("c", 1), ("b", 1)])
+        self.assertEqual(counter.get("a"), 0)
+        self.assertEqual(counter.most_common(0), [])
+
+
+class TestRequestStatistics(unittest.TestCase):
+    """Test statistics kept as running aggregates."""
+
+    def test_aggregates_match_recomputation(self):
+        """Test that incremental statistics equal statistics recomputed from the stored requests."""
+        rng = random.Random(11)  # noqa: S311
+        storage = RequestStorage(max_requests=200)
+        for number in range(1500):
+            url = f"/api/{rng.choice(['a', 'b', 'c', 'd'])}/{rng.randrange(8)}?q={number}"
+            storage.add_request(_request(number, method=rng.choice(["GET", "POST"]), url=url, size=rng.randrange(500)))
+
+        stored = storage.get_requests()
+        stats = storage.get_statistics()
+        paths = Counter(r.url.split("?")[0] for r in stored)
+
+        self.assertEqual(stats.total_requests, 200)
+        self.assertEqual(stats.method_breakdown, dict(Counter(r.method for r in stored)))
+        self.assertAlmostEqual(stats.average_body_size, sum(r.content_length for r in stored) / 200)
+        self.assertEqual(len(stats.top_endpoints), 10)
+        self.assertEqual([c for _, c in stats.top_endpoints], sorted(paths.values(), reverse=True)[:10])
+        self.assertTrue(all(paths[path] == count for path, count in stats.top_endpoints))
+
+    def test_requests_per_minute(self):
+        """Test the per-minute histogram ending with the current minute."""
+        storage = RequestStorage(max_requests=10)
+        now = datetime.now()
+        storage.add_request(_request(0, timestamp=now - timedelta(hours=2)))
+        storage.add_request(_request(1, timestamp=now - timedelta(minutes=2)))
+        storage.add_request(_request(2, timestamp=now))
+        storage.add_request(_request(3, timestamp=now))
+
+        histogram = storage.get_statistics().requests_per_minute
+
+        self.assertEqual(len(histogram), STATISTICS_HISTOGRAM_MINUTES)
+        self.assertEqual(histogram[-1], 2)
+        self.assertEqual(sum(histogram), 3)
+
+
+class TestRequestTableModel(unittest.TestCase):
+    """Test the table model over the storage."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the Qt application."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up a small storage and a model checked by Qt's model tester."""
+        self.storage = RequestStorage(max_requests=5)
+        self.model = RequestTableModel(self.storage)
+        self.tester = QAbstractItemModelTester(self.model, QAbstractItemModelTester.FailureReportingMode.Warning)
+        self.inserts = []
+        self.model.rowsInserted.connect(lambda _parent, first, last: self.inserts.append((first, last)))
+
+    def _ids(self) -> list[str]:
+        return [self.model.request_at(row).request_id for row in range(self.model.rowCount())]
+
+    def test_captures_are_appended_in_one_batch(self):
+        """Test that captures between two syncs become one row insertion."""
+        for number in range(3):
+            self.storage.add_request(_request(number, url=f"/items/{number}", size=number))
+
+        self.assertEqual(self.model.rowCount(), 0)
+        self.assertEqual(self.model.sync(), 3)
+        self.assertEqual(self.inserts, [(0, 2)])
+        self.assertEqual(self.model.data(self.model.index(1, 2)), "/items/1")
+        self.assertEqual(self.model.data(self.model.index(2, 4)), "2")
+        self.assertEqual(self.model.headerData(1, Qt.Orientation.Horizontal), "Method")
+        self.assertEqual(self.model.sync(), 0)
+        self.assertEqual(self.inserts, [(0, 2)])
+
+    def test_eviction_and_clear_remove_top_rows(self):
+        """Test that evicted and cleared requests leave the model on the next sync."""
+        for number in range(4):
+            self.storage.add_request(_request(number))
+        self.model.sync()
+        for number in range(4, 8):
+            self.storage.add_request(_request(number))
+
+        self.model.sync()
+        self.assertEqual(self._ids(), [f"req-{n}" for n in range(3, 8)])
+
+        self.storage.clear_requests()
+        self.storage.add_request(_request(8))
+        self.model.sync()
+        self.assertEqual(self._ids(), ["req-8"])
+
+    def test_filters(self):
+        """Test that a filtered model only appends matching captures."""
+        self.storage.add_request(_request(0, method="POST"))
+        self.model.set_filters({"method": "post"})
+        self.assertEqual(self._ids(), ["req-0"])
+
+        self.storage.add_request(_request(1, method="GET"))
+        self.storage.add_request(_request(2, method="POST"))
+        self.assertEqual(self.model.sync(), 1)
+        self.assertEqual(self._ids(), ["req-0", "req-2"])
+
+        self.model.set_filters(None)
+        self.assertEqual(self._ids(), ["req-0", "req-1", "req-2"])
+
+    def test_widget_uses_model_view(self):
+        """Test that the widget lists requests through the model."""
+        widget = create_api_inspector_widget()
+        table = widget.findChild(QTableView)
+
+        self.assertIsInstance(table.model(), RequestTableModel)
+        self.assertEqual(table.model().rowCount(), 0)
+        # Delete now: a deferred delete could let the refresh timers outlive widgets collected by the GC
+        sip.delete(widget)
+
+
+class TestCaptureLog(unittest.TestCase):
+    """Test the on-disk capture log behind the in-memory window."""
+
+    def setUp(self):
+        """Set up a temporary log database, removed after the logs opened by a test are closed."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.work_dir = Path(self.temp_dir.name)
+        self.db_path = self.work_dir / "captures.db"
+
+    def _storage(self, max_requests: int = 20) -> RequestStorage:
+        storage = RequestStorage(max_requests=max_requests, capture_log=CaptureLog(self.db_path, batch_size=7))
+        self.addCleanup(storage.set_capture_log, None)
+        return storage
+
+    def test_full_history_filters_match_linear_scan(self):
+        """Test that full-history queries return every capture matching the filters, in order."""
+        rng = random.Random(5)  # noqa: S311
+        storage = self._storage()
+        now = datetime.now()
+        requests = []
+        for number in range(200):
+            request = _request(
+                number,
+                method=rng.choice(["GET", "post"]),
+                url=f"/api/{rng.choice(['users', 'Orders'])}/{rng.randrange(3)}?n={number}",
+                timestamp=now - timedelta(minutes=rng.randrange(0, 3000)),
+                size=rng.choice([0, 5]),
+            )
+            request.query_params = {"n": [str(number)]}
+            requests.append(request)
+            storage.add_request(request)
+
+        self.assertEqual(storage.get_request_count(), 20)
+        self.assertEqual(storage.get_requests(full_history=True), requests)
+        cases = [
+            {"method": "POST"},
+            {"path": "/api/users/1"},
+            {"url_pattern": "orders"},
+            {"time_range": "last_day", "method": "get"},
+        ]
+        for filters in cases:
+            with self.subTest(filters=filters):
+                expected = [
+                    r
+                    for r in requests
+                    if ("method" not in filters or r.method.upper() == filters["method"].upper())
+                    and ("path" not in filters or r.url.split("?")[0] == filters["path"])
+                    and ("url_pattern" not in filters or filters["url_pattern"] in r.url.lower())
+                    and ("time_range" not in filters or r.timestamp >= datetime.now() - timedelta(days=1))
+                ]
+                self.assertEqual(storage.get_requests(filters, full_history=True), expected)
+
+    def test_bodies_are_stored_out_of_line(self):
+        """Test that request rows hold no bodies and empty bodies take no rows."""
+        storage = self._storage()
+        storage.add_request(_request(0, size=3))
+        storage.add_request(_request(1))
+        storage.set_capture_log(None)
+
+        with sqlite3.connect(self.db_path) as connection:
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(requests)")]
+            bodies = connection.execute("SELECT seq, body FROM bodies").fetchall()
+        connection.close()
+        self.assertNotIn("body", columns)
+        self.assertEqual(bodies, [(0, "xxx")])
+
+    def test_reopened_log_keeps_earlier_session(self):
+        """Test that a new storage numbers captures after an existing log and can read it back."""
+        first = self._storage()
+        first.add_request(_request(0))
+        first.add_request(_request(1))
+        first.set_capture_log(None)
+
+        second = RequestStorage(max_requests=20)
+        second.add_request(_request(2))
+        second.set_capture_log(CaptureLog(self.db_path))
+        self.addCleanup(second.set_capture_log, None)
+        second.add_request(_request(3))
+
+        self.assertEqual(second.get_sequence_range(), (2, 4))
+        self.assertEqual([r.request_id for r in second.get_requests()], ["req-2", "req-3"])
+        self.assertEqual(
+            [r.request_id for r in second.get_requests(full_history=True)], ["req-0", "req-1", "req-2", "req-3"]
+        )
+
+    def test_clear_empties_the_log(self):
+        """Test that clearing also deletes the logged history."""
+        storage = self._storage(max_requests=2)
+        for number in range(5):
+            storage.add_request(_request(number))
+
+        storage.clear_requests()
+        storage.add_request(_request(5))
+
+        self.assertEqual([r.request_id for r in storage.get_requests(full_history=True)], ["req-5"])
+
+    def test_export_streams_full_history(self):
+        """Test that file exports include requests only the log still holds."""
+        storage = self._storage(max_requests=3)
+        for number in range(10):
+            storage.add_request(_request(number, method="POST" if number % 2 else "GET", size=2))
+        exporter = DataExporter(storage)
+        json_path = self.work_dir / "export.json"
+        csv_path = self.work_dir / "export.csv"
+
+        self.assertTrue(exporter.export_to_file(str(json_path), "json", {"method": "POST"}))
+        self.assertTrue(exporter.export_to_file(str(csv_path), "csv"))
+
+        exported = json.loads(json_path.read_text(encoding="utf-8"))
+        self.assertEqual(exported["total_requests"], 5)
+        self.assertEqual([r["request_id"] for r in exported["requests"]], [f"req-{n}" for n in range(1, 10, 2)])
+        self.assertEqual(exported["requests"][0]["body"], "xx")
+        self.assertEqual(exported["filters_applied"], {"method": "POST"})
+        csv_lines = csv_path.read_text(encoding="utf-8").split("\n")
+        self.assertEqual(csv_lines[0], DataExporter.CSV_HEADER)
+        self.assertEqual(csv_lines[1:], [DataExporter._csv_line(r) for r in storage.get_requests(full_history=True)])
+        self.assertEqual(len(csv_lines), 11)
+
+
+def _read_all(sock: socket.socket) -> bytes:
+    """Read from a socket until the server closes it."""
+    data = b""
+    while chunk := sock.recv(65536):
+        data += chunk
+    return data
+
+
+class TestCaptureServers(unittest.TestCase):
+    """Test both capture server backends over real sockets."""
+
+    def _start(self, backend: ServerBackend) -> tuple[APIInspectorServer, list[HTTPRequestData]]:
+        server = APIInspectorServer(port=0, backend=backend)
+        captured = []
+        server.request_captured.connect(captured.append, Qt.ConnectionType.DirectConnection)
+        self.assertTrue(server.start_server())
+        self.addCleanup(server.stop_server)
+        return server, captured
+
+    def test_both_backends_store_and_signal(self):
+        """Test that every backend stores requests and emits request_captured."""
+        for backend in ServerBackend:
+            with self.subTest(backend=backend):
+                server, captured = self._start(backend)
+                connection = http.client.HTTPConnection("localhost", server.port, timeout=5)
+                connection.request("POST", "/items?page=2", body=b'{"a": 1}', headers={"User-Agent": "tests"})
+                response = connection.getresponse()
+
+                self.assertEqual(response.status, 200)
+                self.assertEqual(json.loads(response.read())["status"], "captured")
+                stored = server.storage.get_requests()
+                self.assertEqual([(r.method, r.url, r.body) for r in stored], [("POST", "/items?page=2", '{"a": 1}')])
+                self.assertEqual(stored[0].query_params, {"page": ["2"]})
+                self.assertEqual(stored[0].user_agent, "tests")
+                self.assertEqual(captured, stored)
+                self.assertEqual(server.get_server_info()["backend"], backend.value)
+                connection.close()
+                server.stop_server()
+
+    def test_asyncio_keep_alive(self):
+        """Test that the asyncio backend answers several requests on one connection."""
+        server, _ = self._start(ServerBackend.ASYNCIO)
+        connection = http.client.HTTPConnection("localhost", server.port, timeout=5)
+
+        for number in range(3):
+            connection.request("GET", f"/ping/{number}")
+            response = connection.getresponse()
+            self.assertEqual(response.getheader("Connection"), "keep-alive")
+            response.read()
+            if number == 0:
+                first_socket = connection.sock
+            self.assertIs(connection.sock, first_socket)
+
+        self.assertEqual(server.storage.get_request_count(), 3)
+        connection.close()
+
+    def test_asyncio_pipelining_and_chunked_bodies(self):
+        """Test that pipelined requests are answered in order, including chunked and HEAD requests."""
+        server, _ = self._start(ServerBackend.ASYNCIO)
+        with socket.create_connection(("localhost", server.port), timeout=5) as sock:
+            sock.sendall(
+                b"GET /first HTTP/1.1\r\nHost: x\r\n\r\n"
+                b"POST /second HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n"
+                b"HEAD /third HTTP/1.1\r\nConnection: close\r\n\r\n"
+            )
+            data = _read_all(sock)
+
+        self.assertEqual(data.count(b"HTTP/1.1 200 OK"), 3)
+        self.assertTrue(data.endswith(b"\r\n\r\n"))  # No body after the HEAD response
+        stored = server.storage.get_requests()
+        self.assertEqual([r.url for r in stored], ["/first", "/second", "/third"])
+        self.assertEqual((stored[1].body, stored[1].content_length), ("abcde", 5))
+
+    def test_asyncio_rejects_malformed_requests(self):
+        """Test that malformed and oversized requests get an error status and are not stored."""
+        server, _ = self._start(ServerBackend.ASYNCIO)
+        cases = [
+            (b"NOT-HTTP\r\n\r\n", b"400"),
+            (b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n", b"400"),
+            (b"POST / HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n", b"413"),
+            (b"GET / HTTP/1.1\r\nX-Big: " + b"a" * (100 * 1024) + b"\r\n\r\n", b"431"),
+        ]
+        for raw, status in cases:
+            with self.subTest(status=status), socket.create_connection(("localhost", server.port), timeout=5) as sock:
+                sock.sendall(raw)
+                self.assertTrue(_read_all(sock).startswith(b"HTTP/1.1 " + status))
+
+        self.assertEqual(server.storage.get_request_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Unit tests for the API Inspector server benchmark.
+"""
+
+import io
+import json
+import unittest
+
+from devboost.tools.api_inspector import ServerBackend
+from devboost.tools.api_inspector.benchmark import _percentile, build_parser, run, run_backend
+
+
+class TestServerBenchmark(unittest.TestCase):
+    """Test load generation against both backends."""
+
+    def test_run_backend_in_process(self):
+        """Test that every request is answered and captured, with and without keep-alive."""
+        for backend, pipeline in [(ServerBackend.THREADING, 4), (ServerBackend.ASYNCIO, 4)]:
+            with self.subTest(backend=backend):
+                result = run_backend(backend, connections=4, requests=40, pipeline=pipeline, isolate=False)
+
+                self.assertEqual((result.requests, result.errors, result.captured), (40, 0, 40))
+                self.assertGreater(result.requests_per_second, 0.0)
+                self.assertLessEqual(result.p50_ms, result.p99_ms)
+                self.assertLessEqual(result.p99_ms, result.max_ms)
+
+    def test_cli_report(self):
+        """Test that the command line writes one JSON result per selected backend."""
+        stream = io.StringIO()
+        summary = io.StringIO()
+        args = build_parser().parse_args(["--backend", "asyncio", "-c", "2", "-n", "10", "--in-process"])
+
+        self.assertEqual(run(args, stream, summary), 0)
+
+        report = json.loads(stream.getvalue())
+        self.assertEqual([r["backend"] for r in report["results"]], ["asyncio"])
+        self.assertEqual(report["load"]["requests"], 10)
+        self.assertIn("asyncio", summary.getvalue())
+        self.assertEqual(run(build_parser().parse_args(["--pipeline", "0"]), stream, summary), 2)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+
+        self.assertEqual(_percentile(values, 0.5), 51.0)
+        self.assertEqual(_percentile(values, 0.99), 100.0)
+        self.assertEqual(_percentile([], 0.99), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
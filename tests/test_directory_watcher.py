@@ -0,0 +1,239 @@
+"""
+Unit tests for the file optimization folder watch mode.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+from PyQt6.QtWidgets import QApplication
+
+from devboost.tools.file_optimization import OptimizationManager, OptimizationSettings, tool_probe
+from devboost.tools.file_optimization.models import BatchOperationResult
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+from devboost.tools.file_optimization.watcher import DirectoryWatcher, WatchManifest
+
+
+def setUpModule():
+    """Point engines built without a probe cache at a throwaway one instead of the user's shared cache."""
+    temp_dir = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(temp_dir.cleanup)
+    probe_patch = patch.object(tool_probe, "_default_probe_cache", ToolProbeCache(Path(temp_dir.name) / "probes.json"))
+    probe_patch.start()
+    unittest.addModuleCleanup(probe_patch.stop)
+
+
+def _create_png(path: Path, color: tuple[int, int, int] = (120, 40, 200)) -> Path:
+    """Create a small PNG image for watch tests."""
+    Image.new("RGB", (16, 16), color).save(path)
+    return path
+
+
+def _fake_batch(file_paths, output_dir=None, settings=None, progress_callback=None):
+    """Pretend to optimize files by writing a -compressed copy next to each one."""
+    results = []
+    for path in file_paths:
+        output = path.parent / f"{path.stem}-compressed{path.suffix}"
+        output.write_bytes(path.read_bytes()[:-1])
+        results.append(BatchOperationResult(file_path=path, success=True, original_size=path.stat().st_size))
+    return results
+
+
+class TestWatchManifest(unittest.TestCase):
+    """Test change detection against the persistent manifest."""
+
+    def setUp(self):
+        """Set up a watched folder and a manifest file outside it."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.folder = self.work_dir / "assets"
+        self.folder.mkdir()
+        self.manifest_file = self.work_dir / "manifest.json"
+        self.settings = OptimizationSettings()
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _record_all(self, manifest: WatchManifest, settings: OptimizationSettings) -> list[Path]:
+        changed = manifest.find_changes(settings)
+        for path in changed:
+            manifest.record(BatchOperationResult(file_path=path, success=True), settings, None)
+        manifest.save()
+        return changed
+
+    def test_new_files_then_nothing_changed(self):
+        """Test that files are reported once and not again after being recorded."""
+        _create_png(self.folder / "a.png")
+        (self.folder / "sub").mkdir()
+        _create_png(self.folder / "sub" / "b.png")
+        (self.folder / "notes.txt").write_text("not an asset")
+
+        manifest = WatchManifest(self.folder, self.manifest_file)
+        self.assertEqual(len(self._record_all(manifest, self.settings)), 2)
+
+        reloaded = WatchManifest(self.folder, self.manifest_file)
+        self.assertEqual(reloaded.find_changes(self.settings), [])
+
+    def test_modified_and_touched_files(self):
+        """Test that changed content is reported while touching a file with identical bytes is not."""
+        changed_file = _create_png(self.folder / "changed.png")
+        touched_file = _create_png(self.folder / "touched.png")
+        manifest = WatchManifest(self.folder, self.manifest_file)
+        self._record_all(manifest, self.settings)
+
+        _create_png(changed_file, (0, 255, 0))
+        later = time.time() + 5
+        os.utime(changed_file, (later, later))
+        os.utime(touched_file, (later, later))
+
+        self.assertEqual(manifest.find_changes(self.settings), [changed_file.resolve()])
+
+    def test_settings_change_reports_every_file(self):
+        """Test that files optimized with other settings are optimized again."""
+        _create_png(self.folder / "a.png")
+        _create_png(self.folder / "b.png")
+        manifest = WatchManifest(self.folder, self.manifest_file)
+        self._record_all(manifest, self.settings)
+
+        self.assertEqual(len(manifest.find_changes(OptimizationSettings(image_quality=40))), 2)
+
+    def test_outputs_and_work_files_are_ignored(self):
+        """Test that optimized outputs and hidden work files are not treated as inputs."""
+        _create_png(self.folder / "a-compressed.png")
+        _create_png(self.folder / ".a.optimizing.png")
+
+        self.assertEqual(WatchManifest(self.folder, self.manifest_file).find_changes(self.settings), [])
+
+    def test_failed_results_are_retried(self):
+        """Test that files whose optimization failed stay pending."""
+        path = _create_png(self.folder / "a.png")
+        manifest = WatchManifest(self.folder, self.manifest_file)
+        manifest.find_changes(self.settings)
+        manifest.record(BatchOperationResult(file_path=path, success=False), self.settings, None)
+
+        self.assertEqual(manifest.find_changes(self.settings), [path.resolve()])
+
+    def test_rescan_of_large_folder_is_fast(self):
+        """Test that an unchanged folder is rescanned from stat data without hashing."""
+        for i in range(2000):
+            (self.folder / f"img_{i}.png").write_bytes(b"\x89PNG" + i.to_bytes(4, "big"))
+        manifest = WatchManifest(self.folder, self.manifest_file)
+        self._record_all(manifest, self.settings)
+        changed_file = self.folder / "img_7.png"
+        changed_file.write_bytes(b"\x89PNG changed")
+
+        with patch("devboost.tools.file_optimization.cache.OptimizationCache.hash_file", return_value="x") as mock:
+            changed = manifest.find_changes(self.settings)
+
+        self.assertEqual(changed, [changed_file.resolve()])
+        mock.assert_called_once()
+
+    def test_symlinked_file_is_recorded(self):
+        """Test that a symlink to a file is reported once, not on every sync."""
+        target = _create_png(self.work_dir / "outside.png")
+        (self.folder / "linked.png").symlink_to(target)
+        manifest = WatchManifest(self.folder, self.manifest_file)
+
+        self.assertEqual(len(self._record_all(manifest, self.settings)), 1)
+        self.assertEqual(manifest.find_changes(self.settings), [])
+
+
+class TestDirectoryWatcher(unittest.TestCase):
+    """Test syncing a watched folder through the OptimizationManager."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up QApplication for the filesystem watcher and timers."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up a watched folder and a watcher with a mocked batch run."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.folder = self.work_dir / "assets"
+        self.folder.mkdir()
+        self.manager = OptimizationManager()
+        self.watcher = DirectoryWatcher(
+            self.folder,
+            self.manager,
+            OptimizationSettings,
+            manifest=WatchManifest(self.folder, self.work_dir / "manifest.json"),
+            debounce_ms=0,
+            poll_interval_ms=0,
+        )
+
+    def tearDown(self):
+        """Stop watching and remove temporary files."""
+        self.watcher.stop()
+        self.manager.cleanup()
+        self.temp_dir.cleanup()
+
+    def test_only_changed_files_are_optimized(self):
+        """Test that the first sync optimizes everything and later syncs only new files."""
+        _create_png(self.folder / "a.png")
+        _create_png(self.folder / "b.png")
+
+        with patch.object(self.manager, "optimize_batch", side_effect=_fake_batch) as mock_batch:
+            self.assertEqual(len(self.watcher.sync()), 2)
+            self.assertTrue(self.watcher.is_watching)
+
+            self.assertEqual(self.watcher.sync(), [])
+
+            added = _create_png(self.folder / "c.png")
+            results = self.watcher.sync()
+
+        self.assertEqual([r.file_path for r in results], [added.resolve()])
+        self.assertEqual(mock_batch.call_count, 2)
+
+    def test_start_syncs_off_the_calling_thread(self):
+        """Test that the initial sync runs on the sync thread and reports through sync_completed."""
+        _create_png(self.folder / "a.png")
+        threads = []
+        completed = []
+        self.watcher.sync_completed.connect(completed.append)
+
+        def fake_batch(file_paths, output_dir=None, settings=None, progress_callback=None):
+            threads.append(threading.current_thread())
+            return _fake_batch(file_paths, output_dir, settings, progress_callback)
+
+        with patch.object(self.manager, "optimize_batch", side_effect=fake_batch):
+            self.watcher.start()
+            self.watcher.wait_for_sync(timeout=10)
+        QApplication.processEvents()
+
+        self.assertNotEqual(threads, [threading.current_thread()])
+        self.assertEqual(len(threads), 1)
+        self.assertEqual([len(results) for results in completed], [1])
+        self.assertFalse(self.watcher.is_syncing)
+
+    def test_busy_manager_defers_sync(self):
+        """Test that a sync while another batch is running is retried after the debounce."""
+        _create_png(self.folder / "a.png")
+
+        with (
+            patch.object(self.manager, "is_processing", return_value=True),
+            patch.object(self.manager, "optimize_batch") as mock_batch,
+        ):
+            self.assertEqual(self.watcher.sync(), [])
+
+        mock_batch.assert_not_called()
+        self.assertTrue(self.watcher._debounce_timer.isActive())
+
+    def test_events_are_debounced(self):
+        """Test that a burst of directory events starts a single pending sync."""
+        with patch.object(self.watcher, "sync") as mock_sync:
+            for _ in range(5):
+                self.watcher._on_directory_changed(str(self.folder))
+
+            self.assertTrue(self.watcher._debounce_timer.isActive())
+            mock_sync.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
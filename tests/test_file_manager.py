@@ -0,0 +1,334 @@
+"""
+Unit tests for URL and base64 ingestion in the file optimization FileManager.
+"""
+
+import base64
+import io
+import shutil
+import tempfile
+import threading
+import tracemalloc
+import unittest
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from devboost.tools.file_optimization import FileManager
+from devboost.tools.file_optimization.base64_stream import Base64StreamDecoder, iter_text_chunks
+from devboost.tools.file_optimization.downloader import URLDownloader
+from devboost.tools.file_optimization.file_manager import _BASE64_TEXT
+
+PNG_BODY = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 64
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serve in-memory files with Range support; optionally cut the first response short."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, self.headers.get("Range")))
+        name = self.path.split("?")[0]
+        body = server.files.get(name)
+        if body is None:
+            self.send_error(404)
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and server.ranges:
+            start = int(range_header.removeprefix("bytes=").split("-")[0])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", server.content_type)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+
+        payload = body[start:]
+        with server.lock:
+            drop_after = server.drop_after.pop(name, None)
+        if drop_after is not None:
+            # Close the connection mid-body once, like a dropped link during a large download
+            self.wfile.write(payload[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestURLDownloads(unittest.TestCase):
+    """Test concurrent, resumable downloads against a local HTTP server."""
+
+    def setUp(self):
+        """Start a local HTTP server and a downloader writing to a temporary directory."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.files = {
+            "/image.png": PNG_BODY,
+            "/noext": PNG_BODY,
+            "/video.mp4": b"\x00\x00\x00\x18ftypisom" + bytes(200_000),
+            "/archive.bin": bytes(200_000),
+        }
+        self.server.drop_after = {}
+        self.server.ranges = True
+        self.server.content_type = "application/octet-stream"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.downloader = URLDownloader(
+            max_downloads=2, timeout=5, download_dir=Path(self.temp_dir.name), chunk_size=16 * 1024
+        )
+
+    def tearDown(self):
+        """Stop the server and remove downloaded files."""
+        self.downloader.shutdown()
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def test_concurrent_downloads(self):
+        """Test that several URLs download in parallel and keep their order."""
+        urls = [f"{self.base_url}/image.png", f"{self.base_url}/video.mp4", f"{self.base_url}/missing.png"]
+
+        jobs = self.downloader.download_all(urls)
+
+        self.assertEqual([job.success for job in jobs], [True, True, False])
+        self.assertEqual(jobs[0].path.read_bytes(), PNG_BODY)
+        self.assertEqual((jobs[1].file_type, jobs[1].total_size), ("video", 200_012))
+        self.assertIn("404", jobs[2].error)
+        self.assertFalse(jobs[2].path.exists())
+
+    def test_type_detected_from_first_chunk(self):
+        """Test that the type callback fires before the download completes."""
+        seen = []
+        job = self.downloader.submit(
+            f"{self.base_url}/video.mp4",
+            type_callback=lambda j: seen.append((j.mime_type, j.received)),
+        )
+
+        self.assertTrue(job.detected.wait(5))
+        job.future.result(timeout=5)
+
+        self.assertEqual(seen, [("video/mp4", 0)])
+
+    def test_interrupted_download_is_resumed_with_range(self):
+        """Test that a dropped connection continues from the received offset."""
+        self.server.drop_after["/video.mp4"] = 50_000
+        progress = []
+
+        job = self.downloader.submit(
+            f"{self.base_url}/video.mp4", progress_callback=lambda j: progress.append(j.received)
+        )
+        job.future.result(timeout=10)
+
+        self.assertTrue(job.success, job.error)
+        self.assertEqual(job.resumed, 1)
+        self.assertEqual(job.path.read_bytes(), self.server.files["/video.mp4"])
+        # Only the complete 16 KiB chunks received before the drop are kept
+        self.assertEqual(self.server.requests[-1], ("/video.mp4", "bytes=49152-"))
+        self.assertEqual(progress[-1], 200_012)
+
+    def test_server_without_ranges_restarts(self):
+        """Test that a server ignoring Range headers gets a full restart instead of a corrupt append."""
+        self.server.drop_after["/video.mp4"] = 50_000
+        self.server.ranges = False
+
+        job = self.downloader.submit(f"{self.base_url}/video.mp4")
+        job.future.result(timeout=10)
+
+        self.assertTrue(job.success, job.error)
+        self.assertEqual(job.path.read_bytes(), self.server.files["/video.mp4"])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_extension_from_sniffed_type(self):
+        """Test that extensionless URLs get the extension of their detected type."""
+        job = self.downloader.submit(f"{self.base_url}/noext")
+        job.future.result(timeout=5)
+
+        self.assertEqual(job.path.suffix, ".png")
+
+    def test_rejects_non_http_urls(self):
+        """Test that only http and https URLs are accepted."""
+        with self.assertRaises(ValueError):
+            self.downloader.submit("file:///etc/passwd")
+
+    def test_file_manager_process_urls(self):
+        """Test that FileManager returns FileInfo for downloaded URLs and tracks them for cleanup."""
+        file_manager = FileManager(backup_dir=Path(self.temp_dir.name) / "backups")
+        file_manager._downloader = self.downloader
+
+        infos = file_manager.process_urls([f"{self.base_url}/image.png", f"{self.base_url}/missing.png"])
+
+        self.assertEqual(len(infos), 1)
+        self.assertTrue(infos[0].magic_detected)
+        self.assertEqual(infos[0].file_type, "image")
+        self.assertEqual(file_manager.temp_files, [infos[0].path])
+
+    def test_file_manager_routes_url_input(self):
+        """Test that pasted URLs, one per line, are downloaded instead of treated as a path."""
+        file_manager = FileManager(backup_dir=Path(self.temp_dir.name) / "backups")
+        file_manager._downloader = self.downloader
+
+        infos = file_manager.process_input(f"{self.base_url}/image.png\n{self.base_url}/video.mp4\n")
+
+        self.assertEqual([info.file_type for info in infos], ["image", "video"])
+
+    def test_unsupported_download_is_cancelled_after_first_chunk(self):
+        """Test that a URL sniffed as an unsupported type is not downloaded in full."""
+        file_manager = FileManager(backup_dir=Path(self.temp_dir.name) / "backups")
+        file_manager._downloader = self.downloader
+        jobs = []
+
+        infos = file_manager.process_urls([f"{self.base_url}/archive.bin"], type_callback=jobs.append)
+
+        self.assertEqual(infos, [])
+        self.assertEqual(jobs[0].file_type, "unknown")
+        self.assertEqual(jobs[0].received, 0)
+        self.assertFalse(jobs[0].path.exists())
+
+    def test_cleanup_shuts_down_downloader(self):
+        """Test that cleaning up stops the download workers and a later download starts a new pool."""
+        file_manager = FileManager(backup_dir=Path(self.temp_dir.name) / "backups")
+        downloader = file_manager.get_downloader()
+
+        with patch.object(downloader, "shutdown", wraps=downloader.shutdown) as mock_shutdown:
+            file_manager.cleanup_temp_files()
+
+        mock_shutdown.assert_called_once()
+        self.assertIsNot(file_manager.get_downloader(), downloader)
+        file_manager.cleanup_temp_files()
+
+
+class TestBase64Ingestion(unittest.TestCase):
+    """Test streaming base64 and data URL decoding."""
+
+    def setUp(self):
+        """Set up a FileManager with a temporary backup directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_manager = FileManager(backup_dir=Path(self.temp_dir.name) / "backups")
+
+    def tearDown(self):
+        """Remove decoded files."""
+        self.file_manager.cleanup_temp_files()
+        self.temp_dir.cleanup()
+
+    def _decode_in_pieces(self, text: str, piece: int) -> bytes:
+        decoder = Base64StreamDecoder()
+        return b"".join(decoder.decode(chunk) for chunk in iter_text_chunks(text, chunk_chars=piece)) + decoder.finish()
+
+    def test_decoder_matches_b64decode_for_any_split(self):
+        """Test that decoding in pieces of any size gives the same bytes, ignoring line breaks."""
+        data = bytes(range(256)) * 3 + b"xy"
+        encoded = base64.encodebytes(data).decode()  # 76-character lines
+
+        for piece in (1, 3, 4, 7, 77, 4096):
+            with self.subTest(piece=piece):
+                self.assertEqual(self._decode_in_pieces(encoded, piece), data)
+
+    def test_decoder_tolerates_missing_padding_and_rejects_garbage(self):
+        """Test unpadded endings and data after padding."""
+        self.assertEqual(self._decode_in_pieces(base64.b64encode(b"hello").decode().rstrip("="), 2), b"hello")
+        with self.assertRaises(ValueError):
+            self._decode_in_pieces("aGk=aGk=", 8)
+        with self.assertRaises(ValueError):
+            self._decode_in_pieces("aGVsbG8x" + "a", 4)
+
+    def test_decoder_reads_text_streams(self):
+        """Test decoding from a text stream instead of a string."""
+        decoder = Base64StreamDecoder()
+        stream = io.StringIO(base64.b64encode(PNG_BODY).decode())
+
+        decoded = b"".join(decoder.decode(chunk) for chunk in iter_text_chunks(stream, chunk_chars=100))
+
+        self.assertEqual(decoded + decoder.finish(), PNG_BODY)
+
+    def test_data_url_extension_follows_sniffed_type(self):
+        """Test that the decoded bytes, not the declared MIME type, choose the file extension."""
+        data_url = "data:image/jpeg;base64," + base64.b64encode(PNG_BODY).decode()
+
+        infos = self.file_manager._process_base64(data_url)
+
+        self.assertEqual(infos[0].path.suffix, ".png")
+        self.assertEqual(infos[0].path.read_bytes(), PNG_BODY)
+        self.assertTrue(infos[0].magic_detected)
+
+    def test_process_input_routes_base64(self):
+        """Test that pasted data URLs and plain base64 are decoded instead of treated as a path."""
+        encoded = base64.b64encode(PNG_BODY).decode()
+
+        for text in (f"data:image/png;base64,{encoded}\n", encoded):
+            with self.subTest(text=text[:16]):
+                infos = self.file_manager.process_input(text)
+
+                self.assertEqual(len(infos), 1)
+                self.assertEqual(infos[0].path.read_bytes(), PNG_BODY)
+
+    def test_process_input_prefers_existing_base64_like_path(self):
+        """Test that an extensionless absolute path that is also valid base64 text is read as a path."""
+        # Temporary directory names may contain "_", so use a hex name that only holds base64 characters
+        directory = Path(tempfile.gettempdir()) / uuid.uuid4().hex
+        if not _BASE64_TEXT.fullmatch(str(directory)):
+            self.skipTest(f"Temporary directory is not base64 text: {directory}")
+        directory.mkdir()
+        self.addCleanup(shutil.rmtree, directory)
+        path = directory / "optimizedimage"
+        path = path.with_name(path.name + "x" * (-len(str(path)) % 4))
+        path.write_bytes(PNG_BODY)
+
+        self.assertTrue(self.file_manager._is_base64_image(str(path)))
+        infos = self.file_manager.process_input(str(path))
+
+        self.assertEqual([info.path for info in infos], [path.resolve()])
+        self.assertEqual(self.file_manager.temp_files, [])
+
+    def test_process_links_decodes_data_urls(self):
+        """Test that dropped data URLs are decoded without touching the downloader."""
+        data_url = "data:image/png;base64," + base64.b64encode(PNG_BODY).decode()
+
+        infos = self.file_manager.process_links([data_url])
+
+        self.assertEqual(infos[0].file_type, "image")
+        self.assertEqual(self.file_manager.temp_files, [infos[0].path])
+        self.assertIsNone(self.file_manager._downloader)
+
+    def test_invalid_payload_leaves_no_file(self):
+        """Test that a payload failing midway is reported and its partial file removed."""
+        payload = base64.b64encode(PNG_BODY).decode() + "=AAAA"
+
+        self.assertEqual(self.file_manager._process_base64(payload), [])
+        self.assertEqual(self.file_manager.temp_files, [])
+
+    def test_plain_base64_detection(self):
+        """Test recognising pasted base64 without decoding it."""
+        self.assertTrue(self.file_manager._is_base64_image(base64.b64encode(PNG_BODY).decode()))
+        self.assertFalse(self.file_manager._is_base64_image("not base64 " * 10))
+
+    def test_peak_memory_is_bounded(self):
+        """Test that decoding a large payload does not allocate a decoded copy of it."""
+        payload = bytes(range(256)) * (32 * 1024)  # 8 MiB
+        data_url = "data:image/png;base64," + base64.b64encode(b"\x89PNG\r\n\x1a\n" + payload).decode()
+
+        tracemalloc.start()
+        try:
+            infos = self.file_manager._process_base64(data_url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(infos[0].size, len(payload) + 8)
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,17 +2,47 @@
 Unit tests for file handling and type detection in the file optimization tool.
 """
 
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, mock_open, patch
 
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+from PyQt6 import sip
+from PyQt6.QtCore import Qt
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication, QListView, QStyleOptionViewItem
+
 from devboost.tools.file_optimization import (
     FileManager,
     FileTypeDetector,
     ImageOptimizationEngine,
     OptimizationSettings,
     QualityPreset,
+    tool_probe,
 )
+from devboost.tools.file_optimization.detector import SignatureTrie
+from devboost.tools.file_optimization.images import estimate_jpeg_quality
+from devboost.tools.file_optimization.models import FileInfo
+from devboost.tools.file_optimization.process_runner import ProcessResult
+from devboost.tools.file_optimization.scanner import FileScanner, scan_paths
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+from devboost.tools.file_optimization.ui.file_list import FileListDelegate, FileListModel
+
+
+def setUpModule():
+    """Point engines built without a probe cache at a throwaway one instead of the user's shared cache."""
+    temp_dir = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(temp_dir.cleanup)
+    probe_patch = patch.object(tool_probe, "_default_probe_cache", ToolProbeCache(Path(temp_dir.name) / "probes.json"))
+    probe_patch.start()
+    unittest.addModuleCleanup(probe_patch.stop)
 
 
 class TestFileTypeDetector(unittest.TestCase):
@@ -47,6 +77,178 @@ class TestFileTypeDetector(unittest.TestCase):
             # Should detect as image based on magic number
             self.assertIn(file_info.file_type, ["image", "unknown"])  # Allow both as magic detection may vary
 
+    def test_detect_mime_from_header(self):
+        """Test signature matching, including the RIFF and ftyp special cases."""
+        cases = {
+            b"\x89PNG\r\n\x1a\n" + bytes(24): "image/png",
+            b"\xff\xd8\xff\xe0" + bytes(28): "image/jpeg",
+            b"\x00\x00\x00\x18ftypheic" + bytes(20): "image/heic",
+            b"\x00\x00\x00\x18ftypisom" + bytes(20): "video/mp4",
+            b"\x00\x00\x00\x1cftypheic" + bytes(20): "image/heic",
+            b"RIFF\x00\x00\x00\x00WEBPVP8 ": "image/webp",
+            b"RIFF\x00\x00\x00\x00AVI LIST": "video/avi",
+            b"RIFF\x00\x00\x00\x00WAVEfmt ": None,
+            b"%PDF-1.7\n": "application/pdf",
+            b"plain text": None,
+            b"": None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header[:12]):
+                self.assertEqual(FileTypeDetector.detect_mime_from_header(header), expected)
+
+    def test_signature_trie_prefers_longest_match(self):
+        """Test that the trie returns every matching signature, most specific first."""
+        trie = SignatureTrie({b"ab": "short", b"abcd": "long", b"x": "other"})
+
+        self.assertEqual(trie.match(b"abcdef"), [(b"abcd", "long"), (b"ab", "short")])
+        self.assertEqual(trie.match(b"abx"), [(b"ab", "short")])
+        self.assertEqual(trie.match(b"zzz"), [])
+
+
+class TestFileScanner(unittest.TestCase):
+    """Test background scanning of dropped files."""
+
+    def setUp(self):
+        """Set up a folder of small files and a scanner with small chunks."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.paths = []
+        for i in range(10):
+            path = self.work_dir / f"image_{i}.png"
+            path.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(8))
+            self.paths.append(str(path))
+        (self.work_dir / "notes.txt").write_text("text")
+        self.scanner = FileScanner(max_workers=2, chunk_size=4)
+        self.chunks = []
+        self.finished = []
+        self.scanner.files_scanned.connect(
+            lambda scan_id, infos: self.chunks.append((scan_id, infos)), Qt.ConnectionType.DirectConnection
+        )
+        self.scanner.scan_finished.connect(
+            lambda scan_id, count: self.finished.append((scan_id, count)), Qt.ConnectionType.DirectConnection
+        )
+
+    def tearDown(self):
+        """Stop the scanner and remove temporary files."""
+        self.scanner.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_scan_paths_skips_missing_files_and_directories(self):
+        """Test that only existing regular files are reported."""
+        infos = scan_paths([self.paths[0], str(self.work_dir / "missing.png"), str(self.work_dir)])
+
+        self.assertEqual([info.path.name for info in infos], ["image_0.png"])
+        self.assertTrue(infos[0].magic_detected)
+
+    def test_results_stream_in_chunks(self):
+        """Test that a scan reports each chunk as it finishes and then the total."""
+        paths = [*self.paths, str(self.work_dir / "notes.txt")]
+
+        scan_id = self.scanner.scan(paths)
+        self.scanner.wait_for_scan(timeout=10)
+
+        self.assertEqual(sorted(len(infos) for _, infos in self.chunks), [3, 4, 4])
+        self.assertEqual({sid for sid, _ in self.chunks}, {scan_id})
+        scanned = [info for _, infos in self.chunks for info in infos]
+        self.assertEqual(sum(1 for info in scanned if info.is_supported), 10)
+        self.assertEqual(self.finished, [(scan_id, 11)])
+
+    def test_urls_go_to_the_url_fetcher(self):
+        """Test that dropped links and data URLs go to the URL fetcher as one task and paths are scanned."""
+        fetched = []
+        self.scanner.url_fetcher = lambda urls: fetched.append(urls) or scan_paths([self.paths[0]])
+        urls = ["https://example.com/photo.png", "http://example.com/clip.mp4", "data:image/png;base64,iVBORw0KGgo="]
+
+        scan_id = self.scanner.scan([*self.paths[1:3], *urls])
+        self.scanner.wait_for_scan(timeout=10)
+
+        self.assertEqual(fetched, [urls])
+        self.assertEqual(sorted(len(infos) for _, infos in self.chunks), [1, 2])
+        self.assertEqual(self.finished, [(scan_id, 3)])
+
+    def test_empty_scan_finishes_immediately(self):
+        """Test that scanning nothing reports an empty result."""
+        scan_id = self.scanner.scan([])
+
+        self.assertEqual(self.finished, [(scan_id, 0)])
+
+    def test_cancelled_scan_reports_nothing(self):
+        """Test that results of a cancelled scan are dropped."""
+        with patch(
+            "devboost.tools.file_optimization.scanner.scan_paths", side_effect=lambda paths: time.sleep(0.05) or []
+        ):
+            self.scanner.scan(self.paths)
+            self.scanner.cancel()
+            time.sleep(0.3)
+
+        self.assertEqual(self.chunks, [])
+        self.assertEqual(self.finished, [])
+
+
+class TestFileListModel(unittest.TestCase):
+    """Test the model/view file list used for large drops."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up QApplication for the list view."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Set up a model over a shared file list and a view painting it."""
+        self.files = []
+        self.model = FileListModel(self.files)
+        self.delegate = FileListDelegate()
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(self.delegate)
+        self.view.resize(600, 300)
+
+    def tearDown(self):
+        """Delete the view before the model and delegate."""
+        sip.delete(self.view)
+
+    def _infos(self, count: int) -> list[FileInfo]:
+        return [FileInfo(Path(f"/tmp/image_{i}.png"), 2048, "image/png", "image", ".png", True) for i in range(count)]
+
+    def test_chunk_is_one_insertion(self):
+        """Test that a chunk of files is added as one row insertion into the shared list."""
+        inserted = []
+        self.model.rowsInserted.connect(lambda _parent, first, last: inserted.append((first, last)))
+
+        self.model.add_files(self._infos(256))
+        self.model.add_files(self._infos(4))
+
+        self.assertEqual(inserted, [(0, 255), (256, 259)])
+        self.assertEqual(len(self.files), 260)
+        self.assertEqual(self.model.data(self.model.index(1)), "🖼️ image_1.png")
+
+    def test_remove_and_clear(self):
+        """Test removing one file by path and clearing the list."""
+        self.model.add_files(self._infos(3))
+
+        self.assertTrue(self.model.remove_file(Path("/tmp/image_1.png")))
+        self.assertFalse(self.model.remove_file(Path("/tmp/missing.png")))
+        self.assertEqual([info.path.name for info in self.files], ["image_0.png", "image_2.png"])
+
+        self.model.clear()
+        self.assertEqual(self.model.rowCount(), 0)
+
+    def test_remove_action_emits_path(self):
+        """Test that clicking a row's remove action requests removing that file."""
+        self.model.add_files(self._infos(2))
+        self.view.show()
+        removed = []
+        self.delegate.remove_requested.connect(removed.append)
+
+        option = QStyleOptionViewItem()
+        self.view.initViewItemOption(option)
+        option.rect = self.view.visualRect(self.model.index(1))
+        QTest.mouseClick(
+            self.view.viewport(), Qt.MouseButton.LeftButton, pos=self.delegate._remove_rect(option).center()
+        )
+
+        self.assertEqual(removed, [Path("/tmp/image_1.png")])
+
 
 class TestFileManager(unittest.TestCase):
     """Test file management functionality."""
@@ -126,8 +328,6 @@ class TestImageOptimizationEngine(unittest.TestCase):
 
     def test_resize_image_basic(self):
         """Test basic image resizing."""
-        from PIL import Image
-
         mock_image = Mock(spec=Image.Image)
         mock_image.size = (2000, 1500)
         mock_resized = Mock(spec=Image.Image)
@@ -136,6 +336,289 @@ class TestImageOptimizationEngine(unittest.TestCase):
         result = self.engine._resize_image(mock_image, max_width=1000, max_height=750)
         self.assertIsNotNone(result)
 
+    def test_pil_jpeg_resize_decodes_in_draft_mode(self):
+        """Test that downscaled JPEGs are decoded at reduced resolution and report time and memory."""
+        settings = OptimizationSettings(max_width=400, max_height=400)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = Path(temp_dir) / "large.jpg"
+            output_path = Path(temp_dir) / "large-compressed.jpg"
+            Image.new("RGB", (3200, 2400), (30, 120, 200)).save(input_path, quality=90)
+
+            with patch.object(JpegImageFile, "draft", autospec=True, side_effect=JpegImageFile.draft) as mock_draft:
+                result = self.engine.optimize_image(input_path, output_path, settings, method="pil")
+
+            with Image.open(output_path) as optimized:
+                self.assertEqual(optimized.size, (400, 300))
+
+        mock_draft.assert_called_once()
+        self.assertEqual(mock_draft.call_args[0][2], (400, 300))
+        self.assertEqual(result["output_dimensions"], (400, 300))
+        # Draft mode decodes at 1/8 scale, so only the reduced pixels are held in memory
+        self.assertEqual(result["decoded_dimensions"], (400, 300))
+        self.assertEqual(result["decoded_bytes"], 400 * 300 * 3)
+        self.assertGreater(result["processing_time"], 0)
+        if result["peak_rss_growth_bytes"] is not None:
+            self.assertGreaterEqual(result["peak_rss_growth_bytes"], 0)
+
+    def test_pil_png_resize_without_draft(self):
+        """Test that formats without draft support are still resized to the target size."""
+        settings = OptimizationSettings(max_width=100)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = Path(temp_dir) / "wide.png"
+            Image.new("RGBA", (1000, 500), (255, 0, 0, 128)).save(input_path)
+
+            result = self.engine.optimize_image(input_path, Path(temp_dir) / "out.png", settings, method="pil")
+
+        self.assertEqual(result["output_dimensions"], (100, 50))
+
+
+# Runs one metadata-strip path in a fresh interpreter and prints its time and peak RSS as JSON
+_STRIP_BENCHMARK_SCRIPT = """
+import json, resource, sys, time
+from pathlib import Path
+from PIL import Image
+from devboost.tools.file_optimization import ImageOptimizationEngine, OptimizationSettings
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+
+mode, src, dst = sys.argv[1:4]
+engine = ImageOptimizationEngine(probe_cache=ToolProbeCache(Path(dst).with_name("probes.json")))
+start = time.perf_counter()
+if mode == "pixel_copy":
+    # Previous implementation: copy every pixel into a fresh image to lose the metadata
+    with Image.open(src) as img:
+        clean = Image.new(img.mode, img.size)
+        clean.putdata(img.getdata())
+        clean.save(dst, quality=75, optimize=True, progressive=True)
+else:
+    engine.optimize_image(Path(src), Path(dst), OptimizationSettings(), method="pil")
+elapsed = time.perf_counter() - start
+print(json.dumps({"time": elapsed, "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+class TestMetadataStripping(unittest.TestCase):
+    """Test that metadata is stripped at save time without copying pixels."""
+
+    def setUp(self):
+        """Set up an engine and a temporary directory."""
+        self.engine = ImageOptimizationEngine()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _create_jpeg_with_metadata(self, size: tuple[int, int]) -> Path:
+        exif = Image.Exif()
+        exif[0x010F] = "TestCamera"  # Make
+        path = self.work_dir / "photo.jpg"
+        Image.effect_noise(size, 40).convert("RGB").save(path, quality=90, exif=exif.tobytes(), icc_profile=b"icc")
+        return path
+
+    def test_metadata_removed_without_pixel_copy(self):
+        """Test that EXIF and ICC are dropped and getdata/putdata are never used."""
+        input_path = self._create_jpeg_with_metadata((64, 48))
+        output_path = self.work_dir / "out.jpg"
+
+        with (
+            patch.object(Image.Image, "getdata") as mock_getdata,
+            patch.object(Image.Image, "putdata") as mock_putdata,
+        ):
+            self.engine.optimize_image(input_path, output_path, OptimizationSettings(), method="pil")
+
+        mock_getdata.assert_not_called()
+        mock_putdata.assert_not_called()
+        with Image.open(output_path) as optimized:
+            self.assertNotIn("exif", optimized.info)
+            self.assertNotIn("icc_profile", optimized.info)
+
+    def test_strip_keeps_rendering_info(self):
+        """Test that stripping only removes metadata keys and keeps keys that affect rendering."""
+        img = Image.new("P", (4, 4))
+        img.info.update({"exif": b"exif", "icc_profile": b"icc", "transparency": 0})
+
+        self.engine._strip_metadata(img)
+
+        self.assertEqual(img.info, {"transparency": 0})
+
+    @unittest.skipIf(sys.platform == "win32", "peak RSS is measured with the resource module")
+    def test_benchmark_against_pixel_copy(self):
+        """Benchmark time and peak memory of the old pixel-copy strip against the save-time strip."""
+        input_path = self._create_jpeg_with_metadata((3000, 2000))
+        measurements = {}
+        for mode in ("pixel_copy", "save_time"):
+            completed = subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    "-W",
+                    "ignore",
+                    "-c",
+                    _STRIP_BENCHMARK_SCRIPT,
+                    mode,
+                    str(input_path),
+                    str(self.work_dir / f"{mode}.jpg"),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).resolve().parent.parent,
+                env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+            )
+            measurements[mode] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        before, after = measurements["pixel_copy"], measurements["save_time"]
+        self.assertLess(after["peak_rss"], before["peak_rss"], measurements)
+        self.assertLess(after["time"], before["time"], measurements)
+
+
+class TestGainEstimate(unittest.TestCase):
+    """Test cheap prediction of image optimization gains."""
+
+    def setUp(self):
+        """Set up a PIL-only engine and a temporary directory."""
+        self.engine = ImageOptimizationEngine()
+        self.engine._available_tools = {"pil": True}
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _save_jpeg(self, name: str, quality: int, size: tuple[int, int] = (512, 384)) -> Path:
+        path = self.work_dir / name
+        Image.effect_noise(size, 30).convert("RGB").save(path, quality=quality)
+        return path
+
+    def test_jpeg_quality_from_quantization_tables(self):
+        """Test that the libjpeg quality setting is recovered from the quantization tables."""
+        for quality in (30, 75, 95):
+            with Image.open(self._save_jpeg(f"q{quality}.jpg", quality, (32, 32))) as img:
+                self.assertEqual(estimate_jpeg_quality(img.quantization), quality)
+
+    def test_high_quality_jpeg_predicts_gain(self):
+        """Test that the sample encode predicts roughly the real gain of a full re-encode."""
+        input_path = self._save_jpeg("high.jpg", 98)
+        output_path = self.work_dir / "out.jpg"
+        settings = OptimizationSettings()
+
+        predicted = self.engine.estimate_gain(input_path, output_path, settings)
+        actual = self.engine.optimize_image(input_path, output_path, settings)["compression_ratio"]
+
+        self.assertGreater(predicted, 20)
+        self.assertAlmostEqual(predicted, actual, delta=15)
+
+    def test_already_compressed_jpeg_predicts_no_gain(self):
+        """Test that a JPEG below the target quality is predicted to gain nothing without encoding."""
+        input_path = self._save_jpeg("low.jpg", 40)
+
+        with patch.object(self.engine, "_encode_sample") as mock_encode:
+            predicted = self.engine.estimate_gain(input_path, self.work_dir / "out.jpg", OptimizationSettings())
+
+        mock_encode.assert_not_called()
+        self.assertEqual(predicted, 0.0)
+
+    def test_no_estimate_for_resize_or_lossy_tools(self):
+        """Test that resizing, conversion and pngquant are not predicted."""
+        png = self.work_dir / "image.png"
+        Image.new("RGB", (32, 32)).save(png)
+        settings = OptimizationSettings()
+
+        self.assertIsNone(self.engine.estimate_gain(png, self.work_dir / "out.jpg", settings))
+        self.assertIsNone(self.engine.estimate_gain(png, self.work_dir / "out.png", OptimizationSettings(max_width=8)))
+        self.engine._available_tools["pngquant"] = True
+        self.assertIsNone(self.engine.estimate_gain(png, self.work_dir / "out.png", settings))
+
+
+class TestImagePipeline(unittest.TestCase):
+    """Test the multi-stage image pipeline mode."""
+
+    def setUp(self):
+        """Set up an engine without external tools and a temporary directory."""
+        self.engine = ImageOptimizationEngine()
+        self.engine._available_tools = {"pil": True}
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.input_path = self.work_dir / "image.png"
+        Image.new("RGB", (64, 64), (10, 200, 30)).save(self.input_path)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_select_method_uses_pipeline(self):
+        """Test that pipeline mode overrides single-tool selection."""
+        self.assertEqual(
+            self.engine.select_method(self.input_path, OptimizationSettings(image_pipeline=True)), "pipeline"
+        )
+        self.assertEqual(self.engine.select_method(self.input_path, OptimizationSettings()), "pil")
+
+    def test_stages_chained_through_pipes_and_smallest_kept(self):
+        """Test that each tool reads the previous stage's output on stdin and the smallest output wins."""
+        self.engine._available_tools.update({"pngquant": True, "oxipng": True})
+        outputs = {"pngquant": b"q" * 50, "oxipng": b"o" * 80}
+
+        def fake_run(cmd, **kwargs):
+            return ProcessResult(success=True, returncode=0, stdout=outputs[cmd[0]], stderr=b"")
+
+        output_path = self.work_dir / "out.png"
+        with patch("devboost.tools.file_optimization.images.run_process", side_effect=fake_run) as mock_run:
+            result = self.engine.optimize_image(self.input_path, output_path, OptimizationSettings(image_pipeline=True))
+
+        pngquant_call, oxipng_call = mock_run.call_args_list
+        self.assertEqual(pngquant_call.kwargs["input_data"], self.input_path.read_bytes())
+        self.assertEqual(oxipng_call.kwargs["input_data"], outputs["pngquant"])
+        self.assertIn("--stdout", oxipng_call.args[0])
+        self.assertEqual(output_path.read_bytes(), outputs["pngquant"])
+        self.assertEqual(result["method"], "pipeline (pngquant+oxipng)")
+        self.assertEqual(result["selected_stage"], "pngquant")
+        self.assertEqual(result["stages"][0], {"stage": "resize", "skipped": "not needed"})
+
+    def test_failed_stage_passes_buffer_on(self):
+        """Test that a failing tool is skipped and the next stage receives the unchanged buffer."""
+        self.engine._available_tools.update({"pngquant": True, "oxipng": True})
+
+        def fake_run(cmd, **kwargs):
+            if cmd[0] == "pngquant":
+                return ProcessResult(success=False, returncode=99, stdout=b"", stderr=b"quality too low")
+            return ProcessResult(success=True, returncode=0, stdout=b"small", stderr=b"")
+
+        output_path = self.work_dir / "out.png"
+        with patch("devboost.tools.file_optimization.images.run_process", side_effect=fake_run) as mock_run:
+            result = self.engine.optimize_image(self.input_path, output_path, OptimizationSettings(image_pipeline=True))
+
+        self.assertEqual(mock_run.call_args_list[1].kwargs["input_data"], self.input_path.read_bytes())
+        self.assertEqual(output_path.read_bytes(), b"small")
+        self.assertIn("quality too low", result["stages"][1]["skipped"])
+
+    def test_resize_and_convert_in_memory(self):
+        """Test that the resize stage converts to the output format and missing tools are skipped."""
+        settings = OptimizationSettings(image_pipeline=True, max_width=32)
+        output_path = self.work_dir / "out.jpg"
+
+        result = self.engine.optimize_image(self.input_path, output_path, settings)
+
+        with Image.open(output_path) as optimized:
+            self.assertEqual(optimized.format, "JPEG")
+            self.assertEqual(optimized.size, (32, 32))
+        self.assertEqual(result["selected_stage"], "resize")
+        self.assertEqual(result["stages"][1], {"stage": "jpegoptim", "skipped": "not installed"})
+        # No intermediate files are written next to the output
+        self.assertEqual(sorted(self.work_dir.iterdir()), sorted([self.input_path, output_path]))
+
+    def test_no_stage_output_falls_back_to_pil(self):
+        """Test that a pipeline where every stage is skipped still produces an output."""
+        settings = OptimizationSettings(image_pipeline=True, image_pipeline_stages=["pngquant"])
+        output_path = self.work_dir / "out.png"
+
+        result = self.engine.optimize_image(self.input_path, output_path, settings)
+
+        self.assertEqual(result["method"], "PIL/Pillow")
+        self.assertTrue(output_path.exists())
+
 
 if __name__ == "__main__":
     unittest.main()
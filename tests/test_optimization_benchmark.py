@@ -0,0 +1,167 @@
+"""
+Unit tests for the file optimization benchmark suite.
+"""
+
+import io
+import json
+import tempfile
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+from unittest.mock import patch
+
+from devboost.tools.file_optimization import (
+    FileTypeDetector,
+    ImageOptimizationEngine,
+    OptimizationSettings,
+    PDFOptimizationEngine,
+)
+from devboost.tools.file_optimization.benchmark import (
+    BenchmarkCase,
+    build_parser,
+    compare_to_baseline,
+    generate_corpus,
+    run,
+    run_benchmarks,
+    run_case,
+)
+
+
+def _report(**metrics) -> dict:
+    """Build a one-case report with the given metrics."""
+    case = BenchmarkCase(engine="image", corpus="png-640x480", preset="high", files=1, **metrics)
+    return {"cases": [asdict(case)]}
+
+
+class TestBenchmarkCorpus(unittest.TestCase):
+    """Test synthetic corpus generation."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_quick_corpus_types(self):
+        """Test that images and PDFs are generated with the types their labels promise."""
+        corpus = generate_corpus(self.work_dir, engines=("image", "pdf"), quick=True)
+
+        labels = {item.label: item for item in corpus}
+        self.assertEqual(set(labels), {"png-640x480", "jpg-640x480", "gif-640x480", "pdf-2-pages"})
+        for item in corpus:
+            self.assertEqual(FileTypeDetector.detect_file_type(item.path).file_type, item.engine)
+
+    def test_corpus_is_reproducible(self):
+        """Test that every run benchmarks identical bytes."""
+        first = generate_corpus(self.work_dir / "a", engines=("image",), quick=True)
+        second = generate_corpus(self.work_dir / "b", engines=("image",), quick=True)
+
+        self.assertEqual([i.path.read_bytes() for i in first], [i.path.read_bytes() for i in second])
+
+
+class TestBenchmarkRuns(unittest.TestCase):
+    """Test running cases and the command line interface."""
+
+    def setUp(self):
+        """Set up a temporary directory and force the PIL path regardless of installed tools."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        patcher = patch.object(ImageOptimizationEngine, "_detect_available_tools", return_value={"pil": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_run_benchmarks_in_process(self):
+        """Test that each corpus item and preset produces one case with throughput and compression."""
+        corpus = generate_corpus(self.work_dir / "corpus", engines=("image",), quick=True)
+        settings = OptimizationSettings(use_cache=False, skip_if_no_gain=False)
+
+        report = run_benchmarks(
+            corpus, {"medium": settings}, self.work_dir / "out", repeat=1, isolate=False, engines=("image",)
+        )
+
+        self.assertEqual(len(report["cases"]), 3)
+        jpeg = next(BenchmarkCase.from_dict(c) for c in report["cases"] if c["corpus"] == "jpg-640x480")
+        self.assertEqual(jpeg.key, "image/jpg-640x480/medium")
+        self.assertEqual(jpeg.failures, 0)
+        self.assertGreater(jpeg.mb_per_second, 0.0)
+        self.assertGreater(jpeg.compression_ratio, 0.0)
+        self.assertEqual(jpeg.methods, ["PIL/Pillow"])
+        json.dumps(report)
+
+    def test_pdf_case_times_page_count(self):
+        """Test that PDF cases time the page count read, even when ghostscript cannot optimize."""
+        item = generate_corpus(self.work_dir / "corpus", engines=("pdf",), quick=True)[0]
+
+        with patch.object(PDFOptimizationEngine, "optimize_pdf", side_effect=RuntimeError("no ghostscript")):
+            case = run_case("pdf", "medium", OptimizationSettings(), item, self.work_dir, repeat=2)
+
+        self.assertEqual(case.failures, 2)
+        self.assertGreater(case.info_seconds, 0.0)
+
+    def test_cli_compares_with_baseline(self):
+        """Test that the exit status reports regressions against a baseline file."""
+        slow_baseline = self.work_dir / "slow.json"
+        slow_baseline.write_text(json.dumps(_report(mb_per_second=0.0001, compression_ratio=0.0)))
+        fast_baseline = self.work_dir / "fast.json"
+        fast_baseline.write_text(json.dumps(_report(mb_per_second=1e9, compression_ratio=0.0)))
+        common = ["--quick", "--engine", "image", "--preset", "high", "--repeat", "1", "--in-process"]
+        output = self.work_dir / "report.json"
+
+        summary = io.StringIO()
+        status = run(
+            build_parser().parse_args([*common, "-o", str(output), "--baseline", str(slow_baseline)]),
+            io.StringIO(),
+            summary,
+        )
+        self.assertEqual(status, 0)
+        self.assertIn("No regressions", summary.getvalue())
+        self.assertEqual(len(json.loads(output.read_text())["cases"]), 3)
+
+        summary = io.StringIO()
+        status = run(build_parser().parse_args([*common, "--baseline", str(fast_baseline)]), io.StringIO(), summary)
+        self.assertEqual(status, 1)
+        self.assertIn("REGRESSION image/png-640x480/high: mb_per_second", summary.getvalue())
+
+
+class TestBaselineComparison(unittest.TestCase):
+    """Test regression detection against a baseline report."""
+
+    def test_throughput_threshold(self):
+        """Test that throughput drops count only beyond the threshold."""
+        baseline = _report(mb_per_second=10.0)
+
+        self.assertEqual(compare_to_baseline(_report(mb_per_second=9.5), baseline, threshold=10), [])
+        regressions = compare_to_baseline(_report(mb_per_second=8.0), baseline, threshold=10)
+        self.assertEqual([(r.metric, r.change) for r in regressions], [("mb_per_second", -20.0)])
+
+    def test_compression_and_memory(self):
+        """Test that compression is compared in points and memory growth in percent."""
+        baseline = _report(compression_ratio=50.0, peak_rss_bytes=100)
+        current = _report(compression_ratio=35.0, peak_rss_bytes=150)
+
+        regressions = compare_to_baseline(current, baseline, threshold=10)
+
+        self.assertEqual(
+            [(r.metric, r.change) for r in regressions], [("compression_ratio", -15.0), ("peak_rss_bytes", 50.0)]
+        )
+        self.assertIn("-15.0 points", regressions[0].describe())
+
+    def test_improvements_new_cases_and_failures(self):
+        """Test that improvements and unmatched cases pass while new failures regress."""
+        baseline = _report(mb_per_second=10.0, peak_rss_bytes=100)
+
+        self.assertEqual(compare_to_baseline(_report(mb_per_second=20.0, peak_rss_bytes=50), baseline), [])
+        self.assertEqual(compare_to_baseline(_report(mb_per_second=1.0), {"cases": []}), [])
+        regressions = compare_to_baseline(_report(failures=1), baseline)
+        self.assertEqual([r.metric for r in regressions], ["failures"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,426 @@
+"""
+Unit tests for batch processing in the file optimization OptimizationManager.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+from PyQt6.QtCore import Qt
+
+from devboost.tools.file_optimization import (
+    ExecutorMode,
+    OptimizationCache,
+    OptimizationManager,
+    OptimizationSettings,
+    QualityPreset,
+    tool_probe,
+)
+from devboost.tools.file_optimization.scheduler import BatchScheduler, EngineBudget, default_engine_budgets
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+
+
+def setUpModule():
+    """Point engines built without a probe cache at a throwaway one instead of the user's shared cache."""
+    temp_dir = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(temp_dir.cleanup)
+    probe_patch = patch.object(tool_probe, "_default_probe_cache", ToolProbeCache(Path(temp_dir.name) / "probes.json"))
+    probe_patch.start()
+    unittest.addModuleCleanup(probe_patch.stop)
+
+
+def _create_png(path: Path, size: tuple[int, int] = (64, 64)) -> Path:
+    """Create a small PNG image for optimization tests."""
+    Image.new("RGB", size, (120, 40, 200)).save(path)
+    return path
+
+
+class TestExecutorModes(unittest.TestCase):
+    """Test thread and process execution backends."""
+
+    def setUp(self):
+        """Set up a temporary directory with sample images."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.files = [_create_png(self.work_dir / f"image_{i}.png") for i in range(3)]
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _create_manager(self, mode: ExecutorMode, max_workers: int | None = None) -> OptimizationManager:
+        manager = OptimizationManager(executor_mode=mode, max_workers=max_workers)
+        manager.initialize_engines()
+        # Force the GIL-bound PIL path regardless of tools installed on the machine
+        manager.image_engine._available_tools = {"pil": True}
+        self.addCleanup(manager.cleanup)
+        return manager
+
+    def test_thread_mode_never_starts_process_pool(self):
+        """Test that thread mode keeps all work on the thread pool."""
+        manager = self._create_manager(ExecutorMode.THREAD)
+
+        results = manager.optimize_batch(self.files, settings=OptimizationSettings())
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r.success for r in results))
+        self.assertIsNone(manager._process_pool)
+
+    def test_auto_mode_sizes_from_core_count(self):
+        """Test that auto mode sizes the process pool from the core count."""
+        with patch("os.cpu_count", return_value=8):
+            manager = self._create_manager(ExecutorMode.AUTO)
+
+        info = manager.get_optimization_info()
+        self.assertEqual(info["executor_mode"], "auto")
+        self.assertEqual(info["process_pool_size"], 8)
+        self.assertGreaterEqual(info["thread_pool_size"], 8)
+
+    def test_auto_mode_single_core_uses_threads(self):
+        """Test that auto mode falls back to threads on a single core."""
+        with patch("os.cpu_count", return_value=1):
+            manager = self._create_manager(ExecutorMode.AUTO)
+
+        self.assertFalse(manager._uses_process_pool())
+
+    def test_process_mode_signals_and_results(self):
+        """Test that process mode emits the same signals and progress as thread mode."""
+        manager = self._create_manager(ExecutorMode.PROCESS, max_workers=2)
+        completed = []
+        progress_updates = []
+        manager.file_completed.connect(completed.append)
+        manager.progress_updated.connect(progress_updates.append)
+
+        results = manager.optimize_batch(self.files, settings=OptimizationSettings())
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r.success for r in results), [r.error_message for r in results])
+        self.assertTrue(all(r.method_used == "PIL/Pillow" for r in results))
+        self.assertEqual(len(completed), 3)
+        self.assertEqual(progress_updates[-1].completed_files, 3)
+        self.assertIsNotNone(manager._process_pool)
+        for path in self.files:
+            self.assertTrue((self.work_dir / f"{path.stem}-compressed.png").exists())
+
+    def test_subprocess_engines_stay_on_threads(self):
+        """Test that subprocess-backed image methods are not sent to the process pool."""
+        manager = self._create_manager(ExecutorMode.PROCESS, max_workers=2)
+        manager.image_engine._available_tools = {"pil": True, "pngquant": True}
+
+        with patch.object(
+            manager.image_engine, "optimize_image", return_value={"success": True, "method": "pngquant"}
+        ) as mock_optimize:
+            result = manager.optimize_single_file(self.files[0], self.work_dir / "out.png", OptimizationSettings())
+
+        self.assertTrue(result.success)
+        mock_optimize.assert_called_once()
+        self.assertIsNone(manager._process_pool)
+
+
+class TestFileInfo(unittest.TestCase):
+    """Test file type lookup in the manager."""
+
+    def test_supported_formats_are_indexed_once(self):
+        """Test that engine format lists are fetched once, not per file."""
+        manager = OptimizationManager()
+        manager.initialize_engines()
+        manager.video_engine._available_tools = {"ffmpeg": True}
+        manager.pdf_engine._available_tools = {"ghostscript": False}
+        self.addCleanup(manager.cleanup)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [Path(temp_dir) / name for name in ("a.png", "b.mp4", "c.pdf", "d.txt")]
+            for path in paths:
+                path.write_bytes(b"data")
+            with patch.object(
+                manager.image_engine, "get_supported_formats", wraps=manager.image_engine.get_supported_formats
+            ) as mock_formats:
+                infos = [manager.get_file_info(path) for path in paths * 3]
+            missing = manager.get_file_info(Path(temp_dir) / "missing.png")
+
+        mock_formats.assert_called_once()
+        self.assertEqual(
+            [(info.file_type, info.is_supported) for info in infos[:4]],
+            [("image", True), ("video", True), ("pdf", False), ("unknown", False)],
+        )
+        self.assertFalse(missing.is_supported)
+
+
+class TestFileProgress(unittest.TestCase):
+    """Test per-file sub-progress reported while long-running engines work."""
+
+    def test_video_progress_reaches_batch_progress(self):
+        """Test that in-flight video progress is folded into the batch percentage and cleared on completion."""
+        manager = OptimizationManager()
+        manager.initialize_engines()
+        manager.video_engine._available_tools = {"ffmpeg": True}
+        self.addCleanup(manager.cleanup)
+        snapshots = []
+
+        def fake_optimize_video(input_path, output_path, settings, progress_callback=None):
+            progress_callback(50.0)
+            return {"success": True, "method": "ffmpeg", "original_size": 4, "optimized_size": 2}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            video = Path(temp_dir) / "clip.mp4"
+            video.write_bytes(b"data")
+            with patch.object(manager.video_engine, "optimize_video", side_effect=fake_optimize_video):
+                manager.optimize_batch(
+                    [video],
+                    settings=OptimizationSettings(use_cache=False),
+                    progress_callback=lambda p: snapshots.append((p.progress_percentage, dict(p.file_progress))),
+                )
+
+        self.assertEqual(snapshots[0], (50.0, {str(video): 50.0}))
+        self.assertEqual(snapshots[-1], (100.0, {}))
+
+
+class TestSkipIfNoGain(unittest.TestCase):
+    """Test gain estimation and discarding of outputs that do not shrink."""
+
+    def setUp(self):
+        """Set up a manager without a result cache and a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.manager = OptimizationManager()
+        self.manager.initialize_engines()
+        self.manager.image_engine._available_tools = {"pil": True}
+        self.settings = OptimizationSettings(use_cache=False)
+
+    def tearDown(self):
+        """Shut down the manager and remove temporary files."""
+        self.manager.cleanup()
+        self.temp_dir.cleanup()
+
+    def _fake_optimize_larger(self, input_path, output_path, settings):
+        output_path.write_bytes(input_path.read_bytes() + b"padding")
+        return {
+            "success": True,
+            "method": "PIL/Pillow",
+            "original_size": input_path.stat().st_size,
+            "optimized_size": output_path.stat().st_size,
+        }
+
+    def test_larger_output_is_discarded(self):
+        """Test that an output larger than the input is deleted and the reason recorded."""
+        source = _create_png(self.work_dir / "tiny.png", (8, 8))
+        output_path = self.work_dir / "tiny-compressed.png"
+
+        with (
+            patch.object(self.manager.image_engine, "estimate_gain", return_value=None),
+            patch.object(self.manager.image_engine, "optimize_image", side_effect=self._fake_optimize_larger),
+        ):
+            result = self.manager.optimize_single_file(source, output_path, self.settings)
+
+        self.assertTrue(result.success)
+        self.assertTrue(result.skipped)
+        self.assertIn("not smaller", result.skip_reason)
+        self.assertEqual(result.optimized_size, result.original_size)
+        self.assertFalse(output_path.exists())
+
+    def test_in_place_larger_output_keeps_input(self):
+        """Test that in-place optimization never replaces a file with a larger output."""
+        source = _create_png(self.work_dir / "inplace.png", (8, 8))
+        original_bytes = source.read_bytes()
+
+        with (
+            patch.object(self.manager.image_engine, "estimate_gain", return_value=None),
+            patch.object(self.manager.image_engine, "optimize_image", side_effect=self._fake_optimize_larger),
+        ):
+            result = self.manager.optimize_single_file(source, source, self.settings)
+
+        self.assertTrue(result.skipped)
+        self.assertEqual(source.read_bytes(), original_bytes)
+        self.assertEqual(list(self.work_dir.iterdir()), [source])
+
+    def test_predicted_low_gain_skips_encode(self):
+        """Test that a JPEG already below the target quality is skipped without re-encoding."""
+        source = self.work_dir / "low.jpg"
+        Image.effect_noise((256, 256), 40).convert("RGB").save(source, quality=40)
+
+        with patch.object(self.manager.image_engine, "optimize_image") as mock_optimize:
+            result = self.manager.optimize_single_file(source, self.work_dir / "low-compressed.jpg", self.settings)
+
+        mock_optimize.assert_not_called()
+        self.assertTrue(result.skipped)
+        self.assertIn("Predicted gain", result.skip_reason)
+
+    def test_disabled_keeps_larger_output(self):
+        """Test that skip_if_no_gain=False keeps whatever the engine produced."""
+        source = _create_png(self.work_dir / "keep.png", (8, 8))
+        output_path = self.work_dir / "keep-compressed.png"
+        settings = OptimizationSettings(use_cache=False, skip_if_no_gain=False)
+
+        with (
+            patch.object(self.manager.image_engine, "estimate_gain") as mock_estimate,
+            patch.object(self.manager.image_engine, "optimize_image", side_effect=self._fake_optimize_larger),
+        ):
+            result = self.manager.optimize_single_file(source, output_path, settings)
+
+        mock_estimate.assert_not_called()
+        self.assertFalse(result.skipped)
+        self.assertTrue(output_path.exists())
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """Test shortest-job-first scheduling with per-engine budgets."""
+
+    def test_smallest_files_released_first(self):
+        """Test that jobs are released in ascending size order."""
+        scheduler = BatchScheduler({"image": EngineBudget(max_concurrent=2)}, capacity=2)
+        scheduler.add_job(Path("large.png"), "image", 3000)
+        scheduler.add_job(Path("small.png"), "image", 10)
+        scheduler.add_job(Path("medium.png"), "image", 500)
+
+        first = scheduler.take_ready()
+        self.assertEqual([job.path.name for job in first], ["small.png", "medium.png"])
+
+        scheduler.release(first[0])
+        self.assertEqual([job.path.name for job in scheduler.take_ready()], ["large.png"])
+        self.assertFalse(scheduler.has_pending())
+
+    def test_video_budget_leaves_room_for_images(self):
+        """Test that an expensive video encode does not consume every worker slot."""
+        scheduler = BatchScheduler(default_engine_budgets(4), capacity=4)
+        scheduler.add_job(Path("a.mp4"), "video", 100)
+        scheduler.add_job(Path("b.mp4"), "video", 200)
+        for i in range(4):
+            scheduler.add_job(Path(f"{i}.png"), "image", 1000 + i)
+
+        ready = scheduler.take_ready()
+        types = [job.file_type for job in ready]
+
+        self.assertEqual(types.count("video"), 1)
+        self.assertEqual(types.count("image"), 2)
+        self.assertEqual(scheduler.pending_count(), 3)
+
+    def test_oversized_cost_runs_when_idle(self):
+        """Test that a job costing more than the capacity still runs once nothing else is running."""
+        scheduler = BatchScheduler({"video": EngineBudget(max_concurrent=1, cost=16)}, capacity=2)
+        scheduler.add_job(Path("a.mp4"), "video", 100)
+
+        self.assertEqual(len(scheduler.take_ready()), 1)
+
+    def test_manager_processes_mixed_batch_smallest_first(self):
+        """Test that the manager starts files in shortest-job-first order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+            big = _create_png(work_dir / "big.png", (400, 400))
+            small = _create_png(work_dir / "small.png", (8, 8))
+            manager = OptimizationManager()
+            manager.initialize_engines()
+            manager.image_engine._available_tools = {"pil": True}
+            manager.set_engine_budget("image", max_concurrent=1)
+            self.addCleanup(manager.cleanup)
+            started = []
+            # file_started is emitted from worker threads, so connect directly instead of queueing
+            manager.file_started.connect(started.append, Qt.ConnectionType.DirectConnection)
+
+            results = manager.optimize_batch([big, small], settings=OptimizationSettings())
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual([Path(p).name for p in started], ["small.png", "big.png"])
+        self.assertEqual(manager.get_optimization_info()["engine_budgets"]["image"]["max_concurrent"], 1)
+
+
+class TestOptimizationCache(unittest.TestCase):
+    """Test the content-addressed result cache."""
+
+    def setUp(self):
+        """Set up a temporary cache directory and a manager that uses it."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.cache = OptimizationCache(cache_dir=self.work_dir / "cache")
+        self.manager = OptimizationManager(cache=self.cache)
+        self.manager.initialize_engines()
+        self.manager.image_engine._available_tools = {"pil": True}
+        self.source = _create_png(self.work_dir / "photo.png", (128, 128))
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.manager.cleanup()
+        self.temp_dir.cleanup()
+
+    def test_second_run_uses_cached_output(self):
+        """Test that identical bytes and settings return the cached output without re-optimizing."""
+        settings = OptimizationSettings()
+        first = self.manager.optimize_single_file(self.source, self.work_dir / "first.png", settings)
+
+        with patch.object(self.manager.image_engine, "optimize_image") as mock_optimize:
+            second = self.manager.optimize_single_file(self.source, self.work_dir / "second.png", settings)
+
+        mock_optimize.assert_not_called()
+        self.assertEqual(first.method_used, "PIL/Pillow")
+        self.assertEqual(second.method_used, "cached (PIL/Pillow)")
+        self.assertEqual(second.optimized_size, first.optimized_size)
+        self.assertEqual((self.work_dir / "second.png").read_bytes(), (self.work_dir / "first.png").read_bytes())
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_settings_change_misses_cache(self):
+        """Test that different output-affecting settings produce a different key."""
+        output_path = self.work_dir / "out.png"
+        medium = self.cache.make_key(self.source, output_path, OptimizationSettings())
+        high = self.cache.make_key(self.source, output_path, OptimizationSettings(quality_preset=QualityPreset.HIGH))
+        no_backup = self.cache.make_key(self.source, output_path, OptimizationSettings(create_backup=False))
+
+        self.assertNotEqual(medium, high)
+        self.assertEqual(medium, no_backup)
+
+    def test_skip_settings_keep_fingerprint(self):
+        """Test that toggling the no-gain skip settings does not invalidate cached results."""
+        default = OptimizationCache.settings_fingerprint(OptimizationSettings())
+        no_skip = OptimizationCache.settings_fingerprint(OptimizationSettings(skip_if_no_gain=False))
+        higher_gain = OptimizationCache.settings_fingerprint(OptimizationSettings(min_gain_percent=25.0))
+
+        self.assertEqual(default, no_skip)
+        self.assertEqual(default, higher_gain)
+
+    def test_larger_output_is_not_cached(self):
+        """Test that an output that did not shrink is never reused by a later skip-enabled run."""
+        settings = OptimizationSettings(skip_if_no_gain=False)
+
+        def optimize_larger(input_path, output_path, _settings):
+            output_path.write_bytes(input_path.read_bytes() + b"padding")
+            return {
+                "success": True,
+                "original_size": input_path.stat().st_size,
+                "optimized_size": output_path.stat().st_size,
+            }
+
+        with patch.object(self.manager.image_engine, "optimize_image", side_effect=optimize_larger):
+            result = self.manager.optimize_single_file(self.source, self.work_dir / "out.png", settings)
+
+        self.assertTrue(result.success)
+        self.assertEqual(self.cache.get_size(), 0)
+
+    def test_use_cache_disabled(self):
+        """Test that use_cache=False bypasses the cache entirely."""
+        settings = OptimizationSettings(use_cache=False)
+        self.manager.optimize_single_file(self.source, self.work_dir / "out.png", settings)
+
+        self.assertEqual(self.cache.get_size(), 0)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_lru_eviction_respects_max_size(self):
+        """Test that the least recently used entries are evicted first."""
+        cache = OptimizationCache(cache_dir=self.work_dir / "small_cache", max_size=250)
+        payload = self.work_dir / "payload.bin"
+        payload.write_bytes(b"x" * 100)
+
+        cache.put("a", payload, {"method": "test"})
+        cache.put("b", payload, {"method": "test"})
+        # Make "b" the least recently used entry
+        os.utime(cache.cache_dir / "b.bin", (1, 1))
+        cache.put("c", payload, {"method": "test"})
+
+        self.assertIsNone(cache.get("b", self.work_dir / "b.out"))
+        self.assertIsNotNone(cache.get("a", self.work_dir / "a.out"))
+        self.assertIsNotNone(cache.get("c", self.work_dir / "c.out"))
+        self.assertLessEqual(cache.get_size(), 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
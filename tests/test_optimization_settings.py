@@ -404,6 +404,37 @@ class TestSettingsManager(unittest.TestCase):
         error_text = " ".join(errors)
         self.assertIn("Video bitrate must be in format", error_text)
 
+    def test_validate_settings_video_encoder_options(self):
+        """Test validation of encoder preset, two-pass target size and thread count."""
+        self.assertEqual(
+            self.settings_manager.validate_settings(
+                OptimizationSettings(video_encoder_preset="veryslow", video_target_size_kb=2048, video_threads=4)
+            ),
+            [],
+        )
+
+        settings = OptimizationSettings(video_encoder_preset="warp", video_target_size_kb=0, video_threads=-1)
+        error_text = " ".join(self.settings_manager.validate_settings(settings))
+        self.assertIn("Video encoder preset must be one of", error_text)
+        self.assertIn("Video target size must be positive", error_text)
+        self.assertIn("Video threads must not be negative", error_text)
+
+    def test_validate_settings_image_pipeline_stages(self):
+        """Test validation of image pipeline stage names."""
+        valid = OptimizationSettings(image_pipeline=True, image_pipeline_stages=["resize", "pngquant", "oxipng"])
+        self.assertEqual(self.settings_manager.validate_settings(valid), [])
+
+        invalid = OptimizationSettings(image_pipeline=True, image_pipeline_stages=["resize", "zopfli"])
+        errors = self.settings_manager.validate_settings(invalid)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Image pipeline stages", errors[0])
+
+    def test_validate_settings_min_gain(self):
+        """Test validation of the skip-if-no-gain threshold."""
+        self.assertEqual(self.settings_manager.validate_settings(OptimizationSettings(min_gain_percent=5.0)), [])
+        errors = self.settings_manager.validate_settings(OptimizationSettings(min_gain_percent=150.0))
+        self.assertIn("Minimum gain must be between 0 and 100 percent", errors)
+
     def test_validate_settings_valid_bitrate_formats(self):
         """Test settings validation with valid bitrate formats."""
         valid_bitrates = ["1M", "500k", "2000", "10K", "5m"]
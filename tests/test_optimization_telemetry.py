@@ -0,0 +1,235 @@
+"""
+Unit tests for per-stage optimization telemetry and the SQLite run history.
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTabWidget
+
+from devboost.tools.file_optimization import (
+    ExecutorMode,
+    OptimizationManager,
+    OptimizationSettings,
+    tool_probe,
+)
+from devboost.tools.file_optimization.history import OptimizationHistory
+from devboost.tools.file_optimization.models import BatchOperationResult, BatchProgress
+from devboost.tools.file_optimization.process_runner import run_process
+from devboost.tools.file_optimization.telemetry import collect_telemetry, current_telemetry, stage
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+from devboost.tools.file_optimization.ui.results_dialog import OptimizationResultsDialog
+
+
+def setUpModule():
+    """Point engines built without a probe cache at a throwaway one instead of the user's shared cache."""
+    temp_dir = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(temp_dir.cleanup)
+    probe_patch = patch.object(tool_probe, "_default_probe_cache", ToolProbeCache(Path(temp_dir.name) / "probes.json"))
+    probe_patch.start()
+    unittest.addModuleCleanup(probe_patch.stop)
+
+
+def _create_jpeg(path: Path, size: tuple[int, int] = (256, 256)) -> Path:
+    """Create a noisy JPEG so encoding takes measurable time."""
+    Image.effect_noise(size, 64).convert("RGB").save(path, quality=95)
+    return path
+
+
+class TestTelemetryCollection(unittest.TestCase):
+    """Test the thread-local stage collector."""
+
+    def test_stages_accumulate_only_while_collecting(self):
+        """Test that stages are summed inside a collection and ignored outside it."""
+        with stage("decode"):
+            pass
+        self.assertIsNone(current_telemetry())
+
+        with collect_telemetry() as telemetry:
+            with stage("decode"):
+                time.sleep(0.01)
+            with stage("decode"):
+                time.sleep(0.01)
+
+        self.assertEqual(set(telemetry.stages), {"decode"})
+        self.assertGreaterEqual(telemetry.stages["decode"], 0.02)
+        self.assertIsNone(current_telemetry())
+
+    def test_merge_worker_telemetry(self):
+        """Test that timings returned by a worker process are added to the local collection."""
+        with collect_telemetry() as telemetry:
+            telemetry.add_stage("encode", 1.0)
+            telemetry.merge({"stages": {"encode": 0.5, "decode": 0.25}, "tool_cpu_time": 2.0})
+
+        self.assertEqual(telemetry.stages, {"encode": 1.5, "decode": 0.25})
+        self.assertEqual(telemetry.tool_cpu_time, 2.0)
+
+    def test_external_tools_record_wall_and_cpu_time(self):
+        """Test that run_process records the tool stage and the child's CPU time."""
+        busy_loop = "sum(i * i for i in range(3_000_000))"
+        with collect_telemetry() as telemetry:
+            result = run_process([sys.executable, "-c", busy_loop], timeout=30)
+
+        self.assertTrue(result.success)
+        self.assertGreater(telemetry.stages["tool"], 0.0)
+        if sys.platform != "win32":
+            self.assertGreater(telemetry.tool_cpu_time, 0.0)
+
+
+class TestManagerTelemetry(unittest.TestCase):
+    """Test stage timings attached to results and runs recorded by the manager."""
+
+    def setUp(self):
+        """Set up a temporary directory, history database and sample images."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.history = OptimizationHistory(db_path=self.work_dir / "history.db")
+        self.files = [_create_jpeg(self.work_dir / f"photo_{i}.jpg") for i in range(3)]
+        self.settings = OptimizationSettings(use_cache=False, skip_if_no_gain=False)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _create_manager(self, mode: ExecutorMode = ExecutorMode.THREAD, max_workers: int | None = None):
+        manager = OptimizationManager(executor_mode=mode, max_workers=max_workers, history=self.history)
+        manager.initialize_engines()
+        # Force the PIL path regardless of tools installed on the machine
+        manager.image_engine._available_tools = {"pil": True}
+        self.addCleanup(manager.cleanup)
+        return manager
+
+    def test_single_file_stage_times(self):
+        """Test that the probe, decode, encode and write stages are timed."""
+        manager = self._create_manager()
+
+        result = manager.optimize_single_file(self.files[0], self.work_dir / "out.jpg", self.settings)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.file_type, "image")
+        self.assertTrue({"probe", "optimize", "decode", "encode", "write"} <= set(result.stage_times))
+        self.assertLessEqual(result.stage_times["encode"], result.stage_times["optimize"])
+
+    def test_process_pool_stage_times_are_merged(self):
+        """Test that stages timed inside pool workers reach the result."""
+        manager = self._create_manager(ExecutorMode.PROCESS, max_workers=2)
+
+        result = manager.optimize_single_file(self.files[0], self.work_dir / "out.jpg", self.settings)
+
+        self.assertTrue(result.success)
+        self.assertIn("encode", result.stage_times)
+
+    def test_batch_is_recorded_in_history(self):
+        """Test that a finished batch is stored and reported per engine."""
+        manager = self._create_manager()
+        output_dir = self.work_dir / "out"
+        output_dir.mkdir()
+
+        results = manager.optimize_batch(self.files, output_dir, self.settings, preset_name="Web Optimized")
+
+        report = self.history.get_throughput_report()
+        self.assertEqual(len(report), 1)
+        row = report[0]
+        self.assertEqual(row.preset, "Web Optimized")
+        self.assertEqual(row.file_type, "image")
+        self.assertEqual(row.file_count, 3)
+        self.assertEqual(row.input_bytes, sum(r.original_size for r in results))
+        self.assertGreater(row.mb_per_second, 0.0)
+        self.assertGreater(row.files_per_second, 0.0)
+        self.assertIn("encode", row.stage_times)
+
+
+class TestOptimizationHistory(unittest.TestCase):
+    """Test the SQLite run history."""
+
+    def setUp(self):
+        """Set up a temporary history database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history = OptimizationHistory(db_path=Path(self.temp_dir.name) / "history.db")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _result(self, name: str, file_type: str, size: int, seconds: float, **kwargs) -> BatchOperationResult:
+        return BatchOperationResult(
+            file_path=Path(name),
+            success=kwargs.pop("success", True),
+            original_size=size,
+            optimized_size=size // 2,
+            processing_time=seconds,
+            file_type=file_type,
+            stage_times={"encode": seconds},
+            **kwargs,
+        )
+
+    def test_report_groups_runs_by_engine(self):
+        """Test throughput per run and engine, newest run first, ignoring cache hits, failures and estimate skips."""
+        settings = OptimizationSettings()
+        self.history.record_run(
+            [self._result("a.jpg", "image", 2 * 1024 * 1024, 1.0), self._result("b.mp4", "video", 1024, 4.0)],
+            settings,
+            started_at=1000.0,
+        )
+        self.history.record_run(
+            [
+                self._result("a.jpg", "image", 2 * 1024 * 1024, 0.5),
+                self._result("c.jpg", "image", 2 * 1024 * 1024, 0.5),
+                self._result("d.jpg", "image", 1024, 9.0, method_used="cached (PIL/Pillow)"),
+                self._result("e.jpg", "image", 1024, 9.0, success=False),
+                self._result("f.jpg", "image", 1024**3, 9.0, skipped=True),
+                self._result("g.jpg", "image", 2 * 1024 * 1024, 1.0, method_used="PIL/Pillow", skipped=True),
+            ],
+            settings,
+            started_at=2000.0,
+            preset="Web Optimized",
+        )
+
+        report = self.history.get_throughput_report()
+
+        self.assertEqual(
+            [(row.started_at, row.file_type) for row in report],
+            [(2000.0, "image"), (1000.0, "image"), (1000.0, "video")],
+        )
+        latest = report[0]
+        self.assertEqual(latest.preset, "Web Optimized")
+        self.assertEqual(latest.failed_count, 1)
+        self.assertEqual(latest.skipped_count, 1)
+        self.assertEqual(latest.file_count, 3)
+        self.assertAlmostEqual(latest.mb_per_second, 3.0)
+        self.assertAlmostEqual(latest.files_per_second, 1.5)
+        self.assertEqual(report[1].preset, settings.quality_preset.value)
+        self.assertEqual(len(self.history.get_throughput_report(limit=1)), 1)
+
+    def test_clear(self):
+        """Test that clearing removes every run."""
+        self.history.record_run([self._result("a.jpg", "image", 1024, 1.0)], OptimizationSettings(), started_at=0.0)
+
+        self.history.clear()
+
+        self.assertEqual(self.history.get_throughput_report(), [])
+
+    def test_results_dialog_shows_history(self):
+        """Test that the results dialog adds a throughput tab when given a history."""
+        _app = QApplication.instance() or QApplication([])
+        result = self._result("a.jpg", "image", 1024 * 1024, 1.0)
+        self.history.record_run([result], OptimizationSettings(), started_at=time.time())
+
+        dialog = OptimizationResultsDialog([result], BatchProgress(1, 1), history=self.history)
+
+        tabs = dialog.findChild(QTabWidget)
+        self.assertEqual(tabs.count(), 2)
+        history_table = tabs.widget(1)
+        self.assertIsInstance(history_table, QTableWidget)
+        self.assertEqual(history_table.rowCount(), 1)
+        self.assertEqual(history_table.item(0, 4).text(), "1.00")
+        dialog.deleteLater()
+
+
+if __name__ == "__main__":
+    unittest.main()
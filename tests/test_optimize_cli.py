@@ -0,0 +1,124 @@
+"""
+Unit tests for the headless devboost-optimize command line interface.
+"""
+
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from devboost.tools.file_optimization import (
+    ImageOptimizationEngine,
+    OptimizationSettings,
+    QualityPreset,
+    SettingsManager,
+    tool_probe,
+)
+from devboost.tools.file_optimization.cli import build_parser, expand_paths, resolve_settings, run
+from devboost.tools.file_optimization.history import OptimizationHistory
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+
+
+def setUpModule():
+    """Point engines built without a probe cache at a throwaway one instead of the user's shared cache."""
+    temp_dir = tempfile.TemporaryDirectory()
+    unittest.addModuleCleanup(temp_dir.cleanup)
+    probe_patch = patch.object(tool_probe, "_default_probe_cache", ToolProbeCache(Path(temp_dir.name) / "probes.json"))
+    probe_patch.start()
+    unittest.addModuleCleanup(probe_patch.stop)
+
+
+def _create_png(path: Path) -> Path:
+    """Create a noisy PNG image that PIL can shrink."""
+    Image.effect_noise((64, 64), 40).convert("RGB").save(path, compress_level=0)
+    return path
+
+
+class TestOptimizeCLI(unittest.TestCase):
+    """Test argument handling and JSON-lines output of devboost-optimize."""
+
+    def setUp(self):
+        """Set up a temporary folder with sample files and isolated settings."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.assets = self.work_dir / "assets"
+        (self.assets / "icons").mkdir(parents=True)
+        self.files = [
+            _create_png(self.assets / "a.png"),
+            _create_png(self.assets / "icons" / "b.png"),
+        ]
+        (self.assets / "readme.txt").write_text("not an asset")
+        self.settings_manager = SettingsManager(config_dir=self.work_dir / "config")
+        self.history = OptimizationHistory(db_path=self.work_dir / "history.db")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _run(self, *argv: str) -> tuple[int, list[dict]]:
+        stream = io.StringIO()
+        with (
+            patch("devboost.tools.file_optimization.cli.SettingsManager", return_value=self.settings_manager),
+            patch("devboost.tools.file_optimization.cli.OptimizationHistory", return_value=self.history),
+            # Force the PIL path regardless of tools installed on the machine
+            patch.object(ImageOptimizationEngine, "_detect_available_tools", return_value={"pil": True}),
+        ):
+            status = run(build_parser().parse_args(list(argv)), stream)
+        return status, [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_expand_paths(self):
+        """Test that directories, globs and earlier outputs are handled."""
+        (self.assets / "a-compressed.png").write_bytes(b"old output")
+
+        self.assertEqual(expand_paths([str(self.assets)]), [self.files[0], self.files[1]])
+        self.assertEqual(expand_paths([str(self.assets / "**" / "b.png")]), [self.files[1]])
+        self.assertEqual(expand_paths([str(self.assets / "*.gif")]), [])
+
+    def test_resolve_settings(self):
+        """Test that named presets and quality levels are accepted and unknown names rejected."""
+        web = resolve_settings(self.settings_manager, "web-optimized")
+        self.assertEqual(web.to_dict(), self.settings_manager.get_preset("Web Optimized").settings.to_dict())
+        self.assertEqual(resolve_settings(self.settings_manager, "LOW").quality_preset, QualityPreset.LOW)
+        self.assertEqual(resolve_settings(self.settings_manager, None), OptimizationSettings())
+        with self.assertRaises(ValueError):
+            resolve_settings(self.settings_manager, "nonexistent")
+
+    def test_batch_emits_json_lines(self):
+        """Test a full run: start event, one event per file and a summary with exit status 0."""
+        output_dir = self.work_dir / "out"
+
+        status, events = self._run(str(self.assets), "--jobs", "2", "--no-cache", "--output-dir", str(output_dir))
+
+        self.assertEqual(status, 0)
+        self.assertEqual(events[0], {"event": "start", "total": 2, "jobs": 2})
+        file_events = [e for e in events if e["event"] == "file"]
+        self.assertEqual(sorted(e["completed"] for e in file_events), [1, 2])
+        self.assertTrue(all(e["success"] for e in file_events))
+        summary = events[-1]
+        self.assertEqual((summary["event"], summary["total"], summary["failed"]), ("summary", 2, 0))
+        self.assertEqual(sorted(p.name for p in output_dir.iterdir()), ["a-compressed.png", "b-compressed.png"])
+        self.assertEqual([row.file_count for row in self.history.get_throughput_report()], [2])
+
+    def test_failures_set_exit_status(self):
+        """Test that a failed file makes the command exit with status 1."""
+        self.files[0].write_bytes(b"\x89PNG corrupted")
+
+        status, events = self._run(str(self.assets), "--no-cache", "--jobs", "1")
+
+        self.assertEqual(status, 1)
+        self.assertEqual(events[-1]["failed"], 1)
+
+    def test_usage_errors(self):
+        """Test that unknown presets and empty matches exit with status 2."""
+        self.assertEqual(self._run(str(self.assets), "--preset", "bogus")[0], 2)
+        status, events = self._run(str(self.work_dir / "*.mp4"))
+        self.assertEqual(status, 2)
+        self.assertEqual(events, [{"event": "error", "message": "No supported files matched"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,296 @@
+"""
+Unit tests for the PDF optimization engine.
+"""
+
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from devboost.tools.file_optimization import OptimizationSettings, PDFOptimizationEngine
+from devboost.tools.file_optimization.pdf_structure import PDFStructureError, _PDFReader, read_pdf_structure
+from devboost.tools.file_optimization.pdfs import choose_page_ranges
+from devboost.tools.file_optimization.process_runner import ProcessResult
+from devboost.tools.file_optimization.telemetry import collect_telemetry
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+
+
+def _fake_ghostscript(cmd, **kwargs):
+    """Pretend to run ghostscript by writing the requested output file."""
+    output = next(arg.split("=", 1)[1] for arg in cmd if arg.startswith("-sOutputFile="))
+    Path(output).write_bytes(b"%PDF-1.4 optimized")
+    return ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+
+def _build_compressed_pdf(path: Path, page_count: int) -> Path:
+    """Write a PDF 1.5 file whose objects live in an object stream indexed by a predicted xref stream."""
+    font_num = 3 + page_count
+    image_num = font_num + 1
+    stream_num = image_num + 1
+    xref_num = stream_num + 1
+
+    kids = " ".join(f"{3 + i} 0 R" for i in range(page_count))
+    compressed = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+        font_num: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i in range(page_count):
+        compressed[3 + i] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_num} 0 R >> /XObject << /Im1 {image_num} 0 R >> >> >>"
+        ).encode()
+
+    header, body = [], b""
+    for num, content in compressed.items():
+        header.append(f"{num} {len(body)}")
+        body += content + b"\n"
+    header_bytes = (" ".join(header) + "\n").encode()
+    stream_data = zlib.compress(header_bytes + body)
+
+    out = bytearray(b"%PDF-1.5\n")
+    offsets = {}
+    offsets[image_num] = len(out)
+    out += (
+        f"{image_num} 0 obj\n<< /Type /XObject /Subtype /Image /Width 1 /Height 1 "
+        f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Length 1 >>\nstream\n"
+    ).encode()
+    out += b"\x80\nendstream\nendobj\n"
+    offsets[stream_num] = len(out)
+    out += (
+        f"{stream_num} 0 obj\n<< /Type /ObjStm /N {len(compressed)} /First {len(header_bytes)} "
+        f"/Filter /FlateDecode /Length {len(stream_data)} >>\nstream\n"
+    ).encode()
+    out += stream_data + b"\nendstream\nendobj\n"
+    offsets[xref_num] = len(out)
+
+    # Rows of /W [1 2 2], PNG "Up" predicted like most PDF writers do
+    rows = []
+    indexes = {num: index for index, num in enumerate(compressed)}
+    for num in range(xref_num + 1):
+        if num in offsets:
+            rows.append(bytes([1]) + offsets[num].to_bytes(2, "big") + bytes(2))
+        elif num in indexes:
+            rows.append(bytes([2]) + stream_num.to_bytes(2, "big") + indexes[num].to_bytes(2, "big"))
+        else:
+            rows.append(bytes(5))
+    previous = bytes(5)
+    predicted = b""
+    for row in rows:
+        predicted += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous, strict=True))
+        previous = row
+    xref_data = zlib.compress(predicted)
+    out += (
+        f"{xref_num} 0 obj\n<< /Type /XRef /Size {xref_num + 1} /W [1 2 2] /Root 1 0 R "
+        f"/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 5 >> /Length {len(xref_data)} >>\nstream\n"
+    ).encode()
+    out += xref_data + b"\nendstream\nendobj\n"
+    out += f"startxref\n{offsets[xref_num]}\n%%EOF\n".encode()
+    path.write_bytes(bytes(out))
+    return path
+
+
+class TestPDFStructure(unittest.TestCase):
+    """Test reading document facts from the PDF object structure."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_classic_xref_table(self):
+        """Test a PDF with a plain xref table and one image per page."""
+        path = self.work_dir / "images.pdf"
+        pages = [Image.new("RGB", (20, 20), (i, 0, 0)) for i in range(5)]
+        pages[0].save(path, save_all=True, append_images=pages[1:])
+
+        structure = read_pdf_structure(path)
+
+        self.assertEqual((structure.pages, structure.image_count, structure.has_fonts), (5, 5, False))
+
+    def test_xref_stream_and_object_streams(self):
+        """Test a PDF 1.5 file with compressed objects and a predicted xref stream."""
+        path = _build_compressed_pdf(self.work_dir / "compressed.pdf", 3)
+
+        structure = read_pdf_structure(path)
+
+        self.assertEqual((structure.pages, structure.image_count, structure.has_fonts), (3, 1, True))
+
+    def test_damaged_file_raises(self):
+        """Test that a file without a readable cross-reference structure raises PDFStructureError."""
+        path = self.work_dir / "broken.pdf"
+        path.write_bytes(b"%PDF-1.4\nnot really a pdf\n")
+
+        with self.assertRaises(PDFStructureError):
+            read_pdf_structure(path)
+
+    def test_large_document_needs_no_per_page_work(self):
+        """Test that page count does not require per-page work beyond the xref scan."""
+        path = _build_compressed_pdf(self.work_dir / "large.pdf", 500)
+
+        with (
+            patch.object(_PDFReader, "resolve", autospec=True, side_effect=_PDFReader.resolve) as mock_resolve,
+            patch("subprocess.run") as mock_run,
+            patch("subprocess.Popen") as mock_popen,
+        ):
+            structure = read_pdf_structure(path)
+
+        self.assertEqual(structure.pages, 500)
+        # Only the catalog, the page tree root and its /Count are resolved, however many pages there are
+        self.assertEqual(mock_resolve.call_count, 3)
+        mock_run.assert_not_called()
+        mock_popen.assert_not_called()
+
+
+class TestPDFInfo(unittest.TestCase):
+    """Test get_pdf_info with the structure reader and the ghostscript fallback."""
+
+    def setUp(self):
+        """Set up an engine that believes ghostscript is installed."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.engine = PDFOptimizationEngine(probe_cache=ToolProbeCache(self.work_dir / "probes.json"))
+        self.engine._available_tools = {"ghostscript": True}
+        self.engine._gs_command = "gs"
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_info_without_ghostscript(self):
+        """Test that readable PDFs never launch ghostscript."""
+        path = _build_compressed_pdf(self.work_dir / "doc.pdf", 4)
+
+        with patch("devboost.tools.file_optimization.pdfs.run_process") as mock_run:
+            info = self.engine.get_pdf_info(path)
+
+        mock_run.assert_not_called()
+        self.assertEqual(info, {"pages": 4, "has_images": True, "has_fonts": True, "image_count": 1})
+
+    def test_damaged_file_uses_single_ghostscript_run(self):
+        """Test that unreadable structures fall back to one ghostscript page count run."""
+        path = self.work_dir / "damaged.pdf"
+        path.write_bytes(b"%PDF-1.4\ngarbage")
+
+        with patch(
+            "devboost.tools.file_optimization.pdfs.run_process",
+            return_value=ProcessResult(success=True, returncode=0, stdout="7\n", stderr=""),
+        ) as mock_run:
+            info = self.engine.get_pdf_info(path)
+
+        mock_run.assert_called_once()
+        self.assertIn("pdfpagecount", mock_run.call_args.args[0][-1])
+        self.assertEqual(info["pages"], 7)
+
+
+class TestPageRanges(unittest.TestCase):
+    """Test splitting documents into page ranges."""
+
+    def test_small_document_is_not_split(self):
+        """Test that short documents stay in a single range."""
+        self.assertEqual(choose_page_ranges(12, 8), [(1, 12)])
+
+    def test_ranges_cover_every_page(self):
+        """Test that ranges are contiguous, balanced and limited by the core count."""
+        ranges = choose_page_ranges(103, 4)
+
+        self.assertEqual(ranges, [(1, 26), (27, 52), (53, 78), (79, 103)])
+
+    def test_unknown_page_count(self):
+        """Test that an unknown page count falls back to a single range."""
+        self.assertEqual(len(choose_page_ranges(0, 8)), 1)
+
+
+class TestParallelPageRanges(unittest.TestCase):
+    """Test parallel page-range optimization with ghostscript."""
+
+    def setUp(self):
+        """Set up an engine that believes ghostscript is installed."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.engine = PDFOptimizationEngine(probe_cache=ToolProbeCache(self.work_dir / "probes.json"))
+        self.engine._available_tools = {"ghostscript": True}
+        self.engine._gs_command = "gs"
+        self.input_path = self.work_dir / "scan.pdf"
+        self.input_path.write_bytes(b"%PDF-1.4 original document")
+        self.output_path = self.work_dir / "scan-compressed.pdf"
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_ranges_optimized_in_parallel_and_merged(self):
+        """Test that each range gets its own gs process and the parts are merged in order."""
+        settings = OptimizationSettings(pdf_parallel=True)
+
+        with (
+            patch.object(self.engine, "get_pdf_info", return_value={"pages": 40}),
+            patch("os.cpu_count", return_value=2),
+            patch("devboost.tools.file_optimization.pdfs.run_process", side_effect=_fake_ghostscript) as mock_run,
+        ):
+            result = self.engine.optimize_pdf(self.input_path, self.output_path, settings)
+
+        commands = [call.args[0] for call in mock_run.call_args_list]
+        range_commands, merge_command = commands[:-1], commands[-1]
+        self.assertEqual(
+            sorted((cmd[-4], cmd[-3]) for cmd in range_commands),
+            [("-dFirstPage=1", "-dLastPage=20"), ("-dFirstPage=21", "-dLastPage=40")],
+        )
+        self.assertTrue(all(cmd[-1] == str(self.input_path) for cmd in range_commands))
+        self.assertEqual([Path(arg).name for arg in merge_command[-2:]], ["part_000.pdf", "part_001.pdf"])
+        self.assertEqual(result["page_ranges"], 2)
+        self.assertEqual(self.output_path.read_bytes(), b"%PDF-1.4 optimized")
+
+    def test_parallel_ranges_are_recorded_as_tool_time(self):
+        """Test that Ghostscript runs on pool threads still reach the calling thread's telemetry."""
+        with (
+            patch.object(self.engine, "get_pdf_info", return_value={"pages": 40}),
+            patch("os.cpu_count", return_value=2),
+            patch("devboost.tools.file_optimization.pdfs.run_process", side_effect=_fake_ghostscript),
+            collect_telemetry() as telemetry,
+        ):
+            self.engine.optimize_pdf(self.input_path, self.output_path, OptimizationSettings(pdf_parallel=True))
+
+        self.assertIn("tool", telemetry.stages)
+
+    def test_parallel_mode_off_uses_single_process(self):
+        """Test that the default settings run one gs process over the whole document."""
+        with (
+            patch.object(self.engine, "get_pdf_info") as mock_info,
+            patch("devboost.tools.file_optimization.pdfs.run_process", side_effect=_fake_ghostscript) as mock_run,
+        ):
+            result = self.engine.optimize_pdf(self.input_path, self.output_path, OptimizationSettings())
+
+        mock_info.assert_not_called()
+        mock_run.assert_called_once()
+        self.assertFalse(any(arg.startswith("-dFirstPage") for arg in mock_run.call_args.args[0]))
+        self.assertNotIn("page_ranges", result)
+
+    def test_failed_range_fails_optimization(self):
+        """Test that a failing range surfaces as an optimization error."""
+
+        def fail_second_range(cmd, **kwargs):
+            if "-dFirstPage=21" in cmd:
+                return ProcessResult(success=False, returncode=1, stdout="", stderr="broken page")
+            return _fake_ghostscript(cmd)
+
+        with (
+            patch.object(self.engine, "get_pdf_info", return_value={"pages": 40}),
+            patch("os.cpu_count", return_value=2),
+            patch("devboost.tools.file_optimization.pdfs.run_process", side_effect=fail_second_range),
+            self.assertRaisesRegex(RuntimeError, "broken page"),
+        ):
+            self.engine.optimize_pdf(self.input_path, self.output_path, OptimizationSettings(pdf_parallel=True))
+
+        self.assertFalse(self.output_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -244,9 +244,9 @@ class TestTimeZoneConverter:
             for city in matching_cities:
                 display_name = city["display_name"]
                 assert city_name in display_name.lower(), f"Display name should contain {city_name}: {display_name}"
-                assert (
-                    "(" in display_name and ")" in display_name
-                ), f"Display name should contain timezone: {display_name}"
+                assert "(" in display_name and ")" in display_name, (
+                    f"Display name should contain timezone: {display_name}"
+                )
 
     def test_search_cities_edge_cases(self):
         """Test edge cases for city search functionality."""
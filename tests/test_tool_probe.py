@@ -0,0 +1,128 @@
+"""
+Unit tests for the persistent tool probe cache used by the file optimization engines.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from devboost.tools.file_optimization import PDFOptimizationEngine, VideoOptimizationEngine
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+
+
+@unittest.skipIf(sys.platform == "win32", "uses executable shell scripts as fake tools")
+class TestToolProbeCache(unittest.TestCase):
+    """Test caching of tool probes by binary path and mtime."""
+
+    def setUp(self):
+        """Set up a temporary directory with a fake tool."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+        self.cache_file = self.work_dir / "probes.json"
+        self.tool = self._create_tool("faketool", "echo 1.0")
+
+    def tearDown(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _create_tool(self, name: str, body: str) -> Path:
+        tool = self.work_dir / name
+        tool.write_text(f"#!/bin/sh\n{body}\n", encoding="utf-8")
+        tool.chmod(tool.stat().st_mode | stat.S_IXUSR)
+        return tool
+
+    def test_warm_start_serves_cached_result(self):
+        """Test that a new cache instance reuses results and only re-probes in the background."""
+        probe_fn = Mock(return_value=True)
+        self.assertTrue(ToolProbeCache(self.cache_file).probe("faketool", str(self.tool), probe_fn))
+        probe_fn.assert_called_once_with(str(self.tool.resolve()))
+
+        warm_cache = ToolProbeCache(self.cache_file)
+        warm_probe = Mock(return_value=False)
+        self.assertTrue(warm_cache.probe("faketool", str(self.tool), warm_probe))
+
+        # The background refresh picks up the changed result for the next start
+        warm_cache.wait_for_refresh(timeout=5)
+        warm_probe.assert_called_once()
+        next_cache = ToolProbeCache(self.cache_file)
+        self.assertFalse(next_cache.probe("faketool", str(self.tool), Mock(return_value=False)))
+        next_cache.wait_for_refresh(timeout=5)
+
+    def test_refresh_runs_once_per_process(self):
+        """Test that repeated hits in one process schedule a single background refresh."""
+        ToolProbeCache(self.cache_file).probe("faketool", str(self.tool), Mock(return_value=True))
+        cache = ToolProbeCache(self.cache_file)
+        probe_fn = Mock(return_value=True)
+
+        for _ in range(3):
+            cache.probe("faketool", str(self.tool), probe_fn)
+        cache.wait_for_refresh(timeout=5)
+
+        probe_fn.assert_called_once()
+
+    def test_changed_binary_is_reprobed(self):
+        """Test that a new mtime invalidates the cached result."""
+        cache = ToolProbeCache(self.cache_file)
+        cache.probe("faketool", str(self.tool), Mock(return_value=True))
+        os.utime(self.tool, ns=(1_000_000_000, 1_000_000_000))
+
+        probe_fn = Mock(return_value=False)
+        self.assertFalse(cache.probe("faketool", str(self.tool), probe_fn))
+        probe_fn.assert_called_once()
+
+    def test_missing_tool_is_cached_until_path_changes(self):
+        """Test that tools that cannot be found are cached against PATH and re-probed once installed."""
+        cache = ToolProbeCache(self.cache_file)
+        with patch.dict(os.environ, {"PATH": str(self.work_dir / "empty")}):
+            probe_fn = Mock(return_value=False)
+            self.assertFalse(cache.probe("newtool", "newtool", probe_fn))
+            self.assertFalse(cache.probe("newtool", "newtool", Mock(return_value=False)))
+            probe_fn.assert_called_once_with("newtool")
+
+        with patch.dict(os.environ, {"PATH": str(self.work_dir)}):
+            tool = self._create_tool("newtool", "exit 0")
+            installed_probe = Mock(return_value=True)
+            self.assertTrue(cache.probe("newtool", "newtool", installed_probe))
+            installed_probe.assert_called_once_with(str(tool.resolve()))
+        cache.wait_for_refresh(timeout=5)
+
+    def test_corrupt_cache_file_is_ignored(self):
+        """Test that an unreadable cache file falls back to probing."""
+        self.cache_file.write_text("{not json", encoding="utf-8")
+
+        self.assertTrue(ToolProbeCache(self.cache_file).probe("faketool", str(self.tool), Mock(return_value=True)))
+
+    def test_engines_skip_subprocess_probes_on_warm_start(self):
+        """Test that engines constructed with a warm cache do not spawn probe processes."""
+        self._create_tool("ffmpeg", "exit 0")
+        self._create_tool("ffprobe", "exit 0")
+        self._create_tool("gs", 'if [ "$1" = "--version" ]; then echo 10.02.1; else echo Ghostscript; fi')
+
+        with patch.dict(os.environ, {"PATH": str(self.work_dir)}):
+            VideoOptimizationEngine(probe_cache=ToolProbeCache(self.cache_file))
+            PDFOptimizationEngine(probe_cache=ToolProbeCache(self.cache_file))
+
+            with patch("devboost.tools.file_optimization.pdfs.get_config", return_value=""):
+                warm_cache = ToolProbeCache(self.cache_file)
+                with (
+                    patch.object(warm_cache, "_schedule_refresh") as mock_refresh,
+                    patch("subprocess.run") as mock_run,
+                ):
+                    video_engine = VideoOptimizationEngine(probe_cache=warm_cache)
+                    pdf_engine = PDFOptimizationEngine(probe_cache=warm_cache)
+
+        mock_run.assert_not_called()
+        self.assertTrue(mock_refresh.called)
+        self.assertFalse(video_engine._available_tools["gifski"])
+
+        self.assertTrue(video_engine._available_tools["ffmpeg"])
+        self.assertTrue(pdf_engine._available_tools["ghostscript"])
+        self.assertEqual(pdf_engine._gs_version, "10.02.1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,8 @@ Unit tests for video optimization functionality in the file optimization tool.
 
 import json
 import subprocess
+import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -13,6 +15,9 @@ from devboost.tools.file_optimization import (
     QualityPreset,
     VideoOptimizationEngine,
 )
+from devboost.tools.file_optimization.process_runner import ProcessResult, run_streaming_process
+from devboost.tools.file_optimization.tool_probe import ToolProbeCache
+from devboost.tools.file_optimization.videos import choose_segment_count, parse_ffmpeg_progress_line
 
 
 class TestVideoOptimizationEngine(unittest.TestCase):
@@ -20,7 +25,10 @@ class TestVideoOptimizationEngine(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.engine = VideoOptimizationEngine()
+        # Isolate from the shared probe cache so patched probes are never served from or written to it
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.engine = VideoOptimizationEngine(probe_cache=ToolProbeCache(Path(self.temp_dir.name) / "probes.json"))
 
     def test_init_creates_logger_and_detects_tools(self):
         """Test that initialization creates logger and detects available tools."""
@@ -31,6 +39,7 @@ class TestVideoOptimizationEngine(unittest.TestCase):
 
     def test_detect_available_tools_all_available(self):
         """Test tool detection when all tools are available."""
+        self.engine._probe_cache.clear()
         with patch.object(self.engine, "_check_command_available", return_value=True):
             tools = self.engine._detect_available_tools()
             expected_tools = {"ffmpeg": True, "ffprobe": True, "gifski": True}
@@ -38,6 +47,7 @@ class TestVideoOptimizationEngine(unittest.TestCase):
 
     def test_detect_available_tools_none_available(self):
         """Test tool detection when no tools are available."""
+        self.engine._probe_cache.clear()
         with patch.object(self.engine, "_check_command_available", return_value=False):
             tools = self.engine._detect_available_tools()
             expected_tools = {"ffmpeg": False, "ffprobe": False, "gifski": False}
@@ -153,7 +163,7 @@ class TestVideoOptimizationEngine(unittest.TestCase):
             result = self.engine.optimize_video(input_path, output_path, settings)
 
             self.assertTrue(result["success"])
-            mock_convert.assert_called_once_with(input_path, output_path, settings)
+            mock_convert.assert_called_once_with(input_path, output_path, settings, progress_callback=None)
 
     def test_optimize_video_general_optimization(self):
         """Test general video optimization."""
@@ -174,7 +184,7 @@ class TestVideoOptimizationEngine(unittest.TestCase):
             result = self.engine.optimize_video(input_path, output_path, settings)
 
             self.assertTrue(result["success"])
-            mock_optimize.assert_called_once_with(input_path, output_path, settings)
+            mock_optimize.assert_called_once_with(input_path, output_path, settings, progress_callback=None)
 
     def test_optimize_video_compression_ratio_calculation(self):
         """Test compression ratio calculation in video optimization."""
@@ -207,9 +217,9 @@ class TestVideoOptimizationEngine(unittest.TestCase):
 
         with (
             patch.object(self.engine, "_get_video_info", return_value={"width": 1920, "height": 1080}),
-            patch("subprocess.run") as mock_run,
+            patch("devboost.tools.file_optimization.videos.run_streaming_process") as mock_run,
         ):
-            mock_run.return_value.returncode = 0
+            mock_run.return_value = ProcessResult(success=True, returncode=0, stdout="", stderr="")
             result = self.engine._optimize_with_ffmpeg(input_path, output_path, settings)
 
             self.assertTrue(result["success"])
@@ -230,9 +240,9 @@ class TestVideoOptimizationEngine(unittest.TestCase):
 
         with (
             patch.object(self.engine, "_get_video_info", return_value={}),
-            patch("subprocess.run") as mock_run,
+            patch("devboost.tools.file_optimization.videos.run_streaming_process") as mock_run,
         ):
-            mock_run.return_value.returncode = 0
+            mock_run.return_value = ProcessResult(success=True, returncode=0, stdout="", stderr="")
             result = self.engine._optimize_with_ffmpeg(input_path, output_path, settings)
 
             self.assertTrue(result["success"])
@@ -251,9 +261,9 @@ class TestVideoOptimizationEngine(unittest.TestCase):
         with (
             patch.object(self.engine, "_get_video_info", return_value={"width": 1920, "height": 1080}),
             patch.object(self.engine, "_build_scale_filter", return_value="scale=1280:720"),
-            patch("subprocess.run") as mock_run,
+            patch("devboost.tools.file_optimization.videos.run_streaming_process") as mock_run,
         ):
-            mock_run.return_value.returncode = 0
+            mock_run.return_value = ProcessResult(success=True, returncode=0, stdout="", stderr="")
             result = self.engine._optimize_with_ffmpeg(input_path, output_path, settings)
 
             self.assertTrue(result["success"])
@@ -274,29 +284,242 @@ class TestVideoOptimizationEngine(unittest.TestCase):
 
         with (
             patch.object(self.engine, "_get_video_info", return_value={}),
-            patch("subprocess.run") as mock_run,
+            patch("devboost.tools.file_optimization.videos.run_streaming_process") as mock_run,
         ):
-            mock_run.return_value.returncode = 1
-            mock_run.return_value.stderr = "ffmpeg error"
+            mock_run.return_value = ProcessResult(success=False, returncode=1, stdout="", stderr="ffmpeg error")
 
             with self.assertRaises(RuntimeError) as context:
                 self.engine._optimize_with_ffmpeg(input_path, output_path, settings)
             self.assertIn("ffmpeg failed", str(context.exception))
 
+    def test_optimize_with_ffmpeg_reports_progress(self):
+        """Test that ffmpeg progress lines are turned into percent-complete callbacks."""
+        input_path = Path("test.mp4")
+        output_path = Path("output.mp4")
+        settings = OptimizationSettings()
+        progress = []
+
+        def fake_run(cmd, on_line=None, stall_timeout=None):
+            for line in ("frame=10", "out_time_us=2500000", "out_time_ms=5000000", "progress=end"):
+                on_line(line)
+            return ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with (
+            patch.object(self.engine, "_get_video_info", return_value={"duration": 10.0}),
+            patch("devboost.tools.file_optimization.videos.run_streaming_process", side_effect=fake_run) as mock_run,
+        ):
+            self.engine._optimize_with_ffmpeg(input_path, output_path, settings, progress_callback=progress.append)
+
+        self.assertEqual(progress, [25.0, 50.0, 100.0])
+        args = mock_run.call_args[0][0]
+        self.assertIn("-progress", args)
+        self.assertEqual(args[args.index("-progress") + 1], "pipe:1")
+
     def test_optimize_with_ffmpeg_timeout(self):
-        """Test ffmpeg optimization timeout handling."""
+        """Test that a stalled ffmpeg run is reported as a timeout."""
         input_path = Path("test.mp4")
         output_path = Path("output.mp4")
         settings = OptimizationSettings()
+        stalled = ProcessResult(success=False, returncode=-9, stdout="", stderr="", timed_out=True)
 
         with (
             patch.object(self.engine, "_get_video_info", return_value={}),
-            patch("subprocess.run", side_effect=subprocess.TimeoutExpired("ffmpeg", 300)),
+            patch("devboost.tools.file_optimization.videos.run_streaming_process", return_value=stalled),
         ):
             with self.assertRaises(RuntimeError) as context:
                 self.engine._optimize_with_ffmpeg(input_path, output_path, settings)
             self.assertIn("timed out", str(context.exception))
 
+    def test_optimize_with_ffmpeg_encoder_preset_and_threads(self):
+        """Test that the encoder preset and thread count reach the ffmpeg command."""
+        settings = OptimizationSettings(video_encoder_preset="veryslow", video_threads=4)
+        success = ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with (
+            patch.object(self.engine, "_get_video_info", return_value={}),
+            patch("devboost.tools.file_optimization.videos.run_streaming_process", return_value=success) as mock_run,
+        ):
+            result = self.engine._optimize_with_ffmpeg(Path("test.mp4"), Path("output.mp4"), settings)
+            mp4_args = mock_run.call_args[0][0]
+            self.engine._optimize_with_ffmpeg(Path("test.mp4"), Path("output.webm"), settings)
+            webm_args = mock_run.call_args[0][0]
+
+        self.assertEqual(result["encoder_preset"], "veryslow")
+        self.assertEqual(mp4_args[mp4_args.index("-preset") + 1], "veryslow")
+        self.assertEqual(mp4_args[mp4_args.index("-threads") + 1], "4")
+        self.assertEqual(webm_args[webm_args.index("-cpu-used") + 1], "0")
+        self.assertNotIn("-preset", webm_args)
+
+    def test_optimize_with_ffmpeg_two_pass_target_size(self):
+        """Test that a target size runs two passes at the bitrate needed to hit it."""
+        settings = OptimizationSettings(video_target_size_kb=1000)
+        progress = []
+
+        def fake_run(cmd, on_line=None, stall_timeout=None):
+            on_line("out_time_us=10000000")
+            return ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with (
+            patch.object(self.engine, "_get_video_info", return_value={"duration": 10.0}),
+            patch("devboost.tools.file_optimization.videos.run_streaming_process", side_effect=fake_run) as mock_run,
+        ):
+            result = self.engine._optimize_with_ffmpeg(
+                Path("test.mp4"), Path("output.mp4"), settings, progress_callback=progress.append
+            )
+
+        first_pass, second_pass = (call[0][0] for call in mock_run.call_args_list)
+        self.assertTrue(result["two_pass"])
+        # 1000 KB over 10 seconds is 800 kbps, minus 128 kbps of audio
+        self.assertEqual(first_pass[first_pass.index("-b:v") + 1], "672k")
+        self.assertEqual(first_pass[first_pass.index("-pass") + 1], "1")
+        self.assertIn("-an", first_pass)
+        self.assertEqual(second_pass[second_pass.index("-pass") + 1], "2")
+        self.assertEqual(second_pass[-1], "output.mp4")
+        self.assertNotIn("-crf", second_pass)
+        self.assertEqual(progress, [50.0, 100.0])
+
+    def test_two_pass_without_duration_falls_back_to_crf(self):
+        """Test that two-pass mode falls back to a single CRF pass when the duration is unknown."""
+        settings = OptimizationSettings(video_target_size_kb=1000)
+        success = ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with (
+            patch.object(self.engine, "_get_video_info", return_value={}),
+            patch("devboost.tools.file_optimization.videos.run_streaming_process", return_value=success) as mock_run,
+        ):
+            result = self.engine._optimize_with_ffmpeg(Path("test.mp4"), Path("output.mp4"), settings)
+
+        mock_run.assert_called_once()
+        self.assertFalse(result["two_pass"])
+        self.assertIn("-crf", mock_run.call_args[0][0])
+
+    def test_benchmark_presets(self):
+        """Test that the benchmark encodes a sample per preset and reports fps and bitrate."""
+        self.engine._available_tools = {"ffmpeg": True}
+
+        def fake_run(cmd, on_line=None, stall_timeout=None):
+            Path(cmd[-1]).write_bytes(b"x" * 2500)
+            on_line("frame=120")
+            return ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with (
+            patch.object(self.engine, "_get_video_info", return_value={"duration": 60.0}),
+            patch("devboost.tools.file_optimization.videos.run_streaming_process", side_effect=fake_run) as mock_run,
+        ):
+            results = self.engine.benchmark_presets(
+                Path("test.mp4"), OptimizationSettings(), presets=("ultrafast", "slow"), sample_seconds=2
+            )
+
+        self.assertEqual([r["preset"] for r in results], ["ultrafast", "slow"])
+        # 2500 bytes over a 2 second sample
+        self.assertEqual(results[0]["bitrate_kbps"], 10.0)
+        self.assertGreater(results[0]["fps"], 0)
+        first_cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(first_cmd[first_cmd.index("-t") + 1], "2")
+        self.assertEqual(first_cmd[first_cmd.index("-preset") + 1], "ultrafast")
+
+    def test_estimate_gain_from_sample(self):
+        """Test that the gain is predicted from a stream-copied sample encoded with the target settings."""
+        self.engine._available_tools = {"ffmpeg": True}
+
+        def fake_run(cmd, on_line=None, stall_timeout=None):
+            # The stream-copied sample is 1000 bytes and re-encodes to 400
+            Path(cmd[-1]).write_bytes(b"s" * 1000 if "copy" in cmd else b"e" * 400)
+            return ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with tempfile.NamedTemporaryFile(suffix=".mp4") as source:
+            source.write(b"x" * 5000)
+            source.flush()
+            with (
+                patch.object(self.engine, "_get_video_info", return_value={"duration": 120.0}),
+                patch(
+                    "devboost.tools.file_optimization.videos.run_streaming_process", side_effect=fake_run
+                ) as mock_run,
+            ):
+                gain = self.engine.estimate_gain(Path(source.name), Path("out.mp4"), OptimizationSettings())
+
+        self.assertEqual(gain, 60.0)
+        sample_cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(sample_cmd[sample_cmd.index("-t") + 1], "10")
+
+    def test_estimate_gain_skips_short_videos_and_uses_target_size(self):
+        """Test that short videos are not sampled and two-pass encodes are predicted from the target."""
+        self.engine._available_tools = {"ffmpeg": True}
+
+        with tempfile.NamedTemporaryFile(suffix=".mp4") as source:
+            source.write(b"x" * 4096)
+            source.flush()
+            with (
+                patch.object(self.engine, "_get_video_info", return_value={"duration": 12.0}),
+                patch("devboost.tools.file_optimization.videos.run_streaming_process") as mock_run,
+            ):
+                self.assertIsNone(self.engine.estimate_gain(Path(source.name), Path("out.mp4"), OptimizationSettings()))
+                target_gain = self.engine.estimate_gain(
+                    Path(source.name), Path("out.mp4"), OptimizationSettings(video_target_size_kb=1)
+                )
+
+        mock_run.assert_not_called()
+        self.assertEqual(target_gain, 75.0)
+
+    def test_segmented_mode_splits_encodes_and_concatenates(self):
+        """Test that segmented mode splits at keyframes, encodes each chunk and joins them losslessly."""
+        settings = OptimizationSettings(video_segmented=True)
+        encoded_inputs = []
+        progress = []
+
+        def fake_run(cmd, on_line=None, stall_timeout=None):
+            output = Path(cmd[-1])
+            if "segment" in cmd:
+                for i in range(3):
+                    (output.parent / f"chunk_{i:03d}.mkv").write_bytes(b"chunk")
+            elif "concat" in cmd:
+                concat_list = Path(cmd[cmd.index("-i") + 1]).read_text(encoding="utf-8")
+                self.assertEqual(concat_list.count("file '"), 3)
+                output.write_bytes(b"joined")
+            else:
+                encoded_inputs.append(Path(cmd[cmd.index("-i") + 1]).name)
+                on_line("progress=end")
+                output.write_bytes(b"encoded")
+            return ProcessResult(success=True, returncode=0, stdout="", stderr="")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / "output.mp4"
+            with (
+                patch("os.cpu_count", return_value=4),
+                patch.object(self.engine, "_get_video_info", return_value={"duration": 90.0}),
+                patch(
+                    "devboost.tools.file_optimization.videos.run_streaming_process", side_effect=fake_run
+                ) as mock_run,
+            ):
+                result = self.engine._encode_with_ffmpeg(
+                    Path("test.mp4"), output_path, settings, progress_callback=progress.append
+                )
+
+            self.assertEqual(output_path.read_bytes(), b"joined")
+
+        self.assertEqual(result["segments"], 3)
+        self.assertEqual(sorted(encoded_inputs), ["chunk_000.mkv", "chunk_001.mkv", "chunk_002.mkv"])
+        split_cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(split_cmd[split_cmd.index("-c") + 1], "copy")
+        self.assertEqual(split_cmd[split_cmd.index("-segment_time") + 1], "30.000")
+        concat_cmd = mock_run.call_args_list[-1][0][0]
+        self.assertEqual(concat_cmd[concat_cmd.index("-c") + 1], "copy")
+        self.assertEqual(progress[-1], 100.0)
+
+    def test_segmented_mode_short_video_uses_single_encode(self):
+        """Test that videos too short to split are encoded by a single ffmpeg process."""
+        settings = OptimizationSettings(video_segmented=True)
+
+        with (
+            patch.object(self.engine, "_get_video_info", return_value={"duration": 20.0}),
+            patch.object(self.engine, "_optimize_with_ffmpeg", return_value={"success": True}) as mock_optimize,
+            patch.object(self.engine, "_optimize_segmented") as mock_segmented,
+        ):
+            self.engine._encode_with_ffmpeg(Path("test.mp4"), Path("output.mp4"), settings)
+
+        mock_optimize.assert_called_once()
+        mock_segmented.assert_not_called()
+
     def test_convert_mov_to_mp4(self):
         """Test MOV to MP4 conversion."""
         input_path = Path("test.mov")
@@ -501,5 +724,78 @@ class TestVideoOptimizationEngine(unittest.TestCase):
             self.assertEqual(info["recommended_methods"]["gif"], "ffmpeg")  # fallback when gifski not available
 
 
+class TestFfmpegProgressParsing(unittest.TestCase):
+    """Test parsing of ffmpeg's machine-readable progress output."""
+
+    def test_out_time_is_converted_to_percent(self):
+        """Test that out_time_us is converted to percent of the input duration."""
+        self.assertEqual(parse_ffmpeg_progress_line("out_time_us=30000000", 120.0), 25.0)
+
+    def test_percent_is_clamped(self):
+        """Test that overshooting the probed duration never reports more than 100%."""
+        self.assertEqual(parse_ffmpeg_progress_line("out_time_us=130000000", 120.0), 100.0)
+        self.assertEqual(parse_ffmpeg_progress_line("out_time_us=-1", 120.0), 0.0)
+
+    def test_unrelated_and_unknown_duration_lines_are_ignored(self):
+        """Test that non-progress keys, bad values and unknown durations return None."""
+        self.assertIsNone(parse_ffmpeg_progress_line("frame=42", 120.0))
+        self.assertIsNone(parse_ffmpeg_progress_line("out_time_us=N/A", 120.0))
+        self.assertIsNone(parse_ffmpeg_progress_line("out_time_us=1000", 0.0))
+
+    def test_progress_end(self):
+        """Test that the final progress=end line reports completion."""
+        self.assertEqual(parse_ffmpeg_progress_line("progress=end", 0.0), 100.0)
+
+
+class TestSegmentCount(unittest.TestCase):
+    """Test chunk count selection for segmented encoding."""
+
+    def test_limited_by_cores(self):
+        """Test that long videos use one chunk per core."""
+        self.assertEqual(choose_segment_count(3600.0, 8), 8)
+
+    def test_limited_by_duration(self):
+        """Test that chunks are never shorter than the minimum segment length."""
+        self.assertEqual(choose_segment_count(95.0, 8), 3)
+        self.assertEqual(choose_segment_count(20.0, 8), 1)
+
+    def test_unknown_duration(self):
+        """Test that an unknown duration disables splitting."""
+        self.assertEqual(choose_segment_count(0.0, 8), 1)
+
+
+class TestStreamingProcessRunner(unittest.TestCase):
+    """Test the streaming subprocess runner used for long-running encodes."""
+
+    def test_streams_stdout_lines(self):
+        """Test that stdout is delivered line by line and the exit code is reported."""
+        lines = []
+        script = "import sys; print('a=1'); print('b=2'); sys.stderr.write('warn'); sys.exit(3)"
+
+        result = run_streaming_process([sys.executable, "-c", script], on_line=lines.append, stall_timeout=10)
+
+        self.assertEqual(lines, ["a=1", "b=2"])
+        self.assertFalse(result.success)
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(result.stderr, "warn")
+        self.assertFalse(result.timed_out)
+
+    def test_watchdog_kills_stalled_process(self):
+        """Test that a process with no output for stall_timeout seconds is killed."""
+        result = run_streaming_process([sys.executable, "-c", "import time; time.sleep(30)"], stall_timeout=0.5)
+
+        self.assertTrue(result.timed_out)
+        self.assertFalse(result.success)
+
+    def test_steady_output_is_not_a_stall(self):
+        """Test that a process running longer than stall_timeout survives while it keeps reporting."""
+        script = "import time\nfor i in range(6):\n    print(i, flush=True)\n    time.sleep(0.2)"
+
+        result = run_streaming_process([sys.executable, "-c", script], stall_timeout=0.5)
+
+        self.assertTrue(result.success)
+        self.assertFalse(result.timed_out)
+
+
 if __name__ == "__main__":
     unittest.main()